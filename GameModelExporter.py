@@ -1,6 +1,6 @@
 import bpy
 import os
-from bpy.types import PropertyGroup, Panel, Operator
+from bpy.types import PropertyGroup, Panel, Operator, UIList
 
 # Import individual operators
 from . import (
@@ -9,8 +9,13 @@ from . import (
     static_mesh_operator,
     scene_setup_operator,
     collision_operators,
-    fbx_export_operator
+    fbx_export_operator,
+    validation_operator,
+    benchmark_operator,
+    prop_placement_operator,
+    uv_projection_operator
 )
+from . import node_materials, node_objects, node_status, watch_mode
 
 # Define the update function for the relative path
 def update_relative_path(self, context):
@@ -28,26 +33,12 @@ def update_relative_path(self, context):
         self["custom_file_path"] = full_path
         print(f"Updated export path: {full_path}")
         
-        # Update material color to grey when path is set
+        # Update material color to grey when path is set (shared material, no new datablocks)
         if self.relative_export_path != "":
-            # Create a new material
-            mat = bpy.data.materials.new(name="GreyMaterial")
-            # Set the material's diffuse color
-            mat.diffuse_color = (0.5, 0.5, 0.5, 1)  # Grey
-            # Assign the material to the text object
-            if self.data.materials:
-                self.data.materials[0] = mat
-            else:
-                self.data.materials.append(mat)
-
-# Add the relative path property to the Object class
-bpy.types.Object.relative_export_path = bpy.props.StringProperty(
-    name="Relative Export Path",
-    description="Path relative to the Addons Path",
-    default="",
-    maxlen=1024,
-    update=update_relative_path
-)
+            node_materials.assign_node_material(self, 'READY')
+    elif not self.relative_export_path:
+        # Path cleared, the node goes back to red
+        node_materials.assign_node_material(self, 'NO_PATH')
 
 # File browser operator for selecting relative path
 class OBJECT_OT_BrowseRelativePath(Operator):
@@ -97,14 +88,42 @@ class OBJECT_OT_BrowseRelativePath(Operator):
         
         # Update the active object's relative path
         obj = context.object
-        if obj and obj.type == 'FONT':
+        if node_status.is_node(obj):
             obj.relative_export_path = relative_path
             self.report({'INFO'}, f"Export path set to: {relative_path or 'Base directory'}")
         else:
-            self.report({'ERROR'}, "Please select a text object (node)")
+            self.report({'ERROR'}, "Please select a node")
         
         return {'FINISHED'}
 
+# Merge the per-node materials older versions created into the shared ones
+class OBJECT_OT_MergeNodeMaterials(Operator):
+    bl_idname = "object.merge_node_materials"
+    bl_label = "Merge Node Materials"
+    bl_description = "Replace old per-node RedMaterial.NNN / GreyMaterial.NNN copies with the shared node materials"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        removed = node_materials.merge_duplicate_node_materials()
+        self.report({'INFO'}, f"Merged {removed} duplicate node materials")
+        return {'FINISHED'}
+
+# One-shot migration of text nodes to the cheaper marker nodes
+class OBJECT_OT_ConvertTextNodes(Operator):
+    bl_idname = "object.convert_text_nodes"
+    bl_label = "Convert Text Nodes"
+    bl_description = "Replace every text node with a marker node, keeping its name, export path, transform and children"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            self.report({'ERROR'}, "Switch to Object Mode first")
+            return {'CANCELLED'}
+
+        converted = node_objects.convert_text_nodes(context)
+        self.report({'INFO'}, f"Converted {converted} text nodes to marker nodes")
+        return {'FINISHED'}
+
 # Custom panel for file path (keeping for potential compatibility)
 class OBJECT_PT_CustomPanel(Panel):
     bl_idname = "OBJECT_PT_custom_panel"
@@ -117,16 +136,15 @@ class OBJECT_PT_CustomPanel(Panel):
         layout = self.layout
         obj = context.object
         
-        # Get addon preferences
-        preferences = context.preferences.addons[__name__.split('.')[0]].preferences
-        base_path = preferences.addons_path
+        # Addons Path from the node status cache (not re-resolved on every redraw)
+        base_path = node_status.get_base_path()
         
         if not base_path:
             box = layout.box()
             box.label(text="⚠ Set Addons Path in preferences first", icon='ERROR')
             return
         
-        if obj and obj.type == 'FONT':
+        if node_status.is_node(obj):
             # Show browse button
             row = layout.row()
             row.operator("object.browse_relative_path", icon='FILEBROWSER')
@@ -139,9 +157,284 @@ class OBJECT_PT_CustomPanel(Panel):
                 box = layout.box()
                 box.label(text="No export path set", icon='INFO')
 
-# Export FBX Properties (keeping for potential future use)
+# Scrollable list of all nodes with their cached export status
+class OBJECT_UL_S2Nodes(UIList):
+    bl_idname = "OBJECT_UL_S2Nodes"
+
+    show_problems_only: bpy.props.BoolProperty(
+        name="Problems Only",
+        description="Only show nodes that are dirty, have no export path, no collision or no materials",
+        default=False
+    )
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        status = node_status.peek_status(item.name)
+        if status is None:
+            layout.label(text=item.name)
+            return
+
+        row = layout.row(align=True)
+        row.label(text=item.name, icon='FILE_REFRESH' if status.dirty else 'CHECKMARK')
+        row.label(text=status.relative_path or "No export path", icon='FILE_FOLDER' if status.has_path else 'ERROR')
+        row.label(text="", icon='MESH_CUBE' if status.has_collision else 'CANCEL')
+        row.label(text="", icon='MATERIAL' if status.vmat_ok else 'ERROR')
+        row.label(text=status.last_export_text)
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_invert", text="", icon='ARROW_LEFTRIGHT')
+        row.prop(self, "show_problems_only", text="", icon='ERROR')
+        row.prop(self, "use_filter_sort_alpha", text="", icon='SORTALPHA')
+
+    def filter_items(self, context, data, propname):
+        # Cached in node_status, so redraws don't walk every object
+        return node_status.filter_flags(
+            self.filter_name,
+            self.show_problems_only,
+            self.use_filter_invert,
+            self.use_filter_sort_alpha,
+            self.bitflag_filter_item
+        )
+
+def update_node_index(self, context):
+    """Make the node clicked in the dashboard the active, selected object"""
+    if not 0 <= self.s2_node_index < len(bpy.data.objects):
+        return
+    obj = bpy.data.objects[self.s2_node_index]
+    if obj.name in context.view_layer.objects:
+        for selected in context.selected_objects:
+            selected.select_set(False)
+        obj.select_set(True)
+        context.view_layer.objects.active = obj
+
+# Export settings stored per scene
 class ExportFBXProperties(PropertyGroup):
-    pass  # Empty for now, but keeping the structure
+    node_type: bpy.props.EnumProperty(
+        name="New Nodes",
+        description="Object type used by Create Node",
+        items=[
+            ('MARKER', "Marker", "Small marker sharing one mesh with all nodes, cheap to evaluate with thousands of nodes"),
+            ('TEXT', "Text", "Text object showing the node name (font curves slow down large scenes)"),
+        ],
+        default='MARKER'
+    )
+
+    export_format: bpy.props.EnumProperty(
+        name="Format",
+        description="File format written by the node and static mesh exports",
+        items=[
+            ('FBX', "FBX", "Blender's FBX exporter"),
+            ('DMX_BINARY', "DMX (binary)", "Native DMX writer, binary encoding. ModelDoc imports DMX faster than FBX"),
+            ('DMX_TEXT', "DMX (text)", "Native DMX writer, keyvalues2 text encoding (readable, larger)"),
+        ],
+        default='FBX'
+    )
+
+    watch_mode: bpy.props.BoolProperty(
+        name="Watch Mode",
+        description="Automatically re-export nodes whose children changed, after the scene has been quiet for a while or on save",
+        default=False,
+        update=watch_mode.update_watch_mode
+    )
+
+    validate_before_export: bpy.props.BoolProperty(
+        name="Validate Before Export",
+        description="Check nodes and static meshes for problems (missing paths, non-box collision, NaN vertices, ...) before exporting",
+        default=True
+    )
+
+    block_on_validation_errors: bpy.props.BoolProperty(
+        name="Block on Errors",
+        description="Cancel the export when validation finds errors",
+        default=False
+    )
+
+    watch_quiet_period: bpy.props.FloatProperty(
+        name="Quiet Period",
+        description="Seconds without changes before watch mode re-exports dirty nodes",
+        default=2.0,
+        min=0.2,
+        max=600.0,
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE'
+    )
+
+    deterministic_output: bpy.props.BoolProperty(
+        name="Deterministic Output",
+        description="Write identical bytes for identical geometry: no timestamps or file paths, fixed ids and stable names",
+        default=False
+    )
+
+    use_content_store: bpy.props.BoolProperty(
+        name="Content Store",
+        description="Keep every exported file once in a content-addressed store and hard link (or copy) it into place, so identical models take the space of one",
+        default=False
+    )
+
+    export_materials: bpy.props.BoolProperty(
+        name="Export Materials",
+        description="Convert the image textures of used materials and write .vmat files into the addon content folder",
+        default=False
+    )
+
+    material_folder: bpy.props.StringProperty(
+        name="Material Folder",
+        description="Folder inside the Addons Path for converted textures and generated .vmat files",
+        default="materials/blender"
+    )
+
+    texture_format: bpy.props.EnumProperty(
+        name="Texture Format",
+        description="File format of converted textures",
+        items=[
+            ('TGA', "TGA", "Uncompressed 32-bit TGA, fastest to write"),
+            ('PNG', "PNG", "Compressed PNG, smaller files"),
+        ],
+        default='TGA'
+    )
+
+    strip_attributes: bpy.props.BoolProperty(
+        name="Strip Unused Data",
+        description="Export only the UV maps and color attributes Source 2 uses and no custom properties except FBX_vmatPath",
+        default=False
+    )
+
+    uv_channel_count: bpy.props.IntProperty(
+        name="UV Maps",
+        description="Number of UV maps kept when stripping, starting with the render UV map",
+        default=1,
+        min=1,
+        max=8
+    )
+
+    position_precision: bpy.props.FloatProperty(
+        name="Position Precision",
+        description="Round vertex positions to this grid in Hammer units, the same grid for FBX and DMX. 0 keeps full precision",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        precision=4
+    )
+
+    normal_precision: bpy.props.FloatProperty(
+        name="Normal Precision",
+        description="Round normal components to this step. 0 keeps full precision",
+        default=0.0,
+        min=0.0,
+        max=0.1,
+        precision=4
+    )
+
+    collision_hulls: bpy.props.BoolProperty(
+        name="Collision Hulls",
+        description="Export every island of a node's _coll mesh as a simplified convex hull: near-coplanar planes merged, vertices capped, slivers dropped",
+        default=False
+    )
+
+    hull_max_vertices: bpy.props.IntProperty(
+        name="Max Hull Vertices",
+        description="Most vertices per collision hull, larger hulls keep their most spread-out points",
+        default=64,
+        min=4,
+        max=255
+    )
+
+    hull_plane_angle: bpy.props.FloatProperty(
+        name="Merge Angle",
+        description="Hull vertices whose surrounding planes differ by less than this angle are removed, merging the planes",
+        default=0.0349066,
+        min=0.0,
+        max=0.349066,
+        subtype='ANGLE'
+    )
+
+    hull_min_volume: bpy.props.FloatProperty(
+        name="Min Hull Volume",
+        description="Hulls smaller than this (cubic Hammer units) are dropped as slivers",
+        default=1.0,
+        min=0.0,
+        max=10000.0
+    )
+
+    region_mode: bpy.props.EnumProperty(
+        name="Region",
+        description="Which nodes Export Region exports",
+        items=[
+            ('ACTIVE', "Active Object", "Nodes whose bounds overlap the bounding box of the active object, e.g. a box around a building"),
+            ('COLLECTION', "Collection", "Nodes whose bounds overlap the combined bounds of a collection"),
+            ('CURSOR', "3D Cursor", "Nodes whose bounds come within a radius of the 3D cursor"),
+        ],
+        default='ACTIVE'
+    )
+
+    region_collection: bpy.props.PointerProperty(
+        name="Region Collection",
+        description="Collection whose bounds select the nodes",
+        type=bpy.types.Collection
+    )
+
+    region_radius: bpy.props.FloatProperty(
+        name="Radius",
+        description="Largest distance from the 3D cursor to a node's bounds",
+        default=10.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+
+    placement_path: bpy.props.StringProperty(
+        name="Placement File",
+        description="Hammer prefab (.vmap) written by Export Prop Placement. Empty: maps/prefabs/<blend name>_props.vmap in the Addons Path",
+        default="",
+        subtype='FILE_PATH'
+    )
+
+    placement_class: bpy.props.EnumProperty(
+        name="Entity Class",
+        description="Entity class of placed props (a node's s2_entity_class custom property overrides it)",
+        items=[
+            ('prop_static', "prop_static", "Static props, baked into the map"),
+            ('prop_dynamic', "prop_dynamic", "Dynamic props that can be moved or hidden at runtime"),
+        ],
+        default='prop_static'
+    )
+
+    modifier_cache_size: bpy.props.IntProperty(
+        name="Modifier Cache",
+        description="Number of evaluated modifier stacks kept between exports and reused while the mesh and its modifiers are unchanged. 0 disables the cache",
+        default=64,
+        min=0,
+        max=4096
+    )
+
+    buffer_cache_size: bpy.props.IntProperty(
+        name="Buffer Cache (MB)",
+        description="Disk space for processed DMX export buffers, kept next to the .blend between sessions. Unchanged nodes are written from it without evaluating their meshes. Least recently used entries go first. 0 disables the cache",
+        default=2048,
+        min=0,
+        max=65536
+    )
+
+    texels_per_inch: bpy.props.FloatProperty(
+        name="Texels/Inch",
+        description="Texture density of Greybox UVs. Hammer's default texture scale of 0.25 is 4 texels per inch",
+        default=4.0,
+        min=0.01,
+        max=64.0
+    )
+
+    greybox_uvs: bpy.props.BoolProperty(
+        name="Greybox UVs",
+        description="Static mesh export gives meshes with only dev materials world-aligned box UVs (on the exported copy)",
+        default=False
+    )
+
+    stream_static_export: bpy.props.BoolProperty(
+        name="Stream Static Export",
+        description="DMX static mesh export copies and evaluates one object at a time and keeps the finished meshes on disk "
+                    "until the file is written, so huge selections don't run out of memory. Writes the same file",
+        default=False
+    )
 
 # Main panel
 class ExportFBXPanel(Panel):
@@ -156,9 +449,8 @@ class ExportFBXPanel(Panel):
         scene = context.scene
         obj = context.object
 
-        # Get addon preferences
-        preferences = context.preferences.addons[__name__.split('.')[0]].preferences
-        base_path = preferences.addons_path
+        # Addons Path from the node status cache (not re-resolved on every redraw)
+        base_path = node_status.get_base_path()
 
         # Create Node and Scene Setup buttons
         row = layout.row()
@@ -172,13 +464,18 @@ class ExportFBXPanel(Panel):
         # Dev Material button
         row = layout.row()
         row.operator("object.adddevmat", icon='MATERIAL')
+        row = layout.row(align=True)
+        row.operator("object.greybox_uvs", icon='UV')
+        row.prop(scene.export_fbx, "texels_per_inch")
         
         layout.separator()
 
-        # Show export settings for selected text objects (nodes)
-        if obj and obj.type == 'FONT':
+        # Show export settings for the selected node
+        if node_status.is_node(obj):
             box = layout.box()
             box.label(text="Node Export Settings:", icon='TEXT')
+            if node_status.is_marker_node(obj):
+                box.prop(obj, f'["{node_status.NODE_NAME_PROPERTY}"]', text="Name")
             
             if not base_path:
                 # Warning if base path not set
@@ -190,26 +487,95 @@ class ExportFBXPanel(Panel):
                 row.operator("object.browse_relative_path", icon='FILEBROWSER', text="Select Export Folder")
                 
                 # Show current path info
-                if hasattr(obj, 'relative_export_path') and obj.relative_export_path:
+                status = node_status.peek_status(obj.name)
+                if status is not None and status.relative_path:
                     info_box = box.box()
                     info_box.label(text="Export Path:", icon='CHECKMARK')
-                    info_box.label(text=f"  {obj.relative_export_path}")
-                    info_box.label(text=f"Full Path: {os.path.join(base_path, obj.relative_export_path)}")
+                    info_box.label(text=f"  {status.relative_path}")
+                    info_box.label(text=f"Full Path: {status.export_path}")
                 else:
                     info_box = box.box()
                     info_box.label(text="⚠ No export path set", icon='ERROR')
         
-        elif obj and obj.type != 'FONT':
-            # Show info when non-text object is selected
+        elif obj:
+            # Show info when another object is selected
             box = layout.box()
-            box.label(text="Select a Node (text object) to set export path", icon='INFO')
+            box.label(text="Select a Node to set export path", icon='INFO')
+
+        layout.separator()
+
+        # Dashboard of all nodes, fed by the cached node status
+        box = layout.box()
+        box.label(text="Nodes:", icon='OUTLINER')
+        box.template_list("OBJECT_UL_S2Nodes", "", bpy.data, "objects", scene, "s2_node_index", rows=6)
+        row = box.row(align=True)
+        row.prop(scene.export_fbx, "node_type")
+        row.operator("object.convert_text_nodes", icon='MESH_ICOSPHERE', text="")
 
         layout.separator()
 
+        # Export settings
+        row = layout.row()
+        row.prop(scene.export_fbx, "export_format")
+        row = layout.row(align=True)
+        row.prop(scene.export_fbx, "validate_before_export")
+        sub = row.row(align=True)
+        sub.active = scene.export_fbx.validate_before_export
+        sub.prop(scene.export_fbx, "block_on_validation_errors")
+        row.operator("object.validate_export", icon='CHECKMARK', text="")
+        row = layout.row(align=True)
+        row.prop(scene.export_fbx, "watch_mode", icon='HIDE_OFF')
+        sub = row.row(align=True)
+        sub.active = scene.export_fbx.watch_mode
+        sub.prop(scene.export_fbx, "watch_quiet_period", text="")
+        row = layout.row(align=True)
+        row.prop(scene.export_fbx, "deterministic_output")
+        row.prop(scene.export_fbx, "use_content_store")
+        row = layout.row(align=True)
+        row.prop(scene.export_fbx, "export_materials", icon='MATERIAL')
+        sub = row.row(align=True)
+        sub.active = scene.export_fbx.export_materials
+        sub.prop(scene.export_fbx, "texture_format", text="")
+        if scene.export_fbx.export_materials:
+            layout.prop(scene.export_fbx, "material_folder")
+        row = layout.row(align=True)
+        row.prop(scene.export_fbx, "strip_attributes")
+        sub = row.row(align=True)
+        sub.active = scene.export_fbx.strip_attributes
+        sub.prop(scene.export_fbx, "uv_channel_count")
+        row = layout.row(align=True)
+        row.prop(scene.export_fbx, "position_precision", text="Position")
+        row.prop(scene.export_fbx, "normal_precision", text="Normal")
+        row = layout.row(align=True)
+        row.prop(scene.export_fbx, "collision_hulls")
+        sub = row.row(align=True)
+        sub.active = scene.export_fbx.collision_hulls
+        sub.prop(scene.export_fbx, "hull_max_vertices", text="Vertices")
+        row = layout.row(align=True)
+        row.active = scene.export_fbx.collision_hulls
+        row.prop(scene.export_fbx, "hull_plane_angle")
+        row.prop(scene.export_fbx, "hull_min_volume", text="Min Volume")
+        layout.prop(scene.export_fbx, "modifier_cache_size")
+        row = layout.row()
+        row.active = scene.export_fbx.export_format != 'FBX'
+        row.prop(scene.export_fbx, "buffer_cache_size")
+
         # Main export button
         row = layout.row()
         row.scale_y = 3
         row.operator("object.export_fbx", icon='PLAY')
+
+        # Region export, queried from the node spatial index
+        box = layout.box()
+        row = box.row(align=True)
+        row.prop(scene.export_fbx, "region_mode", text="")
+        if scene.export_fbx.region_mode == 'COLLECTION':
+            row.prop(scene.export_fbx, "region_collection", text="")
+        elif scene.export_fbx.region_mode == 'CURSOR':
+            row.prop(scene.export_fbx, "region_radius")
+        row = box.row(align=True)
+        row.operator("object.export_node_region", icon='EXPORT')
+        row.operator("object.select_node_region", icon='RESTRICT_SELECT_OFF', text="")
         
         layout.separator()
         
@@ -217,9 +583,20 @@ class ExportFBXPanel(Panel):
         row = layout.row()
         row.scale_y = 3
         row.operator("object.staticmesh", icon='PLAY')
+        row = layout.row()
+        row.prop(scene.export_fbx, "greybox_uvs")
+        row.prop(scene.export_fbx, "stream_static_export", text="Stream")
         
         layout.separator()
 
+        # Prop placement export
+        row = layout.row(align=True)
+        row.prop(scene.export_fbx, "placement_class", text="")
+        row.operator("object.export_prop_placement", icon='OUTLINER_OB_GROUP_INSTANCE')
+        layout.prop(scene.export_fbx, "placement_path")
+
+        layout.separator()
+
         # Collision buttons
         row = layout.row()
         row.operator("object.setup_coll", icon='MESH_CUBE')
@@ -231,6 +608,9 @@ def register():
     # Register property groups and operators first
     bpy.utils.register_class(ExportFBXProperties)
     bpy.utils.register_class(OBJECT_OT_BrowseRelativePath)
+    bpy.utils.register_class(OBJECT_OT_MergeNodeMaterials)
+    bpy.utils.register_class(OBJECT_OT_ConvertTextNodes)
+    bpy.utils.register_class(OBJECT_UL_S2Nodes)
     bpy.utils.register_class(OBJECT_PT_CustomPanel)
     bpy.utils.register_class(ExportFBXPanel)
     
@@ -241,12 +621,28 @@ def register():
     scene_setup_operator.register()
     collision_operators.register()
     fbx_export_operator.register()
+    validation_operator.register()
+    benchmark_operator.register()
+    prop_placement_operator.register()
+    uv_projection_operator.register()
     
-    # Add scene property
+    # Add the relative path property to the Object class, and scene properties
+    bpy.types.Object.relative_export_path = bpy.props.StringProperty(
+        name="Relative Export Path",
+        description="Path relative to the Addons Path",
+        default="",
+        maxlen=1024,
+        update=update_relative_path
+    )
     bpy.types.Scene.export_fbx = bpy.props.PointerProperty(type=ExportFBXProperties)
+    bpy.types.Scene.s2_node_index = bpy.props.IntProperty(default=-1, update=update_node_index)
 
 def unregister():
     # Unregister in reverse order
+    uv_projection_operator.unregister()
+    prop_placement_operator.unregister()
+    benchmark_operator.unregister()
+    validation_operator.unregister()
     fbx_export_operator.unregister()
     collision_operators.unregister()
     scene_setup_operator.unregister()
@@ -256,11 +652,16 @@ def unregister():
     
     bpy.utils.unregister_class(ExportFBXPanel)
     bpy.utils.unregister_class(OBJECT_PT_CustomPanel)
+    bpy.utils.unregister_class(OBJECT_UL_S2Nodes)
+    bpy.utils.unregister_class(OBJECT_OT_ConvertTextNodes)
+    bpy.utils.unregister_class(OBJECT_OT_MergeNodeMaterials)
     bpy.utils.unregister_class(OBJECT_OT_BrowseRelativePath)
     bpy.utils.unregister_class(ExportFBXProperties)
     
     # Remove scene properties
+    del bpy.types.Scene.s2_node_index
     del bpy.types.Scene.export_fbx
+    del bpy.types.Object.relative_export_path
 
 if __name__ == "__main__":
     register()
\ No newline at end of file
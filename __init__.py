@@ -17,23 +17,30 @@ bl_info = {
 }
 
 import bpy
+from bpy.app.handlers import persistent
 from bpy.types import AddonPreferences
-from bpy.props import StringProperty
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, StringProperty
 
-# Import all modules
+# Import all modules (GameModelExporter registers the operator modules itself)
 from . import (
     GameModelExporter,
-    add_node_operator,
-    dev_material_operator,
-    static_mesh_operator,
-    scene_setup_operator,
-    collision_operators,
-    fbx_export_operator
+    modifier_cache,
+    node_status,
+    node_spatial,
+    watch_mode
 )
 
-def auto_rename_text_object(scene):
-    """Handler function that renames text objects based on their content"""
-    for obj in scene.objects:
+@persistent
+def auto_rename_text_object(scene, depsgraph):
+    """Handler function that renames text objects based on their content.
+    Only looks at the objects in this update, not at the whole scene."""
+    # The exporter's temporary duplicates keep their names
+    if node_status.is_suspended():
+        return
+    for update in depsgraph.updates:
+        if not isinstance(update.id, bpy.types.Object):
+            continue
+        obj = update.id.original
         if obj.type == 'FONT':
             # Get the current text content (strip whitespace)
             text_content = obj.data.body.strip()
@@ -41,9 +48,12 @@ def auto_rename_text_object(scene):
             # Only rename if text content is not empty and different from current name
             if text_content and text_content != obj.name:
                 # Rename the object to match text content
-                old_name = obj.name
                 obj.name = text_content
 
+def update_addons_path(self, context):
+    """Cached node export paths depend on the Addons Path"""
+    node_status.invalidate()
+
 # Addon preferences
 class Source2ExporterPreferences(AddonPreferences):
     bl_idname = __name__
@@ -53,7 +63,61 @@ class Source2ExporterPreferences(AddonPreferences):
         description="Base path for all exports - all export paths will be relative to this location",
         default="",
         maxlen=1024,
-        subtype='DIR_PATH'
+        subtype='DIR_PATH',
+        update=update_addons_path
+    )
+
+    # Per-project runtime budgets per exported prop, 0 = no limit
+    budget_triangles: IntProperty(
+        name="Triangles",
+        description="Most triangles per prop model",
+        default=0,
+        min=0
+    )
+
+    budget_draw_calls: IntProperty(
+        name="Draw Calls",
+        description="Most materials (one draw call each) per prop model",
+        default=0,
+        min=0
+    )
+
+    budget_vertices: IntProperty(
+        name="Vertices",
+        description="Most vertices per prop model after splitting at normal, UV, color and material seams",
+        default=0,
+        min=0
+    )
+
+    budget_collision_hulls: IntProperty(
+        name="Collision Hulls",
+        description="Most convex pieces in a prop's collision model",
+        default=0,
+        min=0
+    )
+
+    budget_size: FloatProperty(
+        name="Size",
+        description="Largest bounding box dimension of a prop model, in Hammer units",
+        default=0.0,
+        min=0.0
+    )
+
+    enforce_budgets: BoolProperty(
+        name="Don't Export Props Over Budget",
+        description="Skip props that go over a budget instead of only warning about them",
+        default=False
+    )
+
+    budget_report: EnumProperty(
+        name="Budget Report",
+        description="Write the budget metrics of every exported node next to the .blend file (<name>_budget)",
+        items=[
+            ('NONE', "None", "No report file, over budget props are still reported"),
+            ('CSV', "CSV", "Spreadsheet, one row per node"),
+            ('JSON', "JSON", "Budgets and one record per node"),
+        ],
+        default='NONE'
     )
     
     static_mesh_export_path: StringProperty(
@@ -64,6 +128,22 @@ class Source2ExporterPreferences(AddonPreferences):
         subtype='DIR_PATH'
     )
 
+    content_store_path: StringProperty(
+        name="Content Store Path",
+        description="Folder of the content-addressed export store. Empty: a .s2_store folder inside the export folder. Hard links need it on the same drive as the exports",
+        default="",
+        maxlen=1024,
+        subtype='DIR_PATH'
+    )
+
+    buffer_cache_path: StringProperty(
+        name="Buffer Cache Path",
+        description="Folder of the DMX export buffer cache. Empty: a .s2_buffer_cache folder next to the .blend file",
+        default="",
+        maxlen=1024,
+        subtype='DIR_PATH'
+    )
+
     def draw(self, context):
         layout = self.layout
         
@@ -73,6 +153,20 @@ class Source2ExporterPreferences(AddonPreferences):
             box = layout.box()
             box.label(text="⚠ Please set the Addons Path", icon='ERROR')
             box.label(text="This will be the base directory for all exports")
+
+        # Budgets
+        box = layout.box()
+        box.label(text="Prop Budgets (0 = no limit):")
+        row = box.row(align=True)
+        row.prop(self, "budget_triangles")
+        row.prop(self, "budget_vertices")
+        row = box.row(align=True)
+        row.prop(self, "budget_draw_calls")
+        row.prop(self, "budget_collision_hulls")
+        box.prop(self, "budget_size")
+        row = box.row()
+        row.prop(self, "enforce_budgets")
+        row.prop(self, "budget_report")
         
         # Static mesh export path
         layout.separator()
@@ -84,15 +178,18 @@ class Source2ExporterPreferences(AddonPreferences):
             box.label(text="⚠ Please set the static mesh export path", icon='ERROR')
             box.label(text="This should point to your CS2 static mesh folder")
 
+        # Content store
+        layout.separator()
+        layout.prop(self, "content_store_path")
+        layout.prop(self, "buffer_cache_path")
+
 # List of modules to register
 modules = [
     GameModelExporter,
-    add_node_operator,
-    dev_material_operator,
-    static_mesh_operator,
-    scene_setup_operator,
-    collision_operators,
-    fbx_export_operator
+    modifier_cache,
+    node_status,
+    node_spatial,
+    watch_mode
 ]
 
 def register():
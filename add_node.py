@@ -1,6 +1,8 @@
 import bpy
 from mathutils import Vector
 
+from . import node_materials, node_objects
+
 def auto_rename_text_object(scene):
     """Handler function that renames text objects based on their content"""
     for obj in scene.objects:
@@ -43,12 +45,6 @@ else:
         center += obj.location
     center /= len(selected_objects)
 
-    # Create a new Text object
-    bpy.ops.object.text_add(location=center)
-
-    # Get the created Text object
-    text_obj = bpy.context.object
-
     # Determine the desired name
     if len(selected_objects) > 1:
         desired_name = "Node"
@@ -56,80 +52,67 @@ else:
         # If only one object is selected, use the same name as the mesh
         desired_name = selected_objects[0].name
 
-    # Let Blender assign whatever name it wants (might be Node.001, etc.)
-    # But we'll control the text content
-
-    # Enter edit mode to set clean text content
-    bpy.context.view_layer.objects.active = text_obj
-    bpy.ops.object.mode_set(mode='EDIT')
-    
-    # Clear all text and set clean name without any numeric suffix
-    bpy.ops.font.select_all()
-    bpy.ops.font.delete()
-    bpy.ops.font.text_insert(text=desired_name)
-    
-    # Exit edit mode
-    bpy.ops.object.mode_set(mode='OBJECT')
-    
-    # Now use the clean text content to rename the object
-    text_obj.name = desired_name
-
-    # Set the horizontal alignment of the text to 'CENTER'
-    text_obj.data.align_x = 'CENTER'
-
-    # Calculate the maximum Y dimension of the bounding boxes of the selected objects
-    max_y_dim = max((obj.dimensions.y for obj in selected_objects if obj.dimensions.y > 0), default=1.0)
-
-    # Adjust the Y offset of the text within the Text object to be outside the bounding box
-    # Note: Blender uses meters as the unit for measurement, so we convert inches to meters
-    text_obj.data.offset_y = -max_y_dim - 10 * 0.0254
-
-    # Make the selected objects children of the Text object
+    if bpy.context.scene.export_fbx.node_type == 'MARKER':
+        # Marker node: shared marker mesh, the name is kept in a property
+        node_obj = node_objects.new_marker_node(desired_name, bpy.context.collection)
+        node_obj.location = center
+        # The children are parented with matrix_world, which needs the node's matrix up to date
+        bpy.context.view_layer.update()
+    else:
+        # Create a new Text object
+        bpy.ops.object.text_add(location=center)
+
+        # Get the created Text object
+        node_obj = bpy.context.object
+
+        # Let Blender assign whatever name it wants (might be Node.001, etc.)
+        # But we'll control the text content
+
+        # Enter edit mode to set clean text content
+        bpy.context.view_layer.objects.active = node_obj
+        bpy.ops.object.mode_set(mode='EDIT')
+
+        # Clear all text and set clean name without any numeric suffix
+        bpy.ops.font.select_all()
+        bpy.ops.font.delete()
+        bpy.ops.font.text_insert(text=desired_name)
+
+        # Exit edit mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        # Now use the clean text content to rename the object
+        node_obj.name = desired_name
+
+        # Set the horizontal alignment of the text to 'CENTER'
+        node_obj.data.align_x = 'CENTER'
+
+        # Calculate the maximum Y dimension of the bounding boxes of the selected objects
+        max_y_dim = max((obj.dimensions.y for obj in selected_objects if obj.dimensions.y > 0), default=1.0)
+
+        # Adjust the Y offset of the text within the Text object to be outside the bounding box
+        # Note: Blender uses meters as the unit for measurement, so we convert inches to meters
+        node_obj.data.offset_y = -max_y_dim - 10 * 0.0254
+
+        # Assign the shared red "no export path" material (one material for all nodes)
+        node_materials.assign_node_material(node_obj, 'NO_PATH')
+
+    # Make the selected objects children of the node
     for obj in selected_objects:
         # Store the world space matrix
         matrix_world = obj.matrix_world.copy()
         
         # Set the parent
-        obj.parent = text_obj
+        obj.parent = node_obj
         
         # Restore the world space matrix
         obj.matrix_world = matrix_world
 
-    # Create a new material with unique name to avoid conflicts
-    mat_name = "RedMaterial"
-    counter = 1
-    while mat_name in bpy.data.materials:
-        mat_name = f"RedMaterial.{counter:03d}"
-        counter += 1
-    
-    mat = bpy.data.materials.new(name=mat_name)
-
-    # Set the material's diffuse color (Updated for Blender 4.4)
-    mat.diffuse_color = (1, 0, 0, 1)  # Red
-    
-    # For proper material setup in Blender 4.4
-    if not mat.use_nodes:
-        mat.use_nodes = True
-    
-    # Get the principled BSDF node
-    nodes = mat.node_tree.nodes
-    principled = nodes.get("Principled BSDF")
-    if principled:
-        principled.inputs[0].default_value = (1, 0, 0, 1)  # Base Color
-
-    # Assign the material to the text object
-    if text_obj.data.materials:
-        # Assign to first material slot
-        text_obj.data.materials[0] = mat
-    else:
-        # No slots
-        text_obj.data.materials.append(mat)
-
     # Set the viewport display color to red
-    text_obj.color = (1, 0, 0, 1)  # Red
+    node_obj.color = (1, 0, 0, 1)  # Red
 
     # Deselect all objects
     bpy.ops.object.select_all(action='DESELECT')
 
-    print(f"Created node '{text_obj.name}' with {len(selected_objects)} child objects")
-    print("Note: The object will automatically rename itself when you edit the text content")
\ No newline at end of file
+    print(f"Created node '{node_obj.name}' with {len(selected_objects)} child objects")
+    if node_obj.type == 'FONT':
+        print("Note: The object will automatically rename itself when you edit the text content")
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Smaller export files: attribute stripping and precision control
+
+Removes the data Source 2 does not read from the temporary export duplicates (extra UV
+maps, color attributes the materials don't use, custom properties other than
+FBX_vmatPath) and rounds positions and normals of the written file to a grid. Works on
+objects handed in by the exporters and on parsed FBX documents, no bpy import.
+"""
+
+import os
+
+import numpy as np
+
+from . import export_compare, fbx_binary
+from .dmx_model import VERTEX_PAINT_MAPS
+
+# Custom properties the Source 2 importers read
+KEPT_PROPERTIES = ("FBX_vmatPath",)
+
+class SlimStats:
+    """What was removed from one exported file and roughly how many bytes that saved"""
+    __slots__ = ("uv_layers", "color_attributes", "properties", "stripped_bytes", "quantized_bytes")
+
+    def __init__(self):
+        self.uv_layers = 0
+        self.color_attributes = 0
+        self.properties = 0
+        self.stripped_bytes = 0     # estimate, uncompressed size of the removed layers
+        self.quantized_bytes = 0    # measured, FBX only
+
+    @property
+    def saved_bytes(self):
+        return self.stripped_bytes + self.quantized_bytes
+
+    def add(self, other):
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def describe(self):
+        parts = []
+        if self.uv_layers:
+            parts.append(f"{self.uv_layers} UV maps")
+        if self.color_attributes:
+            parts.append(f"{self.color_attributes} color attributes")
+        if self.properties:
+            parts.append(f"{self.properties} properties")
+        text = ", ".join(parts) + " removed" if parts else "nothing removed"
+        if self.quantized_bytes:
+            text += f", precision {format_size(-self.quantized_bytes)}"
+        return text
+
+def format_size(size):
+    sign = "-" if size < 0 else ""
+    size = abs(size)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{sign}{size:.0f} {unit}" if unit == "B" else f"{sign}{size:.1f} {unit}"
+        size /= 1024.0
+
+def is_enabled(settings):
+    return settings.strip_attributes or settings.position_precision > 0 or settings.normal_precision > 0
+
+def _kept_uv_layers(mesh, uv_count):
+    # The render UV map is channel 0, the next maps in their own order
+    layers = list(mesh.uv_layers)
+    active = next((layer for layer in layers if layer.active_render), layers[0] if layers else None)
+    ordered = ([active] if active else []) + [layer for layer in layers if layer != active]
+    return {layer.name for layer in ordered[:uv_count]}
+
+def _kept_color_attributes(mesh):
+    # Same choice as the DMX writer: the vertex paint maps, otherwise the active color attribute
+    names = {attribute.name for attribute in mesh.color_attributes if attribute.name in VERTEX_PAINT_MAPS}
+    active = mesh.color_attributes.active_color
+    if active is not None and "VertexPaintBlendParams" not in names:
+        names.add(active.name)
+    return names
+
+def _strip_properties(block, stats):
+    for key in list(block.keys()):
+        if key not in KEPT_PROPERTIES:
+            del block[key]
+            stats.properties += 1
+
+def strip_objects(objects, uv_count, bytes_per_value=8):
+    """Remove unused UV maps, color attributes and custom properties from temporary export objects.
+
+    bytes_per_value -- size of one written float (8 for FBX doubles, 4 for DMX) for the estimate
+    Returns SlimStats.
+    """
+    stats = SlimStats()
+    for obj in objects:
+        _strip_properties(obj, stats)
+        if obj.type != 'MESH':
+            continue
+        mesh = obj.data
+        _strip_properties(mesh, stats)
+        corners = len(mesh.loops)
+
+        kept = _kept_uv_layers(mesh, uv_count)
+        for layer in [layer for layer in mesh.uv_layers if layer.name not in kept]:
+            mesh.uv_layers.remove(layer)
+            stats.uv_layers += 1
+            # uv values plus their index array
+            stats.stripped_bytes += corners * (2 * bytes_per_value + 4)
+
+        kept = _kept_color_attributes(mesh)
+        for name in [attribute.name for attribute in mesh.color_attributes if attribute.name not in kept]:
+            mesh.color_attributes.remove(mesh.color_attributes[name])
+            stats.color_attributes += 1
+            stats.stripped_bytes += corners * (4 * bytes_per_value + 4)
+    return stats
+
+def quantize(values, step):
+    """Round values to multiples of step, keeping the dtype"""
+    if step <= 0 or not len(values):
+        return values
+    return (np.round(np.asarray(values, dtype=np.float64) / step) * step).astype(values.dtype)
+
+def quantize_fbx(document, position_step, normal_step):
+    """Round the vertices and normals of every geometry in a parsed FBX on the grid of the DMX export.
+
+    FBX stores vertices in object space, so they are moved into the file's world space with
+    their model's matrix, rounded there and moved back. The world space is the DMX space
+    (Hammer units) with other axis names, so the same steps give the same vertices and
+    normals as quantize_buffers() on the DMX path.
+    """
+    def replace(node, values):
+        type_code, _array = node.properties[0]
+        node.properties[0] = (type_code, fbx_binary.FbxArray.from_values(type_code, values))
+
+    for geometry, matrix in export_compare.fbx_geometry_matrices(document):
+        linear, offset = matrix[:3, :3], matrix[:3, 3]
+        vertices = geometry.child("Vertices")
+        if vertices is not None and position_step > 0:
+            points = vertices.value().values().astype(np.float64).reshape(-1, 3)
+            world = quantize(points @ linear.T + offset, position_step)
+            replace(vertices, ((world - offset) @ np.linalg.inv(linear).T).ravel())
+        if normal_step <= 0:
+            continue
+        normal_matrix = np.linalg.inv(linear).T
+        for layer in geometry.children_named("LayerElementNormal"):
+            normals = layer.child("Normals")
+            if normals is None:
+                continue
+            world = normals.value().values().astype(np.float64).reshape(-1, 3) @ normal_matrix.T
+            lengths = np.linalg.norm(world, axis=1, keepdims=True)
+            np.divide(world, lengths, out=world, where=lengths > 0)
+            replace(normals, (quantize(world, normal_step) @ np.linalg.inv(normal_matrix).T).ravel())
+    return document
+
+def quantize_buffers(buffers_list, position_step, normal_step):
+    """Round positions (DMX units) and normals of MeshBuffers in place, so near-equal normals weld"""
+    for buffers in buffers_list:
+        if position_step > 0:
+            buffers.positions = quantize(buffers.positions, position_step)
+        if normal_step > 0:
+            buffers.loop_normals = quantize(buffers.loop_normals, normal_step)
+    return buffers_list
+
+class SizeReport:
+    """File sizes and savings of one export run, per node"""
+
+    def __init__(self):
+        self.rows = {}  # node name -> [file count, total size, SlimStats]
+
+    def add(self, node_name, file_path, stats):
+        row = self.rows.setdefault(node_name, [0, 0, SlimStats()])
+        row[0] += 1
+        row[1] += os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        if stats is not None:
+            row[2].add(stats)
+
+    def total_saved(self):
+        return sum(stats.saved_bytes for _count, _size, stats in self.rows.values())
+
+    def lines(self):
+        for node_name, (count, size, stats) in self.rows.items():
+            yield (f"{node_name}: {count} file{'s' if count != 1 else ''}, {format_size(size)}, "
+                   f"saved ~{format_size(stats.saved_bytes)} ({stats.describe()})")
+
+    def print(self):
+        if not self.rows:
+            return
+        print("Export size report:")
+        for line in self.lines():
+            print("  " + line)
+        print(f"  Total saved: ~{format_size(self.total_saved())}")
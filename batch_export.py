@@ -0,0 +1,443 @@
+"""
+Resumable batch export of many .blend files
+
+Plain Python, no Blender dependency. Queues the node and static mesh exports of every
+.blend file in a SQLite job queue and works through it with a pool of headless Blender
+workers (export_server.py, one process and port each):
+
+    python batch_export.py C:/maps/de_test --blender "C:/Program Files/Blender/blender.exe" \
+        --workers 4 --addons-path "C:/.../csgo_addons/de_test" --static-path C:/.../static
+
+Run the same command again after a crash or Ctrl+C: finished jobs are kept in the
+queue file (batch_export.sqlite by default) and only the rest is exported.
+
+Export durations are recorded per node in the same file. Once every file is scanned,
+the exports are split into one shard per worker, longest predicted job first
+(export_schedule.py); a worker that runs out of work takes the longest job left.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+import subprocess
+
+import export_client
+import export_schedule
+
+DEFAULT_DB = "batch_export.sqlite"
+DEFAULT_ADDON = "source2_model_exporter"
+DEFAULT_BASE_PORT = 8790
+DEFAULT_RETRIES = 2
+STARTUP_TIMEOUT = 120.0
+
+# Job kinds: 'scan' lists a file's nodes and queues its exports, 'node' exports one node,
+# 'static' runs the static mesh export of a file
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    blend TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    files INTEGER NOT NULL DEFAULT 0,
+    seconds REAL NOT NULL DEFAULT 0,
+    error TEXT NOT NULL DEFAULT '',
+    UNIQUE (blend, kind, target)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, blend);
+CREATE TABLE IF NOT EXISTS history (
+    blend TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL,
+    vertices INTEGER NOT NULL,
+    modifiers INTEGER NOT NULL,
+    materials INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    finished REAL NOT NULL,
+    PRIMARY KEY (blend, kind, target)
+);
+"""
+
+# Columns added to jobs after the first release, created on older queue files
+SCHEDULE_COLUMNS = (
+    ("vertices", "INTEGER NOT NULL DEFAULT 0"),
+    ("modifiers", "INTEGER NOT NULL DEFAULT 0"),
+    ("materials", "INTEGER NOT NULL DEFAULT 0"),
+    ("cost", "REAL NOT NULL DEFAULT 0"),             # predicted export seconds
+    ("worker", "INTEGER"),                           # shard, NULL until scheduled
+    ("export_seconds", "REAL NOT NULL DEFAULT 0"),   # measured by the server, without loading the file
+)
+# Most recent history rows the cost model is fitted on
+HISTORY_LIMIT = 20000
+
+class JobQueue:
+    """SQLite job queue shared by the worker threads (one connection, guarded by a lock)"""
+
+    def __init__(self, path, retries=DEFAULT_RETRIES, workers=1):
+        self.retries = retries
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        existing = {row[1] for row in self.db.execute("PRAGMA table_info(jobs)")}
+        for name, definition in SCHEDULE_COLUMNS:
+            if name not in existing:
+                self.db.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+
+    def _execute(self, sql, parameters=()):
+        with self.lock:
+            return self.db.execute(sql, parameters).fetchall()
+
+    def recover(self):
+        """Jobs left running by a crashed or interrupted run are pending again. Returns their count.
+
+        Shards of the earlier run are dropped, the remaining jobs are scheduled again.
+        """
+        with self.lock:
+            recovered = self.db.execute("UPDATE jobs SET state = 'pending' WHERE state = 'running'").rowcount
+            self.db.execute("UPDATE jobs SET worker = NULL WHERE state = 'pending'")
+            return recovered
+
+    def retry_failed(self):
+        with self.lock:
+            return self.db.execute("UPDATE jobs SET state = 'pending', attempts = 0 WHERE state = 'failed'").rowcount
+
+    def add(self, blend, kind, target=""):
+        """Queue a job unless it is already known (in any state)"""
+        self._execute("INSERT OR IGNORE INTO jobs (blend, kind, target) VALUES (?, ?, ?)", (blend, kind, target))
+
+    def add_many(self, blend, kind, targets, sizes=None, costs=None):
+        """Queue jobs unless they are known; pending ones get the new sizes and costs.
+
+        sizes -- optional {target: (vertices, modifiers, materials)}
+        costs -- optional {target: predicted seconds}
+        """
+        sizes = sizes or {}
+        costs = costs or {}
+        rows = [(blend, kind, target, *sizes.get(target, (0, 0, 0)), costs.get(target, 0.0)) for target in targets]
+        with self.lock:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                "INSERT INTO jobs (blend, kind, target, vertices, modifiers, materials, cost) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (blend, kind, target) DO UPDATE SET vertices = excluded.vertices, "
+                "modifiers = excluded.modifiers, materials = excluded.materials, cost = excluded.cost "
+                "WHERE state = 'pending'", rows)
+            self.db.execute("COMMIT")
+
+    def _schedule(self):
+        """Give unscheduled jobs to the workers' shards, longest first to the least loaded shard"""
+        unscheduled = self.db.execute("SELECT id, cost FROM jobs WHERE state = 'pending' AND kind != 'scan' "
+                                      "AND worker IS NULL").fetchall()
+        if not unscheduled:
+            return
+        loads = [0.0] * self.workers
+        for worker, load in self.db.execute("SELECT worker, SUM(cost) FROM jobs WHERE state IN ('pending', 'running') "
+                                            "AND worker IS NOT NULL GROUP BY worker"):
+            if 0 <= worker < self.workers:
+                loads[worker] = load
+        assignment = export_schedule.lpt_assign(unscheduled, loads)
+        self.db.executemany("UPDATE jobs SET worker = ? WHERE id = ?",
+                            [(worker, job_id) for job_id, worker in assignment.items()])
+
+    def claim(self, worker=0, preferred_blend=None):
+        """Take the next job for a worker.
+
+        Scans go first so the queue fills up early; exports wait until every file is scanned
+        and then come from the worker's own shard, from preferred_blend first (the file the
+        worker has loaded). With the shard done, the longest job left in any shard is taken.
+        Returns (id, blend, kind, target, predicted seconds) or None.
+        """
+        columns = "SELECT id, blend, kind, target, cost FROM jobs WHERE state = 'pending' "
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute(columns + "AND kind = 'scan' ORDER BY id LIMIT 1").fetchone()
+                scanning = self.db.execute("SELECT 1 FROM jobs WHERE state = 'running' AND kind = 'scan' LIMIT 1").fetchone()
+                if row is None and scanning is None:
+                    self._schedule()
+                    row = self.db.execute(columns + "AND worker = ? ORDER BY blend != ?, blend, cost DESC, id LIMIT 1",
+                                          (worker, preferred_blend or "")).fetchone()
+                    if row is None:
+                        row = self.db.execute(columns + "ORDER BY cost DESC, id LIMIT 1").fetchone()
+                if row is not None:
+                    self.db.execute("UPDATE jobs SET state = 'running', attempts = attempts + 1, worker = ? WHERE id = ?",
+                                    (worker, row[0]))
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return row
+
+    def finish(self, job_id, files, seconds, export_seconds=0.0):
+        """Mark a job done and record its export time for the cost model"""
+        with self.lock:
+            self.db.execute("UPDATE jobs SET state = 'done', files = ?, seconds = ?, export_seconds = ?, error = '' "
+                            "WHERE id = ?", (files, seconds, export_seconds, job_id))
+            self.db.execute("INSERT OR REPLACE INTO history SELECT blend, kind, target, vertices, modifiers, materials, ?, ? "
+                            "FROM jobs WHERE id = ? AND kind != 'scan'", (export_seconds or seconds, time.time(), job_id))
+
+    def cost_model(self):
+        return export_schedule.CostModel(self._execute(
+            "SELECT blend, kind, target, vertices, modifiers, materials, seconds FROM history "
+            "ORDER BY finished DESC LIMIT ?", (HISTORY_LIMIT,)))
+
+    def fail(self, job_id, error):
+        """Put a job back in the queue, or mark it failed after too many attempts"""
+        self._execute("UPDATE jobs SET state = CASE WHEN attempts > ? THEN 'failed' ELSE 'pending' END, error = ? "
+                      "WHERE id = ?", (self.retries, error, job_id))
+
+    def counts(self):
+        return dict(self._execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"))
+
+    def busy(self):
+        """True while jobs are pending or running (a running scan can still add jobs)"""
+        return bool(self._execute("SELECT 1 FROM jobs WHERE state IN ('pending', 'running') LIMIT 1"))
+
+    def failures(self):
+        return self._execute("SELECT blend, kind, target, error FROM jobs WHERE state = 'failed' ORDER BY blend, id")
+
+def find_blend_files(inputs):
+    """.blend files in the given files and directories (recursive), without Blender's .blend1 backups"""
+    found = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for folder, _dirs, files in os.walk(path):
+                found.extend(os.path.join(folder, name) for name in files if name.lower().endswith(".blend"))
+        elif path.lower().endswith(".blend") and os.path.isfile(path):
+            found.append(path)
+        else:
+            print(f"Skipping {path}: not a .blend file or folder")
+    return sorted({os.path.abspath(path) for path in found})
+
+class Worker:
+    """One headless Blender running the export server, restarted if it dies"""
+
+    def __init__(self, index, blender, addon, port, log_folder=None):
+        self.index = index
+        self.blender = blender
+        self.addon = addon
+        self.port = port
+        self.log_folder = log_folder
+        self.process = None
+        self.loaded_blend = None
+
+    def start(self):
+        command = [self.blender, "--background", "--addons", self.addon, "--python-expr",
+                   f"from {self.addon} import export_server; export_server.main()", "--", "--port", str(self.port)]
+        log = subprocess.DEVNULL
+        if self.log_folder:
+            log = open(os.path.join(self.log_folder, f"worker_{self.index}.log"), "ab")
+        self.process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+        self.loaded_blend = None
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Blender worker {self.index} exited with code {self.process.returncode}")
+            try:
+                export_client.ping(port=self.port, timeout=2.0)
+                return
+            except OSError:
+                time.sleep(0.5)
+        raise RuntimeError(f"Blender worker {self.index} did not start within {STARTUP_TIMEOUT:.0f} s")
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        if self.alive():
+            try:
+                export_client.shutdown(port=self.port)
+                self.process.wait(timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        self.process = None
+
+def _run_events(events):
+    """Collect written files, the final status and the export seconds (without loading
+    the file) from a stream of server events"""
+    files = []
+    problems = []
+    status = None
+    load_seconds = seconds = 0.0
+    for event in events:
+        kind = event["event"]
+        if kind == "loaded":
+            load_seconds = event.get("seconds", 0.0)
+        elif kind == "node":
+            files.extend(event["files"])
+            # Skipped nodes (no export path) would be skipped again, only missing ones are errors
+            if event["status"] == "missing":
+                problems.append(f"{event['node']}: missing")
+        elif kind == "static":
+            files.extend(event["files"])
+        elif kind == "report" and event["level"] == "ERROR":
+            problems.append(event["message"])
+        elif kind == "error":
+            raise RuntimeError(event["message"])
+        elif kind == "done":
+            status = event["status"]
+            seconds = max(event.get("seconds", 0.0) - load_seconds, 0.0)
+    if status is None:
+        raise RuntimeError("Connection closed before the job finished")
+    return status, files, problems, seconds
+
+def run_job(worker, queue, job, options, include_static, cost_model):
+    """Run one claimed job on a worker. Returns (written file count, export seconds)."""
+    job_id, blend, kind, target, _cost = job
+    if kind == 'scan':
+        nodes, static_count, sizes = export_client.list_nodes(blend, options, port=worker.port)
+        costs = {name: cost_model.predict(blend, 'node', name, *sizes.get(name, (0, 0, 0))) for name in nodes}
+        queue.add_many(blend, 'node', nodes, sizes, costs)
+        if include_static and static_count:
+            static_size = sizes.get(None, (0, 0, 0))
+            queue.add_many(blend, 'static', [""], {"": static_size},
+                           {"": cost_model.predict(blend, 'static', "", *static_size)})
+        return 0, 0.0
+
+    if kind == 'node':
+        events = export_client.request_export(blend, [target], options, port=worker.port, job_id=job_id)
+    else:
+        # Every file gets its own static folder, the static export always writes combined_export
+        static_options = dict(options)
+        static_options["static_mesh_export_path"] = os.path.join(
+            options["static_mesh_export_path"], os.path.splitext(os.path.basename(blend))[0])
+        events = export_client.request_static(blend, None, static_options, port=worker.port, job_id=job_id)
+
+    status, files, problems, seconds = _run_events(events)
+    if status != "FINISHED" or problems:
+        raise RuntimeError("; ".join(problems) or f"export {status.lower()}")
+    return len(files), seconds
+
+def worker_loop(worker, queue, options, include_static, stop_event, totals, cost_model):
+    while not stop_event.is_set():
+        job = queue.claim(worker.index, worker.loaded_blend)
+        if job is None:
+            if not queue.busy():
+                return
+            # Another worker is still scanning a file
+            time.sleep(0.5)
+            continue
+
+        job_id, blend, kind, target, cost = job
+        started = time.perf_counter()
+        try:
+            if not worker.alive():
+                worker.start()
+            files, export_seconds = run_job(worker, queue, job, options, include_static, cost_model)
+        except Exception as e:
+            queue.fail(job_id, str(e))
+            print(f"[worker {worker.index}] {kind} {os.path.basename(blend)} {target}: failed ({e})")
+            if not worker.alive():
+                worker.process = None
+            continue
+
+        seconds = time.perf_counter() - started
+        worker.loaded_blend = blend
+        queue.finish(job_id, files, seconds, export_seconds)
+        with totals["lock"]:
+            totals["models"] += 1 if files else 0
+            totals["files"] += files
+            totals["jobs"] += 1
+            totals["busy"][worker.index] += seconds
+            totals["longest"] = max(totals["longest"], seconds)
+            if kind != 'scan':
+                totals["predictions"].append((cost, export_seconds or seconds))
+        if kind != 'scan':
+            print(f"[worker {worker.index}] {kind} {os.path.basename(blend)} {target}: {files} files in {seconds:.1f} s")
+
+def run_batch(blend_files, blender, workers=2, db_path=DEFAULT_DB, options=None, include_static=True,
+              addon=DEFAULT_ADDON, base_port=DEFAULT_BASE_PORT, retries=DEFAULT_RETRIES, retry_failed=False,
+              log_folder=None):
+    """Export all nodes (and static meshes) of blend_files. Returns the job counts per state."""
+    options = dict(options or {})
+    queue = JobQueue(db_path, retries, workers)
+    recovered = queue.recover()
+    if recovered:
+        print(f"Resuming: {recovered} interrupted jobs are queued again")
+    if retry_failed:
+        queue.retry_failed()
+    for blend in blend_files:
+        queue.add(blend, 'scan')
+
+    # Predicted export seconds per node, from the durations of earlier runs
+    cost_model = queue.cost_model()
+
+    pool = [Worker(index, blender, addon, base_port + index, log_folder) for index in range(workers)]
+    totals = {"lock": threading.Lock(), "models": 0, "files": 0, "jobs": 0,
+              "busy": [0.0] * workers, "longest": 0.0, "predictions": []}
+    stop_event = threading.Event()
+    threads = [threading.Thread(target=worker_loop, args=(worker, queue, options, include_static, stop_event, totals,
+                                                          cost_model), daemon=True) for worker in pool]
+
+    started = time.perf_counter()
+    try:
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        print("Interrupted, finishing the running jobs (run again to resume)...")
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        for worker in pool:
+            worker.stop()
+
+    makespan = time.perf_counter() - started
+    minutes = makespan / 60.0
+    counts = queue.counts()
+    rate = totals["models"] / minutes if minutes > 0 else 0.0
+    print(f"Exported {totals['models']} models ({totals['files']} files) in {totals['jobs']} jobs in {minutes:.1f} min "
+          f"({rate:.1f} models/minute with {workers} workers)")
+    for line in export_schedule.balance_summary(totals["busy"], makespan, totals["longest"]):
+        print(line)
+    error = export_schedule.prediction_error(totals["predictions"])
+    if error is not None:
+        print(f"Cost predictions were off by {error * 100:.0f}% on average")
+    print("Queue: " + ", ".join(f"{state} {count}" for state, count in sorted(counts.items())))
+    for blend, kind, target, error in queue.failures():
+        print(f"  failed: {os.path.basename(blend)} {kind} {target}: {error}")
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the nodes and static meshes of many .blend files")
+    parser.add_argument("inputs", nargs="+", help=".blend files or folders containing them")
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--workers", type=int, default=2, help="number of Blender processes")
+    parser.add_argument("--db", default=DEFAULT_DB, help="job queue file, reused to resume")
+    parser.add_argument("--addons-path", help="override the addon's Addons Path preference")
+    parser.add_argument("--static-path", help="export static meshes into <static path>/<blend name>")
+    parser.add_argument("--addon", default=DEFAULT_ADDON, help="addon module name")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="retries of a failed job")
+    parser.add_argument("--retry-failed", action="store_true", help="queue jobs that failed in earlier runs again")
+    parser.add_argument("--logs", help="folder for the Blender worker logs")
+    args = parser.parse_args(argv)
+
+    blend_files = find_blend_files(args.inputs)
+    if not blend_files:
+        print("No .blend files found")
+        return 1
+
+    options = {}
+    if args.addons_path:
+        options["addons_path"] = args.addons_path
+    if args.static_path:
+        options["static_mesh_export_path"] = args.static_path
+    if args.logs:
+        os.makedirs(args.logs, exist_ok=True)
+
+    counts = run_batch(blend_files, args.blender, max(args.workers, 1), args.db, options, bool(args.static_path),
+                       args.addon, args.base_port, args.retries, args.retry_failed, args.logs)
+    return 1 if counts.get("failed") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import bpy
+import sys
+import time
+from bpy.app.handlers import persistent
+
+from . import export_compare, node_objects, node_spatial, node_status
+
+# Measures what the node objects cost the depsgraph, text nodes against marker nodes.
+# Everything is built in a temporary scene, the user's scene is not touched.
+
+def _new_text_node(name, collection):
+    curve = bpy.data.curves.new(name, 'FONT')
+    curve.body = name
+    node = bpy.data.objects.new(name, curve)
+    collection.objects.link(node)
+    return node
+
+NODE_FACTORIES = {
+    'TEXT': _new_text_node,
+    'MARKER': node_objects.new_marker_node,
+}
+
+def time_node_type(node_type, count, repeats):
+    """(first evaluation, re-evaluation) seconds for count nodes of a type.
+
+    The first evaluation is what a file load pays, the re-evaluation is a full update
+    after every node was tagged (as when all nodes change at once).
+    """
+    scene = bpy.data.scenes.new("S2 Node Benchmark")
+    view_layer = scene.view_layers[0]
+    nodes = []
+    try:
+        for index in range(count):
+            nodes.append(NODE_FACTORIES[node_type](f"S2Bench{index}", scene.collection))
+
+        started = time.perf_counter()
+        view_layer.update()
+        first = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for node in nodes:
+                node.update_tag(refresh={'OBJECT', 'DATA'})
+            view_layer.update()
+        update = (time.perf_counter() - started) / max(repeats, 1)
+    finally:
+        for node in nodes:
+            data = node.data
+            bpy.data.objects.remove(node, do_unlink=True)
+            if isinstance(data, bpy.types.Curve) and data.users == 0:
+                bpy.data.curves.remove(data)
+        bpy.data.scenes.remove(scene)
+    return first, update
+
+def run_node_benchmark(count=2000, repeats=5):
+    """Time both node types. Returns {node type: (first evaluation, re-evaluation)}."""
+    results = {}
+    # The benchmark nodes must not show up in the node dashboard
+    with node_status.suspended():
+        for node_type in NODE_FACTORIES:
+            results[node_type] = time_node_type(node_type, count, repeats)
+    node_status.invalidate()
+
+    print(f"[Benchmark] Depsgraph cost of {count} nodes ({repeats} updates):")
+    for node_type, (first, update) in results.items():
+        print(f"[Benchmark]   {node_type:<6} first evaluation {first * 1000:8.1f} ms, update {update * 1000:8.1f} ms")
+    return results
+
+def _timed_handlers(handlers, timings):
+    """Replace the addon's handlers in a bpy.app.handlers list by timed wrappers.
+    Returns [(wrapper, original)] for _restore_handlers."""
+    package = __name__.rsplit('.', 1)[0]
+    replaced = []
+    for position, handler in enumerate(handlers):
+        if not getattr(handler, "__module__", "").startswith(package):
+            continue
+
+        def timed(*args, handler=handler):
+            started = time.perf_counter()
+            try:
+                return handler(*args)
+            finally:
+                key = f"{handler.__module__.rsplit('.', 1)[-1]}.{handler.__name__}"
+                timings[key] = timings.get(key, 0.0) + time.perf_counter() - started
+        handlers[position] = persistent(timed)
+        replaced.append((handlers[position], handler))
+    return replaced
+
+def _restore_handlers(handlers, replaced):
+    for wrapper, handler in replaced:
+        if wrapper in handlers:
+            handlers[handlers.index(wrapper)] = handler
+
+def run_startup_benchmark(reopen=False):
+    """Time what the addon costs at startup and when a file is opened, on the current file.
+
+    Meant for background mode on a large map:
+        blender -b map.blend --python-expr "import <addon folder>.benchmark as b; b.run_startup_benchmark(True)"
+    reopen -- also open the file again and time the whole load (Blender's own work included)
+    Returns {measurement: seconds}.
+    """
+    package = sys.modules[__name__.rsplit('.', 1)[0]]
+    results = {}
+    handler_times = {}
+
+    started = time.perf_counter()
+    package.unregister()
+    package.register()
+    results["register"] = time.perf_counter() - started
+
+    load_handlers = _timed_handlers(bpy.app.handlers.load_post, handler_times)
+    update_handlers = _timed_handlers(bpy.app.handlers.depsgraph_update_post, handler_times)
+    try:
+        if reopen and bpy.data.filepath:
+            started = time.perf_counter()
+            bpy.ops.wm.open_mainfile(filepath=bpy.data.filepath)
+            results["file open"] = time.perf_counter() - started
+        else:
+            for wrapper, _handler in load_handlers:
+                wrapper(bpy.data.filepath)
+
+        # The first update after a load reports every object
+        started = time.perf_counter()
+        for obj in bpy.data.objects:
+            obj.update_tag()
+        bpy.context.view_layer.update()
+        results["first update"] = time.perf_counter() - started
+    finally:
+        _restore_handlers(bpy.app.handlers.depsgraph_update_post, update_handlers)
+        _restore_handlers(bpy.app.handlers.load_post, load_handlers)
+    results.update(handler_times)
+
+    # Background node scan: the longest single step is what the UI stalls for
+    node_status.invalidate()
+    longest = total = 0.0
+    steps = 0
+    done = False
+    while not done:
+        started = time.perf_counter()
+        done = node_status.scan_step()
+        step = time.perf_counter() - started
+        longest = max(longest, step)
+        total += step
+        steps += 1
+    results["scan longest step"] = longest
+    results["scan in steps"] = total
+
+    # A full scan at once, what the first export after a load pays
+    node_status.invalidate()
+    started = time.perf_counter()
+    node_status.ensure_built()
+    results["scan at once"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    node_spatial.rebuild()
+    node_spatial.ensure_tree()
+    results["region index"] = time.perf_counter() - started
+
+    print(f"[Benchmark] Startup and file load, {len(bpy.data.objects)} objects, "
+          f"{len(node_status.all_statuses())} nodes ({steps} scan steps):")
+    for name, seconds in results.items():
+        print(f"[Benchmark]   {name:<40} {seconds * 1000:10.1f} ms")
+    return results
+
+def run_export_check(reference_folder, candidate_folder, **tolerances):
+    """Compare two export folders, e.g. the FBX and the DMX export of the same nodes, or the
+    exports before and after a change. Works in background mode. Returns True when all match."""
+    results, missing, extra = export_compare.compare_directories(reference_folder, candidate_folder, **tolerances)
+    different = [result for result in results if not result.equal]
+
+    print(f"[Benchmark] Export check: {len(results) - len(different)} of {len(results)} models match "
+          f"({reference_folder} -> {candidate_folder})")
+    for result in different:
+        for line in result.lines():
+            print(f"[Benchmark]   {line}")
+    for path in missing:
+        print(f"[Benchmark]   {path}: missing")
+    for path in extra:
+        print(f"[Benchmark]   {path}: unexpected")
+    return not different and not missing and not extra
@@ -0,0 +1,43 @@
+import bpy
+from bpy.types import Operator
+
+from . import benchmark
+
+class BenchmarkNodesOperator(Operator):
+    bl_idname = "object.benchmark_nodes"
+    bl_label = "Benchmark Node Types"
+    bl_description = "Compare the depsgraph cost of text nodes and marker nodes in a temporary scene"
+
+    node_count: bpy.props.IntProperty(
+        name="Nodes",
+        description="Number of nodes of each type",
+        default=2000,
+        min=1,
+        max=100000
+    )
+
+    repeats: bpy.props.IntProperty(
+        name="Updates",
+        description="Number of timed full updates",
+        default=5,
+        min=1,
+        max=100
+    )
+
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            self.report({'ERROR'}, "Switch to Object Mode first")
+            return {'CANCELLED'}
+
+        results = benchmark.run_node_benchmark(self.node_count, self.repeats)
+        text_first, text_update = results['TEXT']
+        marker_first, marker_update = results['MARKER']
+        self.report({'INFO'}, f"{self.node_count} nodes - text: {text_first * 1000:.0f} ms load, {text_update * 1000:.0f} ms update; "
+                              f"marker: {marker_first * 1000:.0f} ms load, {marker_update * 1000:.0f} ms update")
+        return {'FINISHED'}
+
+def register():
+    bpy.utils.register_class(BenchmarkNodesOperator)
+
+def unregister():
+    bpy.utils.unregister_class(BenchmarkNodesOperator)
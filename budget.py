@@ -0,0 +1,159 @@
+"""
+Per-prop runtime budgets
+
+Measures what an exported prop will cost in game from its final MeshBuffers (DMX space,
+Hammer units): triangles, draw calls (materials), vertices after the GPU splits them at
+normal/UV/color/material seams, collision hulls and bounding box size. Compares them with
+the project budgets and writes the results as a CSV or JSON report. No Blender dependency.
+"""
+
+import csv
+import json
+import os
+
+import numpy as np
+
+from . import dmx_model, mesh_buffers
+
+# Metric -> report column header
+METRICS = {
+    "triangles": "Triangles",
+    "draw_calls": "Draw calls",
+    "vertices": "Vertices",
+    "collision_hulls": "Collision hulls",
+    "size": "Size",
+}
+REPORT_FORMATS = {'CSV': ".csv", 'JSON': ".json"}
+
+class PropMetrics:
+    """Cost of one node's models; size is the largest bounding box dimension, dimensions all three"""
+    __slots__ = ("node_name", "triangles", "draw_calls", "vertices", "collision_hulls", "size", "dimensions")
+
+    def __init__(self, node_name):
+        self.node_name = node_name
+        self.triangles = 0
+        self.draw_calls = 0
+        self.vertices = 0
+        self.collision_hulls = 0
+        self.size = 0.0
+        self.dimensions = (0.0, 0.0, 0.0)
+
+def split_vertex_count(buffers):
+    """Vertices the GPU gets: face corners are one vertex only where position, normal, every
+    UV map, every color and the material match"""
+    if not buffers.loop_count:
+        return 0
+    columns = [buffers.loop_vertices, np.repeat(buffers.poly_materials, buffers.poly_sizes),
+               dmx_model.weld(buffers.loop_normals)[1]]
+    for _name, values in list(buffers.uv_layers) + list(buffers.color_layers):
+        columns.append(dmx_model.weld(values)[1])
+    return len(np.unique(np.stack(columns, axis=1), axis=0))
+
+def hull_count(buffers):
+    """Connected islands with faces, each one a convex hull after compile"""
+    if not buffers.poly_count:
+        return 0
+    labels, _count = mesh_buffers.mesh_islands(buffers.edges(), buffers.vertex_count)
+    return len(np.unique(labels[buffers.loop_vertices]))
+
+def measure(node_name, render_buffers, collision_buffers):
+    """PropMetrics of a node from the buffers of its render and collision models"""
+    metrics = PropMetrics(node_name)
+    materials = set()
+    low = np.full(3, np.inf)
+    high = np.full(3, -np.inf)
+    for buffers in render_buffers:
+        metrics.triangles += buffers.triangle_count
+        metrics.vertices += split_vertex_count(buffers)
+        if buffers.poly_count:
+            used = np.unique(buffers.poly_materials)
+            paths = buffers.vmat_paths
+            materials.update(paths[slot] if slot < len(paths) else "" for slot in used.tolist())
+        if buffers.vertex_count:
+            used_positions = buffers.positions[np.unique(buffers.loop_vertices)] if buffers.loop_count else buffers.positions
+            low = np.minimum(low, used_positions.min(axis=0))
+            high = np.maximum(high, used_positions.max(axis=0))
+    metrics.draw_calls = len(materials)
+    metrics.collision_hulls = sum(hull_count(buffers) for buffers in collision_buffers)
+    if np.isfinite(low).all():
+        metrics.dimensions = tuple(float(value) for value in high - low)
+        metrics.size = max(metrics.dimensions)
+    return metrics
+
+class Budget:
+    """Limits per metric, 0 means no limit"""
+
+    def __init__(self, triangles=0, draw_calls=0, vertices=0, collision_hulls=0, size=0.0):
+        self.limits = {
+            "triangles": triangles,
+            "draw_calls": draw_calls,
+            "vertices": vertices,
+            "collision_hulls": collision_hulls,
+            "size": size,
+        }
+
+    def is_set(self):
+        return any(limit > 0 for limit in self.limits.values())
+
+    def exceeded(self, metrics):
+        """[(metric, value, limit)] of the metrics over their limit"""
+        return [(name, getattr(metrics, name), limit) for name, limit in self.limits.items()
+                if limit > 0 and getattr(metrics, name) > limit]
+
+def describe_exceeded(exceeded):
+    return ", ".join(f"{METRICS[name].lower()} {value:g} > {limit:g}" for name, value, limit in exceeded)
+
+class BudgetReport:
+    """Metrics and budget results of one export run, one row per node"""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.rows = []
+
+    def add(self, metrics, exceeded, exported):
+        self.rows.append((metrics, exceeded, exported))
+
+    def over_budget(self):
+        return [metrics.node_name for metrics, exceeded, _exported in self.rows if exceeded]
+
+    def _records(self):
+        for metrics, exceeded, exported in self.rows:
+            record = {"node": metrics.node_name}
+            for name in METRICS:
+                record[name] = round(getattr(metrics, name), 3) if name == "size" else getattr(metrics, name)
+            record["dimensions"] = [round(value, 3) for value in metrics.dimensions]
+            record["over_budget"] = [name for name, _value, _limit in exceeded]
+            record["exported"] = exported
+            yield record
+
+    def write_csv(self, filepath):
+        with open(filepath, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out)
+            writer.writerow(["Node"] + list(METRICS.values()) + ["Dimensions", "Over budget", "Exported"])
+            for record in self._records():
+                writer.writerow([record["node"]] + [record[name] for name in METRICS]
+                                + [" x ".join("%g" % value for value in record["dimensions"]),
+                                   " ".join(record["over_budget"]), "yes" if record["exported"] else "no"])
+        return filepath
+
+    def write_json(self, filepath):
+        limits = {name: limit for name, limit in self.budget.limits.items() if limit > 0}
+        with open(filepath, "w", encoding="utf-8") as out:
+            json.dump({"budget": limits, "nodes": list(self._records())}, out, indent=2)
+        return filepath
+
+    def write(self, filepath):
+        """Write as CSV or JSON depending on the extension"""
+        folder = os.path.dirname(filepath)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        if filepath.lower().endswith(".json"):
+            return self.write_json(filepath)
+        return self.write_csv(filepath)
+
+def report_path(blend_filepath, base_path, report_format):
+    """<blend name>_budget.csv/.json next to the .blend, or in the addons path while it is unsaved"""
+    extension = REPORT_FORMATS[report_format]
+    if blend_filepath:
+        return os.path.splitext(blend_filepath)[0] + "_budget" + extension
+    return os.path.join(base_path, "untitled_budget" + extension)
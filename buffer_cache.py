@@ -0,0 +1,134 @@
+"""
+On-disk cache of processed node export buffers
+
+After a node is exported to DMX, its captured MeshBuffers (modifiers applied, converted,
+joined, attributes stripped, transformed to DMX space and rounded) are kept as a
+mesh_snapshot file named after the node's content key. Exporting an unchanged node
+again, even after Blender was restarted, memory-maps that file and writes the DMX from
+it without duplicating or evaluating anything. Least recently used entries are
+removed once the cache grows past its size cap.
+"""
+
+import os
+import hashlib
+
+from . import mesh_snapshot, modifier_cache
+
+CACHE_FOLDER = ".s2_buffer_cache"
+# Bump when the captured buffers change for the same scene content
+KEY_VERSION = 1
+TEMP_SUFFIX = ".s2tmp"
+# Object types the node export converts to meshes
+CONVERTED_TYPES = ('CURVE', 'FONT', 'SURFACE', 'META')
+
+def default_folder(blend_filepath, base_path):
+    """Cache next to the .blend, or inside the addons path while the file is unsaved"""
+    if blend_filepath:
+        return os.path.join(os.path.dirname(blend_filepath), CACHE_FOLDER)
+    return os.path.join(base_path, CACHE_FOLDER) if base_path else ""
+
+def node_key(node, members, scene, settings, export_scale, axis_forward, axis_up):
+    """Content key of a node's exported models, None if the node can't be cached.
+
+    Covers everything the DMX buffers depend on: the evaluated geometry, names, materials
+    and node-relative matrices of the render and collision meshes, the rotation and scale
+    baked in by the export (location and heading are reset), and the export settings.
+    members -- node_status.gather_members(node)
+    """
+    signature = [KEY_VERSION, export_scale, axis_forward, axis_up, settings.strip_attributes, settings.uv_channel_count,
+                 settings.position_precision, settings.normal_precision, settings.deterministic_output,
+                 settings.collision_hulls, settings.hull_max_vertices, settings.hull_plane_angle, settings.hull_min_volume]
+
+    rotation = node.matrix_world.to_euler('XYZ')
+    signature.append((round(rotation.x, 6), round(rotation.y, 6), tuple(round(value, 6) for value in node.matrix_world.to_scale())))
+
+    # Curves, text and metaballs are converted by the export, their result is not hashed
+    if any(obj.type in CONVERTED_TYPES for obj, _matrix in members.other):
+        return None
+    for group in (members.render, members.collision):
+        for obj, matrix in group:
+            key = modifier_cache.geometry_key(obj, scene)
+            if key is None:
+                return None
+            materials = [(slot.material.name, slot.material.get("FBX_vmatPath", "")) if slot.material else ("", "")
+                         for slot in obj.material_slots]
+            signature.append((obj.name, key, [tuple(round(value, 6) for value in row) for row in matrix], materials))
+    if not members.render and not members.collision:
+        return None
+    return hashlib.blake2b(repr(signature).encode(), digest_size=20).hexdigest()
+
+class BufferCache:
+    """Snapshot files in one folder, file modification time is the last use"""
+
+    def __init__(self, folder, max_bytes):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.folder, key + mesh_snapshot.FILE_EXTENSION)
+
+    def open(self, key):
+        """Memory-mapped Snapshot of an entry, None if there is none. Close it when done."""
+        filepath = self.path(key)
+        if not os.path.exists(filepath):
+            self.misses += 1
+            return None
+        try:
+            snapshot = mesh_snapshot.open_file(filepath)
+        except Exception as e:
+            # Written by another version or damaged, replaced on the next store
+            print(f"Buffer cache: ignoring {os.path.basename(filepath)}: {e}")
+            self.misses += 1
+            return None
+        try:
+            os.utime(filepath)
+        except OSError:
+            pass
+        self.hits += 1
+        return snapshot
+
+    def store(self, key, buffers_list, metadata=None):
+        """Write an entry; a half-written file never takes the entry's name"""
+        os.makedirs(self.folder, exist_ok=True)
+        filepath = self.path(key)
+        temp_path = filepath + TEMP_SUFFIX
+        try:
+            mesh_snapshot.write_file(temp_path, buffers_list, metadata)
+            os.replace(temp_path, filepath)
+        except OSError as e:
+            print(f"Buffer cache: could not store {key[:12]}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes.
+        Returns (removed count, remaining bytes)."""
+        try:
+            entries = [entry for entry in os.scandir(self.folder) if entry.is_file()]
+        except FileNotFoundError:
+            return 0, 0
+        files = []
+        total = 0
+        for entry in entries:
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        removed = 0
+        files.sort()
+        for _mtime, size, filepath in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                # Still mapped (Windows) or already gone
+                continue
+            total -= size
+            removed += 1
+        return removed, total
+
+    def describe(self):
+        return f"{self.hits} nodes reused, {self.misses} processed"
@@ -0,0 +1,229 @@
+"""
+Collision hull post-process for the node export
+
+Turns a temporary _coll duplicate into convex hulls that compile cheaply:
+every connected island becomes its own convex hull, vertices that only bend the hull
+by a few degrees (near-coplanar planes) are removed, hulls over the vertex limit are
+reduced to their most spread-out points, and hulls with almost no volume (slivers)
+are dropped. The hulls themselves come from bmesh, the rest is NumPy over whole arrays.
+"""
+
+import bmesh
+import numpy as np
+
+from . import mesh_buffers, mesh_merge
+
+# Blender units (metres) -> FBX centimetres; times the export scale gives Hammer units
+UNITS_PER_METER = 100.0
+# Rounds of near-coplanar vertex removal per hull
+MAX_MERGE_PASSES = 16
+
+class HullStats:
+    """Collision mesh of one node before and after the post-process"""
+    __slots__ = ("islands", "hulls", "slivers", "vertices_before", "vertices_after", "faces_before", "faces_after")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def describe(self):
+        text = (f"{self.islands} islands -> {self.hulls} hulls, "
+                f"{self.vertices_before} -> {self.vertices_after} vertices, {self.faces_before} -> {self.faces_after} faces")
+        if self.slivers:
+            text += f", {self.slivers} slivers dropped"
+        return text
+
+def convex_hull(points):
+    """(vertices (N, 3), triangles (T, 3)) of the convex hull of points; no triangles if they are flat"""
+    bm = bmesh.new()
+    try:
+        verts = [bm.verts.new(point) for point in points]
+        result = bmesh.ops.convex_hull(bm, input=verts, use_existing_faces=False)
+        unused = [vert for vert in result["geom_interior"] + result["geom_unused"] if isinstance(vert, bmesh.types.BMVert)]
+        bmesh.ops.delete(bm, geom=unused, context='VERTS')
+        bmesh.ops.triangulate(bm, faces=bm.faces[:])
+        loose = [vert for vert in bm.verts if not vert.link_faces]
+        bmesh.ops.delete(bm, geom=loose, context='VERTS')
+
+        bm.verts.index_update()
+        vertices = np.array([vert.co for vert in bm.verts], dtype=np.float64).reshape(-1, 3)
+        triangles = np.array([[vert.index for vert in face.verts] for face in bm.faces], dtype=np.int64).reshape(-1, 3)
+        return vertices, triangles
+    finally:
+        bm.free()
+
+def hull_volume(vertices, triangles):
+    """Volume enclosed by a closed, consistently wound triangle mesh"""
+    if not len(triangles):
+        return 0.0
+    a, b, c = (vertices[triangles[:, corner]] for corner in range(3))
+    return abs(float(np.einsum("ij,ij->i", a, np.cross(b, c)).sum())) / 6.0
+
+def triangle_normals(vertices, triangles):
+    normals = np.cross(vertices[triangles[:, 1]] - vertices[triangles[:, 0]],
+                       vertices[triangles[:, 2]] - vertices[triangles[:, 0]])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
+
+def flat_vertices(vertices, triangles, max_angle):
+    """Hull vertices whose adjacent triangles all lie within max_angle of their average plane.
+
+    Removing such a vertex merges the near-coplanar planes around it. Only vertices that
+    are flatter than every flat neighbour are returned, so a gently curved surface loses
+    every other vertex per pass instead of collapsing at once.
+    """
+    count = len(vertices)
+    normals = triangle_normals(vertices, triangles)
+    corners = triangles.reshape(-1)
+    corner_normals = np.repeat(normals, 3, axis=0)
+
+    average = np.zeros((count, 3))
+    np.add.at(average, corners, corner_normals)
+    lengths = np.linalg.norm(average, axis=1, keepdims=True)
+    np.divide(average, lengths, out=average, where=lengths > 0)
+
+    # Largest angle between the vertex's average normal and any of its triangles
+    cosines = np.einsum("ij,ij->i", corner_normals, average[corners])
+    lowest = np.ones(count)
+    np.minimum.at(lowest, corners, cosines)
+    bend = np.arccos(np.clip(lowest, -1.0, 1.0))
+    flat = bend <= max_angle
+    if not flat.any():
+        return np.zeros(0, dtype=np.int64)
+
+    # Neighbouring flat vertices: keep the one that bends least (lower index on ties)
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    edges = edges[flat[edges[:, 0]] & flat[edges[:, 1]]]
+    rank = np.lexsort((np.arange(count), bend))
+    order = np.empty(count, dtype=np.int64)
+    order[rank] = np.arange(count)
+    keep = flat.copy()
+    later = np.where(order[edges[:, 0]] > order[edges[:, 1]], edges[:, 0], edges[:, 1])
+    keep[later] = False
+    return np.flatnonzero(keep)
+
+def spread_points(points, count):
+    """count points chosen by farthest point sampling, which keeps the extremes of the shape"""
+    if len(points) <= count:
+        return points
+    chosen = np.empty(count, dtype=np.int64)
+    chosen[0] = np.argmax(np.linalg.norm(points - points.mean(axis=0), axis=1))
+    distances = np.linalg.norm(points - points[chosen[0]], axis=1)
+    for index in range(1, count):
+        chosen[index] = np.argmax(distances)
+        np.minimum(distances, np.linalg.norm(points - points[chosen[index]], axis=1), out=distances)
+    return points[chosen]
+
+def simplify_hull(points, max_vertices, plane_angle):
+    """Convex hull of points with near-coplanar planes merged and at most max_vertices vertices"""
+    vertices, triangles = convex_hull(points)
+    for _ in range(MAX_MERGE_PASSES):
+        if plane_angle <= 0 or len(vertices) <= 4 or not len(triangles):
+            break
+        flat = flat_vertices(vertices, triangles, plane_angle)
+        if not len(flat) or len(vertices) - len(flat) < 4:
+            break
+        vertices, triangles = convex_hull(np.delete(vertices, flat, axis=0))
+    if len(vertices) > max_vertices:
+        vertices, triangles = convex_hull(spread_points(vertices, max_vertices))
+    return vertices, triangles
+
+def island_hulls(positions, edges, poly_materials, loop_vertices, poly_starts, max_vertices, plane_angle, min_volume):
+    """Hulls of every connected island of a mesh.
+
+    positions are in the space the angles and min_volume are measured in.
+    Returns (list of (vertices, triangles, material index), HullStats).
+    """
+    stats = HullStats()
+    labels, _count = mesh_buffers.mesh_islands(edges, len(positions))
+
+    # Islands of the vertices used by faces, loose vertices and edges are left out
+    used = np.unique(loop_vertices)
+    island_ids, labels = np.unique(labels[used], return_inverse=True)
+    labels = labels.reshape(-1)
+    positions = positions[used]
+    island_count = len(island_ids)
+    stats.islands = island_count
+
+    # Material of an island: the one of its first polygon
+    island_materials = np.zeros(island_count, dtype=np.int64)
+    if len(poly_starts):
+        poly_islands = labels[np.searchsorted(used, loop_vertices[poly_starts])]
+        island_materials[poly_islands[::-1]] = poly_materials[::-1]
+
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(island_count + 1))
+    hulls = []
+    for island in range(island_count):
+        points = positions[order[bounds[island]:bounds[island + 1]]]
+        if len(points) < 4:
+            stats.slivers += 1
+            continue
+        vertices, triangles = simplify_hull(points, max_vertices, plane_angle)
+        if hull_volume(vertices, triangles) < min_volume:
+            stats.slivers += 1
+            continue
+        hulls.append((vertices, triangles, int(island_materials[island])))
+        stats.hulls += 1
+        stats.vertices_after += len(vertices)
+        stats.faces_after += len(triangles)
+    return hulls, stats
+
+def _get(collection, attribute, count, dtype, width=1):
+    buffer = np.empty(count * width, dtype=dtype)
+    if count:
+        collection.foreach_get(attribute, buffer)
+    return buffer.reshape(-1, width) if width > 1 else buffer
+
+def _hull_mesh(name, hulls, materials):
+    """New mesh of the hull triangles with the given slot materials"""
+    offsets = np.cumsum([0] + [len(vertices) for vertices, _triangles, _material in hulls])
+    positions = np.concatenate([vertices for vertices, _triangles, _material in hulls]) if hulls else np.zeros((0, 3))
+    corners = (np.concatenate([triangles + offset for (_vertices, triangles, _material), offset in zip(hulls, offsets)])
+               if hulls else np.zeros((0, 3), dtype=np.int64))
+    poly_materials = (np.concatenate([np.full(len(triangles), material) for _vertices, triangles, material in hulls])
+                      if hulls else np.zeros(0, dtype=np.int64))
+    return mesh_merge.new_mesh(name, positions, corners.reshape(-1), np.full(len(corners), 3), poly_materials, materials)
+
+def hull_object(obj, max_vertices, plane_angle, min_volume, export_scale):
+    """Replace a temporary collision object's mesh with simplified convex hulls of its islands.
+
+    min_volume -- smallest hull kept, in cubic Hammer units
+    Returns HullStats.
+    """
+    mesh = obj.data
+    vertex_count = len(mesh.vertices)
+    positions = _get(mesh.vertices, "co", vertex_count, np.float32, 3).astype(np.float64)
+    edges = _get(mesh.edges, "vertices", len(mesh.edges), np.int32, 2)
+    loop_vertices = _get(mesh.loops, "vertex_index", len(mesh.loops), np.int32)
+    poly_starts = _get(mesh.polygons, "loop_start", len(mesh.polygons), np.int32)
+    poly_materials = _get(mesh.polygons, "material_index", len(mesh.polygons), np.int32)
+    faces_before = len(mesh.polygons)
+
+    # Work in the exported shape (object rotation and scale applied, in Hammer units),
+    # so angles and volumes mean the same for every node
+    linear = np.array(obj.matrix_world.to_3x3(), dtype=np.float64) * (export_scale * UNITS_PER_METER)
+    if abs(np.linalg.det(linear)) < 1e-12:
+        stats = HullStats()
+        stats.vertices_before = stats.vertices_after = vertex_count
+        stats.faces_before = stats.faces_after = faces_before
+        return stats
+
+    hulls, stats = island_hulls(positions @ linear.T, edges, poly_materials, loop_vertices, poly_starts,
+                                max_vertices, plane_angle, min_volume)
+    inverse = np.linalg.inv(linear)
+    hulls = [(vertices @ inverse.T, triangles, material) for vertices, triangles, material in hulls]
+    # A new mesh, the duplicate may share its mesh with the scene
+    obj.data = _hull_mesh(mesh.name, hulls, list(mesh.materials))
+
+    stats.vertices_before = vertex_count
+    stats.faces_before = faces_before
+    return stats
+
+def is_enabled(settings):
+    return settings.collision_hulls
+
+def process(obj, settings, export_scale):
+    """Hull a collision object per the scene settings. Returns HullStats."""
+    return hull_object(obj, settings.hull_max_vertices, settings.hull_plane_angle, settings.hull_min_volume, export_scale)
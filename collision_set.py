@@ -1,22 +1,25 @@
 import bpy
 import bmesh
 
+from . import node_status
+
 # Get selected objects
 selected_objects = bpy.context.selected_objects
 active_object = bpy.context.active_object
 
 # Check if we have exactly 2 objects selected
 if len(selected_objects) != 2:
-    print("Please select exactly 2 objects: first a mesh object, then a text object (with Shift)")
+    print("Please select exactly 2 objects: first a mesh object, then a node (with Shift)")
 else:
-    # The active object should be the text object (selected last with Shift)
-    if active_object.type != 'FONT':
-        print("The active object (last selected) must be a text object. Please select the mesh first, then Shift+select the text object.")
+    # The active object should be the node (selected last with Shift)
+    if not node_status.is_node(active_object):
+        print("The active object (last selected) must be a node. Please select the mesh first, then Shift+select the node.")
     else:
         # Find the mesh object (the one that's not active)
         mesh_object = None
         for obj in selected_objects:
-            if obj != active_object and obj.type == 'MESH':
+            # Marker nodes are meshes too, but share one mesh that must not get the collision setup
+            if obj != active_object and obj.type == 'MESH' and not node_status.is_marker_node(obj):
                 mesh_object = obj
                 break
         
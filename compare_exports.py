@@ -0,0 +1,63 @@
+"""
+Compares exported models outside Blender
+
+Plain Python + NumPy. Checks that two exports (files or whole export folders) contain the
+same geometry, normals, UVs, materials and custom properties, e.g. the FBX export against
+the DMX export of the same nodes, or a run before and after a change:
+
+    python compare_exports.py C:/export_fbx/models C:/export_dmx/models
+    python compare_exports.py crate_before.fbx crate_after.fbx --position-tolerance 0.01
+
+Exits with 1 when anything differs, so it can run as a check in build scripts.
+"""
+
+import os
+import sys
+import types
+import argparse
+import importlib
+
+# Package name the addon's Blender-free modules are loaded under
+CORE_PACKAGE = "s2_exporter_core"
+
+def load_core():
+    """Import the addon's Blender-free modules without running its __init__ (which needs bpy)"""
+    if CORE_PACKAGE not in sys.modules:
+        package = types.ModuleType(CORE_PACKAGE)
+        package.__path__ = [os.path.dirname(os.path.abspath(__file__))]
+        sys.modules[CORE_PACKAGE] = package
+    return importlib.import_module(CORE_PACKAGE + ".export_compare")
+
+def main(argv=None):
+    export_compare = load_core()
+    parser = argparse.ArgumentParser(description="Compare exported models (.fbx/.dmx files or folders)")
+    parser.add_argument("reference", help="file or folder of the trusted export")
+    parser.add_argument("candidate", help="file or folder of the export to check")
+    parser.add_argument("--position-tolerance", type=float, default=export_compare.DEFAULT_POSITION_TOLERANCE,
+                        help="in export units (default %(default)s)")
+    parser.add_argument("--normal-tolerance", type=float, default=export_compare.DEFAULT_NORMAL_TOLERANCE,
+                        help="in degrees (default %(default)s)")
+    parser.add_argument("--uv-tolerance", type=float, default=export_compare.DEFAULT_UV_TOLERANCE)
+    args = parser.parse_args(argv)
+    tolerances = {"position_tolerance": args.position_tolerance, "normal_tolerance": args.normal_tolerance,
+                  "uv_tolerance": args.uv_tolerance}
+
+    if os.path.isdir(args.reference):
+        results, missing, extra = export_compare.compare_directories(args.reference, args.candidate, **tolerances)
+    else:
+        results, missing, extra = [export_compare.compare_files(args.reference, args.candidate, **tolerances)], [], []
+
+    for result in results:
+        if not result.equal:
+            print("\n".join(result.lines()))
+    for path in missing:
+        print(f"{path}: missing from {args.candidate}")
+    for path in extra:
+        print(f"{path}: not in {args.reference}")
+    different = sum(1 for result in results if not result.equal)
+    print(f"{len(results) - different} of {len(results)} models match, {different} differ, "
+          f"{len(missing)} missing, {len(extra)} extra")
+    return 1 if different or missing or extra else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
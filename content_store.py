@@ -0,0 +1,68 @@
+"""
+Local content-addressed store for exported files
+
+Every exported file is hashed and kept once under <store>/<first two hex digits>/<hash><ext>.
+The file in the content folder is a hard link to the stored copy (or a plain copy when
+hard links are not possible), so identical models exported under different nodes or
+maps take the disk space of one. No Blender dependency.
+"""
+
+import os
+import shutil
+import hashlib
+
+STORE_FOLDER = ".s2_store"
+READ_CHUNK = 1 << 20
+
+def file_digest(filepath):
+    """SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as source:
+        for chunk in iter(lambda: source.read(READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def object_path(store_root, digest, extension):
+    return os.path.join(store_root, digest[:2], digest + extension)
+
+def _link_or_copy(source, target):
+    """Replace target with a hard link to source, falling back to a copy. Returns 'link' or 'copy'."""
+    temp_path = target + ".s2tmp"
+    if os.path.lexists(temp_path):
+        os.remove(temp_path)
+    try:
+        os.link(source, temp_path)
+        mode = 'link'
+    except OSError:
+        # Different volume, or a file system without hard links
+        shutil.copy2(source, temp_path)
+        mode = 'copy'
+    os.replace(temp_path, target)
+    return mode
+
+def prepare_output(filepath):
+    """Call before writing filepath: unlink it if it is a hard link into the store,
+    so the writer creates a new file instead of overwriting the stored copy"""
+    try:
+        if os.stat(filepath).st_nlink > 1:
+            os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+def store_file(filepath, store_root):
+    """Add a freshly written file to the store.
+
+    Returns (digest, deduplicated): deduplicated is True when identical content was
+    already stored and filepath now points at that copy.
+    """
+    digest = file_digest(filepath)
+    stored = object_path(store_root, digest, os.path.splitext(filepath)[1].lower())
+
+    if os.path.exists(stored):
+        if not os.path.samefile(stored, filepath):
+            _link_or_copy(stored, filepath)
+        return digest, True
+
+    os.makedirs(os.path.dirname(stored), exist_ok=True)
+    _link_or_copy(filepath, stored)
+    return digest, False
@@ -0,0 +1,52 @@
+import bpy
+
+# Datablock types that exports can create. Only these are tracked by the report.
+TRACKED_TYPES = (
+    "objects",
+    "meshes",
+    "curves",
+    "materials",
+    "collections",
+    "images",
+    "node_groups",
+)
+
+def snapshot():
+    """Record which datablocks currently exist, keyed by bpy.data collection name"""
+    return {name: {block.as_pointer() for block in getattr(bpy.data, name)} for name in TRACKED_TYPES}
+
+def new_blocks(before, name):
+    """Datablocks of one type created since the snapshot"""
+    known = before[name]
+    return [block for block in getattr(bpy.data, name) if block.as_pointer() not in known]
+
+def remove_new_orphans(before, keep=None):
+    """Remove meshes and curves created since the snapshot that no longer have users.
+
+    keep -- optional predicate; datablocks it returns True for are left alone
+    Returns the number of removed datablocks.
+    """
+    removed = 0
+    for name in ("meshes", "curves"):
+        data_collection = getattr(bpy.data, name)
+        for block in new_blocks(before, name):
+            if block.users == 0 and not (keep and keep(block)):
+                data_collection.remove(block)
+                removed += 1
+    return removed
+
+def growth(before, after=None):
+    """Net number of datablocks added per type between two snapshots"""
+    after = after if after is not None else snapshot()
+    return {name: len(after[name]) - len(before[name]) for name in TRACKED_TYPES}
+
+def format_growth(delta):
+    """Human readable growth summary, e.g. 'no net datablock growth' or 'meshes +3, curves +1'"""
+    changes = [f"{name} {count:+d}" for name, count in delta.items() if count]
+    if not changes:
+        return "no net datablock growth"
+    return "datablock growth: " + ", ".join(changes)
+
+def counts():
+    """Current number of datablocks per tracked type"""
+    return {name: len(getattr(bpy.data, name)) for name in TRACKED_TYPES}
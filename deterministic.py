@@ -0,0 +1,110 @@
+"""
+Deterministic export output
+
+Blender's FBX exporter writes the export time into the header and derives object ids
+from Python's string hash, which changes with every Blender session. normalize_fbx()
+rewrites those parts so the same geometry always produces the same bytes. No Blender
+dependency.
+"""
+
+import re
+
+from . import fbx_binary
+
+# Blender names duplicates "Name.001", "Name.002", ... depending on what already exists
+DUPLICATE_SUFFIX = re.compile(r"\.\d{3,}$")
+# Object names in FBX are stored as b"Name\x00\x01Class"
+NAME_CLASS_SEPARATOR = b"\x00\x01"
+
+# Values written in place of timestamps and file paths
+FIXED_TIMESTAMP = {"Year": 1970, "Month": 1, "Day": 1}
+FIXED_CREATION_TIME = b"1970-01-01 10:00:00:000"
+FIXED_DATE_TIME = b"01/01/1970 00:00:00.000"
+PATH_PROPERTIES = {b"DocumentUrl", b"SrcDocumentUrl", b"Original|FileName", b"LastSaved|FileName"}
+
+# Object ids are renumbered from here in order of appearance
+FIRST_ID = 1000000
+
+def stable_names(names):
+    """Names with Blender's duplicate suffix removed, where that doesn't create a clash"""
+    stripped = [DUPLICATE_SUFFIX.sub("", name) for name in names]
+    counts = {}
+    for name in stripped:
+        counts[name] = counts.get(name, 0) + 1
+    return [short if counts[short] == 1 else name for name, short in zip(names, stripped)]
+
+def _normalize_header(document):
+    header = document.node("FBXHeaderExtension")
+    if header is not None:
+        timestamp = header.child("CreationTimeStamp")
+        for field in timestamp.children if timestamp is not None else []:
+            if field.name != "Version" and field.properties:
+                field.set_value(0, FIXED_TIMESTAMP.get(field.name, 0))
+
+        scene_info = header.child("SceneInfo")
+        properties = scene_info.child("Properties70") if scene_info is not None else None
+        for prop in properties.children if properties is not None else []:
+            name = prop.value(0)
+            if name in PATH_PROPERTIES:
+                prop.set_value(len(prop.properties) - 1, b"")
+            elif name.endswith(b"DateTime_GMT"):
+                prop.set_value(len(prop.properties) - 1, FIXED_DATE_TIME)
+
+    creation_time = document.node("CreationTime")
+    if creation_time is not None and creation_time.properties:
+        creation_time.set_value(0, FIXED_CREATION_TIME)
+
+def _normalize_ids(document):
+    """Renumber document and object ids in order of appearance and update the connections"""
+    owners = []
+    documents = document.node("Documents")
+    if documents is not None:
+        owners += documents.children_named("Document")
+    objects = document.node("Objects")
+    if objects is not None:
+        owners += objects.children
+    owners = [node for node in owners if node.properties and node.properties[0][0] == b"L"]
+
+    ids = {}
+    for node in owners:
+        ids.setdefault(node.value(0), FIRST_ID + len(ids))
+    for node in owners:
+        node.set_value(0, ids[node.value(0)])
+
+    connections = document.node("Connections")
+    for connection in connections.children if connections is not None else []:
+        for index, (type_code, value) in enumerate(connection.properties):
+            if type_code == b"L" and value in ids:
+                connection.properties[index] = (type_code, ids[value])
+
+def _normalize_names(document):
+    objects = document.node("Objects")
+    if objects is None:
+        return
+    named = [node for node in objects.children
+             if len(node.properties) > 1 and node.properties[1][0] == b"S" and NAME_CLASS_SEPARATOR in node.value(1)]
+    parts = [node.value(1).split(NAME_CLASS_SEPARATOR, 1) for node in named]
+    # Duplicate suffixes only clash within one object class
+    for object_class in {part[1] for part in parts}:
+        members = [(node, part[0]) for node, part in zip(named, parts) if part[1] == object_class]
+        names = stable_names([name.decode("utf-8", "surrogateescape") for _node, name in members])
+        for (node, _old), name in zip(members, names):
+            node.set_value(1, name.encode("utf-8", "surrogateescape") + NAME_CLASS_SEPARATOR + object_class)
+
+def normalize_fbx(document):
+    """Remove timestamps, file paths, session dependent ids and duplicate name suffixes"""
+    _normalize_header(document)
+    _normalize_ids(document)
+    _normalize_names(document)
+    return document
+
+def normalize_file(filepath):
+    """Rewrite a binary FBX file deterministically. Returns True if the file changed."""
+    with open(filepath, "rb") as source:
+        data = source.read()
+    normalized = fbx_binary.serialize(normalize_fbx(fbx_binary.parse(data)))
+    if normalized == data:
+        return False
+    with open(filepath, "wb") as out:
+        out.write(normalized)
+    return True
@@ -1,10 +1,19 @@
 import bpy
 import os
 
-# Ensure an object is selected
-if bpy.context.selected_objects:
+from . import node_status
+
+# Marker nodes share one mesh, a material on it would change every marker
+# (a plain loop: this script runs through exec, comprehensions wouldn't see node_status)
+selected_meshes = []
+for obj in bpy.context.selected_objects:
+    if obj.type == 'MESH' and not node_status.is_marker_node(obj):
+        selected_meshes.append(obj)
+
+# Ensure a mesh is selected
+if selected_meshes:
     # Get the selected object
-    selected_object = bpy.context.selected_objects[0]
+    selected_object = selected_meshes[0]
 
     # If the selected object has any material other than "graygrid", delete all materials
     if selected_object.data.materials:
@@ -102,4 +111,4 @@ if bpy.context.selected_objects:
     print(f"Applied graygrid material to {selected_object.name}")
     
 else:
-    print("No object selected. Please select an object.")
\ No newline at end of file
+    print("No mesh selected. Please select a mesh object (nodes can't get the dev material).")
\ No newline at end of file
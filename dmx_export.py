@@ -0,0 +1,39 @@
+import bpy
+from mathutils import Matrix
+from bpy_extras.io_utils import axis_conversion
+
+from . import attribute_filter, dmx_model, mesh_snapshot
+from .dmx_model import ENCODINGS
+
+# FBX stores centimetres, so the FBX global_scale times 100 gives DMX units (inches) per metre
+FBX_UNITS_PER_METER = 100.0
+
+def conversion_matrix(global_scale, axis_forward, axis_up):
+    """Blender world space -> DMX space for the given FBX export settings.
+
+    The FBX exporter rotates Blender space into (axis_forward, axis_up) and ModelDoc turns
+    the Y-up FBX back into Z-up, so the DMX keeps only the rotation relative to the
+    default (-Z, Y) orientation, plus the inch scale.
+    """
+    to_fbx = axis_conversion(to_forward=axis_forward, to_up=axis_up).to_4x4()
+    from_fbx = axis_conversion(from_forward='-Z', from_up='Y').to_4x4()
+    return Matrix.Scale(global_scale * FBX_UNITS_PER_METER, 4) @ from_fbx @ to_fbx
+
+def capture_objects(context, objects, global_scale, axis_forward, axis_up):
+    """MeshBuffers of the mesh objects in DMX space, e.g. for mesh_snapshot and worker processes"""
+    depsgraph = context.evaluated_depsgraph_get()
+    conversion = conversion_matrix(global_scale, axis_forward, axis_up)
+    return mesh_snapshot.capture_objects(objects, depsgraph, conversion)
+
+def export_objects(context, objects, filepath, export_format, global_scale, axis_forward, axis_up, stable=False,
+                   position_step=0.0, normal_step=0.0):
+    """Write mesh objects to a DMX file with the same scale and axes as the FBX export settings.
+
+    stable        -- deterministic output: fixed element ids, no file name and no duplicate
+                     name suffixes in the file, so identical models write identical bytes
+    position_step -- round positions to this grid in Hammer units (0 keeps full precision)
+    normal_step   -- round normal components to this step, so near-equal normals weld (0 keeps them)
+    """
+    buffers_list = capture_objects(context, objects, global_scale, axis_forward, axis_up)
+    attribute_filter.quantize_buffers(buffers_list, position_step, normal_step)
+    return dmx_model.write_file(filepath, buffers_list, ENCODINGS[export_format], stable)
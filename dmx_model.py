@@ -0,0 +1,214 @@
+"""
+Static Source 2 model element trees built from MeshBuffers
+
+No Blender dependency, so worker processes can turn mesh snapshots into DMX files
+without Blender. dmx_export feeds it meshes from the scene.
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from . import deterministic, dmx_writer
+from .dmx_writer import DmElement
+
+# Scene export_format -> DMX encoding
+ENCODINGS = {
+    'DMX_BINARY': "binary",
+    'DMX_TEXT': "keyvalues2",
+}
+
+# Color attributes with these names are written under their own Source 2 vertex format keyword.
+# Otherwise the active color attribute drives material blending.
+VERTEX_PAINT_MAPS = ("VertexPaintBlendParams", "VertexPaintTintColor")
+
+def weld(values):
+    """Unique rows and the index of every input row into them"""
+    if not len(values):
+        return values, np.zeros(0, dtype=np.int32)
+    unique, inverse = np.unique(values, axis=0, return_inverse=True)
+    return unique, inverse.reshape(-1).astype(np.int32)
+
+def face_corner_list(poly_starts, poly_sizes):
+    """DmeFaceSet 'faces': corner indices of every polygon, each polygon terminated by -1"""
+    total = int(poly_sizes.sum())
+    offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(poly_sizes) - poly_sizes, poly_sizes)
+    corners = np.repeat(poly_starts, poly_sizes) + offsets
+    faces = np.full(total + len(poly_sizes), -1, dtype=np.int32)
+    faces[np.arange(total) + np.repeat(np.arange(len(poly_sizes)), poly_sizes)] = corners
+    return faces
+
+def make_transform(name):
+    transform = DmElement(name, "DmeTransform")
+    transform.set("position", "vector3", (0.0, 0.0, 0.0))
+    transform.set("orientation", "quaternion", (0.0, 0.0, 0.0, 1.0))
+    return transform
+
+def build_mesh(buffers, material_elements):
+    """DmeMesh with one DmeVertexData and a DmeFaceSet per used material slot"""
+    vertex_data = DmElement("bind", "DmeVertexData")
+    vertex_format = vertex_data.set("vertexFormat", "string_array", [])
+    vertex_data.set("jointCount", "int", 0)
+    vertex_data.set("flipVCoordinates", "bool", False)
+
+    def add_stream(keyword, array_type, values, indices):
+        vertex_format.append(keyword)
+        vertex_data.set(keyword, array_type, values)
+        vertex_data.set(keyword + "Indices", "int_array", indices)
+
+    add_stream("position$0", "vector3_array", buffers.positions, buffers.loop_vertices)
+    add_stream("normal$0", "vector3_array", *weld(buffers.loop_normals))
+    for index, (_name, uvs) in enumerate(buffers.uv_layers):
+        add_stream(f"texcoord${index}", "vector2_array", *weld(uvs))
+
+    color_layers = dict(buffers.color_layers)
+    for map_name in VERTEX_PAINT_MAPS:
+        if map_name in color_layers:
+            add_stream(map_name + "$0", "vector4_array", *weld(color_layers.pop(map_name)))
+    if color_layers and "VertexPaintBlendParams$0" not in vertex_format:
+        # Active color attribute (sorted first) among the layers not written above, used for blended materials
+        add_stream("VertexPaintBlendParams$0", "vector4_array", *weld(next(iter(color_layers.values()))))
+
+    mesh = DmElement(buffers.name, "DmeMesh")
+    mesh.set("visible", "bool", True)
+    mesh.set("bindState", "element", vertex_data)
+    mesh.set("currentState", "element", vertex_data)
+    mesh.set("baseStates", "element_array", [vertex_data])
+    mesh.set("deltaStates", "element_array", [])
+
+    face_sets = mesh.set("faceSets", "element_array", [])
+    slot_count = max(len(buffers.vmat_paths), 1)
+    poly_materials = np.clip(buffers.poly_materials, 0, slot_count - 1)
+    for slot in np.unique(poly_materials):
+        polys = np.flatnonzero(poly_materials == slot)
+        vmat_path = buffers.vmat_paths[slot] if buffers.vmat_paths else ""
+        face_set = DmElement(vmat_path or "default", "DmeFaceSet")
+        face_set.set("faces", "int_array", face_corner_list(buffers.poly_starts[polys], buffers.poly_sizes[polys]))
+        face_set.set("material", "element", material_element(material_elements, vmat_path))
+        face_sets.append(face_set)
+    return mesh
+
+def material_element(material_elements, vmat_path):
+    """Shared DmeMaterial per vmat path"""
+    material = material_elements.get(vmat_path)
+    if material is None:
+        name = os.path.splitext(os.path.basename(vmat_path))[0] or "default"
+        material = DmElement(name, "DmeMaterial")
+        material.set("mtlName", "string", vmat_path)
+        material_elements[vmat_path] = material
+    return material
+
+def build_model(name, buffers_list):
+    """Root element of a static (unskinned) Source 2 model with one DmeDag per mesh"""
+    material_elements = {}
+    return assemble_model(name, [build_mesh(buffers, material_elements) for buffers in buffers_list])
+
+def assemble_model(name, meshes):
+    """Root element of a static model from already built DmeMesh elements, one DmeDag per mesh"""
+    model = DmElement(name, "DmeModel")
+    model.set("transform", "element", make_transform(name))
+    model.set("shape", "element", None)
+    model.set("visible", "bool", True)
+    children = model.set("children", "element_array", [])
+    joints = model.set("jointList", "element_array", [])
+
+    transform_list = DmElement("base", "DmeTransformList")
+    base_transforms = transform_list.set("transforms", "element_array", [])
+    model.set("baseStates", "element_array", [transform_list])
+
+    axis_system = DmElement("axisSystem", "DmeAxisSystem")
+    axis_system.set("upAxis", "int", 3)
+    axis_system.set("forwardParity", "int", 1)
+    axis_system.set("coordSys", "int", 0)
+    model.set("axisSystem", "element", axis_system)
+
+    for mesh in meshes:
+        dag = DmElement(mesh.name, "DmeDag")
+        dag.set("transform", "element", make_transform(mesh.name))
+        dag.set("shape", "element", mesh)
+        dag.set("visible", "bool", True)
+        dag.set("children", "element_array", [])
+        children.append(dag)
+        joints.append(dag)
+        base_transforms.append(make_transform(mesh.name))
+
+    root = DmElement(name)
+    root.set("skeleton", "element", model)
+    root.set("model", "element", model)
+    return root
+
+def write_file(filepath, buffers_list, encoding="binary", stable=False):
+    """Write MeshBuffers (already in DMX space) as one static model.
+
+    stable -- deterministic output: fixed element ids, no file name and no duplicate
+              name suffixes in the file, so identical models write identical bytes
+    """
+    if stable:
+        for buffers, stable_name in zip(buffers_list, deterministic.stable_names([b.name for b in buffers_list])):
+            buffers.name = stable_name
+    material_elements = {}
+    return write_meshes(filepath, [build_mesh(buffers, material_elements) for buffers in buffers_list], encoding, stable)
+
+def write_meshes(filepath, meshes, encoding="binary", stable=False):
+    """Write built DmeMesh elements as one static model, see write_file()"""
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    if stable:
+        name = "model"
+        for mesh, stable_name in zip(meshes, deterministic.stable_names([mesh.name for mesh in meshes])):
+            mesh.name = stable_name
+
+    root = assemble_model(name, meshes)
+    if stable:
+        dmx_writer.assign_stable_ids(root)
+    dmx_writer.write_dmx(filepath, root, encoding)
+    return filepath
+
+class MeshSpool:
+    """Static model built one MeshBuffers at a time with bounded memory.
+
+    Every added mesh is turned into its DmeMesh right away and the mesh's arrays are
+    moved to .npy files in a temporary folder and memory-mapped back, so the element
+    tree of a huge model holds almost no memory of its own. write() then streams the
+    arrays from disk in chunks. The file is the same write_file() gives for the same
+    MeshBuffers in the same order.
+    """
+
+    def __init__(self, folder=None):
+        self.folder = tempfile.mkdtemp(prefix="s2_mesh_spool_", dir=folder)
+        self.meshes = []
+        self.material_elements = {}
+        self.spooled_bytes = 0
+        self._count = 0
+
+    def add(self, buffers):
+        """Build and spool the DmeMesh of one MeshBuffers; the buffers can be dropped afterwards"""
+        mesh = build_mesh(buffers, self.material_elements)
+        for element in dmx_writer.collect_elements(mesh):
+            for name, (attribute_type, value) in list(element.attributes.items()):
+                if isinstance(value, np.ndarray) and value.size:
+                    element.attributes[name] = (attribute_type, self._spool(value))
+        self.meshes.append(mesh)
+        return mesh
+
+    def _spool(self, array):
+        path = os.path.join(self.folder, f"{self._count}.npy")
+        self._count += 1
+        np.save(path, np.ascontiguousarray(array))
+        self.spooled_bytes += array.nbytes
+        return np.load(path, mmap_mode="r")
+
+    def write(self, filepath, encoding="binary", stable=False):
+        return write_meshes(filepath, self.meshes, encoding, stable)
+
+    def close(self):
+        """Drop the memory-mapped arrays and delete the temporary folder"""
+        self.meshes = []
+        self.material_elements = {}
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
@@ -0,0 +1,547 @@
+"""
+DMX (Datamodel Exchange) writer and reader
+
+Pure Python + NumPy, no Blender dependency. Writes keyvalues2 text and binary
+(encoding version 5) files. Numeric arrays are kept as NumPy arrays and written
+in bulk. read_dmx() is the reference parser used to round-trip written files.
+"""
+
+import re
+import uuid
+import struct
+
+import numpy as np
+
+# Attribute type names in keyvalues2 order, their position is the binary type id (1-based).
+# The binary id of an array type is the id of its element type + ARRAY_OFFSET.
+ATTRIBUTE_TYPES = (
+    "element",
+    "int",
+    "float",
+    "bool",
+    "string",
+    "binary",
+    "time",
+    "color",
+    "vector2",
+    "vector3",
+    "vector4",
+    "qangle",
+    "quaternion",
+    "matrix",
+)
+ARRAY_OFFSET = len(ATTRIBUTE_TYPES)
+BINARY_VERSION = 5
+
+# Number of float components for vector-like types
+VECTOR_SIZES = {
+    "vector2": 2,
+    "vector3": 3,
+    "vector4": 4,
+    "qangle": 3,
+    "quaternion": 4,
+    "matrix": 16,
+}
+
+# Namespace of the ids written by assign_stable_ids()
+STABLE_ID_NAMESPACE = uuid.UUID("5d1b3c52-7a0e-4f43-9c1e-2b6f0d8a4e71")
+
+# Rows written per chunk for large arrays, bounds the temporary memory of a write
+CHUNK_ROWS = 1 << 18
+
+class DmxError(Exception):
+    pass
+
+class DmElement:
+    """One DMX element: a type, a name, an id and ordered typed attributes"""
+
+    def __init__(self, name, element_type="DmElement", element_id=None):
+        self.name = name
+        self.type = element_type
+        self.id = element_id or uuid.uuid4()
+        self.attributes = {}
+
+    def set(self, name, attribute_type, value):
+        """Set a typed attribute. Array types end with '_array'."""
+        base = attribute_type[:-6] if attribute_type.endswith("_array") else attribute_type
+        if base not in ATTRIBUTE_TYPES:
+            raise DmxError(f"Unknown DMX attribute type: {attribute_type}")
+        self.attributes[name] = (attribute_type, value)
+        return value
+
+    def __getitem__(self, name):
+        return self.attributes[name][1]
+
+    def __contains__(self, name):
+        return name in self.attributes
+
+    def get(self, name, default=None):
+        attribute = self.attributes.get(name)
+        return attribute[1] if attribute is not None else default
+
+    def __repr__(self):
+        return f"<DmElement {self.type} '{self.name}'>"
+
+def collect_elements(root):
+    """All elements reachable from root, root first, in breadth-first order"""
+    elements = [root]
+    seen = {id(root)}
+    index = 0
+    while index < len(elements):
+        element = elements[index]
+        index += 1
+        for attribute_type, value in element.attributes.values():
+            if attribute_type == "element":
+                children = [value]
+            elif attribute_type == "element_array":
+                children = value
+            else:
+                continue
+            for child in children:
+                if child is not None and id(child) not in seen:
+                    seen.add(id(child))
+                    elements.append(child)
+    return elements
+
+def header_line(encoding, encoding_version, format_name, format_version):
+    return f"<!-- dmx encoding {encoding} {encoding_version} format {format_name} {format_version} -->"
+
+def _as_rows(value, attribute_type):
+    """Numeric array attribute as a 2D (or 1D) NumPy array of its storage type"""
+    base = attribute_type[:-6]
+    if base in VECTOR_SIZES:
+        return np.asarray(value, dtype=np.float32).reshape(-1, VECTOR_SIZES[base])
+    if base == "float":
+        return np.asarray(value, dtype=np.float32).reshape(-1)
+    if base == "int":
+        return np.asarray(value, dtype=np.int32).reshape(-1)
+    if base == "bool":
+        return np.asarray(value, dtype=np.int8).reshape(-1)
+    if base == "color":
+        return np.asarray(value, dtype=np.uint8).reshape(-1, 4)
+    if base == "time":
+        return (np.asarray(value, dtype=np.float64).reshape(-1) * 10000).round().astype(np.int32)
+    return None
+
+# ---------------------------------------------------------------------------
+# keyvalues2 text
+
+def _kv2_escape(text):
+    return (text.replace("\\", "\\\\").replace("\"", "\\\"")
+            .replace("\n", "\\n").replace("\t", "\\t"))
+
+def _kv2_scalar(attribute_type, value):
+    """Text form of a single (non-array) value"""
+    if attribute_type == "element":
+        return str(value.id) if value is not None else ""
+    if attribute_type == "int":
+        return str(int(value))
+    if attribute_type == "float":
+        return "%.9g" % value
+    if attribute_type == "bool":
+        return "1" if value else "0"
+    if attribute_type == "string":
+        return _kv2_escape(value)
+    if attribute_type == "binary":
+        return bytes(value).hex().upper()
+    if attribute_type == "time":
+        return "%.9g" % value
+    if attribute_type == "color":
+        return " ".join(str(int(c)) for c in value)
+    return " ".join("%.9g" % c for c in value)
+
+def _kv2_numeric_array(out, rows, attribute_type, indent):
+    """Write a numeric array with one C-level format call per chunk"""
+    base = attribute_type[:-6]
+    if base in ("float", "time") or base in VECTOR_SIZES:
+        number = "%.9g"
+        values = rows.astype(np.float64) / 10000 if base == "time" else rows
+    else:
+        number = "%d"
+        values = rows
+    width = 1 if values.ndim == 1 else values.shape[1]
+    line = indent + "\"" + " ".join([number] * width) + "\",\n"
+
+    total = len(values)
+    for start in range(0, total, CHUNK_ROWS):
+        chunk = values[start:start + CHUNK_ROWS]
+        text = (line * len(chunk)) % tuple(chunk.ravel().tolist())
+        if start + CHUNK_ROWS >= total:
+            text = text[:-2] + "\n"  # no comma after the last item
+        out.write(text)
+
+def _kv2_write_element(out, element, depth):
+    indent = "\t" * depth
+    out.write(f"{indent}\"{_kv2_escape(element.type)}\"\n{indent}{{\n")
+    inner = indent + "\t"
+    out.write(f"{inner}\"id\" \"elementid\" \"{element.id}\"\n")
+    out.write(f"{inner}\"name\" \"string\" \"{_kv2_escape(element.name)}\"\n")
+
+    for name, (attribute_type, value) in element.attributes.items():
+        if not attribute_type.endswith("_array"):
+            out.write(f"{inner}\"{_kv2_escape(name)}\" \"{attribute_type}\" \"{_kv2_scalar(attribute_type, value)}\"\n")
+            continue
+
+        out.write(f"{inner}\"{_kv2_escape(name)}\" \"{attribute_type}\"\n{inner}[\n")
+        base = attribute_type[:-6]
+        item_indent = inner + "\t"
+        rows = _as_rows(value, attribute_type)
+        if rows is not None:
+            if len(rows):
+                _kv2_numeric_array(out, rows, attribute_type, item_indent)
+        elif base == "element":
+            items = [f"{item_indent}\"element\" \"{child.id if child is not None else ''}\"" for child in value]
+            if items:
+                out.write(",\n".join(items) + "\n")
+        else:
+            items = [f"{item_indent}\"{_kv2_scalar(base, item)}\"" for item in value]
+            if items:
+                out.write(",\n".join(items) + "\n")
+        out.write(f"{inner}]\n")
+
+    out.write(f"{indent}}}\n")
+
+def write_keyvalues2(out, root, format_name="model", format_version=22):
+    out.write(header_line("keyvalues2", 1, format_name, format_version) + "\n")
+    for element in collect_elements(root):
+        _kv2_write_element(out, element, 0)
+        out.write("\n")
+
+# ---------------------------------------------------------------------------
+# binary
+
+class _StringTable:
+    def __init__(self):
+        self.strings = []
+        self.indices = {}
+
+    def add(self, text):
+        if text not in self.indices:
+            self.indices[text] = len(self.strings)
+            self.strings.append(text)
+        return self.indices[text]
+
+def _binary_strings(elements):
+    table = _StringTable()
+    for element in elements:
+        table.add(element.type)
+        table.add(element.name)
+        for name, (attribute_type, value) in element.attributes.items():
+            table.add(name)
+            if attribute_type == "string":
+                table.add(value)
+    return table
+
+def _binary_scalar(out, attribute_type, value, strings, element_indices):
+    if attribute_type == "element":
+        out.write(struct.pack("<i", element_indices[id(value)] if value is not None else -1))
+    elif attribute_type == "int":
+        out.write(struct.pack("<i", int(value)))
+    elif attribute_type == "float":
+        out.write(struct.pack("<f", value))
+    elif attribute_type == "bool":
+        out.write(struct.pack("<b", 1 if value else 0))
+    elif attribute_type == "string":
+        out.write(struct.pack("<i", strings.indices[value]))
+    elif attribute_type == "binary":
+        data = bytes(value)
+        out.write(struct.pack("<i", len(data)) + data)
+    elif attribute_type == "time":
+        out.write(struct.pack("<i", int(round(value * 10000))))
+    elif attribute_type == "color":
+        out.write(struct.pack("<4B", *[int(c) for c in value]))
+    else:
+        size = VECTOR_SIZES[attribute_type]
+        out.write(struct.pack(f"<{size}f", *value))
+
+def _binary_array(out, attribute_type, value, element_indices):
+    base = attribute_type[:-6]
+    rows = _as_rows(value, attribute_type)
+    if rows is not None:
+        out.write(struct.pack("<i", len(rows)))
+        little = rows.dtype.newbyteorder("<")
+        for start in range(0, len(rows), CHUNK_ROWS):
+            out.write(np.ascontiguousarray(rows[start:start + CHUNK_ROWS], dtype=little).tobytes())
+        return
+
+    out.write(struct.pack("<i", len(value)))
+    if base == "element":
+        indices = [element_indices[id(child)] if child is not None else -1 for child in value]
+        out.write(np.asarray(indices, dtype="<i4").tobytes())
+    elif base == "string":
+        # Strings inside arrays are stored inline, not in the string table
+        for item in value:
+            out.write(item.encode("utf-8") + b"\0")
+    elif base == "binary":
+        for item in value:
+            data = bytes(item)
+            out.write(struct.pack("<i", len(data)) + data)
+
+def write_binary(out, root, format_name="model", format_version=22):
+    elements = collect_elements(root)
+    element_indices = {id(element): index for index, element in enumerate(elements)}
+    strings = _binary_strings(elements)
+
+    out.write(header_line("binary", BINARY_VERSION, format_name, format_version).encode("ascii") + b"\n\0")
+
+    out.write(struct.pack("<i", len(strings.strings)))
+    for text in strings.strings:
+        out.write(text.encode("utf-8") + b"\0")
+
+    out.write(struct.pack("<i", len(elements)))
+    for element in elements:
+        out.write(struct.pack("<ii", strings.indices[element.type], strings.indices[element.name]))
+        out.write(element.id.bytes_le)
+
+    for element in elements:
+        out.write(struct.pack("<i", len(element.attributes)))
+        for name, (attribute_type, value) in element.attributes.items():
+            base = attribute_type[:-6] if attribute_type.endswith("_array") else attribute_type
+            type_id = ATTRIBUTE_TYPES.index(base) + 1
+            if base != attribute_type:
+                type_id += ARRAY_OFFSET
+            out.write(struct.pack("<ib", strings.indices[name], type_id))
+            if base != attribute_type:
+                _binary_array(out, attribute_type, value, element_indices)
+            else:
+                _binary_scalar(out, attribute_type, value, strings, element_indices)
+
+def assign_stable_ids(root, namespace=STABLE_ID_NAMESPACE):
+    """Replace the random element ids with ids derived from each element's position in the tree,
+    so the same tree always writes the same bytes"""
+    for index, element in enumerate(collect_elements(root)):
+        element.id = uuid.uuid5(namespace, str(index))
+    return root
+
+def write_dmx(filepath, root, encoding="binary", format_name="model", format_version=22):
+    """Write the element tree under root to filepath ('binary' or 'keyvalues2')"""
+    if encoding == "binary":
+        with open(filepath, "wb") as out:
+            write_binary(out, root, format_name, format_version)
+    elif encoding == "keyvalues2":
+        with open(filepath, "w", encoding="utf-8", newline="\n") as out:
+            write_keyvalues2(out, root, format_name, format_version)
+    else:
+        raise DmxError(f"Unknown DMX encoding: {encoding}")
+    return filepath
+
+# ---------------------------------------------------------------------------
+# reading (reference parser)
+
+_HEADER = re.compile(r"<!--\s*dmx encoding (\S+) (\d+) format (\S+) (\d+)\s*-->")
+
+class _BinaryReader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def int(self):
+        return self.unpack("<i")[0]
+
+    def cstring(self):
+        end = self.data.index(b"\0", self.offset)
+        text = self.data[self.offset:end].decode("utf-8")
+        self.offset = end + 1
+        return text
+
+    def array(self, dtype, count, width=1):
+        dtype = np.dtype(dtype)
+        size = dtype.itemsize * count * width
+        values = np.frombuffer(self.data, dtype=dtype, count=count * width, offset=self.offset)
+        self.offset += size
+        return values.reshape(-1, width) if width > 1 else values
+
+def _read_binary(data, version):
+    if version < 4:
+        raise DmxError(f"Binary DMX version {version} is not supported")
+    reader = _BinaryReader(data)
+    reader.offset = data.index(b"\0") + 1
+
+    strings = [reader.cstring() for _ in range(reader.int())]
+    elements = []
+    for _ in range(reader.int()):
+        element_type, name = reader.unpack("<ii")
+        element_id = uuid.UUID(bytes_le=bytes(reader.unpack("16s")[0]))
+        elements.append(DmElement(strings[name], strings[element_type], element_id))
+
+    for element in elements:
+        for _ in range(reader.int()):
+            name_index, type_id = reader.unpack("<ib")
+            is_array = type_id > ARRAY_OFFSET
+            base = ATTRIBUTE_TYPES[(type_id - ARRAY_OFFSET if is_array else type_id) - 1]
+            attribute_type = base + "_array" if is_array else base
+            if is_array:
+                count = reader.int()
+                if base == "element":
+                    value = [elements[i] if i >= 0 else None for i in reader.array("<i4", count)]
+                elif base == "string":
+                    value = [reader.cstring() for _ in range(count)]
+                elif base == "binary":
+                    value = []
+                    for _ in range(count):
+                        size = reader.int()
+                        value.append(bytes(reader.unpack(f"{size}s")[0]))
+                elif base in VECTOR_SIZES:
+                    value = reader.array("<f4", count, VECTOR_SIZES[base])
+                elif base == "float":
+                    value = reader.array("<f4", count)
+                elif base == "int":
+                    value = reader.array("<i4", count)
+                elif base == "bool":
+                    value = reader.array("<i1", count).astype(bool)
+                elif base == "color":
+                    value = reader.array("<u1", count, 4)
+                else:
+                    value = reader.array("<i4", count) / 10000.0
+            else:
+                if base == "element":
+                    index = reader.int()
+                    value = elements[index] if index >= 0 else None
+                elif base == "int":
+                    value = reader.int()
+                elif base == "float":
+                    value = reader.unpack("<f")[0]
+                elif base == "bool":
+                    value = bool(reader.unpack("<b")[0])
+                elif base == "string":
+                    value = strings[reader.int()]
+                elif base == "binary":
+                    value = bytes(reader.unpack(f"{reader.int()}s")[0])
+                elif base == "time":
+                    value = reader.int() / 10000.0
+                elif base == "color":
+                    value = reader.unpack("<4B")
+                else:
+                    value = reader.unpack(f"<{VECTOR_SIZES[base]}f")
+            element.set(strings[name_index], attribute_type, value)
+    return elements[0] if elements else None
+
+_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}\[\],])|//[^\n]*|\s+', re.S)
+
+def _kv2_unescape(text):
+    return re.sub(r"\\(.)", lambda m: {"n": "\n", "t": "\t"}.get(m.group(1), m.group(1)), text)
+
+def _kv2_tokens(text):
+    tokens = []
+    for match in _TOKEN.finditer(text):
+        if match.group(1) is not None:
+            tokens.append(("str", _kv2_unescape(match.group(1))))
+        elif match.group(2) is not None:
+            tokens.append(("sym", match.group(2)))
+    return tokens
+
+def _kv2_parse_value(base, text):
+    if base == "int":
+        return int(text)
+    if base == "float":
+        return float(text)
+    if base == "bool":
+        return text.strip() not in ("0", "false", "")
+    if base == "string":
+        return text
+    if base == "binary":
+        return bytes.fromhex(text)
+    if base == "time":
+        return float(text)
+    if base == "color":
+        return tuple(int(c) for c in text.split())
+    return tuple(float(c) for c in text.split())
+
+def _read_keyvalues2(text):
+    tokens = _kv2_tokens(text[text.index("-->") + 3:])
+    position = 0
+    by_id = {}
+    references = []  # (element, attribute name, is_array, ids)
+    roots = []
+
+    def take():
+        nonlocal position
+        token = tokens[position]
+        position += 1
+        return token
+
+    def parse_element(element_type):
+        element = DmElement("", element_type)
+        if take() != ("sym", "{"):
+            raise DmxError("Expected '{'")
+        while tokens[position] != ("sym", "}"):
+            name = take()[1]
+            attribute_type = take()
+            if attribute_type[0] == "str" and tokens[position] == ("sym", "{"):
+                # Inline element
+                element.set(name, "element", parse_element(attribute_type[1]))
+                continue
+            attribute_type = attribute_type[1]
+            if attribute_type == "elementid":
+                element.id = uuid.UUID(take()[1])
+                by_id[element.id] = element
+            elif name == "name" and attribute_type == "string":
+                element.name = take()[1]
+            elif attribute_type == "element":
+                references.append((element, name, False, [take()[1]]))
+                element.set(name, "element", None)
+            elif attribute_type.endswith("_array"):
+                base = attribute_type[:-6]
+                take()  # [
+                items = []
+                ids = []
+                while tokens[position] != ("sym", "]"):
+                    token = take()
+                    if token == ("sym", ","):
+                        continue
+                    if base == "element":
+                        if tokens[position] == ("sym", "{"):
+                            items.append(parse_element(token[1]))
+                            ids.append(None)
+                        else:
+                            items.append(None)
+                            ids.append(take()[1])
+                    else:
+                        items.append(_kv2_parse_value(base, token[1]))
+                take()  # ]
+                if base == "element":
+                    element.set(name, attribute_type, items)
+                    references.append((element, name, True, ids))
+                elif base in VECTOR_SIZES or base in ("float", "int", "color", "time", "bool"):
+                    element.set(name, attribute_type, _as_rows(items, attribute_type) if base != "time"
+                                else np.asarray(items, dtype=np.float64))
+                else:
+                    element.set(name, attribute_type, items)
+            else:
+                element.set(name, attribute_type, _kv2_parse_value(attribute_type, take()[1]))
+        take()  # }
+        return element
+
+    while position < len(tokens):
+        roots.append(parse_element(take()[1]))
+
+    for element, name, is_array, ids in references:
+        if is_array:
+            items = element[name]
+            for index, element_id in enumerate(ids):
+                if element_id is not None:
+                    items[index] = by_id.get(uuid.UUID(element_id)) if element_id else None
+        else:
+            element_id = ids[0]
+            element.set(name, "element", by_id.get(uuid.UUID(element_id)) if element_id else None)
+
+    return roots[0] if roots else None
+
+def read_dmx(filepath):
+    """Parse a DMX file written in keyvalues2 or binary (v4+) encoding. Returns the root element."""
+    with open(filepath, "rb") as source:
+        data = source.read()
+    match = _HEADER.match(data[:256].decode("ascii", "replace"))
+    if match is None:
+        raise DmxError(f"Not a DMX file: {filepath}")
+    encoding, version = match.group(1), int(match.group(2))
+    if encoding == "binary":
+        return _read_binary(data, version)
+    if encoding == "keyvalues2":
+        return _read_keyvalues2(data.decode("utf-8"))
+    raise DmxError(f"Unsupported DMX encoding: {encoding}")
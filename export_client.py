@@ -0,0 +1,87 @@
+"""
+Client for the headless export server (export_server.py)
+
+Plain Python with no Blender dependency, so build tools can import it directly
+or run it from the command line:
+
+    python export_client.py C:/maps/props.blend Crate Barrel --port 8765
+"""
+
+import sys
+import json
+import socket
+import argparse
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+def _events(sock):
+    """Yield decoded JSON events from a socket until it closes"""
+    with sock.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def send_command(command, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None, **fields):
+    """Send one command and yield events until the job ends"""
+    message = dict(fields, command=command)
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        for event in _events(sock):
+            yield event
+            if event["event"] in ("done", "error", "pong", "bye"):
+                return
+
+def request_export(blend_file, nodes=None, options=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None, job_id=None):
+    """Export nodes from blend_file and yield progress events as they arrive"""
+    return send_command("export", host, port, timeout, id=job_id, file=blend_file,
+                        nodes=list(nodes or []), options=dict(options or {}))
+
+def list_nodes(blend_file, options=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None):
+    """Node names of blend_file and its static mesh count: (names, static_count, sizes).
+
+    sizes maps every node name, and None for the static meshes, to [vertices, modifiers, materials].
+    """
+    names, static_count, sizes = [], 0, {}
+    for event in send_command("list", host, port, timeout, file=blend_file, options=dict(options or {})):
+        if event["event"] == "nodes":
+            names, static_count = event["nodes"], event["static"]
+            sizes = dict(event.get("sizes", {}))
+            sizes[None] = event.get("static_size", [0, 0, 0])
+        elif event["event"] == "error":
+            raise RuntimeError(event["message"])
+    return names, static_count, sizes
+
+def request_static(blend_file, objects=None, options=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None, job_id=None):
+    """Run the static mesh export of blend_file and yield progress events as they arrive"""
+    return send_command("static", host, port, timeout, id=job_id, file=blend_file,
+                        objects=list(objects or []), options=dict(options or {}))
+
+def ping(host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5.0):
+    """Return the server's pong event (includes the currently loaded file)"""
+    return next(send_command("ping", host, port, timeout))
+
+def shutdown(host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5.0):
+    """Ask the server to stop after the current connection"""
+    return next(send_command("shutdown", host, port, timeout))
+
+def main():
+    parser = argparse.ArgumentParser(description="Send an export job to the Source 2 export server")
+    parser.add_argument("blend_file")
+    parser.add_argument("nodes", nargs="*", help="Node names to export (default: all nodes)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--addons-path", help="Override the addon's Addons Path preference")
+    args = parser.parse_args()
+
+    options = {"addons_path": args.addons_path} if args.addons_path else {}
+    status = "CANCELLED"
+    for event in request_export(args.blend_file, args.nodes, options, args.host, args.port):
+        print(json.dumps(event))
+        if event["event"] == "done":
+            status = event["status"]
+    return 0 if status == "FINISHED" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,579 @@
+"""
+Export equivalence checker
+
+Reads exported models (binary FBX through fbx_binary, DMX through dmx_writer) into one
+plain geometry form and compares two of them: topology and vertex positions within a
+tolerance, normals, UVs, the material (vmat path) of every face and the custom properties
+of every object. Meant to prove that a faster export path (DMX writer, in-memory merge,
+caches) writes the same models as Blender's FBX exporter. No Blender dependency.
+
+Faces are compared as a whole, independent of object boundaries, face order, vertex
+order and the corner a face starts at, since the export paths join and weld differently.
+Winding is compared, a flipped face is a difference.
+"""
+
+import os
+
+import numpy as np
+
+from . import deterministic, dmx_writer, fbx_binary
+
+EXPORT_EXTENSIONS = (".fbx", ".dmx")
+# Positions in export units (Hammer units for node and static exports)
+DEFAULT_POSITION_TOLERANCE = 1e-3
+DEFAULT_NORMAL_TOLERANCE = 0.5      # degrees
+DEFAULT_UV_TOLERANCE = 1e-4
+# Differences listed per check before they are only counted
+MAX_EXAMPLES = 5
+# Faces are sorted by the positions of this many corners
+SORT_CORNERS = 8
+
+# FBX world space of the exporter's default orientation (-Z forward, Y up) -> DMX space
+# (Z up), the inverse of what dmx_export.conversion_matrix adds
+FBX_TO_DMX = np.array([[1.0, 0.0, 0.0],
+                       [0.0, 0.0, -1.0],
+                       [0.0, 1.0, 0.0]])
+
+# FBX RotationOrder enum -> axes in the order they are applied
+ROTATION_ORDERS = ("XYZ", "XZY", "YZX", "YXZ", "ZXY", "ZYX")
+
+class ExportGeometry:
+    """All faces of one exported file in its world space, corners in face order.
+
+    corner_positions -- (C, 3) float64
+    sizes            -- (P,) corners per face
+    corner_normals   -- (C, 3) float64 or None when the file has none
+    uv_layers        -- [(C, 2) float64], in channel order
+    face_materials   -- (P,) vmat path (or material name) of every face
+    objects          -- {object name: {custom property: value}}, None if the format has none
+    """
+    __slots__ = ("filepath", "format", "corner_positions", "sizes", "corner_normals", "uv_layers", "face_materials",
+                 "objects")
+
+    def __init__(self, filepath, file_format):
+        self.filepath = filepath
+        self.format = file_format
+        self.corner_positions = np.zeros((0, 3))
+        self.sizes = np.zeros(0, dtype=np.int64)
+        self.corner_normals = None
+        self.uv_layers = []
+        self.face_materials = np.zeros(0, dtype=object)
+        self.objects = None
+
+    @property
+    def face_count(self):
+        return len(self.sizes)
+
+    @property
+    def corner_count(self):
+        return len(self.corner_positions)
+
+def _append(geometry, parts):
+    """Concatenate [(positions, sizes, normals, uv layers, materials)] into geometry"""
+    if not parts:
+        return geometry
+    geometry.corner_positions = np.concatenate([part[0] for part in parts])
+    geometry.sizes = np.concatenate([part[1] for part in parts]).astype(np.int64)
+    if all(part[2] is not None for part in parts):
+        geometry.corner_normals = np.concatenate([part[2] for part in parts])
+    # Files with fewer UV maps on some meshes only keep the channels every mesh has
+    layer_count = min(len(part[3]) for part in parts)
+    geometry.uv_layers = [np.concatenate([part[3][index] for part in parts]) for index in range(layer_count)]
+    geometry.face_materials = np.concatenate([np.asarray(part[4], dtype=object) for part in parts])
+    return geometry
+
+def _normalized(vectors):
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, lengths, out=vectors, where=lengths > 0)
+    return vectors
+
+# ---------------------------------------------------------------------------
+# FBX
+
+def _split_name(name_class):
+    return name_class.split(deterministic.NAME_CLASS_SEPARATOR)[0].decode("utf-8", "replace")
+
+def _text(value):
+    return value.decode("utf-8", "replace") if isinstance(value, bytes) else value
+
+def _properties70(node):
+    """{name: (type, flags, values)} of a Properties70 block"""
+    block = node.child("Properties70")
+    result = {}
+    for prop in block.children if block is not None else []:
+        values = [value for _type_code, value in prop.properties]
+        if len(values) >= 4:
+            result[_text(values[0])] = (_text(values[1]), _text(values[3]), tuple(_text(value) for value in values[4:]))
+    return result
+
+def _axis_matrix(axis, degrees):
+    angle = np.radians(degrees)
+    cos, sin = np.cos(angle), np.sin(angle)
+    first, second = [(1, 2), (2, 0), (0, 1)][axis]
+    matrix = np.identity(4)
+    matrix[first, first] = matrix[second, second] = cos
+    matrix[first, second] = -sin
+    matrix[second, first] = sin
+    return matrix
+
+def _rotation(degrees, order="XYZ"):
+    """Euler rotation in degrees, the first axis of order applied first"""
+    matrix = np.identity(4)
+    for axis in order:
+        index = "XYZ".index(axis)
+        matrix = _axis_matrix(index, degrees[index]) @ matrix
+    return matrix
+
+def _vector(properties, name, default):
+    entry = properties.get(name)
+    return tuple(float(value) for value in entry[2][:3]) if entry is not None and len(entry[2]) >= 3 else default
+
+def _local_matrix(properties):
+    """Model transform without pivots: translation, pre-rotation, rotation, inverse post-rotation, scale"""
+    order_entry = properties.get("RotationOrder")
+    order = ROTATION_ORDERS[int(order_entry[2][0])] if order_entry is not None and order_entry[2] else "XYZ"
+    translation = np.identity(4)
+    translation[:3, 3] = _vector(properties, "Lcl Translation", (0.0, 0.0, 0.0))
+    scale = np.diag(list(_vector(properties, "Lcl Scaling", (1.0, 1.0, 1.0))) + [1.0])
+    return (translation @ _rotation(_vector(properties, "PreRotation", (0.0, 0.0, 0.0)))
+            @ _rotation(_vector(properties, "Lcl Rotation", (0.0, 0.0, 0.0)), order)
+            @ np.linalg.inv(_rotation(_vector(properties, "PostRotation", (0.0, 0.0, 0.0)))) @ scale)
+
+def _geometric_matrix(properties):
+    translation = np.identity(4)
+    translation[:3, 3] = _vector(properties, "GeometricTranslation", (0.0, 0.0, 0.0))
+    scale = np.diag(list(_vector(properties, "GeometricScaling", (1.0, 1.0, 1.0))) + [1.0])
+    return translation @ _rotation(_vector(properties, "GeometricRotation", (0.0, 0.0, 0.0))) @ scale
+
+def _layer_values(element, data_name, width, corner_vertices, sizes):
+    """Per-corner values of a LayerElement* block, None if it can't be mapped"""
+    data = element.child(data_name)
+    if data is None:
+        return None
+    values = data.value().values().astype(np.float64).reshape(-1, width)
+    mapping_node = element.child("MappingInformationType")
+    reference_node = element.child("ReferenceInformationType")
+    mapping = _text(mapping_node.value()) if mapping_node is not None else "ByPolygonVertex"
+    reference = _text(reference_node.value()) if reference_node is not None else "Direct"
+
+    index_node = element.child(data_name + "Index") or element.child(data_name + "Indices")
+    if reference in ("IndexToDirect", "Index") and index_node is not None:
+        values = values[index_node.value().values().astype(np.int64)]
+    if mapping == "ByPolygonVertex":
+        return values if len(values) == len(corner_vertices) else None
+    if mapping in ("ByVertice", "ByVertex"):
+        return values[corner_vertices]
+    if mapping == "ByPolygon":
+        return np.repeat(values, sizes, axis=0)
+    if mapping == "AllSame":
+        return np.repeat(values[:1], len(corner_vertices), axis=0)
+    return None
+
+def _face_slots(geometry_node, sizes):
+    element = geometry_node.child("LayerElementMaterial")
+    if element is None or element.child("Materials") is None:
+        return np.zeros(len(sizes), dtype=np.int64)
+    slots = element.child("Materials").value().values().astype(np.int64)
+    mapping_node = element.child("MappingInformationType")
+    if (mapping_node is not None and _text(mapping_node.value()) == "AllSame") or len(slots) != len(sizes):
+        return np.full(len(sizes), slots[0] if len(slots) else 0, dtype=np.int64)
+    return slots
+
+class FbxObjects:
+    """Objects of a parsed FBX with their object-object connections and model world matrices"""
+
+    def __init__(self, document):
+        objects_node = document.node("Objects")
+        connections_node = document.node("Connections")
+        self.nodes = objects_node.children if objects_node is not None else []
+        self.by_id = {node.value(0): node for node in self.nodes if node.properties}
+        self.parents = {}
+        self.children = {}
+        for connection in connections_node.children if connections_node is not None else []:
+            if connection.name != "C" or _text(connection.value(0)) != "OO":
+                continue
+            child_id, parent_id = connection.value(1), connection.value(2)
+            self.parents.setdefault(child_id, parent_id)
+            self.children.setdefault(parent_id, []).append(child_id)
+        self._world = {}
+
+    def models(self):
+        return [node for node in self.nodes if node.name == "Model"]
+
+    def linked(self, node):
+        """Objects connected to node (its children, geometry and materials)"""
+        return [self.by_id[child_id] for child_id in self.children.get(node.value(0), []) if child_id in self.by_id]
+
+    def meshes(self, model):
+        return [node for node in self.linked(model) if node.name == "Geometry" and node.child("Vertices") is not None]
+
+    def world_matrix(self, model):
+        model_id = model.value(0)
+        if model_id not in self._world:
+            parent = self.by_id.get(self.parents.get(model_id))
+            parent_matrix = self.world_matrix(parent) if parent is not None and parent.name == "Model" else np.identity(4)
+            self._world[model_id] = parent_matrix @ _local_matrix(_properties70(model))
+        return self._world[model_id]
+
+    def mesh_matrix(self, model):
+        """Geometry space of a model -> FBX world space"""
+        return self.world_matrix(model) @ _geometric_matrix(_properties70(model))
+
+def fbx_geometry_matrices(document):
+    """[(Geometry node, 4x4 geometry -> world matrix)] of the meshes in a parsed FBX.
+    A geometry shared by several models is listed with the first of them."""
+    fbx = FbxObjects(document)
+    found = {}
+    for model in fbx.models():
+        for mesh in fbx.meshes(model):
+            found.setdefault(id(mesh), (mesh, fbx.mesh_matrix(model)))
+    return list(found.values())
+
+def read_fbx_geometry(filepath, to_dmx=False):
+    """ExportGeometry of a binary FBX file.
+
+    to_dmx -- rotate the FBX world space into DMX space, to compare with a DMX export
+    """
+    document = fbx_binary.read_fbx(filepath)
+    geometry = ExportGeometry(filepath, "FBX")
+    if document.node("Objects") is None:
+        geometry.objects = {}
+        return geometry
+
+    fbx = FbxObjects(document)
+    models = fbx.models()
+    model_names = deterministic.stable_names([_split_name(node.value(1)) for node in models])
+
+    geometry.objects = {}
+    parts = []
+    for model, model_name in zip(models, model_names):
+        properties = _properties70(model)
+        geometry.objects[model_name] = {name: values[0] if len(values) == 1 else values
+                                        for name, (_type, flags, values) in properties.items() if "U" in flags}
+
+        materials = []
+        for node in fbx.linked(model):
+            if node.name == "Material":
+                material_properties = _properties70(node)
+                vmat = material_properties.get("FBX_vmatPath")
+                materials.append(vmat[2][0] if vmat is not None and vmat[2] else _split_name(node.value(1)))
+        meshes = fbx.meshes(model)
+        if not meshes:
+            continue
+
+        matrix = fbx.mesh_matrix(model)
+        if to_dmx:
+            rotation = np.identity(4)
+            rotation[:3, :3] = FBX_TO_DMX
+            matrix = rotation @ matrix
+        normal_matrix = np.linalg.pinv(matrix[:3, :3]).T
+        for mesh in meshes:
+            parts.append(_fbx_mesh(mesh, matrix, normal_matrix, materials))
+    return _append(geometry, parts)
+
+def _fbx_mesh(mesh, matrix, normal_matrix, materials):
+    points = mesh.child("Vertices").value().values().astype(np.float64).reshape(-1, 3)
+    index_node = mesh.child("PolygonVertexIndex")
+    raw = index_node.value().values().astype(np.int64) if index_node is not None else np.zeros(0, dtype=np.int64)
+    ends = raw < 0
+    corner_vertices = np.where(ends, ~raw, raw)
+    end_positions = np.flatnonzero(ends)
+    sizes = np.diff(np.concatenate([[-1], end_positions]))
+    corner_vertices = corner_vertices[:int(sizes.sum())]
+
+    positions = points[corner_vertices] @ matrix[:3, :3].T + matrix[:3, 3]
+    normals = None
+    element = mesh.child("LayerElementNormal")
+    if element is not None:
+        normals = _layer_values(element, "Normals", 3, corner_vertices, sizes)
+        if normals is not None:
+            normals = _normalized(normals @ normal_matrix.T)
+    uv_layers = []
+    for element in mesh.children_named("LayerElementUV"):
+        uvs = _layer_values(element, "UV", 2, corner_vertices, sizes)
+        if uvs is not None:
+            uv_layers.append(uvs)
+
+    slots = _face_slots(mesh, sizes)
+    names = np.array(list(materials) + [""], dtype=object)
+    face_materials = names[np.where((slots >= 0) & (slots < len(materials)), slots, len(materials))]
+    return positions, sizes, normals, uv_layers, face_materials
+
+# ---------------------------------------------------------------------------
+# DMX
+
+def _dag_meshes(dag, parent_matrix, found):
+    matrix = parent_matrix
+    transform = dag.get("transform")
+    if transform is not None:
+        local = np.identity(4)
+        x, y, z, w = transform.get("orientation", (0.0, 0.0, 0.0, 1.0))
+        local[:3, :3] = [[1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+                         [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+                         [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)]]
+        local[:3, 3] = transform.get("position", (0.0, 0.0, 0.0))
+        matrix = parent_matrix @ local
+    shape = dag.get("shape")
+    if shape is not None and shape.type == "DmeMesh":
+        found.append((shape, matrix))
+    for child in dag.get("children") or []:
+        if child is not None:
+            _dag_meshes(child, matrix, found)
+
+def _dmx_mesh(mesh, matrix):
+    vertex_data = mesh.get("bindState") or mesh.get("currentState")
+    if vertex_data is None:
+        return None
+
+    def stream(keyword, width):
+        if keyword not in vertex_data or keyword + "Indices" not in vertex_data:
+            return None
+        values = np.asarray(vertex_data[keyword], dtype=np.float64).reshape(-1, width)
+        return values[np.asarray(vertex_data[keyword + "Indices"], dtype=np.int64)]
+
+    positions = stream("position$0", 3)
+    if positions is None:
+        return None
+    normals = stream("normal$0", 3)
+    uv_layers = []
+    while True:
+        uvs = stream(f"texcoord${len(uv_layers)}", 2)
+        if uvs is None:
+            break
+        uv_layers.append(uvs)
+
+    corners, sizes, face_materials = [], [], []
+    for face_set in mesh.get("faceSets") or []:
+        faces = np.asarray(face_set["faces"], dtype=np.int64)
+        ends = np.flatnonzero(faces < 0)
+        set_sizes = np.diff(np.concatenate([[-1], ends])) - 1
+        set_sizes = set_sizes[set_sizes > 0]
+        corners.append(faces[faces >= 0])
+        sizes.append(set_sizes)
+        material = face_set.get("material")
+        face_materials.extend([material.get("mtlName", material.name) if material is not None else ""] * len(set_sizes))
+    if not corners:
+        return None
+    corners = np.concatenate(corners)
+    sizes = np.concatenate(sizes)
+
+    normal_matrix = np.linalg.inv(matrix[:3, :3]).T
+    positions = positions[corners] @ matrix[:3, :3].T + matrix[:3, 3]
+    normals = _normalized(normals[corners] @ normal_matrix.T) if normals is not None else None
+    return positions, sizes, normals, [uvs[corners] for uvs in uv_layers], face_materials
+
+def read_dmx_geometry(filepath):
+    """ExportGeometry of a DMX model (binary or keyvalues2)"""
+    root = dmx_writer.read_dmx(filepath)
+    geometry = ExportGeometry(filepath, "DMX")
+    model = root.get("model") if root is not None else None
+    found = []
+    if model is not None:
+        for dag in model.get("children") or []:
+            if dag is not None:
+                _dag_meshes(dag, np.identity(4), found)
+    parts = [part for part in (_dmx_mesh(mesh, matrix) for mesh, matrix in found) if part is not None]
+    return _append(geometry, parts)
+
+def read_export(filepath, to_dmx=False):
+    """ExportGeometry of an .fbx or .dmx file; to_dmx puts FBX geometry into DMX space"""
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".fbx":
+        return read_fbx_geometry(filepath, to_dmx)
+    if extension == ".dmx":
+        return read_dmx_geometry(filepath)
+    raise ValueError(f"Not an exported model: {filepath}")
+
+# ---------------------------------------------------------------------------
+# comparing
+
+class CompareResult:
+    """Differences between a reference and a candidate export, empty when they match"""
+
+    def __init__(self, reference, candidate):
+        self.reference = reference
+        self.candidate = candidate
+        self.differences = []
+        self.max_position_error = 0.0
+
+    @property
+    def equal(self):
+        return not self.differences
+
+    def add(self, check, message):
+        self.differences.append((check, message))
+
+    def lines(self):
+        if self.equal:
+            return [f"{self.candidate}: same as {self.reference} (max position error {self.max_position_error:.2g})"]
+        return [f"{self.candidate}: differs from {self.reference}"] + [f"  {check}: {message}"
+                                                                        for check, message in self.differences]
+
+def _canonical_order(sizes, ranks):
+    """Corner order that starts every face at its lowest ranked corner and sorts the faces
+    by size and the ranks of their first SORT_CORNERS corners. Returns (corner order, face order)."""
+    if not len(sizes):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    starts = np.cumsum(sizes) - sizes
+    face_of_corner = np.repeat(np.arange(len(sizes)), sizes)
+    within = np.arange(len(ranks)) - starts[face_of_corner]
+
+    lowest = np.minimum.reduceat(ranks, starts)
+    first = np.minimum.reduceat(np.where(ranks == lowest[face_of_corner], within, np.iinfo(np.int64).max), starts)
+    rotated = starts[face_of_corner] + (within + first[face_of_corner]) % sizes[face_of_corner]
+
+    width = min(int(sizes.max()), SORT_CORNERS)
+    keys = np.full((len(sizes), width), -1, dtype=np.int64)
+    kept = within < width
+    keys[face_of_corner[kept], within[kept]] = ranks[rotated[kept]]
+    face_order = np.lexsort(tuple(keys[:, column] for column in reversed(range(width))) + (sizes,))
+
+    # Corners of the sorted faces, each face from its lowest corner
+    sorted_sizes = sizes[face_order]
+    sorted_within = np.arange(len(ranks)) - np.repeat(np.cumsum(sorted_sizes) - sorted_sizes, sorted_sizes)
+    corner_order = rotated[np.repeat(starts[face_order], sorted_sizes) + sorted_within]
+    return corner_order, face_order
+
+def _examples(values):
+    shown = ", ".join(str(value) for value in values[:MAX_EXAMPLES])
+    return shown + (", ..." if len(values) > MAX_EXAMPLES else "")
+
+def _compare_properties(result, reference, candidate):
+    missing = sorted(set(reference) - set(candidate))
+    extra = sorted(set(candidate) - set(reference))
+    if missing:
+        result.add("objects", f"missing {_examples(missing)}")
+    if extra:
+        result.add("objects", f"unexpected {_examples(extra)}")
+    changed = []
+    for name in sorted(set(reference) & set(candidate)):
+        for key in sorted(set(reference[name]) | set(candidate[name])):
+            if reference[name].get(key) != candidate[name].get(key):
+                changed.append(f"{name}.{key} {reference[name].get(key)} -> {candidate[name].get(key)}")
+    if changed:
+        result.add("properties", f"{len(changed)} differ: {_examples(changed)}")
+
+def compare(reference, candidate, position_tolerance=DEFAULT_POSITION_TOLERANCE,
+            normal_tolerance=DEFAULT_NORMAL_TOLERANCE, uv_tolerance=DEFAULT_UV_TOLERANCE):
+    """CompareResult of two ExportGeometry.
+
+    Positions are matched on a grid of position_tolerance, so two positions closer than
+    the tolerance can still land on different sides of a grid line. normal_tolerance is
+    in degrees.
+    """
+    result = CompareResult(reference.filepath, candidate.filepath)
+    if reference.objects is not None and candidate.objects is not None:
+        _compare_properties(result, reference.objects, candidate.objects)
+
+    quantized = np.round(np.concatenate([reference.corner_positions, candidate.corner_positions])
+                         / position_tolerance).astype(np.int64)
+    if len(quantized):
+        _unique, ranks = np.unique(quantized, axis=0, return_inverse=True)
+        ranks = ranks.reshape(-1)
+    else:
+        ranks = np.zeros(0, dtype=np.int64)
+    reference_ranks, candidate_ranks = ranks[:reference.corner_count], ranks[reference.corner_count:]
+
+    reference_vertices = len(np.unique(reference_ranks))
+    candidate_vertices = len(np.unique(candidate_ranks))
+    if (reference.face_count, reference.corner_count, reference_vertices) != \
+            (candidate.face_count, candidate.corner_count, candidate_vertices):
+        result.add("topology", f"{reference.face_count} faces, {reference.corner_count} corners, {reference_vertices} vertices "
+                               f"-> {candidate.face_count} faces, {candidate.corner_count} corners, {candidate_vertices} vertices")
+        return result
+
+    reference_corners, reference_faces = _canonical_order(reference.sizes, reference_ranks)
+    candidate_corners, candidate_faces = _canonical_order(candidate.sizes, candidate_ranks)
+    sizes = reference.sizes[reference_faces]
+    if not np.array_equal(sizes, candidate.sizes[candidate_faces]):
+        result.add("topology", "face sizes differ")
+        return result
+
+    # Faces with the same corners (in the same winding)
+    corner_face = np.repeat(np.arange(len(sizes)), sizes)
+    corner_matches = reference_ranks[reference_corners] == candidate_ranks[candidate_corners]
+    face_matches = np.ones(len(sizes), dtype=bool)
+    np.logical_and.at(face_matches, corner_face, corner_matches)
+    if not face_matches.all():
+        result.add("geometry", f"{int((~face_matches).sum())} of {len(sizes)} faces moved, changed or flipped")
+    matched = face_matches[corner_face]
+
+    reference_positions = reference.corner_positions[reference_corners][matched]
+    candidate_positions = candidate.corner_positions[candidate_corners][matched]
+    if len(reference_positions):
+        result.max_position_error = float(np.abs(reference_positions - candidate_positions).max())
+
+    if (reference.corner_normals is None) != (candidate.corner_normals is None):
+        result.add("normals", "only one file has normals")
+    elif reference.corner_normals is not None and matched.any():
+        cosines = np.einsum("ij,ij->i", reference.corner_normals[reference_corners][matched],
+                            candidate.corner_normals[candidate_corners][matched])
+        angles = np.degrees(np.arccos(np.clip(cosines, -1.0, 1.0)))
+        over = int((angles > normal_tolerance).sum())
+        if over:
+            result.add("normals", f"{over} corners off by up to {angles.max():.2f} degrees")
+
+    if len(reference.uv_layers) != len(candidate.uv_layers):
+        result.add("uvs", f"{len(reference.uv_layers)} -> {len(candidate.uv_layers)} UV maps")
+    for index, (reference_uvs, candidate_uvs) in enumerate(zip(reference.uv_layers, candidate.uv_layers)):
+        if not matched.any():
+            break
+        error = np.abs(reference_uvs[reference_corners][matched] - candidate_uvs[candidate_corners][matched]).max(axis=1)
+        over = int((error > uv_tolerance).sum())
+        if over:
+            result.add("uvs", f"UV map {index}: {over} corners off by up to {error.max():.4g}")
+
+    reference_materials = reference.face_materials[reference_faces][face_matches]
+    candidate_materials = candidate.face_materials[candidate_faces][face_matches]
+    changed = reference_materials != candidate_materials
+    if changed.any():
+        pairs = sorted({f"{before} -> {after}" for before, after in zip(reference_materials[changed], candidate_materials[changed])})
+        result.add("materials", f"{int(changed.sum())} faces: {_examples(pairs)}")
+    return result
+
+def compare_files(reference_path, candidate_path, **tolerances):
+    """compare() two export files; an FBX compared with a DMX is read in DMX space"""
+    mixed = os.path.splitext(reference_path)[1].lower() != os.path.splitext(candidate_path)[1].lower()
+    try:
+        reference = read_export(reference_path, to_dmx=mixed)
+        candidate = read_export(candidate_path, to_dmx=mixed)
+    except (OSError, ValueError, fbx_binary.FbxError, dmx_writer.DmxError) as e:
+        result = CompareResult(reference_path, candidate_path)
+        result.add("read", str(e))
+        return result
+    return compare(reference, candidate, **tolerances)
+
+def export_files(folder):
+    """Relative paths of the exported models under folder"""
+    found = []
+    for root, _dirs, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(EXPORT_EXTENSIONS):
+                found.append(os.path.relpath(os.path.join(root, name), folder))
+    return sorted(found)
+
+def compare_directories(reference_folder, candidate_folder, **tolerances):
+    """Compare every export in reference_folder with the file of the same path in candidate_folder.
+
+    A model exported as .fbx on one side and .dmx on the other is paired by name.
+    Returns (results, missing, extra): CompareResult per pair, reference files without a
+    candidate and candidate files without a reference.
+    """
+    reference_files = export_files(reference_folder)
+    candidate_files = export_files(candidate_folder)
+    candidates = {os.path.splitext(path)[0].lower(): path for path in candidate_files}
+    for path in candidate_files:
+        candidates[path.lower()] = path
+
+    results = []
+    missing = []
+    paired = set()
+    for path in reference_files:
+        match = candidates.get(path.lower()) or candidates.get(os.path.splitext(path)[0].lower())
+        if match is None or match in paired:
+            missing.append(path)
+            continue
+        paired.add(match)
+        results.append(compare_files(os.path.join(reference_folder, path), os.path.join(candidate_folder, match), **tolerances))
+    extra = [path for path in candidate_files if path not in paired]
+    return results, missing, extra
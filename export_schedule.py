@@ -0,0 +1,132 @@
+"""
+Export cost model and longest-processing-time-first scheduling for batch_export.py
+
+Plain Python, no Blender dependency. Export durations of earlier runs are kept per node
+together with the node's size (vertices, modifiers, materials). New or changed nodes get
+a prediction from a least-squares fit over all recorded nodes, unchanged nodes reuse
+their own last duration. Jobs are then handed out longest first to the least loaded
+worker (LPT), which keeps the makespan within 4/3 of the optimum for equal workers.
+"""
+
+import heapq
+
+FEATURES = ("vertices", "modifiers", "materials")
+# Predicted seconds per job kind while there is too little history to fit
+DEFAULT_SECONDS = {"node": 2.0, "static": 30.0}
+DEFAULT_SECONDS_PER_1000_VERTICES = 0.05
+MIN_SECONDS = 0.05
+# Fits need a few more samples than terms, the small ridge keeps them stable
+MIN_SAMPLES = 8
+RIDGE = 1e-3
+
+def _terms(vertices, modifiers, materials):
+    """Regression terms: modifiers multiply the geometry work, materials add per-slot work"""
+    thousands = vertices / 1000.0
+    return [1.0, thousands, thousands * modifiers, modifiers, materials]
+
+def _solve(matrix, vector):
+    """Solve a small dense linear system with Gaussian elimination (partial pivoting)"""
+    size = len(vector)
+    rows = [list(matrix[index]) + [vector[index]] for index in range(size)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            return None
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(column + 1, size):
+            factor = rows[row][column] / rows[column][column]
+            for index in range(column, size + 1):
+                rows[row][index] -= factor * rows[column][index]
+    solution = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        total = rows[row][size] - sum(rows[row][index] * solution[index] for index in range(row + 1, size))
+        solution[row] = total / rows[row][row]
+    return solution
+
+def fit(samples):
+    """Least-squares weights of _terms for [(vertices, modifiers, materials, seconds)], None if too few"""
+    if len(samples) < MIN_SAMPLES:
+        return None
+    term_count = len(_terms(0, 0, 0))
+    normal = [[0.0] * term_count for _ in range(term_count)]
+    target = [0.0] * term_count
+    for vertices, modifiers, materials, seconds in samples:
+        terms = _terms(vertices, modifiers, materials)
+        for row in range(term_count):
+            target[row] += terms[row] * seconds
+            for column in range(term_count):
+                normal[row][column] += terms[row] * terms[column]
+    scale = max(normal[index][index] for index in range(term_count))
+    for index in range(1, term_count):
+        normal[index][index] += RIDGE * scale
+    return _solve(normal, target)
+
+class CostModel:
+    """Predicted export seconds per job from the recorded history"""
+
+    def __init__(self, history):
+        """history -- [(blend, kind, target, vertices, modifiers, materials, seconds)]"""
+        self.known = {}
+        samples = {}
+        for blend, kind, target, vertices, modifiers, materials, seconds in history:
+            self.known[(blend, kind, target)] = ((vertices, modifiers, materials), seconds)
+            samples.setdefault(kind, []).append((vertices, modifiers, materials, seconds))
+        self.weights = {kind: fit(kind_samples) for kind, kind_samples in samples.items()}
+        self.averages = {kind: sum(sample[3] for sample in kind_samples) / len(kind_samples)
+                         for kind, kind_samples in samples.items()}
+
+    def predict(self, blend, kind, target, vertices=0, modifiers=0, materials=0):
+        features = (vertices, modifiers, materials)
+        known = self.known.get((blend, kind, target))
+        if known is not None and known[0] == features:
+            # Unchanged since it was last exported
+            return max(known[1], MIN_SECONDS)
+
+        weights = self.weights.get(kind)
+        if weights is not None:
+            predicted = sum(weight * term for weight, term in zip(weights, _terms(*features)))
+            return max(predicted, MIN_SECONDS)
+        base = self.averages.get(kind, DEFAULT_SECONDS.get(kind, DEFAULT_SECONDS["node"]))
+        return max(base + vertices / 1000.0 * DEFAULT_SECONDS_PER_1000_VERTICES * (1 + modifiers), MIN_SECONDS)
+
+def lpt_assign(jobs, loads):
+    """Longest processing time first: every job, longest first, goes to the least loaded worker.
+
+    jobs  -- [(job id, predicted seconds)]
+    loads -- predicted seconds already assigned per worker (list, one entry per worker)
+    Returns {job id: worker index}.
+    """
+    heap = [(load, worker) for worker, load in enumerate(loads)]
+    heapq.heapify(heap)
+    assignment = {}
+    for job_id, cost in sorted(jobs, key=lambda job: -job[1]):
+        load, worker = heapq.heappop(heap)
+        assignment[job_id] = worker
+        heapq.heappush(heap, (load + cost, worker))
+    return assignment
+
+def balance_summary(busy, makespan, longest_job):
+    """Lines describing how evenly the workers were loaded.
+
+    busy        -- seconds each worker spent on jobs
+    makespan    -- wall seconds of the run
+    longest_job -- seconds of the longest single job (no schedule can finish before it)
+    """
+    if not busy or makespan <= 0:
+        return []
+    total = sum(busy)
+    ideal = max(total / len(busy), longest_job)
+    if total <= 0 or ideal <= 0:
+        # Nothing ran, e.g. a resumed queue that was already finished
+        return []
+    lines = [f"Worker busy time: {min(busy) / 60:.1f}-{max(busy) / 60:.1f} min, average {total / len(busy) / 60:.1f} min "
+             f"({total / (len(busy) * makespan) * 100:.0f}% utilization)"]
+    lines.append(f"Makespan {makespan / 60:.1f} min, ideal {ideal / 60:.1f} min (+{(makespan / ideal - 1) * 100:.0f}%)")
+    return lines
+
+def prediction_error(pairs):
+    """Mean absolute error of [(predicted, actual)] relative to the actual seconds, None without data"""
+    pairs = [(predicted, actual) for predicted, actual in pairs if actual > 0]
+    if not pairs:
+        return None
+    return sum(abs(predicted - actual) / actual for predicted, actual in pairs) / len(pairs)
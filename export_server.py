@@ -0,0 +1,308 @@
+"""
+Headless export server
+
+Keeps one Blender process running so tools that request many small exports
+don't pay Blender's startup and addon registration for every job.
+
+Start it with the addon enabled:
+
+    blender --background --addons source2_model_exporter --python-expr \
+        "from source2_model_exporter import export_server; export_server.main()" \
+        -- --port 8765
+
+The server only listens on localhost. Each connection sends one JSON object per
+line and receives newline-delimited JSON events back (see export_client.py).
+
+    {"file": "C:/maps/de_test/props.blend", "nodes": ["Crate", "Barrel"],
+     "options": {"addons_path": "C:/.../csgo_addons/de_test"}}
+
+Events: accepted, loaded, node (once per node), report, done / error.
+
+Other commands: "list" answers with the file's node names ("nodes" event), "static"
+runs the static mesh export for the given objects (default: all meshes outside
+nodes) and answers with a "static" event listing the written files.
+"""
+
+import bpy
+import os
+import sys
+import json
+import time
+import argparse
+import socketserver
+
+from contextlib import contextmanager
+
+from . import fbx_export_operator, node_status
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+class BlendFileCache:
+    """Keeps the last opened .blend loaded between jobs.
+
+    Blender can only hold one main file, so the cache is a single slot that is
+    reused as long as the requested file is the same and hasn't changed on disk.
+    """
+
+    def __init__(self):
+        self.filepath = None
+        self.mtime = None
+
+    def ensure_loaded(self, filepath):
+        """Open filepath unless it is already loaded. Returns True on a cache hit."""
+        filepath = os.path.abspath(filepath)
+        mtime = os.path.getmtime(filepath)
+
+        if (self.filepath == filepath and self.mtime == mtime
+                and os.path.abspath(bpy.data.filepath) == filepath):
+            return True
+
+        bpy.ops.wm.open_mainfile(filepath=filepath)
+        self.filepath = filepath
+        self.mtime = mtime
+        return False
+
+def apply_options(context, options):
+    """Apply per-job options to the addon preferences and scene export settings.
+
+    Nothing is changed if an option is unknown.
+    Returns the previous values for restore_options().
+    """
+    preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+    scene_settings = getattr(context.scene, "export_fbx", None)
+
+    targets = []
+    for key in options:
+        if hasattr(preferences, key):
+            targets.append((preferences, key))
+        elif scene_settings is not None and hasattr(scene_settings, key):
+            targets.append((scene_settings, key))
+        else:
+            raise ValueError(f"Unknown export option: {key}")
+
+    previous = []
+    for owner, key in targets:
+        previous.append((owner, key, getattr(owner, key)))
+        setattr(owner, key, options[key])
+    return previous
+
+def restore_options(previous):
+    """Undo apply_options(), so the next job (and the user's preferences) don't keep a job's options"""
+    for owner, key, value in reversed(previous):
+        setattr(owner, key, value)
+
+def resolve_nodes(node_names):
+    """Look up node objects by name. Returns (nodes, missing_names)"""
+    if not node_names:
+        nodes = [obj for obj in bpy.context.scene.objects if node_status.is_node(obj)]
+        return nodes, []
+
+    nodes = []
+    missing = []
+    for name in node_names:
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            missing.append(name)
+        else:
+            nodes.append(obj)
+    return nodes, missing
+
+@contextmanager
+def job_file(job, blend_cache, send):
+    """Open the job's .blend and apply its options for the duration of the job.
+
+    Yields False (after an error event) if the file doesn't exist. The options are
+    restored afterwards, also when the job fails.
+    """
+    started = time.perf_counter()
+    filepath = job.get("file")
+    if not filepath or not os.path.isfile(filepath):
+        send({"event": "error", "message": f"Blend file not found: {filepath}"})
+        yield False
+        return
+
+    cached = blend_cache.ensure_loaded(filepath)
+    send({"event": "loaded", "file": filepath, "cached": cached,
+          "seconds": round(time.perf_counter() - started, 3)})
+
+    previous = apply_options(bpy.context, job.get("options", {}))
+    try:
+        yield True
+    finally:
+        restore_options(previous)
+
+def run_job(job, blend_cache, send):
+    """Run a single export job, streaming events through send(dict)"""
+    started = time.perf_counter()
+    with job_file(job, blend_cache, send) as loaded:
+        if not loaded:
+            return
+
+        context = bpy.context
+        nodes, missing = resolve_nodes(job.get("nodes"))
+        for name in missing:
+            send({"event": "node", "node": name, "status": "missing", "files": []})
+
+        def report(level, message):
+            send({"event": "report", "level": sorted(level)[0], "message": message})
+
+        def progress(node_name, status, files):
+            send({"event": "node", "node": node_name, "status": status, "files": files})
+
+        result = fbx_export_operator.export_nodes(context, nodes, report, progress)
+    send({"event": "done", "status": sorted(result)[0],
+          "seconds": round(time.perf_counter() - started, 3)})
+
+def static_objects(scene):
+    """Meshes that are not part of a node, the default selection of a static export"""
+    return [obj for obj in scene.objects
+            if obj.type == 'MESH' and node_status.find_node(obj) is None and obj.visible_get()]
+
+def export_size(objects):
+    """[vertices, modifiers, materials] of the meshes an export works on, for the batch cost model"""
+    vertices = modifiers = 0
+    materials = set()
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        vertices += len(obj.data.vertices)
+        modifiers += sum(1 for modifier in obj.modifiers if modifier.show_viewport)
+        materials.update(slot.material.name for slot in obj.material_slots if slot.material)
+    return [vertices, modifiers, len(materials)]
+
+def run_list(job, blend_cache, send):
+    """Send the node names of a file with their sizes, and how many static meshes it has"""
+    started = time.perf_counter()
+    with job_file(job, blend_cache, send) as loaded:
+        if not loaded:
+            return
+        scene = bpy.context.scene
+        index = node_status.children_index(scene.objects)
+        nodes = [obj for obj in scene.objects if node_status.is_node(obj)]
+        static = static_objects(scene)
+        send({"event": "nodes", "nodes": [node.name for node in nodes], "static": len(static),
+              "sizes": {node.name: export_size(node_status.gather_members(node, index).objects()) for node in nodes},
+              "static_size": export_size(static)})
+    send({"event": "done", "status": "FINISHED", "seconds": round(time.perf_counter() - started, 3)})
+
+def run_static(job, blend_cache, send):
+    """Run the static mesh export (static_export.py) on the given or default objects"""
+    started = time.perf_counter()
+    with job_file(job, blend_cache, send) as loaded:
+        if not loaded:
+            return
+
+        context = bpy.context
+        # The static export writes combined_export.<format> into the static mesh export path
+        preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+        if not preferences.static_mesh_export_path:
+            send({"event": "error", "message": "Static mesh export path is not set"})
+            return
+        extension = ".fbx" if context.scene.export_fbx.export_format == 'FBX' else ".dmx"
+        file_path = os.path.join(preferences.static_mesh_export_path, "combined_export" + extension)
+        mtime = os.path.getmtime(file_path) if os.path.exists(file_path) else None
+
+        names = job.get("objects")
+        objects = [bpy.data.objects[name] for name in names if name in bpy.data.objects] if names else static_objects(context.scene)
+        if not objects:
+            send({"event": "static", "files": []})
+            send({"event": "done", "status": "CANCELLED", "seconds": round(time.perf_counter() - started, 3)})
+            return
+
+        # The export works on the selection, put the file's own selection back afterwards
+        selected = [obj.name for obj in context.selected_objects]
+        active = context.view_layer.objects.active
+        active_name = active.name if active is not None else None
+        try:
+            bpy.ops.object.select_all(action='DESELECT')
+            for obj in objects:
+                obj.select_set(True)
+            context.view_layer.objects.active = objects[0]
+
+            bpy.ops.object.staticmesh()
+        finally:
+            bpy.ops.object.select_all(action='DESELECT')
+            for name in selected:
+                obj = bpy.data.objects.get(name)
+                if obj is not None:
+                    obj.select_set(True)
+            context.view_layer.objects.active = bpy.data.objects.get(active_name) if active_name else None
+
+        written = os.path.exists(file_path) and os.path.getmtime(file_path) != mtime
+        send({"event": "static", "files": [file_path] if written else []})
+        send({"event": "done", "status": "FINISHED" if written else "CANCELLED",
+              "seconds": round(time.perf_counter() - started, 3)})
+
+# Commands that work on a .blend file
+JOB_COMMANDS = {
+    "export": run_job,
+    "list": run_list,
+    "static": run_static,
+}
+
+class ExportRequestHandler(socketserver.StreamRequestHandler):
+    """Reads newline-delimited JSON jobs and writes events back on the same socket"""
+
+    def send(self, event):
+        self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                self.send({"event": "error", "message": f"Invalid job: {e}"})
+                continue
+
+            command = job.get("command", "export")
+            if command == "ping":
+                self.send({"event": "pong", "file": self.server.blend_cache.filepath})
+            elif command == "shutdown":
+                self.send({"event": "bye"})
+                self.server.shutdown_requested = True
+                return
+            elif command in JOB_COMMANDS:
+                self.send({"event": "accepted", "job": job.get("id")})
+                try:
+                    JOB_COMMANDS[command](job, self.server.blend_cache, self.send)
+                except Exception as e:
+                    self.send({"event": "error", "message": str(e)})
+            else:
+                self.send({"event": "error", "message": f"Unknown command: {command}"})
+
+class ExportServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        if address[0] not in ("127.0.0.1", "localhost", "::1"):
+            raise ValueError("The export server only listens on localhost")
+        super().__init__(address, ExportRequestHandler)
+        self.blend_cache = BlendFileCache()
+        self.shutdown_requested = False
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Serve export jobs until a client sends the shutdown command.
+
+    Jobs run on the calling thread because bpy is not thread safe, so requests
+    are handled one at a time.
+    """
+    with ExportServer((host, port)) as server:
+        print(f"Source 2 export server listening on {host}:{server.server_address[1]}")
+        while not server.shutdown_requested:
+            server.handle_request()
+    print("Source 2 export server stopped")
+
+def main():
+    """Entry point for `blender --background ... --python-expr`"""
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Source 2 headless export server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    serve(args.host, args.port)
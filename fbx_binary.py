@@ -0,0 +1,251 @@
+"""
+Binary FBX reader and writer
+
+Pure Python + NumPy, no Blender dependency. Parses a binary FBX (version 7100-7700)
+into a tree of FbxNode and writes it back. Array properties keep their raw, possibly
+zlib compressed payload until they are decoded, so an unmodified tree is written back
+byte for byte.
+"""
+
+import zlib
+import struct
+
+import numpy as np
+
+MAGIC = b"Kaydara FBX Binary  \x00\x1a\x00"
+FOOTER_MAGIC = b"\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b"
+# Footer after the padding: version, 120 zero bytes, FOOTER_MAGIC
+FOOTER_TAIL_LENGTH = 4 + 120 + len(FOOTER_MAGIC)
+FOOTER_ID_LENGTH = 16
+
+# Scalar property type codes and their struct formats ('C' is a one byte bool)
+SCALAR_FORMATS = {
+    b"Y": "<h",
+    b"C": "<B",
+    b"I": "<i",
+    b"F": "<f",
+    b"D": "<d",
+    b"L": "<q",
+}
+
+# Array property type codes and their element dtypes
+ARRAY_DTYPES = {
+    b"f": np.dtype("<f4"),
+    b"d": np.dtype("<f8"),
+    b"l": np.dtype("<i8"),
+    b"i": np.dtype("<i4"),
+    b"b": np.dtype("u1"),
+}
+
+# Arrays smaller than this are stored uncompressed, like Blender's exporter does
+COMPRESS_MIN_BYTES = 128
+
+class FbxError(Exception):
+    pass
+
+class FbxArray:
+    """Array property: element type code, element count and the payload as stored in the file"""
+    __slots__ = ("type_code", "count", "encoding", "payload")
+
+    def __init__(self, type_code, count, encoding, payload):
+        self.type_code = type_code
+        self.count = count
+        self.encoding = encoding  # 0 = raw, 1 = zlib
+        self.payload = payload
+
+    @classmethod
+    def from_values(cls, type_code, values):
+        data = np.ascontiguousarray(values, dtype=ARRAY_DTYPES[type_code]).reshape(-1)
+        raw = data.tobytes()
+        if len(raw) >= COMPRESS_MIN_BYTES:
+            return cls(type_code, len(data), 1, zlib.compress(raw, 1))
+        return cls(type_code, len(data), 0, raw)
+
+    def values(self):
+        """Decoded NumPy array"""
+        raw = zlib.decompress(self.payload) if self.encoding == 1 else self.payload
+        return np.frombuffer(raw, dtype=ARRAY_DTYPES[self.type_code], count=self.count)
+
+    def __eq__(self, other):
+        if not isinstance(other, FbxArray) or self.type_code != other.type_code or self.count != other.count:
+            return False
+        if self.encoding == other.encoding and self.payload == other.payload:
+            return True
+        return np.array_equal(self.values(), other.values())
+
+    def __repr__(self):
+        return f"FbxArray({self.type_code.decode()}, {self.count})"
+
+class FbxNode:
+    """One FBX node record.
+
+    properties -- list of (type code, value); value is an int/float for scalars,
+                  bytes for 'S' and 'R' and an FbxArray for arrays
+    terminated -- the record ends with a null record even if it has no children
+                  (kept so files round-trip exactly)
+    """
+    __slots__ = ("name", "properties", "children", "terminated")
+
+    def __init__(self, name, properties=None, children=None, terminated=False):
+        self.name = name
+        self.properties = properties if properties is not None else []
+        self.children = children if children is not None else []
+        self.terminated = terminated
+
+    def child(self, name):
+        """First child with the given name, or None"""
+        return next((child for child in self.children if child.name == name), None)
+
+    def children_named(self, name):
+        return [child for child in self.children if child.name == name]
+
+    def value(self, index=0):
+        return self.properties[index][1]
+
+    def set_value(self, index, value):
+        self.properties[index] = (self.properties[index][0], value)
+
+    def __repr__(self):
+        return f"FbxNode({self.name}, {len(self.properties)} properties, {len(self.children)} children)"
+
+class FbxDocument:
+    """A parsed file: version, top-level nodes and the footer bytes after them"""
+    __slots__ = ("version", "nodes", "footer")
+
+    def __init__(self, version, nodes, footer=b""):
+        self.version = version
+        self.nodes = nodes
+        self.footer = footer
+
+    def node(self, name):
+        return next((node for node in self.nodes if node.name == name), None)
+
+# ---------------------------------------------------------------------------
+# reading
+
+def _header_format(version):
+    return "<QQQB" if version >= 7500 else "<IIIB"
+
+def _read_property(data, offset):
+    type_code = bytes(data[offset:offset + 1])
+    offset += 1
+    scalar = SCALAR_FORMATS.get(type_code)
+    if scalar is not None:
+        return (type_code, struct.unpack_from(scalar, data, offset)[0]), offset + struct.calcsize(scalar)
+    if type_code in ARRAY_DTYPES:
+        count, encoding, length = struct.unpack_from("<III", data, offset)
+        offset += 12
+        return (type_code, FbxArray(type_code, count, encoding, bytes(data[offset:offset + length]))), offset + length
+    if type_code in (b"S", b"R"):
+        length = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        return (type_code, bytes(data[offset:offset + length])), offset + length
+    raise FbxError(f"Unknown property type {type_code!r} at offset {offset - 1}")
+
+def _read_node(data, offset, header_format):
+    """Returns (node, next offset); node is None for a null record"""
+    end_offset, property_count, _property_length, name_length = struct.unpack_from(header_format, data, offset)
+    offset += struct.calcsize(header_format)
+    if end_offset == 0:
+        return None, offset
+
+    node = FbxNode(bytes(data[offset:offset + name_length]).decode("utf-8", "surrogateescape"))
+    offset += name_length
+    for _ in range(property_count):
+        prop, offset = _read_property(data, offset)
+        node.properties.append(prop)
+
+    if offset < end_offset:
+        node.terminated = True
+        while True:
+            child, offset = _read_node(data, offset, header_format)
+            if child is None:
+                break
+            node.children.append(child)
+    if offset != end_offset:
+        raise FbxError(f"Node '{node.name}' ends at {offset}, expected {end_offset}")
+    return node, offset
+
+def parse(data):
+    """FbxDocument from the bytes of a binary FBX file"""
+    data = memoryview(data)
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise FbxError("Not a binary FBX file")
+    version = struct.unpack_from("<I", data, len(MAGIC))[0]
+    header_format = _header_format(version)
+
+    offset = len(MAGIC) + 4
+    nodes = []
+    while offset < len(data):
+        node, offset = _read_node(data, offset, header_format)
+        if node is None:
+            break
+        nodes.append(node)
+    return FbxDocument(version, nodes, bytes(data[offset:]))
+
+def read_fbx(filepath):
+    with open(filepath, "rb") as source:
+        return parse(source.read())
+
+# ---------------------------------------------------------------------------
+# writing
+
+def _write_property(out, type_code, value):
+    out += type_code
+    scalar = SCALAR_FORMATS.get(type_code)
+    if scalar is not None:
+        out += struct.pack(scalar, value)
+    elif type_code in ARRAY_DTYPES:
+        out += struct.pack("<III", value.count, value.encoding, len(value.payload))
+        out += value.payload
+    elif type_code in (b"S", b"R"):
+        out += struct.pack("<I", len(value))
+        out += value
+    else:
+        raise FbxError(f"Unknown property type {type_code!r}")
+
+def _write_node(out, node, header_format):
+    start = len(out)
+    name = node.name.encode("utf-8", "surrogateescape")
+    out += bytes(struct.calcsize(header_format))
+    out += name
+
+    properties_start = len(out)
+    for type_code, value in node.properties:
+        _write_property(out, type_code, value)
+    property_length = len(out) - properties_start
+
+    if node.children or node.terminated:
+        for child in node.children:
+            _write_node(out, child, header_format)
+        out += bytes(struct.calcsize(header_format))
+    struct.pack_into(header_format, out, start, len(out), len(node.properties), property_length, len(name))
+
+def _write_footer(out, footer):
+    """Footer with its padding recomputed for the new length, or the old footer as is"""
+    padding = footer[FOOTER_ID_LENGTH:-FOOTER_TAIL_LENGTH]
+    if len(footer) < FOOTER_ID_LENGTH + FOOTER_TAIL_LENGTH or not footer.endswith(FOOTER_MAGIC) or any(padding):
+        out += footer
+        return
+    out += footer[:FOOTER_ID_LENGTH]
+    out += bytes(4)
+    pad = (-len(out)) % 16 or 16
+    out += bytes(pad)
+    out += footer[-FOOTER_TAIL_LENGTH:]
+
+def serialize(document):
+    """Bytes of a binary FBX file"""
+    header_format = _header_format(document.version)
+    out = bytearray(MAGIC)
+    out += struct.pack("<I", document.version)
+    for node in document.nodes:
+        _write_node(out, node, header_format)
+    out += bytes(struct.calcsize(header_format))
+    _write_footer(out, document.footer)
+    return bytes(out)
+
+def write_fbx(filepath, document):
+    data = serialize(document)
+    with open(filepath, "wb") as out:
+        out.write(data)
+    return filepath
@@ -3,243 +3,619 @@ import os
 import math
 from bpy.types import Operator
 
-class ExportFBXOperator(Operator):
-    bl_idname = "object.export_fbx"
-    bl_label = "Export model + Coll"
-    bl_description = "Export selected models and collision meshes as separate FBX files"
-    bl_options = {'REGISTER', 'UNDO'}
+from . import attribute_filter, budget, buffer_cache, collision_hull, content_store, datablocks, deterministic, dmx_export, dmx_model, fbx_binary, material_export, mesh_buffers, mesh_merge, modifier_cache, node_spatial, node_status, validation
+
+def add_vmat_properties(objects):
+    """Add FBX_vmatPath custom property to objects based on their materials"""
+    for obj in objects:
+        if obj.type == 'MESH' and obj.data.materials:
+            # Get the first material (primary material)
+            material = obj.data.materials[0]
+            if material:
+                # Generated/dev materials carry their .vmat path, otherwise use the material name
+                vmat_path = mesh_buffers.vmat_path_for(material)
+                obj["FBX_vmatPath"] = vmat_path
+                print(f"Added FBX_vmatPath='{vmat_path}' to object '{obj.name}'")
+
+def get_full_export_path(context, original_obj):
+    """Get the full export path by combining Addons Path with relative path"""
+    # Get addon preferences
+    preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+    base_path = preferences.addons_path
+
+    if not base_path:
+        return None
+
+    # Check for relative path first (new system)
+    if hasattr(original_obj, 'relative_export_path') and original_obj.relative_export_path:
+        return os.path.join(base_path, original_obj.relative_export_path)
+
+    # Fallback to old system for compatibility
+    if "custom_file_path" in original_obj:
+        return original_obj["custom_file_path"]
+
+    return None
+
+def get_store_root(context, default_folder):
+    """Content store folder: the preference, or a .s2_store folder inside default_folder"""
+    preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+    if preferences.content_store_path:
+        return preferences.content_store_path
+    return os.path.join(default_folder, content_store.STORE_FOLDER) if default_folder else ""
+
+def get_buffer_cache(context, base_path):
+    """Cache of processed DMX buffers per the preferences and scene settings, None if it is off"""
+    preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+    settings = context.scene.export_fbx
+    folder = preferences.buffer_cache_path or buffer_cache.default_folder(bpy.data.filepath, base_path)
+    if settings.export_format == 'FBX' or settings.buffer_cache_size <= 0 or not folder:
+        return None
+    return buffer_cache.BufferCache(bpy.path.abspath(folder), settings.buffer_cache_size * 1024 * 1024)
+
+def finish_output(context, file_path, store_root, stats=None):
+    """Round, make deterministic and move a written file into the content store, per the scene settings.
+
+    stats -- optional attribute_filter.SlimStats that gets the bytes saved by rounding
+    """
+    settings = context.scene.export_fbx
+    if file_path.lower().endswith(".fbx"):
+        # Same grid in Hammer units as the DMX path, see quantize_fbx
+        position_step = settings.position_precision
+        normal_step = settings.normal_precision
+        if position_step or normal_step or settings.deterministic_output:
+            size_before = os.path.getsize(file_path)
+            document = fbx_binary.read_fbx(file_path)
+            attribute_filter.quantize_fbx(document, position_step, normal_step)
+            if settings.deterministic_output:
+                deterministic.normalize_fbx(document)
+            fbx_binary.write_fbx(file_path, document)
+            if stats is not None and (position_step or normal_step):
+                stats.quantized_bytes += size_before - os.path.getsize(file_path)
+    if settings.use_content_store and store_root:
+        digest, deduplicated = content_store.store_file(file_path, store_root)
+        state = "already stored" if deduplicated else "stored"
+        print(f"Content store: {os.path.basename(file_path)} {state} as {digest[:12]}")
+    return file_path
 
-    def add_vmat_properties(self, objects):
-        """Add FBX_vmatPath custom property to objects based on their material names"""
+def slim_objects(context, objects, export_format):
+    """Strip unused attributes from temporary export objects, per the scene settings.
+
+    Returns attribute_filter.SlimStats, or None if no size option is on.
+    """
+    settings = context.scene.export_fbx
+    if not attribute_filter.is_enabled(settings):
+        return None
+    if not settings.strip_attributes:
+        return attribute_filter.SlimStats()
+    # FBX writes doubles, DMX floats
+    bytes_per_value = 8 if export_format == 'FBX' else 4
+    return attribute_filter.strip_objects(objects, settings.uv_channel_count, bytes_per_value)
+
+def prepare_model(context, objects, export_format, export_scale, axis_forward='X', axis_up='Y', capture=False):
+    """Strip unused attributes from export objects and capture the MeshBuffers a DMX is written from.
+
+    capture -- also capture the buffers for the FBX format, e.g. to measure them for the budgets
+    Returns (SlimStats or None, list of MeshBuffers or None).
+    """
+    settings = context.scene.export_fbx
+    stats = slim_objects(context, objects, export_format)
+    buffers_list = None
+    if export_format != 'FBX' or capture:
+        buffers_list = dmx_export.capture_objects(context, objects, export_scale, axis_forward, axis_up)
+        attribute_filter.quantize_buffers(buffers_list, settings.position_precision, settings.normal_precision)
+    return stats, buffers_list
+
+def write_model(context, objects, file_stem, export_format, export_scale, axis_forward='X', axis_up='Y', store_root="",
+                size_report=None, node_name="", captured=None, prepared=None):
+    """Write objects to file_stem + .fbx or .dmx depending on the export format. Returns the file path.
+
+    The objects are temporary duplicates, unused attributes are stripped from them in place.
+    size_report -- optional attribute_filter.SizeReport, the file is added under node_name
+    captured    -- optional list, gets the MeshBuffers a DMX was written from
+    prepared    -- optional result of prepare_model() for the objects
+    """
+    settings = context.scene.export_fbx
+    stable = settings.deterministic_output
+    if prepared is None:
+        prepared = prepare_model(context, objects, export_format, export_scale, axis_forward, axis_up)
+    stats, buffers_list = prepared
+    if export_format != 'FBX':
+        file_path = file_stem + ".dmx"
+        content_store.prepare_output(file_path)
+        dmx_model.write_file(file_path, buffers_list, dmx_model.ENCODINGS[export_format], stable)
+        if captured is not None:
+            captured.extend(buffers_list)
+    else:
+        # Blender's FBX exporter works on the selection
+        bpy.ops.object.select_all(action='DESELECT')
         for obj in objects:
-            if obj.type == 'MESH' and obj.data.materials:
-                # Get the first material (primary material)
-                material = obj.data.materials[0]
-                if material:
-                    # Add the custom property with the material name
-                    obj["FBX_vmatPath"] = material.name
-                    print(f"Added FBX_vmatPath='{material.name}' to object '{obj.name}'")
-
-    def get_full_export_path(self, original_obj):
-        """Get the full export path by combining Addons Path with relative path"""
-        # Get addon preferences
-        preferences = bpy.context.preferences.addons[__name__.split('.')[0]].preferences
-        base_path = preferences.addons_path
-        
-        if not base_path:
-            return None
-            
-        # Check for relative path first (new system)
-        if hasattr(original_obj, 'relative_export_path') and original_obj.relative_export_path:
-            return os.path.join(base_path, original_obj.relative_export_path)
-        
-        # Fallback to old system for compatibility
-        if "custom_file_path" in original_obj:
-            return original_obj["custom_file_path"]
-            
+            obj.select_set(True)
+        context.view_layer.objects.active = objects[0]
+        file_path = file_stem + ".fbx"
+        content_store.prepare_output(file_path)
+
+        bpy.ops.export_scene.fbx(
+            filepath=file_path,
+            use_selection=True,
+            object_types={'MESH'},
+            global_scale=export_scale,
+            mesh_smooth_type='FACE',
+            use_custom_props=True,
+            axis_forward=axis_forward,
+            axis_up=axis_up
+        )
+    finish_output(context, file_path, store_root, stats)
+    if size_report is not None:
+        size_report.add(node_name or os.path.basename(file_stem), file_path, stats)
+    return file_path
+
+def snapshot_parts(snapshot):
+    """File suffix ('' for the model, '_coll') -> MeshBuffers of a buffer cache snapshot"""
+    parts = {}
+    start = 0
+    for suffix, count in snapshot.metadata["parts"]:
+        parts[suffix] = snapshot.meshes[start:start + count]
+        start += count
+    return parts
+
+def write_cached_models(context, snapshot, file_stem, export_format, store_root="", size_report=None, node_name=""):
+    """Write the models of a node from a buffer cache snapshot. Returns the file paths."""
+    stable = context.scene.export_fbx.deterministic_output
+    file_paths = []
+    for suffix, meshes in snapshot_parts(snapshot).items():
+        if not meshes:
+            continue
+        file_path = file_stem + suffix + ".dmx"
+        content_store.prepare_output(file_path)
+        dmx_model.write_file(file_path, meshes, dmx_model.ENCODINGS[export_format], stable)
+        finish_output(context, file_path, store_root)
+        if size_report is not None:
+            size_report.add(node_name, file_path, None)
+        file_paths.append(file_path)
+    return file_paths
+
+def get_budget_report(context):
+    """BudgetReport for the budgets in the addon preferences, None if no budget is set and no report is wanted"""
+    preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+    limits = budget.Budget(preferences.budget_triangles, preferences.budget_draw_calls, preferences.budget_vertices,
+                           preferences.budget_collision_hulls, preferences.budget_size)
+    if not limits.is_set() and preferences.budget_report == 'NONE':
         return None
+    return budget.BudgetReport(limits)
 
-    def execute(self, context):
-        # Use fixed export scale (previously default value)
-        export_scale = 0.393701
-
-        # Get addon preferences for base path
-        preferences = context.preferences.addons[__name__.split('.')[0]].preferences
-        base_path = preferences.addons_path
-        
-        if not base_path:
-            self.report({'ERROR'}, "Addons Path is not set. Please configure it in addon preferences.")
-            return {'CANCELLED'}
+def check_budget(context, budget_report, node_name, render_buffers, collision_buffers, report):
+    """Measure a node's final buffers against the budgets.
+    Returns False if it is over budget and the preferences say not to export it."""
+    preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+    metrics = budget.measure(node_name, render_buffers or [], collision_buffers or [])
+    exceeded = budget_report.budget.exceeded(metrics)
+    refused = bool(exceeded) and preferences.enforce_budgets
+    budget_report.add(metrics, exceeded, not refused)
+    if exceeded:
+        report({'WARNING'}, f"{node_name} is over budget: {budget.describe_exceeded(exceeded)}"
+                            + (", not exported" if refused else ""))
+    return not refused
 
-        # Check if the 'temp' collection exists, if not create it
-        if 'temp' not in bpy.data.collections:
-            temp_collection = bpy.data.collections.new('temp')
-            bpy.context.scene.collection.children.link(temp_collection)
-        else:
-            temp_collection = bpy.data.collections['temp']
+def write_budget_report(context, budget_report, base_path, report):
+    preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+    if budget_report is None or not budget_report.rows or preferences.budget_report == 'NONE':
+        return
+    filepath = budget.report_path(bpy.data.filepath, base_path, preferences.budget_report)
+    try:
+        budget_report.write(filepath)
+        print(f"Budget report written to {filepath}")
+    except OSError as e:
+        report({'WARNING'}, f"Could not write budget report {filepath}: {e}")
 
-        # Get all selected objects
-        selected_objects = bpy.context.selected_objects
+def node_output_dir(context, node, report):
+    """Export folder of a node, created if needed. None (after a warning) if there is none."""
+    output_dir = get_full_export_path(context, node)
 
-        if not selected_objects:
-            self.report({'WARNING'}, "No objects selected for export")
-            return {'CANCELLED'}
+    if not output_dir:
+        report({'WARNING'}, f"No export path set for {node.name}")
+        return None
 
+    if not os.path.exists(output_dir):
         try:
-            # Store original selection
-            original_selection = selected_objects.copy()
-            
-            # Duplicate selected objects and their children and move them to 'temp' collection
-            duplicated_objects = []
-            
+            os.makedirs(output_dir, exist_ok=True)
+            print(f"Created directory: {output_dir}")
+        except Exception as e:
+            report({'WARNING'}, f"Could not create directory {output_dir}: {e}")
+            return None
+    return output_dir
+
+def cleanup_temp_collection(temp_collection, datablocks_before):
+    """Remove the temp duplicates together with the meshes, curves and collection they leave behind"""
+    for obj in list(temp_collection.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.data.collections.remove(temp_collection)
+
+    # Duplicated, converted and joined object data is orphaned now, cached modifier results stay
+    datablocks.remove_new_orphans(datablocks_before, keep=modifier_cache.is_cached_mesh)
+
+def export_nodes(context, nodes, report, progress=None):
+    """Export the given nodes (and their children) as model + collision FBX files.
+
+    This is the code path behind ExportFBXOperator. It is also used by the
+    headless export server, so it must not depend on the user's selection.
+
+    report   -- callable with the same signature as Operator.report
+    progress -- optional callable(node_name, status, files) invoked once per node
+                with status 'exported' or 'skipped'
+    """
+    # The temp duplicates must not show up as edits in the node dashboard
+    with node_status.suspended():
+        return _export_nodes(context, nodes, report, progress)
+
+def _export_nodes(context, nodes, report, progress):
+    # Use fixed export scale (previously default value)
+    export_scale = 0.393701
+
+    # FBX through Blender's exporter, or the native DMX writer
+    export_format = context.scene.export_fbx.export_format
+
+    # Get addon preferences for base path
+    preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+    base_path = preferences.addons_path
+
+    if not base_path:
+        report({'ERROR'}, "Addons Path is not set. Please configure it in addon preferences.")
+        return {'CANCELLED'}
+
+    if not nodes:
+        report({'WARNING'}, "No objects selected for export")
+        return {'CANCELLED'}
+
+    # Report every problem before the slow part starts
+    if not validation.run(context, nodes=nodes, report=report):
+        return {'CANCELLED'}
+
+    def notify(node_name, status, files=()):
+        if progress is not None:
+            progress(node_name, status, list(files))
+
+    # Textures and .vmat files first, so the duplicates pick up the generated vmat paths
+    settings = context.scene.export_fbx
+
+    # Parent -> children of the whole scene in one pass, so every node's subtree
+    # is walked once instead of scanning all objects per Object.children access
+    scene_index = node_status.children_index(context.scene.objects)
+
+    if settings.export_materials:
+        children = [child for node in nodes for child in node_status.gather_members(node, scene_index).objects()]
+        material_export.export_materials(children, base_path, settings.material_folder,
+                                         settings.texture_format, report)
+
+    # Identical models exported under different nodes share one stored file
+    store_root = get_store_root(context, base_path)
+
+    # File sizes per node, printed when stripping or rounding is on
+    size_report = attribute_filter.SizeReport()
+
+    # Remember existing datablocks so everything the export creates can be removed afterwards
+    datablocks_before = datablocks.snapshot()
+
+    # Create a fresh 'temp' collection for the duplicates, it is removed again after export
+    temp_collection = bpy.data.collections.new('temp')
+    context.scene.collection.children.link(temp_collection)
+
+    # Processed buffers of nodes exported before, also from earlier sessions (DMX only)
+    cache = get_buffer_cache(context, base_path)
+    cache_keys = {}     # node name -> content key, stored after the node is exported
+
+    # Triangles, draw calls, ... per node against the project budgets
+    budget_report = get_budget_report(context)
+
+    try:
+        # Store original selection
+        original_selection = [obj for obj in nodes if node_status.is_node(obj)]
+
+        # Unchanged nodes are written straight from the cache, without duplicating anything
+        exported_count = 0
+        if cache is not None:
+            remaining = []
             for obj in original_selection:
-                # Deselect all first
+                members = node_status.gather_members(obj, scene_index)
+                key = buffer_cache.node_key(obj, members, context.scene, settings, export_scale, 'X', 'Y')
+                snapshot = cache.open(key) if key is not None else None
+                if snapshot is None:
+                    if key is not None:
+                        cache_keys[obj.name] = key
+                    remaining.append(obj)
+                    continue
+
+                with snapshot:
+                    output_dir = node_output_dir(context, obj, report)
+                    if not output_dir:
+                        notify(obj.name, 'skipped')
+                        continue
+                    base_filename = node_status.node_name(obj)
+                    if budget_report is not None:
+                        parts = snapshot_parts(snapshot)
+                        if not check_budget(context, budget_report, base_filename, parts.get(""), parts.get("_coll"), report):
+                            notify(obj.name, 'skipped')
+                            continue
+                    written_files = write_cached_models(context, snapshot, os.path.join(output_dir, base_filename),
+                                                        export_format, store_root, size_report, base_filename)
+                exported_count += 1
+                node_status.mark_exported(obj)
+                notify(obj.name, 'exported', written_files)
+            original_selection = remaining
+
+        # Duplicate every node with everything parented under it (at any depth) and move
+        # the copies to the 'temp' collection; remember which copy belongs to which node
+        duplicated_nodes = []
+
+        for obj in original_selection:
+            # Deselect all first
+            bpy.ops.object.select_all(action='DESELECT')
+
+            # Select the node and all its members, including the empties between them
+            obj.select_set(True)
+            for member in node_status.gather_members(obj, scene_index).objects():
+                member.select_set(True)
+
+            # Duplicate the selection
+            bpy.ops.object.duplicate()
+
+            # Get the duplicated objects and move them to temp collection
+            duplicates = context.selected_objects
+            duplicate_names = {duplicated_obj.name for duplicated_obj in duplicates}
+            for duplicated_obj in duplicates:
+                # Remove from current collections
+                for collection in duplicated_obj.users_collection:
+                    collection.objects.unlink(duplicated_obj)
+                # Add to temp collection
+                temp_collection.objects.link(duplicated_obj)
+
+                # The node copy is the one whose parent was not duplicated
+                if node_status.is_node(duplicated_obj) and (duplicated_obj.parent is None
+                                                            or duplicated_obj.parent.name not in duplicate_names):
+                    duplicated_nodes.append((obj, duplicated_obj))
+
+        # Apply modifier stacks, reusing the results of earlier exports where nothing changed
+        modifier_cache.apply_cached(context, temp_collection.objects, context.scene.export_fbx.modifier_cache_size)
+
+        # Convert all objects in 'temp' collection to mesh
+        for obj in temp_collection.objects:
+            if obj.type in ('CURVE', 'FONT', 'SURFACE', 'META'):
                 bpy.ops.object.select_all(action='DESELECT')
-                
-                # Select the object and its children
                 obj.select_set(True)
-                if obj.children:
-                    for child in obj.children:
-                        child.select_set(True)
-                
-                # Duplicate the selection
-                bpy.ops.object.duplicate()
-                
-                # Get the duplicated objects and move them to temp collection
-                for duplicated_obj in bpy.context.selected_objects:
-                    # Remove from current collections
-                    for collection in duplicated_obj.users_collection:
-                        collection.objects.unlink(duplicated_obj)
-                    # Add to temp collection
-                    temp_collection.objects.link(duplicated_obj)
-                    duplicated_objects.append(duplicated_obj)
-                        
-            # Convert all objects in 'temp' collection to mesh
-            for obj in temp_collection.objects:
-                if obj.type != 'MESH':
-                    bpy.context.view_layer.objects.active = obj
-                    bpy.ops.object.convert(target='MESH')
-
-            # Add FBX_vmatPath custom properties to all duplicated objects
-            self.add_vmat_properties(temp_collection.objects)
-
-            # Deselect everything
-            bpy.ops.object.select_all(action='DESELECT')
+                context.view_layer.objects.active = obj
+                bpy.ops.object.convert(target='MESH')
 
-            # Find parent objects in the 'temp' collection (objects with children)
-            parent_objects = []
-            for obj in temp_collection.objects:
-                if obj.children:
-                    parent_objects.append(obj)
-
-            # Process each parent object
-            exported_count = 0
-            for obj in parent_objects:
-                # Find the corresponding original object
-                original_obj = None
-                for orig in original_selection:
-                    if orig.name.split('.')[0] == obj.name.split('.')[0]:
-                        original_obj = orig
-                        break
-                
-                if original_obj is None:
-                    self.report({'WARNING'}, f"Could not find original object for {obj.name}")
-                    continue
-                
-                # Get the full export path using the new system
-                output_dir = self.get_full_export_path(original_obj)
-                
-                if not output_dir:
-                    self.report({'WARNING'}, f"No export path set for {obj.name}")
-                    continue
-                    
-                if not os.path.exists(output_dir):
-                    try:
-                        os.makedirs(output_dir, exist_ok=True)
-                        print(f"Created directory: {output_dir}")
-                    except Exception as e:
-                        self.report({'WARNING'}, f"Could not create directory {output_dir}: {e}")
-                        continue
+        # Add FBX_vmatPath custom properties to all duplicated objects
+        add_vmat_properties(temp_collection.objects)
+
+        # Deselect everything
+        bpy.ops.object.select_all(action='DESELECT')
+
+        # Members of the copies, from one pass over the temp objects
+        temp_index = node_status.children_index(temp_collection.objects)
+
+        # Process each node copy
+        for original_obj, obj in duplicated_nodes:
+            # Get the full export path using the new system
+            output_dir = node_output_dir(context, original_obj, report)
+            if not output_dir:
+                notify(original_obj.name, 'skipped')
+                continue
 
-                # Get the filename from the original text object's content
-                if original_obj.type == 'FONT':
-                    base_filename = original_obj.data.body.strip()
-                    if not base_filename:
-                        # Fallback to object name if text is empty
-                        base_filename = original_obj.name.split(".")[0]
-                else:
-                    # Fallback for non-text objects
-                    base_filename = original_obj.name.split(".")[0]
-
-                # Store the current location of the parent
-                old_location = obj.location.copy()
-
-                # Move the parent to the center of the scene
-                obj.location = (0, 0, 0)
-
-                # Rotate the object 90 degrees on the Z axis (if needed)
-                obj.rotation_euler[2] = math.radians(0)
-
-                # Separate collision and regular children
-                coll_child = None
-                other_children = []
-                for child in obj.children:
-                    if '_coll' in child.name:
-                        coll_child = child
-                    else:
-                        other_children.append(child)
-
-                # Export collision child as separate FBX
-                if coll_child is not None:
-                    bpy.ops.object.select_all(action='DESELECT')                    
-                    coll_child.select_set(True)
-                    bpy.context.view_layer.objects.active = coll_child
-                    filename = base_filename + "_coll.fbx"
-                    file_path = os.path.join(output_dir, filename)
-                    
-                    bpy.ops.export_scene.fbx(
-                        filepath=file_path, 
-                        use_selection=True, 
-                        object_types={'MESH'}, 
-                        global_scale=export_scale, 
-                        mesh_smooth_type='FACE', 
-                        use_custom_props=True, 
-                        axis_forward='X', 
-                        axis_up='Y'
-                    )
-
-                # Merge and export other children
-                if other_children:
+            # Get the filename from the node's text or name property
+            base_filename = node_status.node_name(original_obj)
+
+            # Move the parent to the center of the scene
+            obj.location = (0, 0, 0)
+
+            # Rotate the object 90 degrees on the Z axis (if needed)
+            obj.rotation_euler[2] = math.radians(0)
+
+            # Separate collision and render members, at any depth below the node
+            members = node_status.gather_members(obj, temp_index)
+            coll_children = [child for child, _matrix in members.collision if child.type == 'MESH']
+            other_children = [child for child, _matrix in members.render]
+
+            # Several collision meshes become one collision model, merged in memory
+            # (hundreds of collision boxes cost about as much as one joined mesh)
+            coll_child = None
+            if coll_children:
+                coll_child = coll_children[0]
+                if len(coll_children) > 1:
+                    mesh_merge.merge_objects(coll_child, coll_children[1:])
+                    print(f"Merged {len(coll_children)} collision meshes of {base_filename}")
+
+                # Convex hulls within the Source 2 limits instead of the modelled mesh
+                if collision_hull.is_enabled(settings):
+                    hull_stats = collision_hull.process(coll_child, settings, export_scale)
+                    print(f"Collision hulls for {base_filename}: {hull_stats.describe()}")
+
+            # Merge the render children into one model
+            render_child = None
+            if other_children:
+                if len(other_children) > 1:
                     bpy.ops.object.select_all(action='DESELECT')
                     for child in other_children:
                         child.select_set(True)
-                    
-                    if len(other_children) > 1:
-                        bpy.context.view_layer.objects.active = other_children[0]
-                        bpy.ops.object.join()
+                    context.view_layer.objects.active = other_children[0]
+                    bpy.ops.object.join()
+                render_child = other_children[0]
 
-                    # Export the merged children as one FBX
-                    bpy.ops.object.select_all(action='DESELECT')
-                    other_children[0].select_set(True)
-                    bpy.context.view_layer.objects.active = other_children[0]
-                    filename = base_filename + ".fbx"
-                    file_path = os.path.join(output_dir, filename)
-                    
-                    bpy.ops.export_scene.fbx(
-                        filepath=file_path, 
-                        use_selection=True, 
-                        object_types={'MESH'}, 
-                        global_scale=export_scale, 
-                        mesh_smooth_type='FACE', 
-                        use_custom_props=True, 
-                        axis_forward='X', 
-                        axis_up='Y'
-                    )
-                    
-                exported_count += 1
+            # Final buffers, measured against the budgets before anything is written
+            measure = budget_report is not None
+            prepared_coll = (prepare_model(context, [coll_child], export_format, export_scale, capture=measure)
+                             if coll_child is not None else None)
+            prepared_render = (prepare_model(context, [render_child], export_format, export_scale, capture=measure)
+                               if render_child is not None else None)
+            if measure and not check_budget(context, budget_report, base_filename,
+                                            prepared_render[1] if prepared_render else None,
+                                            prepared_coll[1] if prepared_coll else None, report):
+                notify(original_obj.name, 'skipped')
+                continue
 
-            self.report({'INFO'}, f"Successfully exported {exported_count} objects with VMAT properties")
+            written_files = []
+            captured_coll = []
+            captured_render = []
 
-        except Exception as e:
-            self.report({'ERROR'}, f"Export failed: {str(e)}")
+            # Export collision child as separate file
+            if coll_child is not None:
+                file_stem = os.path.join(output_dir, base_filename + "_coll")
+                file_path = write_model(context, [coll_child], file_stem, export_format, export_scale, store_root=store_root,
+                                        size_report=size_report, node_name=base_filename, captured=captured_coll,
+                                        prepared=prepared_coll)
+                written_files.append(file_path)
+
+            # Export the merged children as one file
+            if render_child is not None:
+                file_stem = os.path.join(output_dir, base_filename)
+                file_path = write_model(context, [render_child], file_stem, export_format, export_scale, store_root=store_root,
+                                        size_report=size_report, node_name=base_filename, captured=captured_render,
+                                        prepared=prepared_render)
+                written_files.append(file_path)
+
+            key = cache_keys.get(original_obj.name)
+            if key is not None:
+                cache.store(key, captured_render + captured_coll,
+                            {"parts": [["", len(captured_render)], ["_coll", len(captured_coll)]]})
+
+            exported_count += 1
+            node_status.mark_exported(original_obj)
+            notify(original_obj.name, 'exported', written_files)
+
+        if attribute_filter.is_enabled(settings):
+            size_report.print()
+        write_budget_report(context, budget_report, base_path, report)
+        if budget_report is not None and budget_report.over_budget():
+            print(f"Over budget: {', '.join(budget_report.over_budget())}")
+        if cache is not None:
+            removed, size = cache.evict()
+            print(f"Buffer cache: {cache.describe()}, {attribute_filter.format_size(size)} in {cache.folder}"
+                  + (f", {removed} old entries removed" if removed else ""))
+        report({'INFO'}, f"Successfully exported {exported_count} objects with VMAT properties")
+
+    except Exception as e:
+        report({'ERROR'}, f"Export failed: {str(e)}")
+        return {'CANCELLED'}
+
+    finally:
+        # Clean up: delete the temp objects, their meshes and the 'temp' collection
+        try:
+            cleanup_temp_collection(temp_collection, datablocks_before)
+        except Exception as cleanup_error:
+            report({'WARNING'}, f"Cleanup warning: {str(cleanup_error)}")
+
+    # Repeated exports must not grow bpy.data
+    print(f"Export finished with {datablocks.format_growth(datablocks.growth(datablocks_before))}")
+
+    return {'FINISHED'}
+
+class ExportFBXOperator(Operator):
+    bl_idname = "object.export_fbx"
+    bl_label = "Export model + Coll"
+    bl_description = "Export selected models and collision meshes as separate FBX or DMX files"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        # Get all selected objects
+        return export_nodes(context, context.selected_objects.copy(), self.report)
+
+def region_nodes(context):
+    """Nodes in the region set in the panel (spatial index query, the selection is not used)"""
+    settings = context.scene.export_fbx
+    if settings.region_mode == 'ACTIVE':
+        obj = context.active_object
+        return node_spatial.nodes_in_object_bounds(obj) if obj is not None else []
+    if settings.region_mode == 'COLLECTION':
+        collection = settings.region_collection
+        return node_spatial.nodes_in_collection_bounds(collection) if collection is not None else []
+    return node_spatial.nodes_in_radius(context.scene.cursor.location, settings.region_radius)
+
+class ExportNodeRegionOperator(Operator):
+    bl_idname = "object.export_node_region"
+    bl_label = "Export Region"
+    bl_description = "Export the nodes inside the active object's bounds, a collection's bounds or a radius around the 3D cursor, without selecting them"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        nodes = region_nodes(context)
+        if not nodes:
+            self.report({'WARNING'}, "No nodes in the region")
             return {'CANCELLED'}
+        print(f"Region export: {len(nodes)} nodes")
 
+        # The export duplicates through the selection, put the user's selection back afterwards
+        selected = [obj.name for obj in context.selected_objects]
+        active = context.view_layer.objects.active
+        active_name = active.name if active is not None else None
+        try:
+            return export_nodes(context, nodes, self.report)
         finally:
-            # Clean up: select all objects in 'temp' collection and delete them
-            try:
-                bpy.ops.object.select_all(action='DESELECT')
-                objects_to_delete = list(temp_collection.objects)
-                for obj in objects_to_delete:
+            bpy.ops.object.select_all(action='DESELECT')
+            for name in selected:
+                obj = bpy.data.objects.get(name)
+                if obj is not None:
                     obj.select_set(True)
-                if objects_to_delete:
-                    bpy.ops.object.delete()
-            except Exception as cleanup_error:
-                self.report({'WARNING'}, f"Cleanup warning: {str(cleanup_error)}")
+            context.view_layer.objects.active = bpy.data.objects.get(active_name) if active_name else None
+
+class SelectNodeRegionOperator(Operator):
+    bl_idname = "object.select_node_region"
+    bl_label = "Select Region"
+    bl_description = "Select the nodes inside the region used by Export Region"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        nodes = region_nodes(context)
+        bpy.ops.object.select_all(action='DESELECT')
+        for node in nodes:
+            node.select_set(True)
+        self.report({'INFO'}, f"{len(nodes)} nodes in the region")
+        return {'FINISHED'}
+
+class ExportDatablockReportOperator(Operator):
+    bl_idname = "object.export_datablock_report"
+    bl_label = "Export Datablock Report"
+    bl_description = "Export the selected nodes several times and report how many datablocks each export left behind"
+
+    repeats: bpy.props.IntProperty(
+        name="Repeats",
+        description="Number of exports to run",
+        default=3,
+        min=1,
+        max=50
+    )
+
+    def execute(self, context):
+        nodes = context.selected_objects.copy()
+        baseline = datablocks.snapshot()
+        counts_before = datablocks.counts()
+
+        for run in range(self.repeats):
+            before = datablocks.snapshot()
+            result = export_nodes(context, nodes, self.report)
+            if 'FINISHED' not in result:
+                return result
+            print(f"Export {run + 1}/{self.repeats}: {datablocks.format_growth(datablocks.growth(before))}")
+
+            # Restore the selection the export cleared
+            for node in nodes:
+                node.select_set(True)
+
+        counts_after = datablocks.counts()
+        for name in datablocks.TRACKED_TYPES:
+            print(f"  {name}: {counts_before[name]} -> {counts_after[name]}")
 
+        total = datablocks.growth(baseline)
+        level = {'INFO'} if not any(total.values()) else {'WARNING'}
+        self.report(level, f"{self.repeats} exports: {datablocks.format_growth(total)}")
         return {'FINISHED'}
 
 def register():
     bpy.utils.register_class(ExportFBXOperator)
+    bpy.utils.register_class(ExportNodeRegionOperator)
+    bpy.utils.register_class(SelectNodeRegionOperator)
+    bpy.utils.register_class(ExportDatablockReportOperator)
 
 def unregister():
-    bpy.utils.unregister_class(ExportFBXOperator)
\ No newline at end of file
+    bpy.utils.unregister_class(ExportDatablockReportOperator)
+    bpy.utils.unregister_class(SelectNodeRegionOperator)
+    bpy.utils.unregister_class(ExportNodeRegionOperator)
+    bpy.utils.unregister_class(ExportFBXOperator)
@@ -0,0 +1,208 @@
+import bpy
+import os
+import re
+import json
+import zlib
+import struct
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Converts the image textures of Blender materials into the content materials/ tree and
+# writes a matching .vmat, so custom-textured props don't need hand-made Hammer materials.
+
+HASH_MANIFEST = ".s2_texture_hashes.json"
+VMAT_SHADER = "csgo_complex.vfx"
+
+# Principled BSDF input -> (vmat texture parameter, feature flag or None)
+TEXTURE_INPUTS = {
+    "Base Color": ("TextureColor", None),
+    "Normal": ("TextureNormal", None),
+    "Roughness": ("TextureRoughness", None),
+    "Metallic": ("TextureMetalness", "F_METALNESS_TEXTURE"),
+    "Alpha": ("TextureTranslucency", "F_TRANSLUCENT"),
+}
+
+def safe_name(name):
+    """File name friendly version of a datablock name"""
+    return re.sub(r"[^A-Za-z0-9_\-]+", "_", name).strip("_").lower() or "unnamed"
+
+def linked_image(socket):
+    """Image feeding a shader input, directly or through a Normal Map node"""
+    if not socket.is_linked:
+        return None
+    node = socket.links[0].from_node
+    if node.type == 'NORMAL_MAP' and node.inputs["Color"].is_linked:
+        node = node.inputs["Color"].links[0].from_node
+    if node.type == 'TEX_IMAGE' and node.image is not None:
+        return node.image
+    return None
+
+def material_textures(material):
+    """{vmat parameter: image} for the image textures linked into the material's Principled BSDF"""
+    if not material or not material.use_nodes or material.node_tree is None:
+        return {}
+    principled = next((node for node in material.node_tree.nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    if principled is None:
+        return {}
+
+    textures = {}
+    for input_name, (parameter, _flag) in TEXTURE_INPUTS.items():
+        socket = principled.inputs.get(input_name)
+        image = linked_image(socket) if socket is not None else None
+        if image is not None:
+            textures[parameter] = image
+    return textures
+
+def collect_materials(objects):
+    """Materials used by the mesh objects, each once, in first-use order"""
+    materials = {}
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        for slot in obj.material_slots:
+            if slot.material is not None:
+                materials.setdefault(slot.material.name, slot.material)
+    return list(materials.values())
+
+def read_pixels(image):
+    """(height, width, 4) float32 pixels, bottom row first (Blender order). Main thread only."""
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+def encode_tga(pixels):
+    """Uncompressed 32-bit TGA. TGA rows are bottom-up like Blender's, so no flip is needed."""
+    height, width = pixels.shape[:2]
+    rgba = (np.clip(pixels, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+    header = struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, width, height, 32, 8)
+    return header + rgba[:, :, [2, 1, 0, 3]].tobytes()
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+def encode_png(pixels):
+    """8-bit RGBA PNG, rows flipped to top-down"""
+    height, width = pixels.shape[:2]
+    rgba = (np.clip(pixels[::-1], 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8).reshape(height, width * 4)
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), rgba], axis=1).tobytes()
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+            + _png_chunk(b"IDAT", zlib.compress(raw, 6))
+            + _png_chunk(b"IEND", b""))
+
+ENCODERS = {
+    'TGA': (".tga", encode_tga),
+    'PNG': (".png", encode_png),
+}
+
+def write_texture(pixels, filepath, texture_format):
+    """Worker job: encode and write one texture (numpy and zlib release the GIL)"""
+    _extension, encode = ENCODERS[texture_format]
+    data = encode(pixels)
+    with open(filepath, "wb") as out:
+        out.write(data)
+    return filepath
+
+def vmat_text(textures):
+    """Legacy KeyValues .vmat for csgo_complex with the given {parameter: content path}"""
+    lines = ["// Generated by Source 2 Model Exporter", "\"Layer0\"", "{", f"\t\"shader\"\t\t\"{VMAT_SHADER}\""]
+    flags = sorted({flag for name, flag in TEXTURE_INPUTS.values() if flag and name in textures})
+    for flag in flags:
+        lines.append(f"\t\"{flag}\"\t\t\"1\"")
+    for parameter, path in textures.items():
+        lines.append(f"\t\"{parameter}\"\t\t\"{path}\"")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def load_manifest(folder):
+    try:
+        with open(os.path.join(folder, HASH_MANIFEST), "r", encoding="utf-8") as source:
+            return json.load(source)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(folder, manifest):
+    with open(os.path.join(folder, HASH_MANIFEST), "w", encoding="utf-8") as out:
+        json.dump(manifest, out, indent=1, sort_keys=True)
+
+def export_materials(objects, content_root, material_folder="materials/blender", texture_format='TGA', report=None, max_workers=None):
+    """Convert textures and write .vmat files for the materials used by objects.
+
+    content_root    -- the Addons Path (the addon's content folder)
+    material_folder -- folder inside content_root, content paths are relative to content_root
+    Sets material["FBX_vmatPath"] on every material that got a .vmat.
+    Returns (converted, skipped, vmats_written).
+    """
+    report = report or (lambda level, message: print(message))
+    folder_rel = material_folder.replace("\\", "/").strip("/")
+    folder = os.path.join(content_root, *folder_rel.split("/"))
+    os.makedirs(folder, exist_ok=True)
+
+    extension, _encode = ENCODERS[texture_format]
+    manifest = load_manifest(folder)
+
+    # Main thread: read pixels and decide what needs converting
+    jobs = []
+    image_paths = {}
+    skipped = 0
+    materials = collect_materials(objects)
+    for material in materials:
+        for image in material_textures(material).values():
+            if image.name in image_paths:
+                continue
+            filename = safe_name(os.path.splitext(image.name)[0]) + extension
+            image_paths[image.name] = f"{folder_rel}/{filename}"
+            filepath = os.path.join(folder, filename)
+
+            if image.size[0] == 0 or image.size[1] == 0:
+                report({'WARNING'}, f"Image '{image.name}' has no pixel data, skipped")
+                continue
+
+            pixels = read_pixels(image)
+            digest = hashlib.blake2b(pixels.tobytes(), digest_size=16).hexdigest() + texture_format
+            entry = manifest.get(image.name)
+            if entry and entry.get("hash") == digest and os.path.exists(filepath):
+                skipped += 1
+                continue
+            jobs.append((image.name, {"hash": digest, "file": filename}, pixels, filepath))
+
+    # Worker threads: encode and write
+    converted = 0
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [(name, entry, pool.submit(write_texture, pixels, filepath, texture_format))
+                       for name, entry, pixels, filepath in jobs]
+            for name, entry, future in futures:
+                try:
+                    future.result()
+                    manifest[name] = entry
+                    converted += 1
+                except OSError as e:
+                    report({'WARNING'}, f"Could not write texture: {e}")
+
+    # .vmat files, only rewritten when their content changes
+    vmats_written = 0
+    for material in materials:
+        textures = material_textures(material)
+        if not textures:
+            continue
+        content = vmat_text({parameter: image_paths[image.name] for parameter, image in textures.items()})
+        filename = safe_name(material.name) + ".vmat"
+        filepath = os.path.join(folder, filename)
+        try:
+            with open(filepath, "r", encoding="utf-8") as source:
+                unchanged = source.read() == content
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            with open(filepath, "w", encoding="utf-8", newline="\n") as out:
+                out.write(content)
+            vmats_written += 1
+        material["FBX_vmatPath"] = f"{folder_rel}/{filename}"
+
+    save_manifest(folder, manifest)
+    print(f"Materials: {converted} textures converted, {skipped} unchanged, {vmats_written} .vmat files written")
+    return converted, skipped, vmats_written
@@ -0,0 +1,183 @@
+import numpy as np
+
+# Flat NumPy copies of a mesh, read with foreach_get so no per-vertex Python loops are needed.
+# All exporters that don't go through bpy.ops.export_scene.fbx work on these buffers.
+
+class MeshBuffers:
+    """Array-backed copy of one evaluated mesh
+
+    positions       (V, 3) float32, already transformed by the export matrix
+    loop_vertices   (L,)   int32, vertex index of every face corner
+    loop_normals    (L, 3) float32, split (corner) normals, transformed
+    poly_starts     (P,)   int32, first corner of every polygon
+    poly_sizes      (P,)   int32, corner count of every polygon
+    poly_materials  (P,)   int32, material slot of every polygon
+    uv_layers       list of (name, (L, 2) float32)
+    color_layers    list of (name, (L, 4) float32), sRGB, converted to the corner domain
+    material_names  list of material names per slot ('' for empty slots)
+    vmat_paths      list of vmat paths per slot
+    matrix          (4, 4) float32, the transform that was applied
+    """
+    __slots__ = ("name", "positions", "loop_vertices", "loop_normals", "poly_starts", "poly_sizes",
+                 "poly_materials", "uv_layers", "color_layers", "material_names", "vmat_paths", "matrix")
+
+    def __init__(self, name):
+        self.name = name
+        self.positions = np.zeros((0, 3), dtype=np.float32)
+        self.loop_vertices = np.zeros(0, dtype=np.int32)
+        self.loop_normals = np.zeros((0, 3), dtype=np.float32)
+        self.poly_starts = np.zeros(0, dtype=np.int32)
+        self.poly_sizes = np.zeros(0, dtype=np.int32)
+        self.poly_materials = np.zeros(0, dtype=np.int32)
+        self.uv_layers = []
+        self.color_layers = []
+        self.material_names = []
+        self.vmat_paths = []
+        self.matrix = np.identity(4, dtype=np.float32)
+
+    @property
+    def vertex_count(self):
+        return len(self.positions)
+
+    @property
+    def loop_count(self):
+        return len(self.loop_vertices)
+
+    @property
+    def poly_count(self):
+        return len(self.poly_starts)
+
+    @property
+    def triangle_count(self):
+        return int(np.maximum(self.poly_sizes - 2, 0).sum())
+
+    def loop_polygons(self):
+        """Polygon index of every face corner"""
+        return np.repeat(np.arange(self.poly_count, dtype=np.int32), self.poly_sizes)
+
+    def edges(self):
+        """(E, 2) vertex pairs of all polygon edges (duplicates included)"""
+        nxt = np.arange(self.loop_count, dtype=np.int64) + 1
+        ends = (self.poly_starts + self.poly_sizes - 1).astype(np.int64)
+        nxt[ends] = self.poly_starts
+        return np.stack([self.loop_vertices, self.loop_vertices[nxt]], axis=1)
+
+def _get(collection, attribute, count, dtype, width=1):
+    buffer = np.empty(count * width, dtype=dtype)
+    if count:
+        collection.foreach_get(attribute, buffer)
+    return buffer.reshape(-1, width) if width > 1 else buffer
+
+def vmat_path_for(material):
+    """vmat path written for a material: the generated/dev .vmat path if it has one,
+    otherwise the material name, which matches the Hammer asset name"""
+    if not material:
+        return ""
+    return material.get("FBX_vmatPath") or material.name
+
+def transform_points(points, matrix):
+    """Apply a 4x4 matrix to (N, 3) points"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return (points @ matrix[:3, :3].T + matrix[:3, 3]).astype(np.float32)
+
+def transform_normals(normals, matrix):
+    """Apply the inverse transpose of a 4x4 matrix to (N, 3) normals and renormalize"""
+    normal_matrix = np.linalg.inv(np.asarray(matrix, dtype=np.float64)[:3, :3]).T
+    result = normals @ normal_matrix.T
+    lengths = np.linalg.norm(result, axis=1, keepdims=True)
+    np.divide(result, lengths, out=result, where=lengths > 0)
+    return result.astype(np.float32)
+
+def _corner_normals(mesh, loop_count):
+    if hasattr(mesh, "corner_normals"):
+        return _get(mesh.corner_normals, "vector", loop_count, np.float32, 3)
+    # Blender < 4.1
+    mesh.calc_normals_split()
+    return _get(mesh.loops, "normal", loop_count, np.float32, 3)
+
+def read_mesh(mesh, name, matrix=None, materials=None):
+    """Copy a mesh datablock into MeshBuffers, transformed by matrix (4x4, world space if None)"""
+    buffers = MeshBuffers(name)
+    vertex_count = len(mesh.vertices)
+    loop_count = len(mesh.loops)
+    poly_count = len(mesh.polygons)
+
+    positions = _get(mesh.vertices, "co", vertex_count, np.float32, 3)
+    buffers.loop_vertices = _get(mesh.loops, "vertex_index", loop_count, np.int32)
+    normals = _corner_normals(mesh, loop_count)
+    buffers.poly_starts = _get(mesh.polygons, "loop_start", poly_count, np.int32)
+    buffers.poly_sizes = _get(mesh.polygons, "loop_total", poly_count, np.int32)
+    buffers.poly_materials = _get(mesh.polygons, "material_index", poly_count, np.int32)
+
+    for uv_layer in mesh.uv_layers:
+        buffers.uv_layers.append((uv_layer.name, _get(uv_layer.data, "uv", loop_count, np.float32, 2)))
+
+    for color in mesh.color_attributes:
+        if color.domain == 'POINT':
+            values = _get(color.data, "color_srgb", vertex_count, np.float32, 4)[buffers.loop_vertices]
+        elif color.domain == 'CORNER':
+            values = _get(color.data, "color_srgb", loop_count, np.float32, 4)
+        else:
+            continue
+        buffers.color_layers.append((color.name, values))
+    # The active color attribute goes first
+    active = mesh.color_attributes.active_color
+    if active is not None:
+        buffers.color_layers.sort(key=lambda layer: layer[0] != active.name)
+
+    materials = list(materials if materials is not None else mesh.materials)
+    buffers.material_names = [material.name if material else "" for material in materials]
+    buffers.vmat_paths = [vmat_path_for(material) for material in materials]
+
+    if matrix is not None:
+        buffers.matrix = np.asarray(matrix, dtype=np.float32)
+        buffers.positions = transform_points(positions, buffers.matrix)
+        buffers.loop_normals = transform_normals(normals, buffers.matrix)
+    else:
+        buffers.positions = positions
+        buffers.loop_normals = normals
+    return buffers
+
+def extract_object(obj, depsgraph, matrix=None):
+    """MeshBuffers of an object's evaluated mesh (modifiers applied).
+
+    matrix defaults to the object's world matrix.
+    """
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        if matrix is None:
+            matrix = obj.matrix_world
+        materials = [slot.material for slot in eval_obj.material_slots]
+        return read_mesh(mesh, obj.name, np.array(matrix, dtype=np.float32), materials)
+    finally:
+        eval_obj.to_mesh_clear()
+
+def mesh_islands(edges, vertex_count):
+    """Connected component label (0..K-1) of every vertex, from (E, 2) edge vertex pairs.
+
+    Vectorized label propagation with pointer jumping, no per-vertex Python loop.
+    Returns (labels, island_count).
+    """
+    labels = np.arange(vertex_count, dtype=np.int64)
+    if vertex_count == 0:
+        return labels, 0
+
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    while len(edges):
+        smallest = np.minimum(labels[edges[:, 0]], labels[edges[:, 1]])
+        updated = labels.copy()
+        np.minimum.at(updated, edges[:, 0], smallest)
+        np.minimum.at(updated, edges[:, 1], smallest)
+        # Pointer jumping: follow labels to their root so long chains converge quickly
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    roots, compact = np.unique(labels, return_inverse=True)
+    return compact.reshape(-1), len(roots)
@@ -0,0 +1,89 @@
+import bpy
+import numpy as np
+
+# In-memory mesh merging for the temporary export duplicates.
+# Works like Ctrl+J (bpy.ops.object.join) but reads every mesh once with foreach_get,
+# concatenates the arrays with NumPy and writes one new mesh with foreach_set, so joining
+# hundreds of objects costs about as much as one mesh of the same size.
+
+def _get(collection, attribute, count, dtype, width=1):
+    buffer = np.empty(count * width, dtype=dtype)
+    if count:
+        collection.foreach_get(attribute, buffer)
+    return buffer.reshape(-1, width) if width > 1 else buffer
+
+def polygon_corners(starts, sizes, reverse=False):
+    """Corner (loop) index of every polygon corner in polygon order, optionally with every polygon reversed"""
+    within = np.arange(int(sizes.sum()), dtype=np.int64) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    if reverse:
+        within = np.repeat(sizes, sizes) - 1 - within
+    return np.repeat(starts, sizes) + within
+
+def new_mesh(name, positions, corners, sizes, poly_materials, materials):
+    """Mesh datablock from arrays: (V, 3) positions, flat corner vertex indices, corners per
+    polygon, material slot per polygon and the slot materials"""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(positions))
+    mesh.loops.add(len(corners))
+    mesh.polygons.add(len(sizes))
+    mesh.vertices.foreach_set("co", np.asarray(positions, dtype=np.float32).reshape(-1))
+    mesh.loops.foreach_set("vertex_index", np.asarray(corners, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_start", (np.cumsum(sizes) - sizes).astype(np.int32))
+    if bpy.app.version < (4, 0, 0):
+        # Older versions need the corner count of every polygon
+        mesh.polygons.foreach_set("loop_total", np.asarray(sizes, dtype=np.int32))
+    mesh.polygons.foreach_set("material_index", np.asarray(poly_materials, dtype=np.int32))
+    for material in materials:
+        mesh.materials.append(material)
+    mesh.update(calc_edges=True)
+    mesh.validate()
+    return mesh
+
+def merge_objects(target, sources):
+    """Merge the meshes of sources into target, in target's local space.
+
+    Keeps positions, faces and materials (enough for collision models); mirrored
+    sources get their faces flipped back. target gets a new mesh, so a mesh it shares
+    with the scene is never edited; the sources are left as they are. Returns the merged mesh.
+    """
+    to_target = np.array(target.matrix_world.inverted_safe(), dtype=np.float64)
+    materials = []
+    material_slots = {}     # material name ('' for empty slots) -> merged slot
+    positions, corners, sizes, poly_materials = [], [], [], []
+    vertex_offset = 0
+
+    for obj in [target] + [source for source in sources if source != target]:
+        mesh = obj.data
+        vertex_count = len(mesh.vertices)
+        poly_count = len(mesh.polygons)
+        matrix = np.identity(4) if obj == target else to_target @ np.array(obj.matrix_world, dtype=np.float64)
+
+        points = _get(mesh.vertices, "co", vertex_count, np.float32, 3).astype(np.float64)
+        positions.append(points @ matrix[:3, :3].T + matrix[:3, 3])
+
+        loop_vertices = _get(mesh.loops, "vertex_index", len(mesh.loops), np.int32)
+        starts = _get(mesh.polygons, "loop_start", poly_count, np.int32)
+        totals = _get(mesh.polygons, "loop_total", poly_count, np.int32)
+        mirrored = np.linalg.det(matrix[:3, :3]) < 0
+        corners.append(loop_vertices[polygon_corners(starts, totals, mirrored)] + vertex_offset)
+        sizes.append(totals)
+        vertex_offset += vertex_count
+
+        # Slot materials of this object -> slots of the merged mesh
+        remap = []
+        for slot in obj.material_slots:
+            key = slot.material.name if slot.material else ""
+            if key not in material_slots:
+                material_slots[key] = len(materials)
+                materials.append(slot.material)
+            remap.append(material_slots[key])
+        slots = _get(mesh.polygons, "material_index", poly_count, np.int32)
+        if remap:
+            poly_materials.append(np.asarray(remap, dtype=np.int32)[np.clip(slots, 0, len(remap) - 1)])
+        else:
+            poly_materials.append(np.zeros(poly_count, dtype=np.int32))
+
+    merged = new_mesh(target.data.name, np.concatenate(positions), np.concatenate(corners),
+                      np.concatenate(sizes), np.concatenate(poly_materials), materials)
+    target.data = merged
+    return merged
@@ -0,0 +1,196 @@
+"""
+Array-backed mesh snapshots for worker processes
+
+A snapshot holds the MeshBuffers of one node or static chunk in a single flat buffer:
+a fixed prefix, a small JSON header, then every array as raw bytes at a 64-byte aligned
+offset. It is written once into shared memory or a memory-mapped file, readers get
+NumPy views straight into that buffer (nothing is copied or unpickled).
+No Blender dependency.
+"""
+
+import json
+import mmap
+import struct
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import mesh_buffers
+
+MAGIC = b"S2MSNAP\x00"
+VERSION = 1
+ALIGNMENT = 64
+FILE_EXTENSION = ".s2snap"
+# magic, version, header length
+PREFIX = struct.Struct("<8sII")
+
+# MeshBuffers array attributes stored for every mesh
+ARRAY_FIELDS = ("positions", "loop_vertices", "loop_normals", "poly_starts", "poly_sizes", "poly_materials", "matrix")
+
+class SnapshotError(Exception):
+    pass
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+class _Layout:
+    """Header and array placement of a snapshot, computed before anything is written"""
+
+    def __init__(self, buffers_list, metadata):
+        self.arrays = []
+        self.data_size = 0
+        meshes = []
+        for buffers in buffers_list:
+            meshes.append({
+                "name": buffers.name,
+                "material_names": list(buffers.material_names),
+                "vmat_paths": list(buffers.vmat_paths),
+                "arrays": {field: self._add(getattr(buffers, field)) for field in ARRAY_FIELDS},
+                "uv_layers": [[name, self._add(values)] for name, values in buffers.uv_layers],
+                "color_layers": [[name, self._add(values)] for name, values in buffers.color_layers],
+            })
+        header = {"metadata": metadata or {}, "meshes": meshes, "data_size": self.data_size}
+        self.header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        self.data_start = _align(PREFIX.size + len(self.header))
+        self.size = self.data_start + self.data_size
+
+    def _add(self, array):
+        array = np.ascontiguousarray(array)
+        offset = _align(self.data_size)
+        self.arrays.append((offset, array))
+        self.data_size = offset + array.nbytes
+        return {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+
+    def write(self, buffer):
+        """Write the snapshot into a writable buffer of at least self.size bytes"""
+        PREFIX.pack_into(buffer, 0, MAGIC, VERSION, len(self.header))
+        buffer[PREFIX.size:PREFIX.size + len(self.header)] = self.header
+        for offset, array in self.arrays:
+            if array.nbytes:
+                target = np.frombuffer(buffer, dtype=array.dtype, count=array.size, offset=self.data_start + offset)
+                target[...] = array.reshape(-1)
+
+def snapshot_size(buffers_list, metadata=None):
+    return _Layout(buffers_list, metadata).size
+
+def create_shared(buffers_list, metadata=None, name=None):
+    """Write a snapshot into a new shared memory block.
+
+    Returns the SharedMemory; the creator calls close() and unlink() once the workers are done.
+    """
+    layout = _Layout(buffers_list, metadata)
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(layout.size, 1))
+    try:
+        layout.write(block.buf)
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    return block
+
+def write_file(filepath, buffers_list, metadata=None):
+    """Write a snapshot to a file through a memory map. Returns filepath."""
+    layout = _Layout(buffers_list, metadata)
+    with open(filepath, "w+b") as out:
+        out.truncate(layout.size)
+        with mmap.mmap(out.fileno(), layout.size) as mapped:
+            layout.write(mapped)
+    return filepath
+
+class Snapshot:
+    """An opened snapshot. metadata is a dict, meshes a list of MeshBuffers whose arrays
+    are read-only views into the shared buffer; they are only valid until close()."""
+
+    def __init__(self, buffer, closer):
+        self._closer = closer
+        self.metadata = {}
+        self.meshes = []
+
+        magic, version, header_length = PREFIX.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Not a mesh snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}")
+        header = json.loads(bytes(buffer[PREFIX.size:PREFIX.size + header_length]))
+        data_start = _align(PREFIX.size + header_length)
+
+        def view(entry):
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"], dtype=np.int64))
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + entry["offset"]) if count else np.zeros(0, dtype)
+            array = array.reshape(entry["shape"])
+            array.flags.writeable = False
+            return array
+
+        self.metadata = header["metadata"]
+        for mesh in header["meshes"]:
+            buffers = mesh_buffers.MeshBuffers(mesh["name"])
+            for field in ARRAY_FIELDS:
+                setattr(buffers, field, view(mesh["arrays"][field]))
+            buffers.uv_layers = [(name, view(entry)) for name, entry in mesh["uv_layers"]]
+            buffers.color_layers = [(name, view(entry)) for name, entry in mesh["color_layers"]]
+            buffers.material_names = mesh["material_names"]
+            buffers.vmat_paths = mesh["vmat_paths"]
+            self.meshes.append(buffers)
+
+    def close(self):
+        # Views must be gone before the buffer can be released
+        self.meshes = []
+        if self._closer is not None:
+            self._closer()
+            self._closer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _attach_shared(name):
+    """Open an existing shared memory block without handing its lifetime to this process"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Python < 3.13 registers attached blocks with the resource tracker, which would
+    # unlink them when this (worker) process exits. Skip the registration.
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+
+    def register_except_shared_memory(resource_name, resource_type):
+        if resource_type != "shared_memory":
+            register(resource_name, resource_type)
+
+    resource_tracker.register = register_except_shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def open_shared(name):
+    block = _attach_shared(name)
+    return Snapshot(block.buf, block.close)
+
+def open_file(filepath):
+    with open(filepath, "rb") as source:
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return Snapshot(mapped, mapped.close)
+    except BaseException:
+        mapped.close()
+        raise
+
+def capture_objects(objects, depsgraph, matrix=None):
+    """MeshBuffers of the evaluated mesh objects, ready to be snapshotted.
+
+    matrix -- optional 4x4 applied on top of every object's world matrix (e.g. the DMX
+              conversion matrix); None keeps world space
+    """
+    buffers_list = []
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        object_matrix = obj.matrix_world if matrix is None else matrix @ obj.matrix_world
+        buffers_list.append(mesh_buffers.extract_object(obj, depsgraph, object_matrix))
+    return buffers_list
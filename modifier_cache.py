@@ -0,0 +1,316 @@
+import bpy
+import hashlib
+from collections import OrderedDict
+from bpy.app.handlers import persistent
+
+import numpy as np
+
+# Evaluated modifier stacks, reused across exports while the base mesh and the modifier
+# settings stay the same. Every entry is a mesh datablock without users named
+# CACHE_PREFIX + key; such meshes are not saved with the file, so the cache lives for one session.
+CACHE_PREFIX = ".s2_modcache_"
+DEFAULT_MAX_ENTRIES = 64
+
+_entries = OrderedDict()    # key -> cached mesh name, least recently used first
+_hits = 0
+_misses = 0
+
+# Attribute data type -> (foreach field, values per element, dtype)
+ATTRIBUTE_FIELDS = {
+    'FLOAT': ("value", 1, np.float32),
+    'INT': ("value", 1, np.int32),
+    'INT8': ("value", 1, np.int32),
+    'BOOLEAN': ("value", 1, np.bool_),
+    'FLOAT2': ("vector", 2, np.float32),
+    'INT32_2D': ("value", 2, np.int32),
+    'FLOAT_VECTOR': ("vector", 3, np.float32),
+    'FLOAT_COLOR': ("color", 4, np.float32),
+    'BYTE_COLOR': ("color", 4, np.float32),
+    'QUATERNION': ("value", 4, np.float32),
+    'FLOAT4X4': ("value", 16, np.float32),
+}
+
+# RNA properties that don't change the evaluated geometry
+IGNORED_PROPERTIES = {
+    "rna_type", "name", "label", "show_expanded", "show_in_editmode", "show_on_cage",
+    "show_viewport", "show_render", "is_active", "is_override_data", "persistent_uid",
+    "use_pin_to_last", "execution_time", "location", "width", "height", "dimensions",
+    "select", "hide", "color", "use_custom_color", "show_options", "show_preview",
+    "show_texture", "parent", "bl_description", "bl_icon", "bl_label", "bl_idname",
+    "bl_static_type", "bl_width_default", "bl_width_min", "bl_width_max",
+    "bl_height_default", "bl_height_min", "bl_height_max", "internal_links", "warning_propagation",
+}
+
+# Modifiers that can read any vertex group, not only the ones named in their settings
+ANY_GROUP_MODIFIERS = {'ARMATURE', 'NODES', 'DATA_TRANSFER', 'MASK'}
+# Vertex weights are hashed vertex by vertex; bigger meshes whose weights matter aren't cached
+MAX_WEIGHT_VERTICES = 200000
+
+class _Unhashable(Exception):
+    """Raised while building a key for data that can't be hashed"""
+
+def _update_array(digest, collection, field, count, dtype):
+    buffer = np.empty(count, dtype=dtype)
+    if count:
+        collection.foreach_get(field, buffer)
+    digest.update(buffer.tobytes())
+
+def _used_groups(modifiers):
+    """Names of the vertex groups the modifiers read, None if they can read any group"""
+    names = set()
+    for modifier in modifiers:
+        if modifier.type in ANY_GROUP_MODIFIERS:
+            return None
+        for prop in modifier.bl_rna.properties:
+            if prop.type == 'STRING' and "vertex_group" in prop.identifier:
+                names.add(getattr(modifier, prop.identifier))
+    names.discard("")
+    return names
+
+def _mesh_digest(obj, digest, groups):
+    """Hash the base mesh of obj into digest, with the weights of the named vertex groups
+    (None for all groups). Returns False if the mesh has data that can't be hashed."""
+    mesh = obj.data
+    sizes = {
+        'POINT': len(mesh.vertices),
+        'EDGE': len(mesh.edges),
+        'FACE': len(mesh.polygons),
+        'CORNER': len(mesh.loops),
+    }
+    digest.update(repr(sorted(sizes.items())).encode())
+    _update_array(digest, mesh.edges, "vertices", sizes['EDGE'] * 2, np.int32)
+    _update_array(digest, mesh.loops, "vertex_index", sizes['CORNER'], np.int32)
+    _update_array(digest, mesh.polygons, "loop_start", sizes['FACE'], np.int32)
+
+    # Positions, UV maps, colors, sharp edges/faces, creases, ... are all attributes
+    for attribute in sorted(mesh.attributes, key=lambda attribute: attribute.name):
+        field = ATTRIBUTE_FIELDS.get(attribute.data_type)
+        size = sizes.get(attribute.domain)
+        if field is None or size is None:
+            return False
+        name, width, dtype = field
+        digest.update(f"{attribute.name}|{attribute.domain}|{attribute.data_type}".encode())
+        _update_array(digest, attribute.data, name, size * width, dtype)
+
+    digest.update(repr([material.name if material else "" for material in mesh.materials]).encode())
+    digest.update(repr((getattr(mesh, "use_auto_smooth", None), getattr(mesh, "auto_smooth_angle", None),
+                        mesh.has_custom_normals)).encode())
+    if mesh.has_custom_normals and hasattr(mesh, "corner_normals"):
+        _update_array(digest, mesh.corner_normals, "vector", sizes['CORNER'] * 3, np.float32)
+
+    if mesh.shape_keys is not None:
+        for key_block in mesh.shape_keys.key_blocks:
+            digest.update(repr((key_block.name, key_block.value, key_block.mute, key_block.relative_key.name)).encode())
+            _update_array(digest, key_block.data, "co", sizes['POINT'] * 3, np.float32)
+
+    if obj.vertex_groups:
+        digest.update(repr([group.name for group in obj.vertex_groups]).encode())
+        indices = {group.index for group in obj.vertex_groups if groups is None or group.name in groups}
+        if indices:
+            # Vertex weights have no foreach access
+            if sizes['POINT'] > MAX_WEIGHT_VERTICES:
+                return False
+            weights = [(vertex.index, group.group, group.weight) for vertex in mesh.vertices
+                       for group in vertex.groups if group.group in indices]
+            digest.update(repr(weights).encode())
+    return True
+
+def _value_signature(value, obj, seen):
+    """Comparable, repr-able stand-in for a property value"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bpy.types.Object):
+        # Operands (Boolean, Array offset, Mirror object, ...) act in obj's local space
+        relative = obj.matrix_world.inverted_safe() @ value.matrix_world
+        signature = ["Object", value.name, [tuple(row) for row in relative]]
+        if value.name in seen or value.type == 'EMPTY':
+            return signature
+        seen.add(value.name)
+        if value.type == 'MESH':
+            modifiers = [modifier for modifier in value.modifiers if modifier.show_viewport]
+            # Data Transfer copies the operand's vertex groups
+            transfer = any(modifier.type == 'DATA_TRANSFER' and modifier.object == value for modifier in obj.modifiers)
+            digest = hashlib.blake2b(digest_size=16)
+            if not _mesh_digest(value, digest, None if transfer else _used_groups(modifiers)):
+                raise _Unhashable(value.name)
+            signature.append(digest.hexdigest())
+            signature.append([_rna_signature(modifier, value, seen) for modifier in modifiers])
+        elif value.type == 'ARMATURE':
+            signature.append([(bone.name, [tuple(row) for row in bone.matrix_local]) for bone in value.data.bones])
+            signature.append([(bone.name, [tuple(row) for row in bone.matrix]) for bone in value.pose.bones])
+        else:
+            # Curves, text, lattices, ...: their data isn't hashed, so a key could miss edits
+            raise _Unhashable(value.name)
+        return signature
+    if isinstance(value, bpy.types.Collection):
+        return ["Collection", value.name, [_value_signature(member, obj, seen) for member in value.all_objects]]
+    if isinstance(value, bpy.types.NodeTree):
+        return ["NodeTree", value.name, _node_tree_signature(value, obj, seen)]
+    if isinstance(value, bpy.types.ID):
+        return [type(value).__name__, value.name]
+    if hasattr(value, "to_list"):
+        # ID property arrays
+        return value.to_list()
+    if isinstance(value, bpy.types.bpy_struct):
+        return _rna_signature(value, obj, seen, nested=True)
+    try:
+        return [_value_signature(item, obj, seen) for item in value]
+    except TypeError:
+        return repr(value)
+
+def _rna_signature(struct, obj, seen, nested=False):
+    """All settings of a modifier or node that can change its result"""
+    signature = [struct.bl_rna.identifier]
+    for prop in struct.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in IGNORED_PROPERTIES or prop.type == 'COLLECTION':
+            continue
+        # Nested structs (curve mappings, ...) only contribute their own values
+        if nested and prop.type == 'POINTER':
+            continue
+        signature.append((identifier, _value_signature(getattr(struct, identifier, None), obj, seen)))
+
+    # Geometry Nodes modifier inputs are ID properties
+    if not nested and hasattr(struct, "keys"):
+        for key in sorted(struct.keys()):
+            signature.append((key, _value_signature(struct[key], obj, seen)))
+    return signature
+
+def _node_tree_signature(tree, obj, seen):
+    key = "NodeTree:" + tree.name
+    if key in seen:
+        return key
+    seen.add(key)
+
+    nodes = []
+    for node in sorted(tree.nodes, key=lambda node: node.name):
+        inputs = [(socket.identifier, _value_signature(getattr(socket, "default_value", None), obj, seen))
+                  for socket in node.inputs]
+        nodes.append((node.name, node.mute, _rna_signature(node, obj, seen), inputs))
+    links = sorted((link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier, link.is_muted)
+                   for link in tree.links)
+    interface = []
+    if hasattr(tree, "interface"):
+        for item in tree.interface.items_tree:
+            interface.append((item.item_type, getattr(item, "identifier", ""), getattr(item, "socket_type", ""),
+                              _value_signature(getattr(item, "default_value", None), obj, seen)))
+    return [nodes, links, interface]
+
+def stack_key(obj, scene):
+    """Key of an object's base mesh plus its viewport modifier stack, None if it can't be cached"""
+    if obj.type != 'MESH' or not any(modifier.show_viewport for modifier in obj.modifiers):
+        return None
+    return geometry_key(obj, scene)
+
+def geometry_key(obj, scene):
+    """Key of an object's evaluated geometry: base mesh plus viewport modifiers (if any).
+    None if the object is not a mesh or it or one of its operands has data that can't be hashed."""
+    if obj.type != 'MESH':
+        return None
+    modifiers = [modifier for modifier in obj.modifiers if modifier.show_viewport]
+
+    digest = hashlib.blake2b(digest_size=20)
+    if not _mesh_digest(obj, digest, _used_groups(modifiers)):
+        return None
+    seen = set()
+    try:
+        signature = [_rna_signature(modifier, obj, seen) for modifier in modifiers]
+    except _Unhashable:
+        return None
+    if any(modifier.type == 'NODES' for modifier in modifiers):
+        # Geometry Nodes can depend on the current frame
+        signature.append(("frame", scene.frame_current))
+    digest.update(repr(signature).encode())
+    return digest.hexdigest()
+
+def is_cached_mesh(mesh):
+    """keep predicate for datablocks.remove_new_orphans"""
+    return mesh.name.startswith(CACHE_PREFIX) and mesh.name in _entries.values()
+
+def _lookup(key):
+    name = _entries.get(key)
+    if name is None:
+        return None
+    mesh = bpy.data.meshes.get(name)
+    if mesh is None:
+        # Purged by the user (File > Clean Up)
+        del _entries[key]
+        return None
+    _entries.move_to_end(key)
+    return mesh
+
+def _store(key, mesh, max_entries):
+    mesh.name = CACHE_PREFIX + key
+    _entries[key] = mesh.name
+    while len(_entries) > max_entries:
+        _old_key, name = _entries.popitem(last=False)
+        old = bpy.data.meshes.get(name)
+        if old is not None and old.users == 0:
+            bpy.data.meshes.remove(old)
+
+def apply_cached(context, objects, max_entries=DEFAULT_MAX_ENTRIES):
+    """Replace the modifier stacks of (temporary) mesh objects with their evaluated result,
+    taken from the cache when the base mesh and modifiers are unchanged.
+
+    The objects lose their modifiers, so call this on export duplicates only.
+    Returns (hits, misses).
+    """
+    global _hits, _misses
+    if max_entries <= 0:
+        return 0, 0
+
+    hits = misses = 0
+    depsgraph = None
+    for obj in objects:
+        key = stack_key(obj, context.scene)
+        if key is None:
+            continue
+
+        cached = _lookup(key)
+        if cached is None:
+            if depsgraph is None:
+                depsgraph = context.evaluated_depsgraph_get()
+            evaluated = obj.evaluated_get(depsgraph)
+            cached = bpy.data.meshes.new_from_object(evaluated, preserve_all_data_layers=True, depsgraph=depsgraph)
+            _store(key, cached, max_entries)
+            misses += 1
+        else:
+            hits += 1
+
+        # The object gets its own copy, exports join and edit their meshes
+        base = obj.data
+        base_name = base.name
+        obj.data = cached.copy()
+        obj.modifiers.clear()
+        if base.users == 0:
+            bpy.data.meshes.remove(base)
+        obj.data.name = base_name
+
+    _hits += hits
+    _misses += misses
+    if hits or misses:
+        print(f"Modifier cache: {hits} reused, {misses} evaluated, {len(_entries)} cached stacks "
+              f"({_hits} reused / {_misses} evaluated this session)")
+    return hits, misses
+
+def clear():
+    """Drop all cached meshes"""
+    for name in _entries.values():
+        mesh = bpy.data.meshes.get(name)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+    _entries.clear()
+
+@persistent
+def on_load_post(*args):
+    # The cached meshes belonged to the previous file
+    _entries.clear()
+
+def register():
+    if on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_load_post)
+
+def unregister():
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    clear()
@@ -0,0 +1,86 @@
+import bpy
+
+from . import node_status
+
+# One shared material per node state instead of a new material for every node or path change
+NODE_MATERIALS = {
+    'NO_PATH': ("RedMaterial", (1, 0, 0, 1)),
+    'READY': ("GreyMaterial", (0.5, 0.5, 0.5, 1)),
+}
+
+def get_node_material(state):
+    """Return the shared material for a node state, creating it only once per file"""
+    name, color = NODE_MATERIALS[state]
+    mat = bpy.data.materials.get(name)
+    if mat is None:
+        mat = bpy.data.materials.new(name=name)
+        # Set the material's diffuse color (viewport colour of the node)
+        mat.diffuse_color = color
+
+        # For proper material setup in Blender 4.4
+        mat.use_nodes = True
+        principled = mat.node_tree.nodes.get("Principled BSDF")
+        if principled:
+            principled.inputs[0].default_value = color  # Base Color
+    return mat
+
+# Marker nodes share one small mesh per state (with the state material), a state change swaps the mesh
+MARKER_MESHES = {
+    'NO_PATH': "S2NodeMarker_NoPath",
+    'READY': "S2NodeMarker_Ready",
+}
+MARKER_RADIUS = 0.25
+
+def get_marker_mesh(state):
+    """Return the shared marker mesh (an octahedron) for a node state, creating it only once per file"""
+    name = MARKER_MESHES[state]
+    mesh = bpy.data.meshes.get(name)
+    if mesh is None:
+        r = MARKER_RADIUS
+        vertices = [(r, 0, 0), (-r, 0, 0), (0, r, 0), (0, -r, 0), (0, 0, r), (0, 0, -r)]
+        faces = [(0, 2, 4), (2, 1, 4), (1, 3, 4), (3, 0, 4),
+                 (2, 0, 5), (1, 2, 5), (3, 1, 5), (0, 3, 5)]
+        mesh = bpy.data.meshes.new(name)
+        mesh.from_pydata(vertices, [], faces)
+        mesh.update()
+        mesh.materials.append(get_node_material(state))
+    return mesh
+
+def assign_node_material(obj, state):
+    """Show a node state: swap in the shared marker mesh, or put the shared state
+    material in the node's first material slot"""
+    if node_status.is_marker_node(obj):
+        mesh = get_marker_mesh(state)
+        if obj.data != mesh:
+            obj.data = mesh
+        return
+
+    if not hasattr(obj.data, "materials"):
+        return
+
+    mat = get_node_material(state)
+    if obj.data.materials:
+        # Only write when it changes, every assignment tags the depsgraph
+        if obj.data.materials[0] != mat:
+            obj.data.materials[0] = mat
+    else:
+        obj.data.materials.append(mat)
+
+def merge_duplicate_node_materials():
+    """Remap old per-node copies (RedMaterial.001, GreyMaterial.004, ...) to the shared materials.
+
+    Returns the number of materials removed.
+    """
+    removed = 0
+    for state, (name, _color) in NODE_MATERIALS.items():
+        duplicates = [mat for mat in bpy.data.materials
+                      if mat.name.startswith(name + ".") and mat.name[len(name) + 1:].isdigit()]
+        if not duplicates:
+            continue
+
+        shared = get_node_material(state)
+        for mat in duplicates:
+            mat.user_remap(shared)
+            bpy.data.materials.remove(mat)
+            removed += 1
+    return removed
@@ -0,0 +1,70 @@
+import bpy
+
+from . import node_materials, node_status
+
+# Marker nodes: mesh objects that all share one small marker mesh per state.
+# Unlike text nodes there is no font curve for the depsgraph to re-evaluate, the
+# name lives in a custom property and the state colour comes from the shared mesh's material.
+
+def node_state(node):
+    return 'READY' if getattr(node, "relative_export_path", "") else 'NO_PATH'
+
+def new_marker_node(name, collection, state='NO_PATH'):
+    """Create a marker node called name and link it to collection"""
+    node = bpy.data.objects.new(name, node_materials.get_marker_mesh(state))
+    node[node_status.NODE_NAME_PROPERTY] = name
+    # The object name is drawn next to the marker instead of a text curve
+    node.show_name = True
+    node.hide_render = True
+    collection.objects.link(node)
+    return node
+
+def convert_text_node(text_node):
+    """Replace a text node with a marker node with the same name, export path,
+    transform, parent, collections and children. Returns the marker node."""
+    object_name = text_node.name
+    marker = bpy.data.objects.new(object_name + ".s2convert", node_materials.get_marker_mesh(node_state(text_node)))
+    marker[node_status.NODE_NAME_PROPERTY] = node_status.node_name(text_node)
+    marker.show_name = True
+    marker.hide_render = True
+    for collection in text_node.users_collection:
+        collection.objects.link(marker)
+
+    # Same transform, children keep their parent inverse so nothing moves
+    marker.parent = text_node.parent
+    marker.matrix_parent_inverse = text_node.matrix_parent_inverse.copy()
+    marker.matrix_basis = text_node.matrix_basis.copy()
+    for child in list(text_node.children):
+        parent_inverse = child.matrix_parent_inverse.copy()
+        child.parent = marker
+        child.matrix_parent_inverse = parent_inverse
+
+    # Export settings and the last export time
+    for key in ("custom_relative_path", "custom_file_path", "s2_last_export"):
+        if key in text_node:
+            marker[key] = text_node[key]
+    marker["relative_export_path"] = text_node.relative_export_path
+
+    selected = text_node.select_get()
+    curve = text_node.data
+    bpy.data.objects.remove(text_node, do_unlink=True)
+    if curve is not None and curve.users == 0:
+        bpy.data.curves.remove(curve)
+
+    marker.name = object_name
+    if selected and marker.name in bpy.context.view_layer.objects:
+        marker.select_set(True)
+    return marker
+
+def convert_text_nodes(context):
+    """Convert every text node in the file. Returns the number of converted nodes."""
+    active_name = context.view_layer.objects.active.name if context.view_layer.objects.active else None
+    text_nodes = [obj for obj in bpy.data.objects if obj.type == 'FONT']
+
+    for text_node in text_nodes:
+        convert_text_node(text_node)
+
+    if active_name is not None and active_name in context.view_layer.objects:
+        context.view_layer.objects.active = context.view_layer.objects[active_name]
+    node_status.invalidate()
+    return len(text_nodes)
@@ -0,0 +1,161 @@
+import bpy
+from mathutils import Vector
+from mathutils.kdtree import KDTree
+from bpy.app.handlers import persistent
+
+from . import node_status
+
+# Spatial index of the nodes for region queries (box, collection bounds, radius).
+# Every node is stored with its world bounding box (node plus all members); the KD-tree holds
+# the box centers. A query searches the region grown by the largest node half-diagonal, so
+# every node whose box can touch the region is found, then keeps the boxes that overlap it.
+# Bounds are updated per node from depsgraph updates; the KD-tree itself is immutable, so it
+# is rebuilt (O(n log n), milliseconds for thousands of nodes) on the next query after a change.
+_bounds = {}            # node name -> (min, max) Vectors, the node's world bounds
+_tree = None
+_tree_names = []        # KD-tree index -> node name
+_tree_dirty = True
+_max_radius = 0.0       # largest half-diagonal of the bounds in the tree
+_built = False
+_object_count = -1
+
+def object_bounds(objects):
+    """World space (min, max) corners of the bounding boxes of objects, None if there are none"""
+    low = Vector((float("inf"),) * 3)
+    high = Vector((float("-inf"),) * 3)
+    found = False
+    for obj in objects:
+        matrix = obj.matrix_world
+        if obj.type in ('MESH', 'CURVE', 'FONT', 'SURFACE', 'META'):
+            corners = [matrix @ Vector(corner) for corner in obj.bound_box]
+        else:
+            corners = [matrix.translation]
+        for corner in corners:
+            low.x, low.y, low.z = min(low.x, corner.x), min(low.y, corner.y), min(low.z, corner.z)
+            high.x, high.y, high.z = max(high.x, corner.x), max(high.y, corner.y), max(high.z, corner.z)
+        found = True
+    return (low, high) if found else None
+
+def node_bounds(node, index=None):
+    """World (min, max) bounds of a node and everything parented under it"""
+    return object_bounds([node] + node_status.gather_members(node, index).objects())
+
+def _store(node, index=None):
+    global _tree_dirty
+    _bounds[node.name] = node_bounds(node, index)
+    _tree_dirty = True
+
+def rebuild():
+    """Recompute the bounds of all nodes (first use, file load, objects added or removed)"""
+    global _built, _object_count, _tree_dirty
+    _bounds.clear()
+    index = node_status.children_index(bpy.data.objects)
+    for status in node_status.all_statuses():
+        node = bpy.data.objects.get(status.name)
+        if node is not None:
+            _store(node, index)
+    _object_count = len(bpy.data.objects)
+    _built = True
+    _tree_dirty = True
+
+def ensure_tree():
+    """The KD-tree of node bounds centers, rebuilt only if a node moved since the last query"""
+    global _tree, _tree_names, _tree_dirty, _max_radius
+    if not _built or _object_count != len(bpy.data.objects):
+        rebuild()
+    if _tree_dirty or _tree is None:
+        _tree_names = [name for name in _bounds if name in bpy.data.objects]
+        _tree = KDTree(len(_tree_names))
+        _max_radius = 0.0
+        for index, name in enumerate(_tree_names):
+            low, high = _bounds[name]
+            _tree.insert((low + high) / 2, index)
+            _max_radius = max(_max_radius, (high - low).length / 2)
+        _tree.balance()
+        _tree_dirty = False
+    return _tree
+
+def _objects(names):
+    return [bpy.data.objects[name] for name in names if name in bpy.data.objects]
+
+def _box_distance(point, low, high):
+    """Distance from point to the box low..high, 0 inside it"""
+    return Vector([max(low[axis] - point[axis], 0.0, point[axis] - high[axis]) for axis in range(3)]).length
+
+def nodes_in_radius(center, radius):
+    """Nodes whose bounds come within radius of center, nearest first"""
+    center = Vector(center)
+    tree = ensure_tree()
+    found = []
+    for _co, index, _distance in tree.find_range(center, radius + _max_radius):
+        name = _tree_names[index]
+        distance = _box_distance(center, *_bounds[name])
+        if distance <= radius:
+            found.append((distance, index, name))
+    return _objects([name for _distance, _index, name in sorted(found)])
+
+def nodes_in_box(low, high):
+    """Nodes whose bounds overlap the axis aligned box low..high"""
+    low, high = Vector(low), Vector(high)
+    tree = ensure_tree()
+    # The box fits in the sphere around its center, every node box touching it has its
+    # center within the largest node half-diagonal of that sphere
+    found = tree.find_range((low + high) / 2, (high - low).length / 2 + _max_radius)
+    names = []
+    for _co, index, _distance in sorted(found, key=lambda item: item[1]):
+        node_low, node_high = _bounds[_tree_names[index]]
+        if all(node_low[axis] <= high[axis] and low[axis] <= node_high[axis] for axis in range(3)):
+            names.append(_tree_names[index])
+    return _objects(names)
+
+def nodes_in_object_bounds(obj):
+    """Nodes overlapping the world bounding box of an object, e.g. a box drawn around a building"""
+    bounds = object_bounds([obj])
+    return [node for node in nodes_in_box(*bounds) if node != obj] if bounds else []
+
+def nodes_in_collection_bounds(collection):
+    """Nodes overlapping the combined bounds of a collection's objects (nodes in it included)"""
+    bounds = object_bounds(collection.all_objects)
+    return nodes_in_box(*bounds) if bounds else []
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    """Move the nodes whose own transform or members changed"""
+    if not _built or node_status.is_suspended():
+        return
+    if _object_count != len(bpy.data.objects):
+        # Rebuilt on the next query
+        return
+
+    # Moving a node updates all its members, recompute every node once
+    moved = {}
+    for update in depsgraph.updates:
+        if not (update.is_updated_transform or update.is_updated_geometry):
+            continue
+        data = update.id
+        if not isinstance(data, bpy.types.Object):
+            continue
+        node = node_status.find_node(data.original)
+        if node is not None:
+            moved[node.name] = node
+    for node in moved.values():
+        _store(node)
+
+@persistent
+def on_load_post(*args):
+    global _built, _tree
+    _bounds.clear()
+    _tree = None
+    _built = False
+
+def register():
+    if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    if on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_load_post)
+
+def unregister():
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
@@ -0,0 +1,516 @@
+import bpy
+import os
+import time
+import fnmatch
+from contextlib import contextmanager
+from bpy.app.handlers import persistent
+
+# Cached per-node export status, so panels and lists never walk the scene while drawing.
+# Entries are recomputed only for nodes touched by a depsgraph update.
+_status = {}            # node name -> NodeStatus
+_dirty = set()          # names of nodes changed since their last export
+_edits = {}             # node name -> _edit_count of the last change to its members
+_edit_count = 0
+_version = 0            # bumped whenever any cached status changes
+_built = False
+_object_count = -1
+_base_path = ""
+_suspended = 0
+_filter_cache = {}
+# Background build after a file load: (node names, next position, names known before)
+_pending = None
+_index = None           # ChildIndex of the scene, from the last scan and kept up to date since
+
+# Nodes computed per timer step of a background build, and the pause between steps
+BUILD_STEP = 500
+BUILD_INTERVAL = 0.01
+
+class NodeStatus:
+    """Validation state of one node, as shown in the node dashboard"""
+    __slots__ = ("name", "relative_path", "export_path", "has_collision", "render_count",
+                 "missing_materials", "materials", "last_export")
+
+    def __init__(self, name, relative_path, export_path, has_collision, render_count,
+                 missing_materials, materials, last_export):
+        self.name = name
+        self.relative_path = relative_path
+        self.export_path = export_path
+        self.has_collision = has_collision
+        self.render_count = render_count
+        self.missing_materials = missing_materials
+        self.materials = materials
+        self.last_export = last_export
+
+    @property
+    def has_path(self):
+        return bool(self.export_path)
+
+    @property
+    def vmat_ok(self):
+        return self.render_count > 0 and not self.missing_materials
+
+    @property
+    def dirty(self):
+        return self.name in _dirty
+
+    @property
+    def has_problems(self):
+        return not (self.has_path and self.has_collision and self.vmat_ok)
+
+    @property
+    def last_export_text(self):
+        if not self.last_export:
+            return "Never"
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(self.last_export))
+
+    def key(self):
+        return (self.relative_path, self.export_path, self.has_collision, self.render_count,
+                self.missing_materials, self.materials, self.last_export)
+
+# Marker nodes keep their name in this custom property (text nodes show it as their text)
+NODE_NAME_PROPERTY = "s2_node_name"
+
+def is_node(obj):
+    """Nodes are the marker or text objects created by Create Node"""
+    return obj is not None and (obj.type == 'FONT' or is_marker_node(obj))
+
+def is_marker_node(obj):
+    """Marker nodes are mesh objects sharing one small marker mesh, see node_objects"""
+    return obj is not None and obj.type == 'MESH' and NODE_NAME_PROPERTY in obj
+
+def node_name(node):
+    """Model name of a node: the text of a text node, the name property of a marker node"""
+    if node.type == 'FONT':
+        name = node.data.body.strip()
+    else:
+        name = str(node.get(NODE_NAME_PROPERTY, "")).strip()
+    # Fallback to the object name without Blender's .001 suffix
+    return name or node.name.split(".")[0]
+
+def find_node(obj):
+    """Return the node an object belongs to (the object itself if it is a node)"""
+    while obj is not None:
+        if is_node(obj):
+            return obj
+        obj = obj.parent
+    return None
+
+def children_index(objects):
+    """Parent name -> child objects, built in one pass.
+
+    Object.children scans every object in the file on each access, so walks over
+    many nodes use this index instead.
+    """
+    index = {}
+    for obj in objects:
+        if obj.parent is not None:
+            index.setdefault(obj.parent.name, []).append(obj)
+    return index
+
+class ChildIndex:
+    """children_index() that follows parent changes instead of being rebuilt.
+
+    Only holds names, so it stays valid across undo; get() resolves them to objects.
+    """
+
+    def __init__(self, objects):
+        self.parents = {}       # object name -> parent name, None for top level objects
+        self.children = {}      # parent name -> names of its children
+        for obj in objects:
+            self._link(obj.name, obj.parent.name if obj.parent is not None else None)
+
+    def _link(self, name, parent):
+        self.parents[name] = parent
+        if parent is not None:
+            self.children.setdefault(parent, set()).add(name)
+
+    def update(self, obj):
+        """Follow a parent change of obj. Returns False if obj is not in the index (added or renamed)."""
+        if obj.name not in self.parents:
+            return False
+        parent = obj.parent.name if obj.parent is not None else None
+        previous = self.parents[obj.name]
+        if parent != previous:
+            if previous is not None:
+                self.children[previous].discard(obj.name)
+            self._link(obj.name, parent)
+        return True
+
+    def get(self, name, default=()):
+        names = self.children.get(name)
+        if not names:
+            return default
+        objects = bpy.data.objects
+        return [objects[child] for child in sorted(names) if child in objects]
+
+class NodeMembers:
+    """Everything parented (at any depth) under a node, with node-relative matrices.
+
+    render    -- (object, matrix) of the meshes that make up the model
+    collision -- (object, matrix) of the '_coll' objects
+    other     -- (object, matrix) of the rest, e.g. the empties meshes are parented to
+    """
+    __slots__ = ("render", "collision", "other")
+
+    def __init__(self):
+        self.render = []
+        self.collision = []
+        self.other = []
+
+    def objects(self):
+        return [obj for group in (self.render, self.collision, self.other) for obj, _matrix in group]
+
+def gather_members(node, index=None):
+    """Walk the whole subtree of a node once. Nested nodes (and what is under them) are
+    nodes of their own and left out. index -- optional children_index() to avoid Object.children."""
+    def children(obj):
+        return index.get(obj.name, ()) if index is not None else obj.children
+
+    to_node = node.matrix_world.inverted_safe()
+    members = NodeMembers()
+    stack = list(children(node))
+    while stack:
+        obj = stack.pop()
+        if is_node(obj):
+            continue
+        entry = (obj, to_node @ obj.matrix_world)
+        if '_coll' in obj.name:
+            members.collision.append(entry)
+        elif obj.type == 'MESH':
+            members.render.append(entry)
+        else:
+            members.other.append(entry)
+        stack.extend(children(obj))
+
+    # Same order as Object.children (by name), the first render mesh names the joined model
+    for group in (members.render, members.collision, members.other):
+        group.sort(key=lambda entry: entry[0].name)
+    return members
+
+def _read_base_path(context):
+    try:
+        return context.preferences.addons[__name__.split('.')[0]].preferences.addons_path
+    except (KeyError, AttributeError):
+        return ""
+
+def get_base_path():
+    """Addons Path preference, cached until the preference changes"""
+    if not _built and _pending is None:
+        # Not worth a scene scan, the panel only needs the preference
+        return _read_base_path(bpy.context)
+    return _base_path
+
+def compute_status(node, base_path, index=None):
+    """Build the NodeStatus for a node from its members (see gather_members)"""
+    relative_path = getattr(node, "relative_export_path", "")
+    if base_path and relative_path:
+        export_path = os.path.join(base_path, relative_path)
+    else:
+        export_path = node.get("custom_file_path", "") if not relative_path else ""
+
+    members = gather_members(node, index)
+    has_collision = bool(members.collision)
+    render_count = 0
+    missing = []
+    materials = set()
+    for child, _matrix in members.render:
+        render_count += 1
+        child_materials = [slot.material.name for slot in child.material_slots if slot.material]
+        if child_materials:
+            materials.update(child_materials)
+        else:
+            missing.append(child.name)
+
+    return NodeStatus(node.name, relative_path, export_path, has_collision, render_count,
+                      tuple(missing), frozenset(materials), node.get("s2_last_export", 0.0))
+
+def _store(node, index=None):
+    """Recompute one node. Returns True if its cached status changed."""
+    status = compute_status(node, _base_path, index)
+    old = _status.get(node.name)
+    if old is not None and old.key() == status.key():
+        return False
+    _status[node.name] = status
+    return True
+
+def _bump():
+    global _version
+    _version += 1
+    _filter_cache.clear()
+
+def _begin_build(context=None):
+    """Start a full scan: read the preference, index the scene and list its nodes"""
+    global _built, _object_count, _base_path, _pending, _index
+    _base_path = _read_base_path(context or bpy.context)
+    # A restarted build keeps the dirty state of the names it already knew
+    known = set(_status) | (_pending[2] if _pending is not None else set())
+    _status.clear()
+    objects = bpy.data.objects
+    _index = ChildIndex(objects)
+    _pending = ([obj.name for obj in objects if is_node(obj)], 0, known)
+    _object_count = len(objects)
+    _built = False
+
+def _build_step(limit=None):
+    """Compute up to limit nodes of the started scan (all if None). Returns True when it is done."""
+    global _built, _pending
+    names, position, known = _pending
+    end = len(names) if limit is None else min(position + limit, len(names))
+    for name in names[position:end]:
+        obj = bpy.data.objects.get(name)
+        if obj is None or not is_node(obj):
+            continue
+        _store(obj, _index)
+        # Nodes seen for the first time are dirty until they have been exported
+        if name not in known and not obj.get("s2_last_export"):
+            _dirty.add(name)
+
+    if end < len(names):
+        _pending = (names, end, known)
+        _bump()
+        return False
+    _pending = None
+    _dirty.intersection_update(_status)
+    _built = True
+    _bump()
+    return True
+
+def rebuild(context=None):
+    """Full scan of all nodes. Only runs on first use, file load and object add/remove."""
+    _begin_build(context)
+    _build_step()
+
+def ensure_built():
+    if _object_count != len(bpy.data.objects):
+        rebuild()
+    elif _pending is not None:
+        # Finish a background build now, the caller needs every node
+        _build_step()
+    elif not _built:
+        rebuild()
+
+def _tag_redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+def scan_step():
+    """One step of the background scan, what one timer tick costs. Returns True when every node is scanned."""
+    if _built:
+        return True
+    if _pending is None or _object_count != len(bpy.data.objects):
+        _begin_build()
+        return False
+    return _build_step(BUILD_STEP)
+
+def _build_timer():
+    if not scan_step():
+        return BUILD_INTERVAL
+    # The dashboard shows every node now
+    _tag_redraw()
+    return None
+
+def build_in_background(first_interval=0.0):
+    """Scan the nodes in small timer steps, so a large file opens without a stall.
+    Anything that needs all nodes before the scan is done finishes it at once (ensure_built)."""
+    if not _built and not bpy.app.timers.is_registered(_build_timer):
+        bpy.app.timers.register(_build_timer, first_interval=first_interval)
+
+def invalidate():
+    """Drop the cache, it is rebuilt on next access (e.g. after the Addons Path changed)"""
+    global _built, _pending
+    _built = False
+    _pending = None
+    _filter_cache.clear()
+
+def get_status(name):
+    ensure_built()
+    return _status.get(name)
+
+def peek_status(name):
+    """Status for drawing: from the cache, or computed for this node alone while the
+    scan still runs in the background (never waits for the full scan)"""
+    if _built and _object_count == len(bpy.data.objects):
+        return _status.get(name)
+    build_in_background()
+    status = _status.get(name)
+    if status is None:
+        obj = bpy.data.objects.get(name)
+        if is_node(obj):
+            status = compute_status(obj, get_base_path())
+    return status
+
+def all_statuses():
+    ensure_built()
+    return [status for name, status in _status.items() if name in bpy.data.objects]
+
+def dirty_nodes():
+    """Node objects changed since their last export"""
+    ensure_built()
+    return [bpy.data.objects[name] for name in sorted(_dirty) if name in bpy.data.objects]
+
+def _edited(name):
+    global _edit_count
+    _edit_count += 1
+    _edits[name] = _edit_count
+
+def edit_count():
+    """Number of node edits this session, changes whenever any node is edited"""
+    return _edit_count
+
+def last_edit(name):
+    """edit_count() at the last edit of a node, 0 if it wasn't edited this session"""
+    return _edits.get(name, 0)
+
+def mark_dirty(node):
+    _edited(node.name)
+    if node.name not in _dirty:
+        _dirty.add(node.name)
+        _bump()
+
+def mark_exported(node):
+    """Called by the exporter after a node was written"""
+    node["s2_last_export"] = time.time()
+    _dirty.discard(node.name)
+    _store(node)
+    _bump()
+
+@contextmanager
+def suspended():
+    """Ignore depsgraph updates caused by the exporter's own temp objects"""
+    global _suspended
+    _suspended += 1
+    try:
+        yield
+    finally:
+        _suspended -= 1
+
+def is_suspended():
+    return _suspended > 0
+
+def filter_flags(filter_name, problems_only, invert, sort_by_name, flag):
+    """UIList filter for bpy.data.objects, cached until a status changes.
+    While the background scan runs, it lists the nodes scanned so far."""
+    if not _built or _object_count != len(bpy.data.objects):
+        build_in_background()
+    key = (_version, len(bpy.data.objects), filter_name, problems_only, invert, sort_by_name)
+    cached = _filter_cache.get(key)
+    if cached is not None:
+        return cached
+
+    pattern = f"*{filter_name.lower()}*" if filter_name else None
+    flags = []
+    for obj in bpy.data.objects:
+        status = _status.get(obj.name)
+        visible = status is not None
+        if visible and pattern:
+            visible = fnmatch.fnmatchcase(obj.name.lower(), pattern) != invert
+        if visible and problems_only:
+            visible = status.has_problems or status.dirty
+        flags.append(flag if visible else 0)
+
+    order = []
+    if sort_by_name:
+        names = [obj.name for obj in bpy.data.objects]
+        ranked = sorted(range(len(names)), key=names.__getitem__)
+        order = [0] * len(names)
+        for position, index in enumerate(ranked):
+            order[index] = position
+
+    _filter_cache.clear()
+    _filter_cache[key] = (flags, order)
+    return flags, order
+
+def material_nodes(material_names, existing):
+    """Names of the cached nodes using one of material_names, or a material not in existing"""
+    return [name for name, status in _status.items()
+            if not status.materials.isdisjoint(material_names) or not status.materials <= existing]
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    """Recompute only the nodes whose members were updated"""
+    if _suspended or (not _built and _pending is None):
+        return
+
+    if _object_count != len(bpy.data.objects):
+        # Objects were added or deleted, the set of nodes may have changed
+        if _built:
+            rebuild()
+        else:
+            _begin_build()
+        return
+
+    global _index
+    if _index is None:
+        _index = ChildIndex(bpy.data.objects)
+
+    changed = False
+    changed_materials = set()
+    for update in depsgraph.updates:
+        data = update.id
+        if isinstance(data, bpy.types.Material):
+            changed_materials.add(data.original.name)
+            continue
+        if not isinstance(data, bpy.types.Object):
+            continue
+
+        obj = data.original
+        # Follow parent changes; a name the index doesn't know is a renamed object, index again
+        previous = _index.parents.get(obj.name)
+        if not _index.update(obj):
+            _index = ChildIndex(bpy.data.objects)
+        elif previous != _index.parents[obj.name] and previous in bpy.data.objects:
+            # The node obj was unparented from lost a member
+            old_node = find_node(bpy.data.objects[previous])
+            if old_node is not None:
+                _edited(old_node.name)
+                _dirty.add(old_node.name)
+                changed |= _store(old_node, _index)
+
+        node = find_node(obj)
+        if node is None:
+            continue
+
+        # Geometry, material or transform changes of members (or editing the node text) need a re-export
+        if obj is not node or update.is_updated_geometry:
+            if update.is_updated_geometry or update.is_updated_transform or update.is_updated_shading:
+                _edited(node.name)
+                if node.name not in _dirty:
+                    _dirty.add(node.name)
+                    changed = True
+        changed |= _store(node, _index)
+
+    if changed_materials:
+        # Re-check the nodes that use a changed material, or a material name that is gone (renamed)
+        existing = {material.name for material in bpy.data.materials}
+        for name in material_nodes(changed_materials, existing):
+            node = bpy.data.objects.get(name)
+            if node is not None:
+                changed |= _store(node, _index)
+
+    if changed:
+        _bump()
+
+@persistent
+def on_load_post(*args):
+    _status.clear()
+    _dirty.clear()
+    _edits.clear()
+    invalidate()
+    # Timers are dropped on load; scan the new file in steps once the UI is up
+    build_in_background(first_interval=BUILD_INTERVAL)
+
+def register():
+    if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    if on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_load_post)
+
+def unregister():
+    if bpy.app.timers.is_registered(_build_timer):
+        bpy.app.timers.unregister(_build_timer)
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
@@ -0,0 +1,168 @@
+"""
+Prop placement export for Hammer
+
+Writes every node as a prop_static/prop_dynamic entity into a .vmap prefab, at the
+node's position and heading and pointing at the model the node exports. Add the
+prefab to a map in Hammer (or open it and copy the entities) instead of placing
+every prop again by hand.
+"""
+
+import os
+import math
+
+import bpy
+from mathutils import Matrix
+
+from . import dmx_export, dmx_writer, node_status
+
+# Same scale and node model axes as the node export
+EXPORT_SCALE = 0.393701
+NODE_AXIS_FORWARD = 'X'
+NODE_AXIS_UP = 'Y'
+
+VMAP_FORMAT_VERSION = 29
+PROP_CLASSES = ('prop_static', 'prop_dynamic')
+
+# Optional per-node override of the scene's entity class
+ENTITY_CLASS_PROPERTY = "s2_entity_class"
+
+def model_path(relative_path, name):
+    """Hammer asset path of a node's model: export folder (relative to the addon content) + name.vmdl"""
+    folder = relative_path.replace("\\", "/").strip("/")
+    return f"{folder}/{name}.vmdl" if folder else f"{name}.vmdl"
+
+def geometry_key(node, index=None):
+    """Nodes with equal keys export identical models: the same (linked) meshes at the same
+    offsets, and the same rotation and scale baked in (the export only resets location and heading)"""
+    members = node_status.gather_members(node, index)
+    children = []
+    for child, node_matrix in members.render + members.collision:
+        if child.type != 'MESH':
+            continue
+        matrix = tuple(round(value, 5) for row in node_matrix for value in row)
+        modifiers = tuple((modifier.type, modifier.name) for modifier in child.modifiers if modifier.show_viewport)
+        materials = tuple(slot.material.name if slot.material else "" for slot in child.material_slots)
+        children.append(('_coll' in child.name, child.data.name, matrix, modifiers, materials))
+    if not children:
+        return None
+    rotation = node.matrix_world.to_euler('XYZ')
+    baked = (round(rotation.x, 5), round(rotation.y, 5), tuple(round(value, 5) for value in node.matrix_world.to_scale()))
+    return (baked, tuple(sorted(children)))
+
+def node_placement(node, model_rotation):
+    """(origin, angles) of a node in Hammer units and degrees (pitch, yaw, roll)"""
+    world = node.matrix_world
+    location = world.translation * (EXPORT_SCALE * dmx_export.FBX_UNITS_PER_METER)
+    # Only the heading is left out of the exported model, see _export_nodes
+    heading = Matrix.Rotation(world.to_euler('XYZ').z, 3, 'Z')
+    # Source angles: yaw about Z, then pitch about Y, then roll about X (Blender's XYZ euler)
+    euler = (heading @ model_rotation).to_euler('XYZ')
+    angles = (math.degrees(euler.y), math.degrees(euler.z), math.degrees(euler.x))
+    return tuple(location), angles
+
+def _format(values):
+    return " ".join("%.6g" % (0.0 if abs(value) < 1e-6 else value) for value in values)
+
+def _map_node(element_type, origin=(0.0, 0.0, 0.0), angles=(0.0, 0.0, 0.0), node_id=0):
+    """Attributes every CMapNode has"""
+    element = dmx_writer.DmElement("", element_type)
+    element.set("origin", "vector3", origin)
+    element.set("angles", "qangle", angles)
+    element.set("scales", "vector3", (1.0, 1.0, 1.0))
+    element.set("nodeID", "int", node_id)
+    element.set("children", "element_array", [])
+    element.set("editorOnly", "bool", False)
+    element.set("force_hidden", "bool", False)
+    element.set("transformLocked", "bool", False)
+    element.set("variableTargetKeys", "string_array", [])
+    element.set("variableNames", "string_array", [])
+    return element
+
+def _entity_properties(**values):
+    properties = dmx_writer.DmElement("", "EditGameClassProps")
+    for key, value in values.items():
+        properties.set(key, "string", value)
+    return properties
+
+def build_prefab(placements):
+    """CMapRootElement with one entity per (classname, model, origin, angles)"""
+    world = _map_node("CMapWorld", node_id=1)
+    world.set("entity_properties", "element", _entity_properties(classname="worldspawn"))
+    entities = world["children"]
+    for index, (classname, model, origin, angles) in enumerate(placements):
+        entity = _map_node("CMapEntity", origin, angles, node_id=index + 2)
+        entity.set("hitNormal", "vector3", (0.0, 0.0, 1.0))
+        entity.set("isProceduralEntity", "bool", False)
+        entity.set("entity_properties", "element", _entity_properties(
+            classname=classname, model=model, origin=_format(origin), angles=_format(angles), scales="1 1 1"))
+        entities.append(entity)
+
+    root = dmx_writer.DmElement("", "CMapRootElement")
+    root.set("isprefab", "bool", True)
+    root.set("editorbuild", "int", 0)
+    root.set("editorversion", "int", 400)
+    root.set("itemFile", "string", "")
+    root.set("world", "element", world)
+    return root
+
+def collect_placements(nodes, default_class):
+    """Placements of the given nodes in one pass over them.
+
+    Nodes sharing their geometry with a node that has an export path reuse its model,
+    even if they come first or have no path of their own.
+    Returns (placements, models, skipped node names).
+    """
+    # Rotation of the node models in Hammer space, see dmx_export.conversion_matrix
+    conversion = dmx_export.conversion_matrix(EXPORT_SCALE, NODE_AXIS_FORWARD, NODE_AXIS_UP)
+    model_rotation = conversion.to_3x3().normalized().inverted()
+
+    index = node_status.children_index(bpy.data.objects)
+
+    models = {}     # geometry key -> model path
+    pending = {}    # geometry key -> (node name, placement) waiting for a model path
+    placements = []
+    skipped = []
+    for node in nodes:
+        status = node_status.get_status(node.name)
+        key = geometry_key(node, index)
+        classname = node.get(ENTITY_CLASS_PROPERTY, default_class)
+        if classname not in PROP_CLASSES:
+            classname = default_class
+        origin, angles = node_placement(node, model_rotation)
+
+        model = models.get(key) if key is not None else None
+        if model is None and status is not None and status.relative_path:
+            model = model_path(status.relative_path, node_status.node_name(node))
+            if key is not None:
+                models[key] = model
+                # Earlier nodes with the same geometry use this model too
+                for _name, placement in pending.pop(key, []):
+                    placement[1] = model
+                    placements.append(placement)
+
+        if model is not None:
+            placements.append([classname, model, origin, angles])
+        elif key is not None:
+            pending.setdefault(key, []).append((node.name, [classname, None, origin, angles]))
+        else:
+            skipped.append(node.name)
+
+    for waiting in pending.values():
+        skipped.extend(name for name, _placement in waiting)
+    return [tuple(placement) for placement in placements], sorted({placement[1] for placement in placements}), skipped
+
+def default_prefab_path(base_path, blend_filepath):
+    name = os.path.splitext(os.path.basename(blend_filepath))[0] or "untitled"
+    return os.path.join(base_path, "maps", "prefabs", f"{name}_props.vmap")
+
+def export_placements(filepath, nodes, default_class='prop_static', stable=False):
+    """Write the nodes as a Hammer prefab. Returns (entity count, model count, skipped node names)."""
+    placements, models, skipped = collect_placements(nodes, default_class)
+    root = build_prefab(placements)
+    if stable:
+        dmx_writer.assign_stable_ids(root)
+    folder = os.path.dirname(filepath)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    dmx_writer.write_dmx(filepath, root, "keyvalues2", "vmap", VMAP_FORMAT_VERSION)
+    return len(placements), len(models), skipped
@@ -0,0 +1,50 @@
+import bpy
+from bpy.types import Operator
+
+from . import node_status, prop_placement
+
+class ExportPropPlacementOperator(Operator):
+    bl_idname = "object.export_prop_placement"
+    bl_label = "Export Prop Placement"
+    bl_description = "Write the selected nodes (all nodes if none are selected) as prop entities into a Hammer prefab (.vmap)"
+
+    def execute(self, context):
+        settings = context.scene.export_fbx
+        preferences = context.preferences.addons[__name__.split('.')[0]].preferences
+
+        filepath = bpy.path.abspath(settings.placement_path) if settings.placement_path else ""
+        if not filepath:
+            if not preferences.addons_path:
+                self.report({'ERROR'}, "Set a Placement File or the Addons Path in addon preferences")
+                return {'CANCELLED'}
+            filepath = prop_placement.default_prefab_path(preferences.addons_path, bpy.data.filepath)
+        if not filepath.lower().endswith(".vmap"):
+            filepath += ".vmap"
+
+        # Node registry order, no scene walk
+        selected = {obj.name for obj in context.selected_objects if node_status.is_node(obj)}
+        nodes = [bpy.data.objects[status.name] for status in node_status.all_statuses()
+                 if not selected or status.name in selected]
+        if not nodes:
+            self.report({'WARNING'}, "No nodes to place")
+            return {'CANCELLED'}
+
+        try:
+            entities, models, skipped = prop_placement.export_placements(
+                filepath, nodes, settings.placement_class, settings.deterministic_output)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write {filepath}: {e}")
+            return {'CANCELLED'}
+
+        for name in skipped:
+            print(f"Prop placement: skipped {name}, it has no export path and shares no geometry with a node that has one")
+        level = {'WARNING'} if skipped else {'INFO'}
+        self.report(level, f"Placed {entities} props using {models} models in {filepath}"
+                           + (f", {len(skipped)} nodes skipped" if skipped else ""))
+        return {'FINISHED'}
+
+def register():
+    bpy.utils.register_class(ExportPropPlacementOperator)
+
+def unregister():
+    bpy.utils.unregister_class(ExportPropPlacementOperator)
@@ -0,0 +1,56 @@
+"""
+Writes DMX models from mesh snapshots, outside Blender
+
+Plain Python + NumPy. Blender captures the meshes into a snapshot (shared memory or an
+.s2snap file, see mesh_snapshot.py) and this process turns it into a DMX without
+opening the .blend file:
+
+    python snapshot_worker.py --shm psm_1a2b3c --out C:/content/models/crate.dmx
+    python snapshot_worker.py --file crate.s2snap --out crate.dmx --encoding keyvalues2
+"""
+
+import os
+import sys
+import types
+import argparse
+import importlib
+
+# Package name the addon's Blender-free modules are loaded under
+CORE_PACKAGE = "s2_exporter_core"
+
+def load_core():
+    """Import the addon's Blender-free modules without running its __init__ (which needs bpy)"""
+    if CORE_PACKAGE not in sys.modules:
+        package = types.ModuleType(CORE_PACKAGE)
+        package.__path__ = [os.path.dirname(os.path.abspath(__file__))]
+        sys.modules[CORE_PACKAGE] = package
+    return (importlib.import_module(CORE_PACKAGE + ".mesh_snapshot"),
+            importlib.import_module(CORE_PACKAGE + ".dmx_model"))
+
+def write_snapshot_dmx(filepath, shm_name=None, snapshot_file=None, encoding="binary", stable=False):
+    """Write the meshes of one snapshot as a static DMX model. Returns filepath."""
+    mesh_snapshot, dmx_model = load_core()
+    if shm_name:
+        snapshot = mesh_snapshot.open_shared(shm_name)
+    else:
+        snapshot = mesh_snapshot.open_file(snapshot_file)
+    with snapshot:
+        # The writer only reads the arrays, they stay views into the snapshot
+        return dmx_model.write_file(filepath, snapshot.meshes, encoding, stable)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a DMX model from a mesh snapshot")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--shm", help="name of the shared memory block")
+    source.add_argument("--file", help="path of an .s2snap file")
+    parser.add_argument("--out", required=True, help="DMX file to write")
+    parser.add_argument("--encoding", choices=("binary", "keyvalues2"), default="binary")
+    parser.add_argument("--stable", action="store_true", help="deterministic output")
+    args = parser.parse_args(argv)
+
+    write_snapshot_dmx(args.out, args.shm, args.file, args.encoding, args.stable)
+    print(args.out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+Static mesh export (Export Static Geometry)
+
+Duplicates the selected objects into the TEMPEXPORT collection, gets the copies ready
+(curves and text converted, vmat paths, modifiers applied, greybox UVs, edge split) and writes them as one
+combined_export.fbx or .dmx into the static mesh export path. With Stream Static
+Export on, DMX exports copy and write one object at a time instead (stream_dmx).
+"""
+
+import bpy
+import os
+
+from . import attribute_filter, buffer_cache, content_store, datablocks, dmx_export, dmx_model, fbx_export_operator, material_export, mesh_buffers, modifier_cache, node_status, uv_projection, validation
+
+TEMP_COLLECTION = "TEMPEXPORT"
+# Blender units -> Hammer units, as FBX global_scale
+EXPORT_SCALE = 0.393701
+
+def add_vmat_properties_to_objects(objects):
+    """Add FBX_vmatPath custom property to objects based on their materials"""
+    for obj in objects:
+        if obj.type == 'MESH' and obj.data.materials:
+            # Get the first material (primary material)
+            material = obj.data.materials[0]
+            if material:
+                # Generated/dev materials carry their .vmat path, otherwise use the material name
+                vmat_path = mesh_buffers.vmat_path_for(material)
+                obj["FBX_vmatPath"] = vmat_path
+                print(f"Added FBX_vmatPath='{vmat_path}' to object '{obj.name}'")
+
+def convert_to_meshes(context, objects):
+    """Convert curve, text, surface and metaball duplicates to mesh objects, as Blender's FBX
+    exporter does on its own. Returns the objects with the converted ones in their place."""
+    converted = []
+    for obj in objects:
+        if obj.type in buffer_cache.CONVERTED_TYPES:
+            bpy.ops.object.select_all(action='DESELECT')
+            obj.select_set(True)
+            context.view_layer.objects.active = obj
+            bpy.ops.object.convert(target='MESH')
+            obj = context.view_layer.objects.active
+        converted.append(obj)
+    return converted
+
+def prepare_duplicates(context, objects, settings):
+    """Get temporary export duplicates ready: vmat properties, modifiers applied, greybox UVs, edge split"""
+    add_vmat_properties_to_objects(objects)
+
+    # Apply modifier stacks, reusing the results of earlier exports where nothing changed
+    modifier_cache.apply_cached(context, objects, settings.modifier_cache_size)
+
+    # World-aligned UVs for greybox meshes, after the modifiers so generated faces get them too
+    if settings.greybox_uvs:
+        greybox = [obj for obj in objects if uv_projection.is_greybox(obj)]
+        for obj in greybox:
+            # Linked duplicates share a mesh, but their UVs depend on where they are
+            if obj.data.users > 1:
+                obj.data = obj.data.copy()
+        count, polygons, _shared = uv_projection.project_objects(greybox, settings.texels_per_inch)
+        if count:
+            print(f"Greybox UVs: projected {polygons} faces on {count} objects")
+
+    # Add Edge Split modifier to each duplicated object
+    for obj in objects:
+        if obj.type == 'MESH':
+            # Check if edge split modifier already exists
+            edge_split_exists = any(mod.type == 'EDGE_SPLIT' for mod in obj.modifiers)
+
+            if not edge_split_exists:
+                edge_split_modifier = obj.modifiers.new(name="EdgeSplit", type='EDGE_SPLIT')
+                edge_split_modifier.use_edge_angle = False
+                edge_split_modifier.use_edge_sharp = True
+
+def stream_dmx(context, objects, temp_collection, settings, file_path, export_format, stable):
+    """Write mesh, curve and text objects to one DMX, copying and evaluating one object at a time.
+
+    Every copy goes through the same steps as the duplicates of the regular export, then
+    its mesh is captured, turned into its DMX mesh, spooled to disk and freed before the
+    next object is copied, so memory grows with the largest object instead of the whole
+    selection. The copies themselves stay in TEMPEXPORT (on an empty mesh) until cleanup,
+    which gives them the names the duplicates of the regular export get.
+    Returns attribute_filter.SlimStats or None.
+    """
+    stats = None
+    placeholder = bpy.data.meshes.new("S2StreamPlaceholder")
+    with dmx_model.MeshSpool() as spool:
+        for source in objects:
+            if source.type != 'MESH' and source.type not in buffer_cache.CONVERTED_TYPES:
+                continue
+            copy = source.copy()
+            copy.data = source.data.copy()
+            temp_collection.objects.link(copy)
+            copy, = convert_to_meshes(context, [copy])
+            prepare_duplicates(context, [copy], settings)
+
+            object_stats = fbx_export_operator.slim_objects(context, [copy], export_format)
+            if object_stats is not None:
+                stats = stats or attribute_filter.SlimStats()
+                stats.add(object_stats)
+            buffers_list = dmx_export.capture_objects(context, [copy], EXPORT_SCALE, '-Z', 'Y')
+            attribute_filter.quantize_buffers(buffers_list, settings.position_precision, settings.normal_precision)
+            for buffers in buffers_list:
+                spool.add(buffers)
+            del buffers_list
+
+            mesh = copy.data
+            copy.modifiers.clear()
+            copy.data = placeholder
+            if mesh.users == 0 and not modifier_cache.is_cached_mesh(mesh):
+                bpy.data.meshes.remove(mesh)
+
+        print(f"Streamed {len(spool.meshes)} meshes, {spool.spooled_bytes / (1024 * 1024):.1f} MB spooled to disk")
+        spool.write(file_path, dmx_model.ENCODINGS[export_format], stable)
+    return stats
+
+def write_fbx(file_path):
+    """Export the selected (temporary) objects with Blender's FBX exporter, with fallback settings if that fails"""
+    try:
+        bpy.ops.export_scene.fbx(
+            filepath=file_path,
+            use_selection=True,
+            object_types={'MESH'},
+            bake_space_transform=False,
+            axis_forward='-Z',
+            axis_up='Y',
+            global_scale=EXPORT_SCALE,
+            use_custom_props=True,
+            # Updated for Blender 4.4 - mesh_smooth_type might have changed
+            mesh_smooth_type='FACE'
+        )
+    except Exception as e:
+        print(f"Export failed: {e}")
+        # Try alternative export settings
+        bpy.ops.export_scene.fbx(
+            filepath=file_path,
+            use_selection=True,
+            object_types={'MESH'},
+            global_scale=EXPORT_SCALE,
+            use_custom_props=True
+        )
+        print("Exported with fallback settings")
+
+def export_selection(context):
+    """Export the selected objects as one static mesh file.
+
+    Returns the written file path, or None if nothing was written (the reason is printed).
+    """
+    addon_prefs = context.preferences.addons[__name__.split('.')[0]].preferences
+
+    # Get export path from user preferences
+    export_path = addon_prefs.static_mesh_export_path
+    if not export_path:
+        print("Error: No export path defined. Please set the path in addon preferences.")
+        print(f"Go to Edit > Preferences > Add-ons > Source 2 Model Exporter > Preferences")
+        return None
+
+    print(f"Using export path: {export_path}")
+
+    # Ensure the export path exists
+    try:
+        if not os.path.exists(export_path):
+            os.makedirs(export_path)
+            print(f"Created export directory: {export_path}")
+    except Exception as e:
+        print(f"Error: Could not create export directory: {e}")
+        return None
+
+    # Check if any objects are selected
+    if not context.selected_objects:
+        print("No objects selected. Please select objects to export.")
+        return None
+    # Report every problem before duplicating anything
+    if not validation.run(context, static_objects=context.selected_objects):
+        print("Static mesh export blocked by validation errors.")
+        return None
+
+    # Ensure the TEMPEXPORT collection exists
+    if TEMP_COLLECTION not in bpy.data.collections:
+        temp_collection = bpy.data.collections.new(TEMP_COLLECTION)
+        context.scene.collection.children.link(temp_collection)
+    else:
+        temp_collection = bpy.data.collections[TEMP_COLLECTION]
+
+    # Store original selection
+    original_selection = context.selected_objects.copy()
+
+    # Marker nodes are meshes too, but never part of a static mesh
+    for obj in original_selection:
+        if node_status.is_marker_node(obj):
+            obj.select_set(False)
+
+    # Textures and .vmat files go into the addon content folder (Addons Path)
+    settings = context.scene.export_fbx
+    if settings.export_materials:
+        if addon_prefs.addons_path:
+            material_export.export_materials(original_selection, addon_prefs.addons_path,
+                                             settings.material_folder, settings.texture_format)
+        else:
+            print("Warning: Addons Path is not set, materials were not exported.")
+
+    # Remember existing datablocks so the duplicates' meshes can be removed afterwards
+    datablocks_before = datablocks.snapshot()
+
+    # FBX through Blender's exporter, or the native DMX writer
+    export_format = settings.export_format
+    # Blender's FBX exporter reads all objects from the scene, only DMX can be streamed
+    streaming = settings.stream_static_export and export_format != 'FBX'
+    if settings.stream_static_export and not streaming:
+        print("Stream Static Export only applies to DMX formats, exporting FBX the regular way.")
+
+    written = None
+    try:
+        if streaming:
+            # Copied one at a time by stream_dmx() below
+            streamed_objects = context.selected_objects.copy()
+        else:
+            # Duplicate selected objects and move duplicates to TEMPEXPORT collection
+            bpy.ops.object.duplicate()
+            duplicated_objects = context.selected_objects.copy()
+
+            for obj in duplicated_objects:
+                # Remove from all current collections
+                for collection in obj.users_collection:
+                    collection.objects.unlink(obj)
+                # Add to temp collection
+                temp_collection.objects.link(obj)
+
+            convert_to_meshes(context, list(temp_collection.objects))
+            prepare_duplicates(context, list(temp_collection.objects), settings)
+
+        # Deselect all objects
+        bpy.ops.object.select_all(action='DESELECT')
+
+        # Select all objects in TEMPEXPORT collection
+        for obj in temp_collection.objects:
+            obj.select_set(True)
+
+        # Set an active object for export
+        if temp_collection.objects:
+            context.view_layer.objects.active = temp_collection.objects[0]
+
+        # Deterministic output, content store and size settings apply here too
+        stable = settings.deterministic_output
+        store_root = fbx_export_operator.get_store_root(context, export_path)
+        # stream_dmx slims every copy itself
+        stats = None if streaming else fbx_export_operator.slim_objects(context, list(temp_collection.objects), export_format)
+        size_report = attribute_filter.SizeReport()
+
+        extension = ".fbx" if export_format == 'FBX' else ".dmx"
+        file_path = os.path.join(export_path, "combined_export" + extension)
+        try:
+            content_store.prepare_output(file_path)
+            if streaming:
+                stats = stream_dmx(context, streamed_objects, temp_collection, settings, file_path, export_format, stable)
+            elif export_format != 'FBX':
+                dmx_export.export_objects(context, list(temp_collection.objects), file_path, export_format, EXPORT_SCALE, '-Z', 'Y', stable,
+                                          settings.position_precision, settings.normal_precision)
+            else:
+                write_fbx(file_path)
+            fbx_export_operator.finish_output(context, file_path, store_root, stats)
+            size_report.add("static", file_path, stats)
+            written = file_path
+            print(f"Successfully exported all objects to {file_path} with VMAT paths")
+        except Exception as e:
+            print(f"Export failed: {e}")
+
+        if stats is not None and written:
+            size_report.print()
+
+    except Exception as e:
+        print(f"Error during export process: {e}")
+
+    finally:
+        # Clean up: delete all objects in TEMPEXPORT collection
+        try:
+            for obj in list(temp_collection.objects):
+                bpy.data.objects.remove(obj, do_unlink=True)
+
+            # Delete the TEMPEXPORT collection
+            bpy.data.collections.remove(temp_collection)
+
+            # Delete the duplicated meshes, they have no users left; cached modifier results stay
+            datablocks.remove_new_orphans(datablocks_before, keep=modifier_cache.is_cached_mesh)
+            print(f"Cleanup completed: TEMPEXPORT collection deleted, {datablocks.format_growth(datablocks.growth(datablocks_before))}.")
+
+        except Exception as cleanup_error:
+            print(f"Cleanup warning: {cleanup_error}")
+
+        # Restore original selection
+        try:
+            bpy.ops.object.select_all(action='DESELECT')
+            for obj in original_selection:
+                if obj.name in bpy.data.objects:  # Check if object still exists
+                    obj.select_set(True)
+        except Exception as selection_error:
+            print(f"Could not restore original selection: {selection_error}")
+
+    print("Static mesh export process completed.")
+    return written
@@ -0,0 +1,71 @@
+"""
+Test setup: stand-ins for the Blender modules and the addon package
+
+The addon modules import bpy, bmesh and mathutils at the top. Tests only drive code
+paths that don't need a real Blender, so minimal modules are enough for the imports;
+each test puts the bpy.context/bpy.data/bpy.ops it needs in place with monkeypatch.
+The addon folder is loaded as the package PACKAGE without running its __init__.
+"""
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "source2_model_exporter"
+
+class _AutoModule(types.ModuleType):
+    """Module that makes up any missing attribute with factory(name)"""
+
+    def __init__(self, name, factory):
+        super().__init__(name)
+        self._factory = factory
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = self._factory(name)
+        setattr(self, name, value)
+        return value
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+def _install_blender_stubs():
+    if "bpy" in sys.modules:
+        return
+    bpy = _module("bpy")
+    bpy.types = sys.modules["bpy.types"] = _AutoModule("bpy.types", lambda name: type(name, (), {}))
+    bpy.props = sys.modules["bpy.props"] = _AutoModule("bpy.props", lambda name: (lambda *args, **kwargs: None))
+    handlers = _AutoModule("bpy.app.handlers", lambda name: [])
+    handlers.persistent = lambda function: function
+    sys.modules["bpy.app.handlers"] = handlers
+    timers = _module("bpy.app.timers", register=lambda *args, **kwargs: None, unregister=lambda *args: None,
+                     is_registered=lambda function: False)
+    bpy.app = _module("bpy.app", version=(4, 2, 0), handlers=handlers, timers=timers, background=True)
+    bpy.utils = _module("bpy.utils", register_class=lambda cls: None, unregister_class=lambda cls: None)
+    bpy.context = types.SimpleNamespace()
+    bpy.data = types.SimpleNamespace()
+    bpy.ops = types.SimpleNamespace()
+
+    mathutils = _module("mathutils", Vector=type("Vector", (), {}), Matrix=type("Matrix", (), {}))
+    mathutils.kdtree = _module("mathutils.kdtree", KDTree=type("KDTree", (), {}))
+    _module("bmesh")
+    extras = _module("bpy_extras")
+    extras.io_utils = _module("bpy_extras.io_utils", axis_conversion=lambda **kwargs: None)
+
+def _install_package():
+    if PACKAGE in sys.modules:
+        return
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [ROOT]
+    sys.modules[PACKAGE] = package
+
+_install_blender_stubs()
+_install_package()
+# Blender-free scripts (batch_export, export_client, ...) import each other by plain name
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
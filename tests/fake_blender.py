@@ -0,0 +1,249 @@
+"""
+Minimal in-memory scene for driving export code without Blender
+
+Objects, meshes, curves and collections with Blender's naming (Name.001 for duplicates),
+user counts, selection, bpy.ops.object.duplicate/select_all/convert and the bpy.data
+collections the exporters touch. Mesh geometry is a set of plain arrays that
+capture() turns into MeshBuffers, standing in for the depsgraph evaluation.
+"""
+
+import types
+
+import numpy as np
+
+from source2_model_exporter import mesh_buffers
+
+class IDCollection:
+    """bpy.data.<type>: name lookup, Blender-style unique names, new/remove"""
+
+    def __init__(self, world, factory=None):
+        self.world = world
+        self.items = []
+        self.factory = factory
+
+    def unique_name(self, name):
+        base = name.rsplit(".", 1)[0] if name[-4:-3] == "." and name[-3:].isdigit() else name
+        taken = {item.name for item in self.items}
+        if name not in taken:
+            return name
+        number = 1
+        while f"{base}.{number:03d}" in taken:
+            number += 1
+        return f"{base}.{number:03d}"
+
+    def add(self, item):
+        item.name = self.unique_name(item.name)
+        self.items.append(item)
+        return item
+
+    def new(self, name):
+        return self.add(self.factory(self.world, name))
+
+    def remove(self, item, do_unlink=True):
+        self.items.remove(item)
+        for collection in self.world.collections.items + [self.world.scene_collection]:
+            if item in collection.objects:
+                collection.objects.unlink(item)
+
+    def get(self, name, default=None):
+        return next((item for item in self.items if item.name == name), default)
+
+    def __getitem__(self, name):
+        item = self.get(name)
+        if item is None:
+            raise KeyError(name)
+        return item
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+    def __len__(self):
+        return len(self.items)
+
+class ID:
+    def as_pointer(self):
+        return id(self)
+
+class Material(ID):
+    def __init__(self, world, name):
+        self.name = name
+        self.properties = {}
+
+    def get(self, key, default=None):
+        return self.properties.get(key, default)
+
+class Mesh(ID):
+    def __init__(self, world, name, positions=None, corners=None, sizes=None, materials=()):
+        self.world = world
+        self.name = name
+        self.positions = np.zeros((0, 3), dtype=np.float32) if positions is None else np.asarray(positions, dtype=np.float32)
+        self.corners = np.zeros(0, dtype=np.int32) if corners is None else np.asarray(corners, dtype=np.int32)
+        self.sizes = np.zeros(0, dtype=np.int32) if sizes is None else np.asarray(sizes, dtype=np.int32)
+        self.materials = list(materials)
+
+    @property
+    def users(self):
+        return sum(1 for obj in self.world.objects if obj.data is self)
+
+    def copy(self):
+        return self.world.meshes.add(Mesh(self.world, self.name, self.positions.copy(), self.corners.copy(),
+                                          self.sizes.copy(), self.materials))
+
+class Curve(Mesh):
+    """Curve or text data, with the geometry bpy.ops.object.convert turns it into"""
+
+    def copy(self):
+        return self.world.curves.add(Curve(self.world, self.name, self.positions.copy(), self.corners.copy(),
+                                           self.sizes.copy(), self.materials))
+
+class Modifiers(list):
+    def new(self, name, type):
+        modifier = types.SimpleNamespace(name=name, type=type)
+        self.append(modifier)
+        return modifier
+
+class Collection(ID):
+    def __init__(self, world, name):
+        self.world = world
+        self.name = name
+        self.objects = CollectionObjects()
+        self.children = types.SimpleNamespace(link=lambda child: None)
+
+class CollectionObjects(list):
+    def link(self, obj):
+        self.append(obj)
+
+    def unlink(self, obj):
+        self.remove(obj)
+
+class Object(ID):
+    def __init__(self, world, name, data=None, location=(0.0, 0.0, 0.0), object_type=None):
+        self.world = world
+        self.name = name
+        self.type = object_type or ('MESH' if isinstance(data, Mesh) else 'EMPTY')
+        self.data = data
+        self.location = np.asarray(location, dtype=np.float32)
+        self.modifiers = Modifiers()
+        self.properties = {}
+        self.parent = None
+        self.selected = False
+
+    @property
+    def material_slots(self):
+        return [types.SimpleNamespace(material=material) for material in self.data.materials] if isinstance(self.data, Mesh) else []
+
+    @property
+    def users_collection(self):
+        return [collection for collection in self.world.collections.items + [self.world.scene_collection]
+                if self in collection.objects]
+
+    def __setitem__(self, key, value):
+        self.properties[key] = value
+
+    def __getitem__(self, key):
+        return self.properties[key]
+
+    def __contains__(self, key):
+        return key in self.properties
+
+    def get(self, key, default=None):
+        return self.properties.get(key, default)
+
+    def select_set(self, state):
+        self.selected = state
+
+    def copy(self):
+        copy = Object(self.world, self.name, self.data, self.location.copy(), self.type)
+        copy.modifiers = Modifiers(self.modifiers)
+        copy.properties = dict(self.properties)
+        return self.world.objects.add(copy)
+
+class Context:
+    """bpy.context: selected_objects follows the selection state of the objects"""
+
+    def __init__(self, world, preferences, scene):
+        self.world = world
+        self.preferences = preferences
+        self.scene = scene
+        self.view_layer = types.SimpleNamespace(objects=types.SimpleNamespace(active=None))
+
+    @property
+    def selected_objects(self):
+        return [obj for obj in self.world.objects if obj.selected]
+
+class World:
+    """bpy.data, bpy.context and bpy.ops of one fake scene"""
+
+    def __init__(self, preferences, settings, package):
+        self.objects = IDCollection(self)
+        self.meshes = IDCollection(self, Mesh)
+        self.curves = IDCollection(self, Curve)
+        self.materials = IDCollection(self, Material)
+        self.collections = IDCollection(self, Collection)
+        self.scene_collection = Collection(self, "Scene Collection")
+        self.data = types.SimpleNamespace(objects=self.objects, meshes=self.meshes, materials=self.materials,
+                                          collections=self.collections, curves=self.curves,
+                                          images=IDCollection(self), node_groups=IDCollection(self), filepath="")
+        self.context = Context(self, types.SimpleNamespace(addons={package: types.SimpleNamespace(preferences=preferences)}),
+                               types.SimpleNamespace(export_fbx=settings, collection=self.scene_collection))
+        self.ops = types.SimpleNamespace(object=types.SimpleNamespace(duplicate=self.duplicate, select_all=self.select_all,
+                                                                      convert=self.convert))
+
+    def add_mesh_object(self, name, positions, corners, sizes, materials=(), location=(0.0, 0.0, 0.0)):
+        mesh = self.meshes.add(Mesh(self, name, positions, corners, sizes, materials))
+        obj = self.objects.add(Object(self, name, mesh, location))
+        self.scene_collection.objects.link(obj)
+        return obj
+
+    def add_curve_object(self, name, positions, corners, sizes, materials=(), location=(0.0, 0.0, 0.0), object_type='CURVE'):
+        curve = self.curves.add(Curve(self, name, positions, corners, sizes, materials))
+        obj = self.objects.add(Object(self, name, curve, location, object_type))
+        self.scene_collection.objects.link(obj)
+        return obj
+
+    def duplicate(self):
+        """bpy.ops.object.duplicate: copies of the selected objects and their meshes become the selection"""
+        originals = [obj for obj in self.objects if obj.selected]
+        for obj in originals:
+            copy = obj.copy()
+            if isinstance(copy.data, Mesh):
+                copy.data = obj.data.copy()
+            for collection in obj.users_collection:
+                collection.objects.link(copy)
+            obj.selected = False
+            copy.selected = True
+
+    def convert(self, target='MESH'):
+        """bpy.ops.object.convert: selected curve and text objects become mesh objects in place"""
+        for obj in self.objects:
+            if obj.selected and isinstance(obj.data, Curve):
+                curve = obj.data
+                obj.type = 'MESH'
+                obj.data = self.meshes.add(Mesh(self, curve.name, curve.positions.copy(), curve.corners.copy(),
+                                                curve.sizes.copy(), curve.materials))
+
+    def select_all(self, action='SELECT'):
+        for obj in self.objects:
+            obj.selected = action == 'SELECT'
+
+def capture(context, objects, global_scale, axis_forward, axis_up):
+    """dmx_export.capture_objects stand-in: MeshBuffers of the fake meshes, moved by the object location"""
+    buffers_list = []
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        mesh = obj.data
+        buffers = mesh_buffers.MeshBuffers(obj.name)
+        buffers.positions = (mesh.positions + obj.location) * np.float32(global_scale * 100)
+        buffers.loop_vertices = mesh.corners.copy()
+        buffers.loop_normals = np.tile(np.array([[0, 0, 1]], dtype=np.float32), (len(mesh.corners), 1))
+        buffers.poly_sizes = mesh.sizes.copy()
+        buffers.poly_starts = (np.cumsum(mesh.sizes) - mesh.sizes).astype(np.int32)
+        buffers.poly_materials = np.zeros(len(mesh.sizes), dtype=np.int32)
+        buffers.material_names = [material.name for material in mesh.materials]
+        buffers.vmat_paths = [f"materials/{material.name}.vmat" for material in mesh.materials]
+        buffers_list.append(buffers)
+    return buffers_list
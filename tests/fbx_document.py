@@ -0,0 +1,71 @@
+"""
+Small binary FBX documents built in memory
+
+Models with a local transform, geometry with vertices, faces and per-corner normals, and
+their object-object connections, in the layout Blender's FBX exporter writes. Enough for
+the readers in export_compare and the passes over parsed files.
+"""
+
+import numpy as np
+
+from source2_model_exporter import deterministic, fbx_binary
+from source2_model_exporter.fbx_binary import FbxArray, FbxDocument, FbxNode
+
+VERSION = 7400
+
+def _name(name, object_class):
+    return name.encode("utf-8") + deterministic.NAME_CLASS_SEPARATOR + object_class
+
+def _vector_property(name, values):
+    properties = [(b"S", name), (b"S", name), (b"S", b""), (b"S", b"A")]
+    return FbxNode("P", properties + [(b"D", float(value)) for value in values])
+
+def polygon_vertex_index(faces):
+    """FBX face list: the last index of every face stored as its complement"""
+    indices = []
+    for face in faces:
+        indices += list(face[:-1]) + [~face[-1]]
+    return np.array(indices, dtype=np.int32)
+
+class FbxBuilder:
+    """Collects models and geometry, document() returns the FbxDocument"""
+
+    def __init__(self, first_id=100):
+        self.objects = []
+        self.connections = []
+        self._next_id = first_id
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def add_mesh(self, name, vertices, faces, normals=None, translation=(0.0, 0.0, 0.0),
+                 rotation=(0.0, 0.0, 0.0), scaling=(1.0, 1.0, 1.0), parent=0):
+        """Model with its geometry, returns the model id. normals are per corner in face order."""
+        model_id, geometry_id = self._new_id(), self._new_id()
+        children = [FbxNode("Vertices", [(b"d", FbxArray.from_values(b"d", np.asarray(vertices).ravel()))]),
+                    FbxNode("PolygonVertexIndex", [(b"i", FbxArray.from_values(b"i", polygon_vertex_index(faces)))])]
+        if normals is not None:
+            children.append(FbxNode("LayerElementNormal", [(b"I", 0)], [
+                FbxNode("MappingInformationType", [(b"S", b"ByPolygonVertex")]),
+                FbxNode("ReferenceInformationType", [(b"S", b"Direct")]),
+                FbxNode("Normals", [(b"d", FbxArray.from_values(b"d", np.asarray(normals).ravel()))]),
+            ]))
+        self.objects.append(FbxNode("Geometry", [(b"L", geometry_id), (b"S", _name(name, b"Geometry")), (b"S", b"Mesh")],
+                                    children))
+        self.objects.append(FbxNode("Model", [(b"L", model_id), (b"S", _name(name, b"Model")), (b"S", b"Mesh")], [
+            FbxNode("Properties70", [], [_vector_property(b"Lcl Translation", translation),
+                                         _vector_property(b"Lcl Rotation", rotation),
+                                         _vector_property(b"Lcl Scaling", scaling)]),
+        ]))
+        self.connections += [(geometry_id, model_id), (model_id, parent)]
+        return model_id
+
+    def document(self):
+        connections = [FbxNode("C", [(b"S", b"OO"), (b"L", child), (b"L", parent)])
+                       for child, parent in self.connections]
+        return FbxDocument(VERSION, [FbxNode("Objects", [], self.objects), FbxNode("Connections", [], connections)])
+
+def write(path, document):
+    fbx_binary.write_fbx(str(path), document)
+    return str(path)
@@ -0,0 +1,44 @@
+import numpy as np
+
+import fbx_document
+from source2_model_exporter import attribute_filter, export_compare, mesh_buffers
+
+POSITION_STEP = 0.25
+NORMAL_STEP = 0.01
+
+QUAD = np.array([[0.0, 0.0, 0.0], [1.013, 0.0, 0.0], [1.013, 0.77, 0.0], [0.0, 0.77, 0.3]])
+
+def _document():
+    builder = fbx_document.FbxBuilder()
+    normals = np.tile([0.1, 0.2, 0.97], (4, 1))
+    # Rotated, scaled and offset like an object placed in a node, under a moved parent
+    parent = builder.add_mesh("parent", QUAD, [[0, 1, 2, 3]], normals, translation=(3.1, -2.05, 0.4),
+                              rotation=(0.0, 0.0, 30.0))
+    builder.add_mesh("child", QUAD, [[0, 1, 2, 3]], normals, translation=(0.6, 0.0, 1.7),
+                     rotation=(-90.0, 12.0, 0.0), scaling=(39.37, 39.37, 20.0), parent=parent)
+    return builder.document()
+
+def test_fbx_positions_on_the_dmx_grid(tmp_path):
+    original = export_compare.read_fbx_geometry(fbx_document.write(tmp_path / "original.fbx", _document()), to_dmx=True)
+    quantized_document = attribute_filter.quantize_fbx(_document(), POSITION_STEP, NORMAL_STEP)
+    quantized = export_compare.read_fbx_geometry(fbx_document.write(tmp_path / "quantized.fbx", quantized_document),
+                                                 to_dmx=True)
+
+    # The DMX path rounds the same vertices after they are in DMX space
+    buffers = mesh_buffers.MeshBuffers("dmx")
+    buffers.positions = original.corner_positions.copy()
+    buffers.loop_normals = original.corner_normals.copy()
+    attribute_filter.quantize_buffers([buffers], POSITION_STEP, NORMAL_STEP)
+
+    np.testing.assert_allclose(quantized.corner_positions, buffers.positions, atol=1e-9)
+    np.testing.assert_allclose(quantized.corner_positions / POSITION_STEP,
+                               np.round(quantized.corner_positions / POSITION_STEP), atol=1e-9)
+    expected_normals = buffers.loop_normals / np.linalg.norm(buffers.loop_normals, axis=1, keepdims=True)
+    np.testing.assert_allclose(quantized.corner_normals, expected_normals, atol=1e-9)
+
+def test_zero_steps_keep_the_file():
+    document = _document()
+    before = [node.child("Vertices").value() for node in document.node("Objects").children_named("Geometry")]
+    attribute_filter.quantize_fbx(document, 0, 0)
+    after = [node.child("Vertices").value() for node in document.node("Objects").children_named("Geometry")]
+    assert before == after
@@ -0,0 +1,213 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from source2_model_exporter import dmx_model, dmx_writer, mesh_buffers
+from source2_model_exporter.dmx_writer import DmElement
+
+ENCODINGS = ("binary", "keyvalues2")
+
+def _sample_tree():
+    """Every attribute type, shared and null references, and awkward strings"""
+    root = DmElement("root", "DmElement")
+    shared = DmElement("shared \"quoted\"\tname\n", "DmeShared")
+    shared.set("text", "string", "ünïcødé \\ back\\slash")
+    # Same text as an element name and attribute value, stored once in the string table
+    shared.set("label", "string", "root")
+    shared.set("empty", "string", "")
+
+    scalars = DmElement("scalars", "DmeScalars")
+    scalars.set("int", "int", -7)
+    scalars.set("float", "float", 0.1)
+    scalars.set("bool", "bool", True)
+    scalars.set("binary", "binary", b"\x00\x01\xfe\xff")
+    scalars.set("time", "time", 1.25)
+    scalars.set("color", "color", (255, 128, 0, 1))
+    scalars.set("vector2", "vector2", (1.5, -2.0))
+    scalars.set("vector3", "vector3", (0.0, 1.0, -1.0))
+    scalars.set("vector4", "vector4", (1.0, 2.0, 3.0, 4.0))
+    scalars.set("qangle", "qangle", (90.0, 0.0, -45.0))
+    scalars.set("quaternion", "quaternion", (0.0, 0.0, 0.0, 1.0))
+    scalars.set("matrix", "matrix", tuple(float(i) for i in range(16)))
+    scalars.set("shared", "element", shared)
+    scalars.set("nothing", "element", None)
+
+    arrays = DmElement("arrays", "DmeArrays")
+    arrays.set("ints", "int_array", np.array([0, -1, 2 ** 31 - 1, -2 ** 31], dtype=np.int32))
+    arrays.set("floats", "float_array", np.array([0.5, -0.25, 1e-8, 3e8], dtype=np.float32))
+    arrays.set("bools", "bool_array", np.array([True, False, True]))
+    arrays.set("times", "time_array", np.array([0.0, 0.5, 2.25]))
+    arrays.set("colors", "color_array", np.array([[0, 0, 0, 0], [255, 255, 255, 255]], dtype=np.uint8))
+    arrays.set("vector2s", "vector2_array", np.arange(10, dtype=np.float32).reshape(-1, 2) / 4)
+    arrays.set("vector3s", "vector3_array", np.arange(12, dtype=np.float32).reshape(-1, 3) - 6)
+    arrays.set("vector4s", "vector4_array", np.ones((2, 4), dtype=np.float32))
+    arrays.set("empty_ints", "int_array", np.zeros(0, dtype=np.int32))
+    arrays.set("empty_vectors", "vector3_array", np.zeros((0, 3), dtype=np.float32))
+    arrays.set("strings", "string_array", ["a", "", "with \"quotes\"", "root"])
+    arrays.set("empty_strings", "string_array", [])
+    arrays.set("binaries", "binary_array", [b"", b"\x10\x20"])
+    arrays.set("elements", "element_array", [shared, None, scalars])
+    arrays.set("no_elements", "element_array", [])
+
+    root.set("scalars", "element", scalars)
+    root.set("arrays", "element", arrays)
+    root.set("also_shared", "element", shared)
+    return root
+
+def _value(attribute_type, value):
+    """Comparable form of an attribute value, references by element id"""
+    base = attribute_type[:-6] if attribute_type.endswith("_array") else attribute_type
+    if base == "element":
+        if attribute_type.endswith("_array"):
+            return [child.id if child is not None else None for child in value]
+        return value.id if value is not None else None
+    if attribute_type.endswith("_array"):
+        if base == "string":
+            return list(value)
+        if base == "binary":
+            return [bytes(item) for item in value]
+        rows = np.asarray(value, dtype=np.float64)
+        return rows.reshape(len(value), -1).tolist() if len(value) else []
+    if base in ("float", "vector2", "vector3", "vector4", "qangle", "quaternion", "matrix"):
+        return np.asarray(value, dtype=np.float32).tolist()
+    if base == "color":
+        return list(value)
+    if base == "binary":
+        return bytes(value)
+    return value
+
+def _describe(root):
+    """Every element of a tree in order with its type, name, id and attributes"""
+    return [(element.type, element.name, element.id,
+             [(name, attribute_type, _value(attribute_type, value))
+              for name, (attribute_type, value) in element.attributes.items()])
+            for element in dmx_writer.collect_elements(root)]
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_round_trip(tmp_path, encoding):
+    root = _sample_tree()
+    path = dmx_writer.write_dmx(str(tmp_path / "tree.dmx"), root, encoding)
+    assert _describe(dmx_writer.read_dmx(path)) == _describe(root)
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_chunked_arrays(tmp_path, monkeypatch, encoding):
+    # Arrays longer than a chunk are written in several pieces
+    monkeypatch.setattr(dmx_writer, "CHUNK_ROWS", 4)
+    root = DmElement("root")
+    for rows in (3, 4, 5, 9):
+        root.set(f"vectors{rows}", "vector3_array", np.arange(rows * 3, dtype=np.float32).reshape(-1, 3))
+        root.set(f"ints{rows}", "int_array", np.arange(rows, dtype=np.int32))
+    path = dmx_writer.write_dmx(str(tmp_path / "chunks.dmx"), root, encoding)
+    assert _describe(dmx_writer.read_dmx(path)) == _describe(root)
+
+def test_binary_string_table(tmp_path):
+    root = _sample_tree()
+    path = dmx_writer.write_dmx(str(tmp_path / "tree.dmx"), root, "binary")
+    data = open(path, "rb").read()
+    header, _, rest = data.partition(b"\n\0")
+    assert header == dmx_writer.header_line("binary", 5, "model", 22).encode("ascii")
+
+    count = int.from_bytes(rest[:4], "little")
+    strings = rest[4:].split(b"\0")[:count]
+    assert len(strings) == len(set(strings)) == count
+    # Element names, types, attribute names and string values; string arrays are inline
+    assert b"root" in strings and b"" in strings and b"with \"quotes\"" not in strings
+
+def test_binary_is_stable_with_stable_ids(tmp_path):
+    paths = []
+    for index in range(2):
+        root = dmx_writer.assign_stable_ids(_sample_tree())
+        paths.append(dmx_writer.write_dmx(str(tmp_path / f"{index}.dmx"), root, "binary"))
+    assert open(paths[0], "rb").read() == open(paths[1], "rb").read()
+
+def test_unknown_encoding(tmp_path):
+    with pytest.raises(dmx_writer.DmxError):
+        dmx_writer.write_dmx(str(tmp_path / "x.dmx"), DmElement("root"), "xml")
+    with pytest.raises(dmx_writer.DmxError):
+        DmElement("root").set("bad", "vector5", (0, 0, 0, 0, 0))
+
+def _quad_buffers(name):
+    """Two quads on two material slots, with a UV map and a color attribute"""
+    buffers = mesh_buffers.MeshBuffers(name)
+    buffers.positions = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0], [2, 1, 0]], dtype=np.float32)
+    buffers.loop_vertices = np.array([0, 1, 2, 3, 1, 4, 5, 2], dtype=np.int32)
+    buffers.loop_normals = np.tile(np.array([[0, 0, 1]], dtype=np.float32), (8, 1))
+    buffers.poly_starts = np.array([0, 4], dtype=np.int32)
+    buffers.poly_sizes = np.array([4, 4], dtype=np.int32)
+    buffers.poly_materials = np.array([0, 1], dtype=np.int32)
+    buffers.uv_layers = [("UVMap", np.array([[0, 0], [1, 0], [1, 1], [0, 1]] * 2, dtype=np.float32))]
+    buffers.color_layers = [("Color", np.ones((8, 4), dtype=np.float32))]
+    buffers.material_names = ["brick", "metal"]
+    buffers.vmat_paths = ["materials/brick.vmat", "materials/metal.vmat"]
+    return buffers
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_model_round_trip(tmp_path, encoding):
+    path = dmx_model.write_file(str(tmp_path / "model.dmx"), [_quad_buffers("Wall.001")], encoding, stable=True)
+    root = dmx_writer.read_dmx(path)
+    model = root["model"]
+    assert model.name == "model" and root["skeleton"] is model
+
+    dag, = model["children"]
+    assert dag.name == "Wall"
+    mesh = dag["shape"]
+    vertex_data = mesh["bindState"]
+    assert list(vertex_data["vertexFormat"]) == ["position$0", "normal$0", "texcoord$0", "VertexPaintBlendParams$0"]
+    assert len(vertex_data["position$0"]) == 6
+    assert vertex_data["position$0Indices"].tolist() == [0, 1, 2, 3, 1, 4, 5, 2]
+    # Equal normals weld into one
+    assert len(vertex_data["normal$0"]) == 1 and vertex_data["normal$0Indices"].tolist() == [0] * 8
+
+    face_sets = mesh["faceSets"]
+    assert [face_set["material"]["mtlName"] for face_set in face_sets] == ["materials/brick.vmat", "materials/metal.vmat"]
+    assert [face_set["faces"].tolist() for face_set in face_sets] == [[0, 1, 2, 3, -1], [4, 5, 6, 7, -1]]
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_tint_layer_and_blend_layer(tmp_path, encoding):
+    buffers = _quad_buffers("Wall")
+    tint = np.tile(np.array([[1.0, 0.0, 0.0, 1.0]], dtype=np.float32), (8, 1))
+    blend = np.tile(np.array([[0.0, 0.0, 1.0, 1.0]], dtype=np.float32), (8, 1))
+    # The tint layer is the active one, so it comes first
+    buffers.color_layers = [("VertexPaintTintColor", tint), ("Blend", blend)]
+    path = dmx_model.write_file(str(tmp_path / "model.dmx"), [buffers], encoding, stable=True)
+    vertex_data = dmx_writer.read_dmx(path)["model"]["children"][0]["shape"]["bindState"]
+    assert list(vertex_data["vertexFormat"])[-2:] == ["VertexPaintTintColor$0", "VertexPaintBlendParams$0"]
+    assert vertex_data["VertexPaintTintColor$0"].tolist() == [[1.0, 0.0, 0.0, 1.0]]
+    assert vertex_data["VertexPaintBlendParams$0"].tolist() == [[0.0, 0.0, 1.0, 1.0]]
+
+def test_binary_layout(tmp_path):
+    """Byte for byte against the binary v5 layout of Valve's datamodel serializer: header line
+    and NUL, int32 string table of NUL-terminated strings, int32 element count, then per element
+    type and name as int32 string indices and the 16 byte id, then per element an int32 attribute
+    count and per attribute an int32 name index, a type byte (1-based, arrays + 14) and the value.
+    Scalar strings are string indices, strings in arrays are inline."""
+    root = DmElement("root", element_id=uuid.UUID(int=1))
+    mesh = DmElement("mesh", "DmeMesh", element_id=uuid.UUID(int=2))
+    root.set("shape", "element", mesh)
+    root.set("label", "string", "hi")
+    root.set("tags", "string_array", ["a", "b"])
+    root.set("weights", "float_array", np.array([0.5], dtype=np.float32))
+    mesh.set("visible", "bool", True)
+    path = dmx_writer.write_dmx(str(tmp_path / "layout.dmx"), root, "binary")
+
+    def strings(*texts):
+        return b"".join(text.encode("ascii") + b"\0" for text in texts)
+    # The mesh's attribute name comes after its type and name
+    expected = (
+        b"<!-- dmx encoding binary 5 format model 22 -->\n\0"
+        + (10).to_bytes(4, "little") + strings("DmElement", "root", "shape", "label", "hi", "tags", "weights", "DmeMesh", "mesh", "visible")
+        + (2).to_bytes(4, "little")
+        + (0).to_bytes(4, "little") + (1).to_bytes(4, "little") + uuid.UUID(int=1).bytes_le
+        + (7).to_bytes(4, "little") + (8).to_bytes(4, "little") + uuid.UUID(int=2).bytes_le
+        # root: 4 attributes
+        + (4).to_bytes(4, "little")
+        + (2).to_bytes(4, "little") + bytes([1]) + (1).to_bytes(4, "little")           # shape: element 1
+        + (3).to_bytes(4, "little") + bytes([5]) + (4).to_bytes(4, "little")           # label: string index of "hi"
+        + (5).to_bytes(4, "little") + bytes([5 + 14]) + (2).to_bytes(4, "little") + b"a\0b\0"
+        + (6).to_bytes(4, "little") + bytes([3 + 14]) + (1).to_bytes(4, "little") + np.float32(0.5).tobytes()
+        # mesh: 1 attribute
+        + (1).to_bytes(4, "little")
+        + (9).to_bytes(4, "little") + bytes([4]) + b"\x01"
+    )
+    assert open(path, "rb").read() == expected
@@ -0,0 +1,66 @@
+import numpy as np
+
+import fbx_document
+from source2_model_exporter import deterministic, export_compare, fbx_binary
+
+CUBE = np.array([[x, y, z] for x in (0.0, 16.0) for y in (0.0, 16.0) for z in (0.0, 16.0)])
+CUBE_FACES = [[0, 1, 3, 2], [4, 6, 7, 5], [0, 4, 5, 1], [2, 3, 7, 6], [0, 2, 6, 4], [1, 5, 7, 3]]
+
+def _cube_normals(vertices, faces):
+    center = vertices.mean(axis=0)
+    normals = []
+    for face in faces:
+        direction = vertices[face].mean(axis=0) - center
+        normals += [direction / np.linalg.norm(direction)] * len(face)
+    return np.array(normals)
+
+def _document(vertices=CUBE, faces=CUBE_FACES, name="cube", first_id=100):
+    builder = fbx_document.FbxBuilder(first_id)
+    builder.add_mesh(name, vertices, faces, _cube_normals(CUBE, faces), translation=(32.0, 0.0, -8.0),
+                     rotation=(0.0, 90.0, 0.0))
+    return builder.document()
+
+def _write(path, document):
+    return fbx_document.write(path, deterministic.normalize_fbx(document))
+
+def test_binary_round_trip(tmp_path):
+    path = _write(tmp_path / "cube.fbx", _document())
+    with open(path, "rb") as source:
+        data = source.read()
+    assert fbx_binary.serialize(fbx_binary.parse(data)) == data
+
+    vertices = fbx_binary.read_fbx(path).node("Objects").child("Geometry").child("Vertices").value().values()
+    np.testing.assert_array_equal(vertices, CUBE.ravel())
+
+def test_same_geometry_is_equal(tmp_path):
+    reference = _write(tmp_path / "reference.fbx", _document())
+    # Another session: other object ids and a duplicate name suffix, same file once normalized
+    candidate = _write(tmp_path / "candidate.fbx", _document(name="cube.001", first_id=500))
+    with open(reference, "rb") as first, open(candidate, "rb") as second:
+        assert first.read() == second.read()
+
+    result = export_compare.compare_files(reference, candidate)
+    assert result.equal, result.lines()
+
+def test_face_order_and_start_corner_are_ignored(tmp_path):
+    reference = _write(tmp_path / "reference.fbx", _document())
+    faces = [face[1:] + face[:1] for face in reversed(CUBE_FACES)]
+    candidate = _write(tmp_path / "candidate.fbx", _document(faces=faces))
+    result = export_compare.compare_files(reference, candidate)
+    assert result.equal, result.lines()
+
+def test_moved_vertex_differs(tmp_path):
+    reference = _write(tmp_path / "reference.fbx", _document())
+    tolerance = export_compare.DEFAULT_POSITION_TOLERANCE
+
+    within = CUBE.copy()
+    within[5, 1] += tolerance / 2
+    result = export_compare.compare_files(reference, _write(tmp_path / "within.fbx", _document(vertices=within)))
+    assert result.equal, result.lines()
+
+    moved = CUBE.copy()
+    moved[5, 1] += tolerance * 2
+    result = export_compare.compare_files(reference, _write(tmp_path / "moved.fbx", _document(vertices=moved)))
+    assert not result.equal
+    # Vertex 5 is a corner of three faces
+    assert result.differences == [("geometry", "3 of 6 faces moved, changed or flipped")]
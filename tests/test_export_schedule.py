@@ -0,0 +1,38 @@
+import batch_export
+import export_schedule
+
+def test_balance_summary():
+    lines = export_schedule.balance_summary([60.0, 120.0], 150.0, 90.0)
+    assert lines == ["Worker busy time: 1.0-2.0 min, average 1.5 min (60% utilization)",
+                     "Makespan 2.5 min, ideal 1.5 min (+67%)"]
+
+def test_balance_summary_without_work():
+    assert export_schedule.balance_summary([0.0, 0.0], 0.01, 0.0) == []
+    assert export_schedule.balance_summary([], 10.0, 0.0) == []
+    assert export_schedule.balance_summary([1.0], 0.0, 1.0) == []
+
+def test_prediction_error():
+    assert export_schedule.prediction_error([]) is None
+    assert export_schedule.prediction_error([(2.0, 1.0), (1.0, 1.0), (5.0, 0.0)]) == 0.5
+
+def test_lpt_assign():
+    assignment = export_schedule.lpt_assign([("a", 5.0), ("b", 4.0), ("c", 3.0), ("d", 3.0)], [0.0, 0.0])
+    assert assignment == {"a": 0, "b": 1, "c": 1, "d": 0}
+
+def test_rerun_finished_queue(tmp_path, capsys):
+    # Resuming a queue where everything is done starts no Blender and prints a summary
+    db_path = str(tmp_path / "queue.sqlite")
+    queue = batch_export.JobQueue(db_path)
+    queue.add("map.blend", 'scan')
+    queue.add_many("map.blend", 'node', ["Crate"], {"Crate": (100, 1, 1)}, {"Crate": 2.0})
+    while True:
+        job = queue.claim()
+        if job is None:
+            break
+        queue.finish(job[0], 1, 2.0, 1.5)
+    queue.db.close()
+
+    counts = batch_export.run_batch(["map.blend"], "no-blender-needed", workers=2, db_path=db_path)
+    assert counts == {"done": 2}
+    output = capsys.readouterr().out
+    assert "Exported 0 models" in output and "Queue: done 2" in output
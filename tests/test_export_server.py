@@ -0,0 +1,185 @@
+import os
+import threading
+import types
+
+import pytest
+
+import export_client
+from conftest import PACKAGE
+
+from source2_model_exporter import export_server
+
+class FakeMatrix:
+    def inverted_safe(self):
+        return self
+
+class FakeObject:
+    def __init__(self, name, object_type, vertices=0):
+        self.name = name
+        self.type = object_type
+        self.parent = None
+        self.matrix_world = FakeMatrix()
+        self.data = types.SimpleNamespace(vertices=[None] * vertices)
+        self.modifiers = []
+        self.material_slots = []
+        self.selected = False
+
+    def __contains__(self, key):
+        return False
+
+    def visible_get(self):
+        return True
+
+    def select_set(self, state):
+        self.selected = state
+
+class Context:
+    """bpy.context: selected_objects follows the selection state of the scene's objects"""
+
+    def __init__(self, preferences, scene, view_layer):
+        self.preferences = preferences
+        self.scene = scene
+        self.view_layer = view_layer
+
+    @property
+    def selected_objects(self):
+        return [obj for obj in self.scene.objects if obj.selected]
+
+@pytest.fixture
+def blender(monkeypatch, tmp_path):
+    """bpy stand-in with one loaded scene and a stubbed node export"""
+    bpy = export_server.bpy
+    preferences = types.SimpleNamespace(addons_path="C:/addons", static_mesh_export_path=str(tmp_path / "static"))
+    settings = types.SimpleNamespace(export_format='FBX', position_precision=0.0)
+    objects = [FakeObject("Crate", 'FONT'), FakeObject("Barrel", 'FONT'), FakeObject("Floor", 'MESH', vertices=8)]
+    scene = types.SimpleNamespace(export_fbx=settings, objects=objects)
+    context = Context(types.SimpleNamespace(addons={PACKAGE: types.SimpleNamespace(preferences=preferences)}),
+                      scene, types.SimpleNamespace(objects=types.SimpleNamespace(active=None)))
+    data = types.SimpleNamespace(filepath="", objects={obj.name: obj for obj in objects})
+
+    def open_mainfile(filepath):
+        data.filepath = filepath
+
+    def staticmesh():
+        # What static_export writes, with the options of the running job
+        extension = ".fbx" if settings.export_format == 'FBX' else ".dmx"
+        os.makedirs(preferences.static_mesh_export_path, exist_ok=True)
+        with open(os.path.join(preferences.static_mesh_export_path, "combined_export" + extension), "w") as out:
+            out.write(",".join(obj.name for obj in objects if obj.selected))
+
+    def select_all(action):
+        for obj in objects:
+            obj.selected = action == 'SELECT'
+
+    ops = types.SimpleNamespace(wm=types.SimpleNamespace(open_mainfile=open_mainfile),
+                                object=types.SimpleNamespace(select_all=select_all, staticmesh=staticmesh))
+    monkeypatch.setattr(bpy, "context", context)
+    monkeypatch.setattr(bpy, "data", data)
+    monkeypatch.setattr(bpy, "ops", ops)
+
+    jobs = []
+
+    def export_nodes(context, nodes, report, progress):
+        jobs.append((settings.export_format, preferences.addons_path))
+        for node in nodes:
+            progress(node.name, "exported", [f"{node.name}.fbx"])
+        report({'INFO'}, f"Exported {len(nodes)} nodes")
+        return {'FINISHED'}
+
+    monkeypatch.setattr(export_server.fbx_export_operator, "export_nodes", export_nodes)
+    blend = tmp_path / "map.blend"
+    blend.write_bytes(b"BLENDER")
+    return types.SimpleNamespace(blend=str(blend), preferences=preferences, settings=settings, jobs=jobs,
+                                 objects=data.objects, context=context)
+
+@pytest.fixture
+def server(blender):
+    with export_server.ExportServer(("127.0.0.1", 0)) as server:
+        def serve():
+            while not server.shutdown_requested:
+                server.handle_request()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        yield server.server_address[1]
+        export_client.shutdown(port=server.server_address[1])
+        thread.join(5)
+
+def test_ping_and_export(blender, server):
+    assert export_client.ping(port=server)["event"] == "pong"
+
+    events = list(export_client.request_export(blender.blend, ["Crate", "Missing"], port=server, timeout=10, job_id=7))
+    kinds = [event["event"] for event in events]
+    assert kinds == ["accepted", "loaded", "node", "node", "report", "done"]
+    assert events[0]["job"] == 7
+    assert events[1]["cached"] is False
+    assert {(event["node"], event["status"]) for event in events if event["event"] == "node"} == {
+        ("Missing", "missing"), ("Crate", "exported")}
+    assert events[-1]["status"] == "FINISHED"
+
+    # The same unchanged file stays loaded
+    events = list(export_client.request_export(blender.blend, [], port=server, timeout=10))
+    assert events[1]["cached"] is True
+    assert [event["node"] for event in events if event["event"] == "node"] == ["Crate", "Barrel"]
+
+def test_options_apply_to_one_job_only(blender, server):
+    list(export_client.request_export(blender.blend, ["Crate"], {"export_format": 'DMX_BINARY', "addons_path": "D:/other"},
+                                      port=server, timeout=10))
+    list(export_client.request_export(blender.blend, ["Crate"], port=server, timeout=10))
+    assert blender.jobs == [('DMX_BINARY', "D:/other"), ('FBX', "C:/addons")]
+    assert blender.settings.export_format == 'FBX'
+    assert blender.preferences.addons_path == "C:/addons"
+
+def test_unknown_option(blender, server):
+    events = list(export_client.request_export(blender.blend, ["Crate"], {"export_format": 'DMX_TEXT', "no_such_option": 1},
+                                               port=server, timeout=10))
+    assert events[-1]["event"] == "error"
+    assert "no_such_option" in events[-1]["message"]
+    assert not blender.jobs
+    # Nothing of the rejected options is left behind
+    assert blender.settings.export_format == 'FBX'
+
+def test_missing_file(blender, server):
+    events = list(export_client.request_export(blender.blend + ".missing", port=server, timeout=10))
+    assert [event["event"] for event in events] == ["accepted", "error"]
+    assert "not found" in events[-1]["message"]
+    with pytest.raises(RuntimeError):
+        export_client.list_nodes(blender.blend + ".missing", port=server, timeout=10)
+
+def test_list(blender, server):
+    names, static_count, sizes = export_client.list_nodes(blender.blend, port=server, timeout=10)
+    assert names == ["Crate", "Barrel"]
+    assert static_count == 1
+    assert sizes == {"Crate": [0, 0, 0], "Barrel": [0, 0, 0], None: [8, 0, 0]}
+
+def test_static(blender, server):
+    events = list(export_client.request_static(blender.blend, options={"export_format": 'DMX_BINARY'}, port=server, timeout=10))
+    static = [event for event in events if event["event"] == "static"]
+    assert len(static) == 1 and static[0]["files"][0].endswith("combined_export.dmx")
+    with open(static[0]["files"][0]) as written:
+        assert written.read() == "Floor"
+    assert events[-1]["status"] == "FINISHED"
+    assert blender.settings.export_format == 'FBX'
+
+def test_static_keeps_the_selection(blender, server):
+    barrel = blender.objects["Barrel"]
+    barrel.select_set(True)
+    blender.context.view_layer.objects.active = barrel
+    events = list(export_client.request_static(blender.blend, port=server, timeout=10))
+    assert events[-1]["status"] == "FINISHED"
+    assert blender.context.selected_objects == [barrel]
+    assert blender.context.view_layer.objects.active is barrel
+
+def test_static_without_path_leaves_the_selection(blender, server):
+    blender.preferences.static_mesh_export_path = ""
+    barrel = blender.objects["Barrel"]
+    barrel.select_set(True)
+    blender.context.view_layer.objects.active = barrel
+    events = list(export_client.request_static(blender.blend, port=server, timeout=10))
+    assert events[-1]["event"] == "error"
+    assert blender.context.selected_objects == [barrel]
+    assert blender.context.view_layer.objects.active is barrel
+
+def test_unknown_command(blender, server):
+    events = list(export_client.send_command("explode", port=server, timeout=10))
+    assert events == [{"event": "error", "message": "Unknown command: explode"}]
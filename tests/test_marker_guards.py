@@ -0,0 +1,63 @@
+import types
+
+import pytest
+
+from source2_model_exporter import collision_operators, dev_material_operator, node_status, uv_projection_operator
+
+bpy = node_status.bpy
+
+class FakeObject:
+    def __init__(self, name, object_type='MESH', properties=None):
+        self.name = name
+        self.type = object_type
+        self.properties = dict(properties or {})
+        self.data = types.SimpleNamespace(materials=[])
+        self.material_slots = []
+
+    def __contains__(self, key):
+        return key in self.properties
+
+def _marker(name):
+    return FakeObject(name, properties={node_status.NODE_NAME_PROPERTY: name})
+
+class Operator:
+    def __init__(self):
+        self.reports = []
+
+    def report(self, level, message):
+        self.reports.append((level, message))
+
+@pytest.fixture
+def select(monkeypatch):
+    """Put a selection (and active object) in bpy.context; any bpy.ops/bpy.data use fails the test"""
+    def make(objects, active=None):
+        context = types.SimpleNamespace(selected_objects=list(objects), active_object=active, mode='OBJECT',
+                                        scene=types.SimpleNamespace(export_fbx=types.SimpleNamespace(texels_per_inch=4.0)))
+        monkeypatch.setattr(bpy, "context", context)
+        monkeypatch.setattr(bpy, "data", None)
+        monkeypatch.setattr(bpy, "ops", None)
+        return context
+    return make
+
+def test_dev_material_skips_markers(select, capsys):
+    marker = _marker("Crate")
+    context = select([marker])
+    operator = Operator()
+    dev_material_operator.AddDevMatOperator.execute(operator, context)
+    assert "No mesh selected" in capsys.readouterr().out
+    assert marker.data.materials == []
+    assert not any(level == {'ERROR'} for level, _message in operator.reports)
+
+def test_collision_setup_skips_markers(select, capsys):
+    other, node = _marker("Barrel"), _marker("Crate")
+    context = select([other, node], active=node)
+    operator = Operator()
+    collision_operators.SetupCollOperator.execute(operator, context)
+    assert "Could not find a mesh object" in capsys.readouterr().out
+    assert other.name == "Barrel"
+
+def test_greybox_uvs_skip_markers(select):
+    context = select([_marker("Crate")])
+    operator = Operator()
+    assert uv_projection_operator.GreyboxUVsOperator.execute(operator, context) == {'CANCELLED'}
+    assert operator.reports == [({'WARNING'}, "No meshes selected")]
@@ -0,0 +1,106 @@
+import types
+
+import numpy as np
+
+from source2_model_exporter import modifier_cache
+
+bpy = modifier_cache.bpy
+
+class FakeMatrix:
+    def inverted_safe(self):
+        return self
+
+    def __matmul__(self, other):
+        return self
+
+    def __iter__(self):
+        return iter([(1.0, 0.0), (0.0, 1.0)])
+
+class Elements(list):
+    """Mesh element collection with foreach_get over one field"""
+
+    def __init__(self, values):
+        super().__init__(values)
+
+    def foreach_get(self, field, buffer):
+        buffer[:] = np.asarray([getattr(item, field) for item in self]).ravel()
+
+class Vertex:
+    def __init__(self, index, weights):
+        self.index = index
+        self.weights = weights    # group index -> weight
+        self.reads = 0
+
+    @property
+    def groups(self):
+        self.reads += 1
+        return [types.SimpleNamespace(group=group, weight=weight) for group, weight in self.weights.items()]
+
+def _mesh(vertex_count=3, weights=None):
+    vertices = Elements(Vertex(index, dict(weights or {})) for index in range(vertex_count))
+    positions = Elements(types.SimpleNamespace(vector=(float(index), 0.0, 0.0)) for index in range(vertex_count))
+    return types.SimpleNamespace(
+        vertices=vertices, edges=Elements([]), loops=Elements([]), polygons=Elements([]),
+        attributes=[types.SimpleNamespace(name="position", domain='POINT', data_type='FLOAT_VECTOR', data=positions)],
+        materials=[], has_custom_normals=False, shape_keys=None)
+
+class FakeObject(bpy.types.Object):
+    def __init__(self, name, object_type='MESH', data=None, modifiers=(), groups=()):
+        self.name = name
+        self.type = object_type
+        self.data = data
+        self.modifiers = list(modifiers)
+        self.vertex_groups = [types.SimpleNamespace(name=group, index=index) for index, group in enumerate(groups)]
+        self.matrix_world = FakeMatrix()
+
+def _modifier(modifier_type, **settings):
+    properties = [types.SimpleNamespace(identifier=identifier, type='STRING' if isinstance(value, str) else 'FLOAT')
+                  for identifier, value in settings.items()]
+    return types.SimpleNamespace(type=modifier_type, show_viewport=True,
+                                 bl_rna=types.SimpleNamespace(identifier=modifier_type, properties=properties), **settings)
+
+SCENE = types.SimpleNamespace(frame_current=1)
+
+def test_only_referenced_vertex_groups_are_hashed():
+    mesh = _mesh(weights={0: 0.5, 1: 1.0})
+    obj = FakeObject("Rock", data=mesh, modifiers=[_modifier('SUBSURF', levels=2.0)], groups=["Mask", "Paint"])
+    key = modifier_cache.geometry_key(obj, SCENE)
+    assert key is not None
+    assert all(vertex.reads == 0 for vertex in mesh.vertices)
+
+    obj.modifiers.append(_modifier('SOLIDIFY', vertex_group="Mask"))
+    key = modifier_cache.geometry_key(obj, SCENE)
+    assert all(vertex.reads == 1 for vertex in mesh.vertices)
+    mesh.vertices[0].weights[1] = 0.25
+    assert modifier_cache.geometry_key(obj, SCENE) == key
+    mesh.vertices[0].weights[0] = 0.25
+    assert modifier_cache.geometry_key(obj, SCENE) != key
+
+def test_modifiers_reading_any_group_hash_all_weights():
+    mesh = _mesh(weights={1: 1.0})
+    obj = FakeObject("Rock", data=mesh, modifiers=[_modifier('ARMATURE')], groups=["Mask", "Bone"])
+    key = modifier_cache.geometry_key(obj, SCENE)
+    mesh.vertices[2].weights[1] = 0.5
+    assert modifier_cache.geometry_key(obj, SCENE) != key
+
+def test_large_weighted_meshes_are_not_cached(monkeypatch):
+    monkeypatch.setattr(modifier_cache, "MAX_WEIGHT_VERTICES", 2)
+    obj = FakeObject("Rock", data=_mesh(weights={0: 1.0}), modifiers=[_modifier('SOLIDIFY', vertex_group="Mask")], groups=["Mask"])
+    assert modifier_cache.geometry_key(obj, SCENE) is None
+    obj.modifiers = [_modifier('SUBSURF', levels=2.0)]
+    assert modifier_cache.geometry_key(obj, SCENE) is not None
+
+def test_operands():
+    cutter = FakeObject("Cutter", data=_mesh())
+    obj = FakeObject("Rock", data=_mesh(), modifiers=[_modifier('BOOLEAN', object=cutter)])
+    key = modifier_cache.geometry_key(obj, SCENE)
+    assert key is not None
+    cutter.data.attributes[0].data[1].vector = (5.0, 0.0, 0.0)
+    assert modifier_cache.geometry_key(obj, SCENE) != key
+
+    # Empties only contribute their placement, curves and text aren't hashed
+    obj.modifiers = [_modifier('ARRAY', offset_object=FakeObject("Offset", 'EMPTY'))]
+    assert modifier_cache.geometry_key(obj, SCENE) is not None
+    obj.modifiers = [_modifier('BOOLEAN', object=FakeObject("Text", 'FONT', data=types.SimpleNamespace(body="A")))]
+    assert modifier_cache.geometry_key(obj, SCENE) is None
+    assert modifier_cache.stack_key(obj, SCENE) is None
@@ -0,0 +1,87 @@
+import math
+import types
+
+import pytest
+
+from source2_model_exporter import node_spatial
+
+class Vector(tuple):
+    """The parts of mathutils.Vector the index uses"""
+
+    def __new__(cls, values):
+        return super().__new__(cls, (float(value) for value in values))
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self, other))
+
+    def __truediv__(self, value):
+        return Vector(a / value for a in self)
+
+    @property
+    def length(self):
+        return math.sqrt(sum(a * a for a in self))
+
+class KDTree:
+    """Brute force mathutils.kdtree.KDTree"""
+
+    def __init__(self, size):
+        self.points = []
+
+    def insert(self, co, index):
+        self.points.append((Vector(co), index))
+
+    def balance(self):
+        pass
+
+    def find_range(self, co, radius):
+        found = [(point, index, (point - Vector(co)).length) for point, index in self.points]
+        return [item for item in found if item[2] <= radius]
+
+class Objects(dict):
+    def __iter__(self):
+        return iter(self.values())
+
+    def get(self, name, default=None):
+        return super().get(name, default)
+
+@pytest.fixture
+def index(monkeypatch):
+    """Nodes as boxes: name -> (min, max)"""
+    boxes = {
+        "Wall": ((0.0, 0.0, 0.0), (20.0, 1.0, 3.0)),
+        "Crate": ((30.0, 30.0, 0.0), (31.0, 31.0, 1.0)),
+    }
+    objects = Objects({name: types.SimpleNamespace(name=name) for name in boxes})
+    monkeypatch.setattr(node_spatial, "Vector", Vector)
+    monkeypatch.setattr(node_spatial, "KDTree", KDTree)
+    monkeypatch.setattr(node_spatial, "bpy", types.SimpleNamespace(data=types.SimpleNamespace(objects=objects),
+                                                                   types=node_spatial.bpy.types))
+    monkeypatch.setattr(node_spatial.node_status, "children_index", lambda objects: None)
+    monkeypatch.setattr(node_spatial.node_status, "all_statuses", lambda: [types.SimpleNamespace(name=name) for name in boxes])
+    monkeypatch.setattr(node_spatial, "node_bounds", lambda node, index=None: tuple(Vector(corner) for corner in boxes[node.name]))
+    monkeypatch.setattr(node_spatial, "_built", False)
+    return boxes
+
+def _names(nodes):
+    return [node.name for node in nodes]
+
+def test_box_finds_nodes_overlapping_it(index):
+    # The wall's center (10, 0.5, 1.5) is outside the box, its end is inside
+    assert _names(node_spatial.nodes_in_box((18.0, -1.0, 0.0), (22.0, 2.0, 2.0))) == ["Wall"]
+    assert _names(node_spatial.nodes_in_box((-1.0, -1.0, -1.0), (40.0, 40.0, 5.0))) == ["Wall", "Crate"]
+    assert node_spatial.nodes_in_box((21.0, 5.0, 0.0), (25.0, 6.0, 1.0)) == []
+
+def test_radius_measures_to_the_bounds(index):
+    # 2 units past the end of the wall, 12 from its center
+    assert _names(node_spatial.nodes_in_radius((22.0, 0.5, 1.0), 3.0)) == ["Wall"]
+    assert node_spatial.nodes_in_radius((22.0, 0.5, 1.0), 1.5) == []
+    assert _names(node_spatial.nodes_in_radius((25.0, 25.0, 0.0), 25.0)) == ["Crate", "Wall"]
+
+def test_moved_node_rebuilds_the_tree(index):
+    assert node_spatial.nodes_in_box((100.0, 100.0, 0.0), (101.0, 101.0, 1.0)) == []
+    index["Crate"] = ((100.5, 100.5, 0.0), (102.0, 102.0, 1.0))
+    node_spatial._store(node_spatial.bpy.data.objects["Crate"])
+    assert _names(node_spatial.nodes_in_box((100.0, 100.0, 0.0), (101.0, 101.0, 1.0))) == ["Crate"]
@@ -0,0 +1,110 @@
+import types
+
+import pytest
+
+from source2_model_exporter import node_status
+
+bpy = node_status.bpy
+
+class FakeMaterial(bpy.types.Material):
+    def __init__(self, name):
+        self.name = name
+        self.original = self
+
+class FakeMatrix:
+    def inverted_safe(self):
+        return self
+
+    def __matmul__(self, other):
+        return self
+
+class FakeObject(bpy.types.Object):
+    def __init__(self, name, object_type='MESH', parent=None, materials=()):
+        self.name = name
+        self.type = object_type
+        self.parent = parent
+        self.matrix_world = FakeMatrix()
+        self.material_slots = [types.SimpleNamespace(material=material) for material in materials]
+        self.original = self
+
+    def __contains__(self, key):
+        return False
+
+    def get(self, key, default=None):
+        return default
+
+class FakeCollection(list):
+    """bpy.data collection: iteration and lookup by name"""
+
+    def get(self, name):
+        return next((item for item in self if item.name == name), None)
+
+    def __getitem__(self, key):
+        return self.get(key) if isinstance(key, str) else super().__getitem__(key)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+@pytest.fixture
+def scene(monkeypatch):
+    """Two text nodes with one mesh each, using different materials"""
+    brick, metal = FakeMaterial("brick"), FakeMaterial("metal")
+    wall, crate = FakeObject("Wall", 'FONT'), FakeObject("Crate", 'FONT')
+    objects = FakeCollection([wall, crate, FakeObject("WallMesh", parent=wall, materials=[brick]),
+                              FakeObject("CrateMesh", parent=crate, materials=[metal])])
+    monkeypatch.setattr(bpy, "data", types.SimpleNamespace(objects=objects, materials=FakeCollection([brick, metal])))
+    monkeypatch.setattr(bpy, "context", types.SimpleNamespace(preferences=types.SimpleNamespace(addons={})))
+    node_status._status.clear()
+    node_status._dirty.clear()
+    node_status.invalidate()
+    node_status.rebuild()
+    yield types.SimpleNamespace(brick=brick, metal=metal, objects=objects)
+    node_status._status.clear()
+    node_status._dirty.clear()
+    node_status.invalidate()
+
+def _update(data):
+    return types.SimpleNamespace(id=data, is_updated_geometry=False, is_updated_transform=False, is_updated_shading=True)
+
+def test_material_update_rechecks_only_its_nodes(scene, monkeypatch):
+    computed = []
+    compute_status = node_status.compute_status
+
+    def counting(node, base_path, index=None):
+        computed.append((node.name, index is not None))
+        return compute_status(node, base_path, index)
+
+    monkeypatch.setattr(node_status, "compute_status", counting)
+    node_status.on_depsgraph_update(None, types.SimpleNamespace(updates=[_update(scene.brick)]))
+    assert computed == [("Wall", True)]
+
+def test_renamed_material_rechecks_its_nodes(scene):
+    scene.metal.name = "steel"
+    node_status.on_depsgraph_update(None, types.SimpleNamespace(updates=[_update(scene.metal)]))
+    assert node_status.get_status("Crate").materials == frozenset({"steel"})
+    assert node_status.get_status("Wall").materials == frozenset({"brick"})
+
+def _moved(obj):
+    return types.SimpleNamespace(id=obj, is_updated_geometry=False, is_updated_transform=True, is_updated_shading=False)
+
+def test_member_update_keeps_the_index(scene, monkeypatch):
+    scans = []
+    monkeypatch.setattr(node_status, "children_index", lambda objects: scans.append("children_index"))
+    monkeypatch.setattr(node_status.ChildIndex, "__init__", lambda self, objects: scans.append("ChildIndex"))
+    node_status.on_depsgraph_update(None, types.SimpleNamespace(updates=[_moved(scene.objects["WallMesh"])]))
+    assert scans == []
+    assert node_status.get_status("Wall").dirty
+
+def test_reparented_member_updates_both_nodes(scene):
+    mesh = scene.objects["CrateMesh"]
+    mesh.parent = scene.objects["Wall"]
+    node_status.on_depsgraph_update(None, types.SimpleNamespace(updates=[_moved(mesh)]))
+    assert node_status.get_status("Wall").render_count == 2
+    assert node_status.get_status("Crate").render_count == 0
+    assert node_status.get_status("Crate").dirty
+
+def test_renamed_parent_is_indexed_again(scene):
+    wall = scene.objects["Wall"]
+    wall.name = "Fence"
+    node_status.on_depsgraph_update(None, types.SimpleNamespace(updates=[_moved(wall)]))
+    assert node_status.get_status("Fence").render_count == 1
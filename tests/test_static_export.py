@@ -0,0 +1,200 @@
+import os
+import types
+
+import pytest
+
+import fake_blender
+from conftest import PACKAGE
+
+from source2_model_exporter import dmx_export, modifier_cache, static_export, static_mesh_operator, uv_projection, validation
+
+def _settings(**overrides):
+    settings = types.SimpleNamespace(
+        export_format='DMX_BINARY', deterministic_output=True, stream_static_export=False,
+        export_materials=False, modifier_cache_size=0, greybox_uvs=False, texels_per_inch=4.0,
+        strip_attributes=False, uv_channel_count=1, position_precision=0.0, normal_precision=0.0,
+        use_content_store=False)
+    settings.__dict__.update(overrides)
+    return settings
+
+@pytest.fixture
+def scene(monkeypatch, tmp_path):
+    """Fake scene with three selected meshes (one a numbered name) and a marker-free selection"""
+    def make(**overrides):
+        preferences = types.SimpleNamespace(static_mesh_export_path=str(tmp_path / "static"), addons_path="",
+                                            content_store_path="")
+        world = fake_blender.World(preferences, _settings(**overrides), PACKAGE)
+        brick = world.materials.new("brick")
+        quad = ([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [0, 1, 2, 3], [4])
+        triangle = ([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [0, 1, 2], [3])
+        for name, geometry, location in (("Wall", quad, (0, 0, 0)), ("Wall.001", quad, (2, 0, 0)),
+                                         ("Ramp", triangle, (0, 3, 1))):
+            world.add_mesh_object(name, *geometry, materials=[brick], location=location).select_set(True)
+
+        bpy = static_export.bpy
+        monkeypatch.setattr(bpy, "context", world.context)
+        monkeypatch.setattr(bpy, "data", world.data)
+        monkeypatch.setattr(bpy, "ops", world.ops)
+        monkeypatch.setattr(dmx_export, "capture_objects", fake_blender.capture)
+        monkeypatch.setattr(validation, "run", lambda context, **kwargs: True)
+        return world
+    return make
+
+def _read(path):
+    with open(path, "rb") as source:
+        return source.read()
+
+def test_writes_dmx_and_cleans_up(scene):
+    world = scene()
+    file_path = static_export.export_selection(world.context)
+    assert file_path is not None and file_path.endswith("combined_export.dmx")
+    assert os.path.getsize(file_path) > 0
+
+    # Only the scene's objects and meshes are left, with the selection restored
+    assert [obj.name for obj in world.objects] == ["Wall", "Wall.001", "Ramp"]
+    assert [mesh.name for mesh in world.meshes] == ["Wall", "Wall.001", "Ramp"]
+    assert static_export.TEMP_COLLECTION not in world.collections
+    assert all(obj.selected for obj in world.objects)
+    assert not any(obj.modifiers for obj in world.objects)
+
+def test_duplicates_are_prepared(scene, monkeypatch):
+    world = scene(greybox_uvs=True, modifier_cache_size=8)
+    applied, projected, captured = [], [], []
+    monkeypatch.setattr(modifier_cache, "apply_cached", lambda context, objects, size: applied.extend(objects))
+    monkeypatch.setattr(uv_projection, "is_greybox", lambda obj: obj.name.startswith("Ramp"))
+    monkeypatch.setattr(uv_projection, "project_objects",
+                        lambda objects, texels: projected.extend(objects) or (len(objects), len(objects), 0))
+
+    def capture(context, objects, *args):
+        captured.extend((obj.name, obj.get("FBX_vmatPath"), [modifier.type for modifier in obj.modifiers])
+                        for obj in objects)
+        return fake_blender.capture(context, objects, *args)
+
+    monkeypatch.setattr(dmx_export, "capture_objects", capture)
+    assert static_export.export_selection(world.context) is not None
+    assert [obj.name for obj in applied] == ["Wall.002", "Wall.003", "Ramp.001"]
+    assert [obj.name for obj in projected] == ["Ramp.001"]
+    assert captured == [(name, "brick", ['EDGE_SPLIT']) for name in ("Wall.002", "Wall.003", "Ramp.001")]
+
+def test_operator_reports_failure(scene):
+    world = scene()
+    world.context.preferences.addons[PACKAGE].preferences.static_mesh_export_path = ""
+    reports = []
+    operator = types.SimpleNamespace(report=lambda level, message: reports.append((level, message)))
+    assert static_mesh_operator.StaticMeshOperator.execute(operator, world.context) == {'CANCELLED'}
+    assert reports[0][0] == {'ERROR'}
+
+def test_operator_reports_failed_write(scene, monkeypatch):
+    world = scene()
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(dmx_export, "export_objects", broken)
+    reports = []
+    operator = types.SimpleNamespace(report=lambda level, message: reports.append((level, message)))
+    assert static_mesh_operator.StaticMeshOperator.execute(operator, world.context) == {'CANCELLED'}
+    assert not os.path.exists(os.path.join(world.context.preferences.addons[PACKAGE].preferences.static_mesh_export_path,
+                                           "combined_export.dmx"))
+
+def test_greybox_uvs_after_modifiers(scene, monkeypatch):
+    # Generated faces get UVs too: the projection sees the applied stacks, edge split comes after
+    world = scene(greybox_uvs=True, modifier_cache_size=8)
+    steps = []
+    monkeypatch.setattr(modifier_cache, "apply_cached", lambda context, objects, size: steps.append("modifiers"))
+    monkeypatch.setattr(uv_projection, "is_greybox", lambda obj: True)
+
+    def project(objects, texels):
+        steps.append(("uvs", sorted(obj.name for obj in objects), texels,
+                      any(modifier.type == 'EDGE_SPLIT' for obj in objects for modifier in obj.modifiers)))
+        return len(objects), len(objects), 0
+
+    monkeypatch.setattr(uv_projection, "project_objects", project)
+    assert static_export.export_selection(world.context) is not None
+    assert steps == ["modifiers", ("uvs", ["Ramp.001", "Wall.002", "Wall.003"], 4.0, False)]
+    # The scene's own meshes are never projected
+    assert all(obj.data.name in ("Wall", "Wall.001", "Ramp") for obj in world.objects)
+
+def _export(scene, tmp_path, label, setup=None, **overrides):
+    world = scene(**overrides)
+    if setup is not None:
+        setup(world)
+    file_path = static_export.export_selection(world.context)
+    assert file_path is not None and os.path.basename(file_path) == "combined_export.dmx"
+    kept = tmp_path / f"{label}.dmx"
+    os.replace(file_path, kept)
+    return world, str(kept)
+
+@pytest.mark.parametrize("export_format", ['DMX_BINARY', 'DMX_TEXT'])
+def test_streamed_matches_regular(scene, tmp_path, export_format):
+    _world, regular = _export(scene, tmp_path, "regular", export_format=export_format)
+    world, streamed = _export(scene, tmp_path, "streamed", export_format=export_format, stream_static_export=True)
+    assert _read(streamed) == _read(regular)
+
+    # The streamed copies and their meshes are gone as well
+    assert [obj.name for obj in world.objects] == ["Wall", "Wall.001", "Ramp"]
+    assert [mesh.name for mesh in world.meshes] == ["Wall", "Wall.001", "Ramp"]
+    assert all(obj.selected for obj in world.objects)
+
+def _add_text(world):
+    world.add_curve_object("Sign", [[0, 0, 0], [1, 0, 0], [1, 0, 1]], [0, 1, 2], [3], materials=[world.materials["brick"]],
+                           location=(5, 0, 0), object_type='FONT').select_set(True)
+
+@pytest.mark.parametrize("export_format", ['DMX_BINARY', 'DMX_TEXT'])
+def test_streamed_matches_regular_with_text(scene, tmp_path, export_format):
+    # Curves and text are converted to meshes on both paths
+    from source2_model_exporter import dmx_writer
+    _world, regular = _export(scene, tmp_path, "regular", _add_text, export_format=export_format)
+    world, streamed = _export(scene, tmp_path, "streamed", _add_text, export_format=export_format, stream_static_export=True)
+    assert _read(streamed) == _read(regular)
+    meshes = [element for element in dmx_writer.collect_elements(dmx_writer.read_dmx(streamed)) if element.type == "DmeMesh"]
+    assert len(meshes) == 4
+
+    assert [obj.name for obj in world.objects] == ["Wall", "Wall.001", "Ramp", "Sign"]
+    assert [mesh.name for mesh in world.meshes] == ["Wall", "Wall.001", "Ramp"]
+    assert [curve.name for curve in world.curves] == ["Sign"]
+    assert world.objects["Sign"].type == 'FONT'
+
+def test_streamed_names_match_regular(scene, tmp_path):
+    # Without deterministic output the duplicate names end up in the file
+    from source2_model_exporter import dmx_writer
+    _world, regular = _export(scene, tmp_path, "regular", deterministic_output=False)
+    _world, streamed = _export(scene, tmp_path, "streamed", deterministic_output=False, stream_static_export=True)
+
+    def names(path):
+        return [(element.type, element.name) for element in dmx_writer.collect_elements(dmx_writer.read_dmx(path))]
+
+    assert names(streamed) == names(regular)
+    assert ("DmeMesh", "Wall.003") in names(streamed)
+
+def test_stream_frees_each_mesh(scene, tmp_path, monkeypatch):
+    world = scene(stream_static_export=True)
+    alive = []
+    capture = fake_blender.capture
+
+    def counting(context, objects, *args):
+        # Only the copy being captured holds a mesh of its own
+        alive.append(sorted(mesh.name for mesh in world.meshes if mesh.name not in ("Wall", "Wall.001", "Ramp")))
+        return capture(context, objects, *args)
+
+    monkeypatch.setattr(dmx_export, "capture_objects", counting)
+    assert static_export.export_selection(world.context) is not None
+    assert [len(names) for names in alive] == [2, 2, 2]
+    assert all("S2StreamPlaceholder" in names for names in alive)
+
+def test_stream_ignored_for_fbx(scene, monkeypatch):
+    world = scene(export_format='FBX', stream_static_export=True, deterministic_output=False)
+    written = []
+    monkeypatch.setattr(static_export, "write_fbx", lambda file_path: written.append(file_path) or open(file_path, "wb").close())
+    monkeypatch.setattr(static_export, "stream_dmx", None)
+    file_path = static_export.export_selection(world.context)
+    assert file_path == written[0] and file_path.endswith("combined_export.fbx")
+
+def test_stream_slims_each_copy_once(scene, monkeypatch):
+    from source2_model_exporter import fbx_export_operator
+    world = scene(stream_static_export=True)
+    slimmed = []
+    monkeypatch.setattr(fbx_export_operator, "slim_objects",
+                        lambda context, objects, export_format: slimmed.append([obj.name for obj in objects]))
+    assert static_export.export_selection(world.context) is not None
+    assert slimmed == [["Wall.002"], ["Wall.003"], ["Ramp.001"]]
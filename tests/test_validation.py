@@ -0,0 +1,80 @@
+import types
+
+import numpy as np
+import pytest
+
+from source2_model_exporter import validation
+
+bpy = validation.bpy
+
+class FakeMatrix:
+    def inverted_safe(self):
+        return self
+
+    def __matmul__(self, other):
+        return self
+
+class Elements:
+    """Mesh element collection: len and foreach_get over per-element arrays"""
+
+    def __init__(self, **fields):
+        self.fields = {name: np.asarray(values) for name, values in fields.items()}
+
+    def __len__(self):
+        return len(next(iter(self.fields.values())))
+
+    def foreach_get(self, field, buffer):
+        buffer[:] = self.fields[field].ravel()
+
+def _mesh(positions, triangles):
+    positions = np.asarray(positions, dtype=np.float32)
+    triangles = np.asarray(triangles, dtype=np.int32)
+    corners = positions[triangles]
+    cross = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(cross, axis=1)
+    edges = sorted({tuple(sorted((int(a), int(b)))) for triangle in triangles
+                    for a, b in zip(triangle, np.roll(triangle, -1))})
+    return types.SimpleNamespace(
+        vertices=Elements(co=positions),
+        edges=Elements(vertices=np.asarray(edges, dtype=np.int32)),
+        polygons=Elements(area=lengths / 2, normal=cross / lengths[:, None],
+                          loop_start=np.arange(len(triangles)) * 3),
+        loops=Elements(vertex_index=triangles.ravel()))
+
+class FakeObject:
+    def __init__(self, name, object_type, data=None, parent=None, properties=()):
+        self.name = name
+        self.type = object_type
+        self.data = data
+        self.parent = parent
+        self.scale = (1.0, 1.0, 1.0)
+        self.matrix_world = FakeMatrix()
+        self.properties = dict(properties)
+
+    def __contains__(self, key):
+        return key in self.properties
+
+TETRAHEDRON = _mesh([(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)], [(0, 2, 1), (0, 1, 3), (0, 3, 2), (1, 2, 3)])
+
+@pytest.fixture
+def node(monkeypatch):
+    """A text node with a render mesh and a tetrahedron _coll mesh"""
+    node = FakeObject("Crate", 'FONT', types.SimpleNamespace(body="Crate"), properties={"custom_file_path": "crate.fbx"})
+    objects = [node, FakeObject("Crate_mesh", 'MESH', TETRAHEDRON, node), FakeObject("Crate_coll", 'MESH', TETRAHEDRON, node)]
+    monkeypatch.setattr(bpy, "data", types.SimpleNamespace(objects=objects))
+    return node
+
+def _context(collision_hulls):
+    settings = types.SimpleNamespace(validate_before_export=True, block_on_validation_errors=True,
+                                     collision_hulls=collision_hulls)
+    return types.SimpleNamespace(scene=types.SimpleNamespace(export_fbx=settings))
+
+def test_non_box_collision_blocks_without_hulls(node):
+    reports = []
+    assert not validation.run(_context(False), nodes=[node], report=lambda level, message: reports.append(message))
+    assert "Crate_coll: 1 of 1 collision pieces are not boxes" in reports
+
+def test_non_box_collision_passes_with_hulls(node):
+    reports = []
+    assert validation.run(_context(True), nodes=[node], report=lambda level, message: reports.append(message))
+    assert reports == []
@@ -0,0 +1,80 @@
+import types
+
+import pytest
+
+from source2_model_exporter import fbx_export_operator, node_status, watch_mode
+
+class FakeNode:
+    def __init__(self, name):
+        self.name = name
+
+    def select_set(self, state):
+        pass
+
+class Names(list):
+    """view_layer.objects: name lookup with `in` and the active object"""
+    active = None
+
+    def __contains__(self, name):
+        return any(obj.name == name for obj in self)
+
+@pytest.fixture
+def scene(monkeypatch):
+    """Two dirty nodes with export paths; the export writes only the nodes in `writable`"""
+    nodes = {name: FakeNode(name) for name in ("Crate", "Barrel")}
+    state = types.SimpleNamespace(dirty={"Crate", "Barrel"}, writable=set(), exports=[], scheduled=0)
+
+    def export_nodes(context, export, report):
+        state.exports.append(sorted(node.name for node in export))
+        state.dirty -= state.writable
+        return {'FINISHED'}
+
+    def schedule(scene):
+        state.scheduled += 1
+
+    monkeypatch.setattr(node_status, "dirty_nodes", lambda: [nodes[name] for name in sorted(state.dirty)])
+    monkeypatch.setattr(node_status, "get_status", lambda name: types.SimpleNamespace(has_path=True))
+    monkeypatch.setattr(fbx_export_operator, "export_nodes", export_nodes)
+    monkeypatch.setattr(watch_mode, "schedule", schedule)
+    monkeypatch.setattr(watch_mode, "_failed", {})
+    state.context = types.SimpleNamespace(selected_objects=[], view_layer=types.SimpleNamespace(objects=Names(nodes.values())))
+    state.scene = types.SimpleNamespace(export_fbx=types.SimpleNamespace(watch_mode=True))
+    return state
+
+def test_failed_nodes_wait_for_an_edit(scene):
+    scene.writable = {"Barrel"}
+    assert watch_mode.export_pending(scene.context) == 1
+    assert scene.exports == [["Barrel", "Crate"]]
+
+    # Crate wasn't written: nothing is pending and updates don't schedule another attempt
+    assert watch_mode.pending_nodes() == []
+    watch_mode.on_depsgraph_update(scene.scene, None)
+    watch_mode.on_depsgraph_update(scene.scene, None)
+    assert scene.scheduled == 0
+    assert watch_mode.export_pending(scene.context) == 0
+    assert len(scene.exports) == 1
+
+    # Editing it makes it pending again
+    node_status._edited("Crate")
+    watch_mode.on_depsgraph_update(scene.scene, None)
+    assert scene.scheduled == 1
+    scene.writable = {"Crate"}
+    assert watch_mode.export_pending(scene.context) == 1
+    assert scene.exports[-1] == ["Crate"]
+
+def test_failed_export_is_recorded(scene, monkeypatch):
+    def broken(context, export, report):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(fbx_export_operator, "export_nodes", broken)
+    with pytest.raises(RuntimeError):
+        watch_mode.export_pending(scene.context)
+    assert watch_mode.pending_nodes() == []
+
+def test_updates_without_edits_do_not_schedule(scene):
+    watch_mode.on_depsgraph_update(scene.scene, None)
+    scheduled = scene.scheduled
+    watch_mode.on_depsgraph_update(scene.scene, None)
+    assert scene.scheduled == scheduled
+    node_status._edited("Barrel")
+    watch_mode.on_depsgraph_update(scene.scene, None)
+    assert scene.scheduled == scheduled + 1
@@ -0,0 +1,126 @@
+"""
+World-aligned box UVs for greybox geometry
+
+Every face is projected along the world axis its normal points at most (tri-planar/box
+mapping), in Hammer inches, at a fixed number of texels per inch. The grid texture then
+lines up across objects and with Hammer's grid, whatever the modelling did to the UVs.
+All selected meshes are read with foreach_get, projected in one NumPy pass and written
+back with foreach_set, no bpy.ops.uv call per object.
+"""
+
+import bpy
+import numpy as np
+
+from . import mesh_buffers
+
+INCHES_PER_METER = 39.3701
+# Hammer's default texture scale (0.25) is 4 texels per inch
+DEFAULT_TEXELS_PER_INCH = 4.0
+# Width of greygrid.png
+DEV_TEXTURE_SIZE = 512
+DEV_MATERIAL_PREFIX = "materials/dev/"
+
+# Per dominant axis (X, Y, Z): world component for U and V, and the U direction for a
+# face pointing the positive way; faces pointing the other way flip U so the texture
+# is never mirrored
+U_COMPONENT = np.array([1, 0, 0])
+V_COMPONENT = np.array([2, 2, 1])
+U_DIRECTION = np.array([1.0, -1.0, 1.0])
+
+def box_uvs(positions, normals, sizes, scale):
+    """(L, 2) UVs of face corners from a box projection.
+
+    positions -- (L, 3) world position of every face corner, in polygon order
+    normals   -- (P, 3) world normal of every polygon
+    sizes     -- (P,) corner count of every polygon
+    scale     -- UV units per world unit
+    """
+    axis = np.argmax(np.abs(normals), axis=1)
+    facing = np.where(normals[np.arange(len(axis)), axis] < 0, -1.0, 1.0)
+    axis = np.repeat(axis, sizes)
+    direction = np.repeat(facing, sizes) * U_DIRECTION[axis]
+
+    corners = np.arange(len(positions))
+    uvs = np.empty((len(positions), 2), dtype=np.float32)
+    uvs[:, 0] = positions[corners, U_COMPONENT[axis]] * direction * scale
+    uvs[:, 1] = positions[corners, V_COMPONENT[axis]] * scale
+    return uvs
+
+def uv_scale(texels_per_inch, texture_size=DEV_TEXTURE_SIZE):
+    """UV units per Blender unit (metre)"""
+    return INCHES_PER_METER * texels_per_inch / texture_size
+
+def is_greybox(obj):
+    """Mesh whose materials are all dev materials (Add Dev Mat), the ones box UVs are meant for"""
+    if obj.type != 'MESH' or not obj.material_slots:
+        return False
+    return all(slot.material and mesh_buffers.vmat_path_for(slot.material).startswith(DEV_MATERIAL_PREFIX)
+               for slot in obj.material_slots)
+
+def _read(obj):
+    """World corner positions, world polygon normals and polygon sizes of a mesh object"""
+    mesh = obj.data
+    vertex_count = len(mesh.vertices)
+    poly_count = len(mesh.polygons)
+    points = np.empty(vertex_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", points)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    starts = np.empty(poly_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", starts)
+    sizes = np.empty(poly_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", sizes)
+    normals = np.empty(poly_count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normals)
+
+    # Corners in polygon order; loops normally are already, but nothing guarantees it
+    order = np.repeat(starts, sizes) + np.arange(len(loop_vertices)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    matrix = obj.matrix_world
+    positions = mesh_buffers.transform_points(points.reshape(-1, 3)[loop_vertices[order]], matrix)
+    normals = mesh_buffers.transform_normals(normals.reshape(-1, 3), matrix)
+    return positions, normals, sizes, order
+
+def project_objects(objects, texels_per_inch=DEFAULT_TEXELS_PER_INCH, texture_size=DEV_TEXTURE_SIZE):
+    """Write world-aligned box UVs into the first UV map of every mesh object (created if missing).
+
+    A mesh shared by several of the objects gets the UVs of the first one.
+    Returns (object count, polygon count, shared count).
+    """
+    seen = set()
+    targets = []
+    shared = 0
+    for obj in objects:
+        if obj.type != 'MESH' or not len(obj.data.polygons):
+            continue
+        if obj.data.name in seen:
+            shared += 1
+            continue
+        if abs(obj.matrix_world.to_3x3().determinant()) < 1e-12:
+            continue
+        seen.add(obj.data.name)
+        targets.append(obj)
+    if not targets:
+        return 0, 0, shared
+
+    # One projection over the corners of every object
+    read = [_read(obj) for obj in targets]
+    uvs = box_uvs(np.concatenate([positions for positions, _normals, _sizes, _order in read]),
+                  np.concatenate([normals for _positions, normals, _sizes, _order in read]),
+                  np.concatenate([sizes for _positions, _normals, sizes, _order in read]),
+                  uv_scale(texels_per_inch, texture_size))
+
+    offset = 0
+    poly_count = 0
+    for obj, (positions, _normals, sizes, order) in zip(targets, read):
+        mesh = obj.data
+        corner_count = len(positions)
+        loop_uvs = np.empty((corner_count, 2), dtype=np.float32)
+        loop_uvs[order] = uvs[offset:offset + corner_count]
+        offset += corner_count
+        poly_count += len(sizes)
+
+        if not mesh.uv_layers:
+            mesh.uv_layers.new(name="UVMap")
+        mesh.uv_layers[0].data.foreach_set("uv", loop_uvs.reshape(-1))
+        mesh.update()
+    return len(targets), poly_count, shared
@@ -0,0 +1,34 @@
+import bpy
+from bpy.types import Operator
+
+from . import node_status, uv_projection
+
+class GreyboxUVsOperator(Operator):
+    bl_idname = "object.greybox_uvs"
+    bl_label = "Greybox UVs"
+    bl_description = "Give the selected meshes world-aligned box UVs at the Texels/Inch density, so the dev grid lines up with Hammer's grid"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            self.report({'ERROR'}, "Switch to Object Mode first")
+            return {'CANCELLED'}
+
+        # Marker nodes share one mesh, projecting it would change every marker
+        meshes = [obj for obj in context.selected_objects if obj.type == 'MESH' and not node_status.is_marker_node(obj)]
+        if not meshes:
+            self.report({'WARNING'}, "No meshes selected")
+            return {'CANCELLED'}
+
+        objects, polygons, shared = uv_projection.project_objects(meshes, context.scene.export_fbx.texels_per_inch)
+        message = f"Projected UVs of {polygons} faces on {objects} objects"
+        if shared:
+            message += f", {shared} objects share a mesh and got the UVs of its first object"
+        self.report({'WARNING'} if shared else {'INFO'}, message)
+        return {'FINISHED'}
+
+def register():
+    bpy.utils.register_class(GreyboxUVsOperator)
+
+def unregister():
+    bpy.utils.unregister_class(GreyboxUVsOperator)
@@ -0,0 +1,177 @@
+import bpy
+import time
+import numpy as np
+
+from . import collision_hull, mesh_buffers, node_status
+
+# Pre-export checks. Every check works on whole foreach_get buffers, so a scene is
+# validated in one pass and all problems are reported together before anything is exported.
+
+# Faces smaller than this (in square metres) count as degenerate
+MIN_FACE_AREA = 1e-10
+SCALE_TOLERANCE = 1e-4
+# Face normal directions of one collision box may differ this much and still count as the same axis
+NORMAL_DECIMALS = 3
+ORTHOGONAL_TOLERANCE = 1e-2
+
+class ValidationIssue:
+    __slots__ = ("object_name", "severity", "message")
+
+    def __init__(self, object_name, severity, message):
+        self.object_name = object_name
+        self.severity = severity  # 'ERROR' or 'WARNING', same as Operator.report levels
+        self.message = message
+
+    def __str__(self):
+        return f"{self.object_name}: {self.message}"
+
+def _get(collection, attribute, count, dtype, width=1):
+    buffer = np.empty(count * width, dtype=dtype)
+    if count:
+        collection.foreach_get(attribute, buffer)
+    return buffer.reshape(-1, width) if width > 1 else buffer
+
+def box_islands(positions, edges, poly_normals, poly_first_vertices):
+    """Split a mesh into islands and tell which of them are boxes.
+
+    An island is a box when it has 8 distinct corners and its faces point along
+    exactly 3 mutually perpendicular directions (quads or triangulated).
+    Returns (island_count, bool array is_box per island).
+    """
+    labels, island_count = mesh_buffers.mesh_islands(edges, len(positions))
+    if island_count == 0:
+        return 0, np.zeros(0, dtype=bool)
+
+    # Distinct corner positions per island
+    corners = np.unique(np.column_stack([labels, np.round(positions, 5)]), axis=0)
+    corner_counts = np.bincount(corners[:, 0].astype(np.int64), minlength=island_count)
+
+    # Face directions per island, with the sign made canonical so opposite faces share a direction
+    normals = np.asarray(poly_normals, dtype=np.float64).copy()
+    dominant = np.abs(normals).argmax(axis=1)
+    signs = np.sign(normals[np.arange(len(normals)), dominant])
+    signs[signs == 0] = 1
+    normals *= signs[:, None]
+    poly_islands = labels[poly_first_vertices]
+    directions = np.unique(np.column_stack([poly_islands, np.round(normals, NORMAL_DECIMALS)]), axis=0)
+    direction_counts = np.bincount(directions[:, 0].astype(np.int64), minlength=island_count)
+
+    candidates = (corner_counts == 8) & (direction_counts == 3)
+    is_box = np.zeros(island_count, dtype=bool)
+    if candidates.any():
+        # Rows of np.unique are sorted by island, so each candidate has 3 consecutive rows
+        rows = directions[candidates[directions[:, 0].astype(np.int64)]][:, 1:].reshape(-1, 3, 3)
+        rows /= np.linalg.norm(rows, axis=2, keepdims=True)
+        dots = np.abs(np.stack([
+            (rows[:, 0] * rows[:, 1]).sum(axis=1),
+            (rows[:, 0] * rows[:, 2]).sum(axis=1),
+            (rows[:, 1] * rows[:, 2]).sum(axis=1),
+        ], axis=1))
+        is_box[candidates] = (dots < ORTHOGONAL_TOLERANCE).all(axis=1)
+    return island_count, is_box
+
+def check_mesh(obj, issues, collision=False, hulls=False):
+    """Geometry checks for one mesh object (base mesh, no modifier evaluation).
+    hulls -- collision pieces are exported as convex hulls, so they don't have to be boxes"""
+    mesh = obj.data
+    vertex_count = len(mesh.vertices)
+    poly_count = len(mesh.polygons)
+
+    if any(abs(value - 1.0) > SCALE_TOLERANCE for value in obj.scale):
+        issues.append(ValidationIssue(obj.name, 'WARNING', f"Unapplied object scale {tuple(round(v, 4) for v in obj.scale)}"))
+
+    positions = _get(mesh.vertices, "co", vertex_count, np.float32, 3)
+    bad_vertices = np.count_nonzero(~np.isfinite(positions).all(axis=1))
+    if bad_vertices:
+        issues.append(ValidationIssue(obj.name, 'ERROR', f"{bad_vertices} vertices with NaN/infinite coordinates"))
+
+    areas = _get(mesh.polygons, "area", poly_count, np.float32)
+    degenerate = np.count_nonzero(~(areas > MIN_FACE_AREA))
+    if degenerate:
+        issues.append(ValidationIssue(obj.name, 'WARNING', f"{degenerate} zero-area faces"))
+
+    if collision:
+        if poly_count == 0:
+            issues.append(ValidationIssue(obj.name, 'ERROR', "Collision mesh has no faces"))
+            return
+        if hulls:
+            return
+        edges = _get(mesh.edges, "vertices", len(mesh.edges), np.int32, 2)
+        normals = _get(mesh.polygons, "normal", poly_count, np.float32, 3)
+        loop_starts = _get(mesh.polygons, "loop_start", poly_count, np.int32)
+        loop_vertices = _get(mesh.loops, "vertex_index", len(mesh.loops), np.int32)
+        island_count, is_box = box_islands(positions, edges, normals, loop_vertices[loop_starts])
+        non_boxes = int(np.count_nonzero(~is_box))
+        if non_boxes:
+            issues.append(ValidationIssue(obj.name, 'ERROR', f"{non_boxes} of {island_count} collision pieces are not boxes"))
+
+def check_node(node, issues, index=None, hulls=False):
+    """Export settings of a node and the geometry of its members (at any depth)"""
+    if node.type == 'FONT' and not node.data.body.strip():
+        issues.append(ValidationIssue(node.name, 'ERROR', "Node text is empty"))
+
+    if not getattr(node, "relative_export_path", "") and "custom_file_path" not in node:
+        issues.append(ValidationIssue(node.name, 'ERROR', "No relative_export_path set"))
+
+    members = node_status.gather_members(node, index)
+    for child, _matrix in members.render:
+        check_mesh(child, issues)
+    for child, _matrix in members.collision:
+        if child.type == 'MESH':
+            check_mesh(child, issues, collision=True, hulls=hulls)
+
+    if not members.render:
+        issues.append(ValidationIssue(node.name, 'ERROR', "Node has no render mesh children"))
+
+def validate_nodes(nodes, hulls=False):
+    """Validate nodes for the model export. Returns a list of ValidationIssue.
+    hulls -- Collision Hulls is on, see check_mesh"""
+    issues = []
+    index = node_status.children_index(bpy.data.objects)
+    for node in nodes:
+        if node_status.is_node(node):
+            check_node(node, issues, index, hulls)
+    return issues
+
+def validate_static(objects):
+    """Validate a static mesh selection. Returns a list of ValidationIssue."""
+    issues = []
+    for obj in objects:
+        if obj.type == 'MESH' and not node_status.is_node(obj):
+            check_mesh(obj, issues)
+    return issues
+
+def report_issues(issues, report, seconds=None):
+    """Send every issue to report(level, message) and print a summary. Returns the error count."""
+    errors = sum(issue.severity == 'ERROR' for issue in issues)
+    warnings = len(issues) - errors
+    for issue in issues:
+        print(f"[Validation] {issue.severity}: {issue}")
+        report({issue.severity}, str(issue))
+
+    timing = f" in {seconds:.2f}s" if seconds is not None else ""
+    print(f"[Validation] {errors} errors, {warnings} warnings{timing}")
+    return errors
+
+def run(context, nodes=None, static_objects=None, report=None):
+    """Validate before an export according to the scene settings.
+
+    Returns False if the export should be blocked.
+    """
+    settings = context.scene.export_fbx
+    if not settings.validate_before_export:
+        return True
+
+    started = time.perf_counter()
+    issues = []
+    if nodes is not None:
+        issues += validate_nodes(nodes, collision_hull.is_enabled(settings))
+    if static_objects is not None:
+        issues += validate_static(static_objects)
+
+    report = report or (lambda level, message: None)
+    errors = report_issues(issues, report, time.perf_counter() - started)
+    if errors and settings.block_on_validation_errors:
+        report({'ERROR'}, f"Export blocked: {errors} validation errors (see above)")
+        return False
+    return True
@@ -0,0 +1,31 @@
+import bpy
+from bpy.types import Operator
+
+from . import node_status, validation
+
+class ValidateExportOperator(Operator):
+    bl_idname = "object.validate_export"
+    bl_label = "Validate"
+    bl_description = "Check the selected nodes (all nodes if none are selected) and selected static meshes for export problems"
+
+    def execute(self, context):
+        selected = context.selected_objects
+        nodes = [obj for obj in selected if node_status.is_node(obj)]
+        static_objects = [obj for obj in selected if obj.type == 'MESH' and node_status.find_node(obj) is None]
+        if not selected:
+            nodes = [obj for obj in context.scene.objects if node_status.is_node(obj)]
+
+        issues = validation.validate_nodes(nodes) + validation.validate_static(static_objects)
+        errors = validation.report_issues(issues, self.report)
+
+        if not issues:
+            self.report({'INFO'}, f"No problems found in {len(nodes)} nodes and {len(static_objects)} static meshes")
+        else:
+            self.report({'WARNING'} if not errors else {'ERROR'}, f"{errors} errors, {len(issues) - errors} warnings (see Info editor)")
+        return {'FINISHED'}
+
+def register():
+    bpy.utils.register_class(ValidateExportOperator)
+
+def unregister():
+    bpy.utils.unregister_class(ValidateExportOperator)
@@ -0,0 +1,174 @@
+import bpy
+import time
+from bpy.app.handlers import persistent
+
+from . import fbx_export_operator, node_status
+
+# Watch mode: re-export dirty nodes automatically once the scene has been quiet for a while.
+# Dirty tracking comes from node_status; this module only decides when to export.
+_last_change = 0.0
+_timer_running = False
+# Nodes the last attempt didn't write (validation, budget, errors): name -> node_status.last_edit()
+# at that attempt. They are left alone until they are edited again.
+_failed = {}
+_seen_edits = 0         # node_status.edit_count() at the last depsgraph update
+
+def watch_settings(scene):
+    settings = getattr(scene, "export_fbx", None)
+    if settings is None or not settings.watch_mode:
+        return None
+    return settings
+
+def pending_nodes():
+    """Dirty nodes that can be exported (they have an export path and didn't fail unchanged)"""
+    nodes = []
+    for node in node_status.dirty_nodes():
+        status = node_status.get_status(node.name)
+        if status is None or not status.has_path:
+            continue
+        if node.name in _failed and _failed[node.name] == node_status.last_edit(node.name):
+            continue
+        nodes.append(node)
+    return nodes
+
+def schedule(scene):
+    """(Re)start the quiet period, the export runs when it passes without further changes"""
+    global _last_change, _timer_running
+    settings = watch_settings(scene)
+    if settings is None:
+        return
+
+    _last_change = time.monotonic()
+    if not _timer_running:
+        _timer_running = True
+        bpy.app.timers.register(watch_timer, first_interval=settings.watch_quiet_period)
+
+def find_view3d_override():
+    """Context override for running object operators from a timer"""
+    window_manager = bpy.context.window_manager
+    for window in window_manager.windows if window_manager else []:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                region = next((region for region in area.regions if region.type == 'WINDOW'), None)
+                return {"window": window, "area": area, "region": region}
+    return {}
+
+def export_pending(context):
+    """Export the pending nodes without disturbing the user's selection"""
+    nodes = pending_nodes()
+    if not nodes:
+        return 0
+
+    selection = context.selected_objects.copy()
+    active = context.view_layer.objects.active
+
+    def report(level, message):
+        print(f"[Watch mode] {sorted(level)[0]}: {message}")
+
+    names = [node.name for node in nodes]
+    try:
+        fbx_export_operator.export_nodes(context, nodes, report)
+    finally:
+        # Restore the selection the export cleared
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        for obj in selection:
+            if obj.name in context.view_layer.objects:
+                obj.select_set(True)
+        if active is not None and active.name in context.view_layer.objects:
+            context.view_layer.objects.active = active
+
+        # Nodes still dirty weren't written, don't retry them before the next edit
+        dirty = {node.name for node in node_status.dirty_nodes()}
+        failed = [name for name in names if name in dirty]
+        for name in names:
+            if name in dirty:
+                _failed[name] = node_status.last_edit(name)
+            else:
+                _failed.pop(name, None)
+        if failed:
+            print(f"[Watch mode] Not exported, retried after the next change: {', '.join(failed)}")
+
+    exported = [name for name in names if name not in _failed]
+    if exported:
+        print(f"[Watch mode] Re-exported {len(exported)} changed node(s): {', '.join(exported)}")
+    return len(exported)
+
+def watch_timer():
+    """Runs on Blender's main thread between events, returns the seconds until the next check"""
+    global _timer_running
+    settings = watch_settings(bpy.context.scene)
+    if settings is None:
+        _timer_running = False
+        return None
+
+    remaining = settings.watch_quiet_period - (time.monotonic() - _last_change)
+    if remaining > 0:
+        return remaining
+
+    # Operators only work in object mode, wait until the user leaves edit/sculpt mode
+    if bpy.context.mode != 'OBJECT':
+        return settings.watch_quiet_period
+
+    try:
+        with bpy.context.temp_override(**find_view3d_override()):
+            export_pending(bpy.context)
+    except Exception as e:
+        print(f"[Watch mode] Export failed: {e}")
+
+    _timer_running = False
+    return None
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    # Only updates that edited a node count (node_status handles the update first), not
+    # every depsgraph tick such as selection changes or the watch export's own duplicates
+    global _seen_edits
+    edits = node_status.edit_count()
+    if edits == _seen_edits:
+        return
+    _seen_edits = edits
+    if watch_settings(scene) is not None and pending_nodes():
+        schedule(scene)
+
+@persistent
+def on_save_post(*args):
+    scene = bpy.context.scene
+    if watch_settings(scene) is not None and pending_nodes():
+        schedule(scene)
+
+@persistent
+def on_load_post(*args):
+    # Timers are dropped when a file is loaded
+    global _timer_running
+    _timer_running = False
+    _failed.clear()
+
+def update_watch_mode(self, context):
+    """Scene setting update: export anything already pending when watch mode is switched on,
+    failed nodes included"""
+    if self.watch_mode:
+        _failed.clear()
+    if self.watch_mode and pending_nodes():
+        schedule(context.scene)
+
+def register():
+    if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    if on_save_post not in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.append(on_save_post)
+    if on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_load_post)
+
+def unregister():
+    global _timer_running
+    if bpy.app.timers.is_registered(watch_timer):
+        bpy.app.timers.unregister(watch_timer)
+    _timer_running = False
+
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    if on_save_post in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.remove(on_save_post)
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)